@@ -207,7 +207,26 @@ class LeanCommand(Command):
         self.context_settings["allow_extra_args"] = allow_unknown_options
 
     def invoke(self, ctx: Context):
-        container.data_downloader.update_database_files()
+        from lean.constants import HOUSEKEEPING_TASK_DATABASE_FILES
+
+        # Update checks and database updates wait on the network, so they run in the background while the command runs
+        # Commands only wait for them when they need their results, the results of unfinished checks are discarded
+        # The components the checks need are created by the checks, so commands that don't need them never create them
+        housekeeping_manager = container.housekeeping_manager
+        if self._requires_lean_config:
+            # The database files are stored in the data directory configured in the Lean config
+            housekeeping_manager.submit(HOUSEKEEPING_TASK_DATABASE_FILES,
+                                        lambda: container.data_downloader.refresh_database_files())
+        housekeeping_manager.submit("announcements", lambda: container.update_manager.check_announcements())
+        housekeeping_manager.submit("cli-update", lambda: container.update_manager.check_cli_outdated())
+
+        try:
+            return self._invoke(ctx)
+        finally:
+            housekeeping_manager.finish()
+            self._report_http_stats(ctx)
+
+    def _invoke(self, ctx: Context):
         if self._requires_lean_config:
             lean_config_manager = container.lean_config_manager
             try:
@@ -271,17 +290,10 @@ class LeanCommand(Command):
                     ctx.params[option] = value
                     skip_next = True
 
-        update_manager = container.update_manager
-        update_manager.show_announcements()
-
         if ctx.params.get("update", False):
-            update_manager.force_refresh_modules_json()
-
-        result = super().invoke(ctx)
+            container.update_manager.force_refresh_modules_json()
 
-        update_manager.warn_if_cli_outdated()
-
-        return result
+        return super().invoke(ctx)
 
     def get_params(self, ctx: Context):
         params = super().get_params(ctx)
@@ -298,8 +310,63 @@ class LeanCommand(Command):
         # Add --verbose option
         params.insert(len(params) - 1, VerboseOption())
 
+        # Add --no-cache option
+        params.insert(len(params) - 1, ClickOption(["--no-cache"],
+                                                    help="Ignore cached API responses and fetch fresh ones",
+                                                    is_flag=True,
+                                                    default=False,
+                                                    expose_value=False,
+                                                    is_eager=True,
+                                                    callback=self._parse_no_cache_option))
+
+        # Add --http-stats and --http-stats-file options
+        params.insert(len(params) - 1, ClickOption(["--http-stats"],
+                                                    help="Print a summary of the timings and sizes of the HTTP requests per endpoint",
+                                                    is_flag=True,
+                                                    default=False,
+                                                    expose_value=False,
+                                                    is_eager=True,
+                                                    callback=self._parse_http_stats_option))
+        params.insert(len(params) - 1, ClickOption(["--http-stats-file"],
+                                                    type=PathParameter(exists=False, file_okay=True, dir_okay=False),
+                                                    help="Write the timings and sizes of the HTTP requests per endpoint to this JSON file",
+                                                    expose_value=False,
+                                                    is_eager=True,
+                                                    callback=self._parse_http_stats_file_option))
+
         return params
 
+    def _parse_http_stats_option(self, ctx: Context, param: Parameter, value: Optional[bool]) -> None:
+        """Parses the --http-stats option."""
+        if value:
+            container.http_client.enable_stats()
+            ctx.meta["lean.http-stats"] = True
+
+    def _parse_http_stats_file_option(self, ctx: Context, param: Parameter, value: Optional[Path]) -> None:
+        """Parses the --http-stats-file option."""
+        if value is not None:
+            container.http_client.enable_stats()
+            ctx.meta["lean.http-stats-file"] = value
+
+    def _report_http_stats(self, ctx: Context) -> None:
+        """Prints and writes the HTTP statistics if they have been requested using the --http-stats(-file) options."""
+        show_stats = ctx.meta.get("lean.http-stats", False)
+        stats_file = ctx.meta.get("lean.http-stats-file", None)
+        if not show_stats and stats_file is None:
+            return
+
+        stats = container.http_client.stats
+        if show_stats:
+            stats.log_summary(container.logger)
+        if stats_file is not None:
+            stats.write_json(stats_file)
+            container.logger.info(f"Wrote HTTP statistics to {stats_file}")
+
+    def _parse_no_cache_option(self, ctx: Context, param: Parameter, value: Optional[bool]) -> None:
+        """Parses the --no-cache option."""
+        if value:
+            container.response_cache.bypass = True
+
     def _parse_config_option(self, ctx: Context, param: Parameter, value: Optional[Path]) -> None:
         """Parses the --config option."""
         if value is not None:
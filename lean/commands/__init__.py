@@ -12,48 +12,48 @@
 # limitations under the License.
 
 from lean.commands.lean import lean
-from lean.commands.backtest import backtest
-from lean.commands.build import build
-from lean.commands.cloud import cloud
-from lean.commands.config import config
-from lean.commands.create_project import create_project
-from lean.commands.delete_project import delete_project
-from lean.commands.data import data
-from lean.commands.decrypt import decrypt
-from lean.commands.encrypt import encrypt
-from lean.commands.init import init
-from lean.commands.library import library
-from lean.commands.live.live import live
-from lean.commands.login import login
-from lean.commands.logout import logout
-from lean.commands.logs import logs
-from lean.commands.optimize import optimize
-from lean.commands.report import report
-from lean.commands.research import research
-from lean.commands.whoami import whoami
-from lean.commands.gui import gui
-from lean.commands.object_store import object_store
-from lean.commands.private_cloud import private_cloud
 
-lean.add_command(config)
-lean.add_command(cloud)
-lean.add_command(data)
-lean.add_command(decrypt)
-lean.add_command(encrypt)
-lean.add_command(library)
-lean.add_command(live)
-lean.add_command(login)
-lean.add_command(logout)
-lean.add_command(whoami)
-lean.add_command(init)
-lean.add_command(create_project)
-lean.add_command(delete_project)
-lean.add_command(backtest)
-lean.add_command(optimize)
-lean.add_command(research)
-lean.add_command(report)
-lean.add_command(build)
-lean.add_command(logs)
-lean.add_command(gui)
-lean.add_command(object_store)
-lean.add_command(private_cloud)
+# Commands are registered by the module containing them and the help shown for them in `lean --help`
+# The modules are only imported when their command is used, so each `lean` invocation only imports what it needs
+lean.add_lazy_command("backtest", "lean.commands.backtest:backtest", "Backtest a project locally using Docker.")
+lean.add_lazy_command("build", "lean.commands.build:build", "Build Docker images of your own version of LEAN.")
+lean.add_lazy_command("cloud", "lean.commands.cloud:cloud", "Interact with the QuantConnect cloud.")
+lean.add_lazy_command("config", "lean.commands.config:config", "Configure Lean CLI options.")
+lean.add_lazy_command("create-project",
+                      "lean.commands.create_project:create_project",
+                      "Alias for 'project-create'")
+lean.add_lazy_command("data", "lean.commands.data:data", "Download or generate data for local use.")
+lean.add_lazy_command("decrypt",
+                      "lean.commands.decrypt:decrypt",
+                      "Decrypt your local project using the specified decryption key.")
+lean.add_lazy_command("delete-project",
+                      "lean.commands.delete_project:delete_project",
+                      "Alias for 'project-delete'")
+lean.add_lazy_command("encrypt",
+                      "lean.commands.encrypt:encrypt",
+                      "Encrypt your local project using the specified encryption key.")
+lean.add_lazy_command("gui", "lean.commands.gui:gui", "Work with the local GUI.")
+lean.add_lazy_command("init", "lean.commands.init:init", "Scaffold a Lean configuration file and data directory.")
+lean.add_lazy_command("library", "lean.commands.library:library", "Manage custom libraries in a project.")
+lean.add_lazy_command("live", "lean.commands.live:live", "Interact with the local machine.")
+lean.add_lazy_command("login", "lean.commands.login:login", "Log in with a QuantConnect account.")
+lean.add_lazy_command("logout", "lean.commands.logout:logout", "Log out and remove stored credentials.")
+lean.add_lazy_command("logs", "lean.commands.logs:logs", "Display the most recent backtest/live/optimization logs.")
+lean.add_lazy_command("object-store",
+                      "lean.commands.object_store:object_store",
+                      "Interact with the Organization's Local Object Store.")
+lean.add_lazy_command("optimize",
+                      "lean.commands.optimize:optimize",
+                      "Optimize a project's parameters locally using Docker.")
+lean.add_lazy_command("private-cloud",
+                      "lean.commands.private_cloud:private_cloud",
+                      "Interact with a QuantConnect private cloud.")
+lean.add_lazy_command("project-create",
+                      "lean.commands.create_project:create_project",
+                      "Create a new project containing starter code.")
+lean.add_lazy_command("project-delete",
+                      "lean.commands.delete_project:delete_project",
+                      "Delete a project locally and in the cloud if it exists.")
+lean.add_lazy_command("report", "lean.commands.report:report", "Generate a report of a backtest.")
+lean.add_lazy_command("research", "lean.commands.research:research", "Run a Jupyter Lab environment locally using Docker.")
+lean.add_lazy_command("whoami", "lean.commands.whoami:whoami", "Display who is logged in.")
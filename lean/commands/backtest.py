@@ -12,12 +12,13 @@
 # limitations under the License.
 
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import ContextManager, List, Optional, Tuple
 from click import command, option, argument
 
 from lean.click import LeanCommand, PathParameter, backtest_parameter_option, CaseInsensitiveChoice
-from lean.constants import DEFAULT_ENGINE_IMAGE, LEAN_ROOT_PATH
-from lean.container import container, Logger
+from lean.constants import DEFAULT_ENGINE_IMAGE, DOWNLOAD_PRIORITY_HIGH, LEAN_ROOT_PATH
+from lean.components.util.logger import Logger
+from lean.container import container
 from lean.models.utils import DebuggingMethod
 from lean.models.cli import cli_data_downloaders, cli_addon_modules
 from lean.components.util.json_modules_handler import build_and_configure_modules, non_interactive_config_build_for_name
@@ -224,6 +225,25 @@ def _migrate_csharp_csproj(project_dir: Path) -> None:
     csproj_path.write_text(xml_manager.to_string(current_content), encoding="utf-8")
 
 
+def _claim_download_priority(data_provider_historical: Optional[str], detach: bool) -> ContextManager:
+    """Claims the high download priority for a backtest which downloads data from QuantConnect.
+
+    LEAN downloads the data inside the engine container whenever the algorithm requests it, so the CLI can't tell
+    when data is being downloaded and the claim covers the entire backtest. A detached backtest keeps running after
+    the CLI exits, which would release the claim right away, so detached backtests don't claim a priority.
+
+    :param data_provider_historical: the name of the historical data provider of the backtest
+    :param detach: whether the backtest runs in a detached container
+    :return: the context manager holding the claim while the backtest runs
+    """
+    from contextlib import nullcontext
+
+    if data_provider_historical != "QuantConnect" or detach:
+        return nullcontext()
+
+    return container.download_queue.claim(DOWNLOAD_PRIORITY_HIGH)
+
+
 @command(cls=LeanCommand, requires_lean_config=True, requires_docker=True)
 @argument("project", type=PathParameter(exists=True, file_okay=True, dir_okay=True))
 @option("--output",
@@ -402,14 +422,16 @@ def backtest(project: Path,
         # Override existing parameters if any are provided via --parameter
         lean_config["parameters"] = lean_config_manager.get_parameters(parameter)
 
+    # Downloads of other lean commands yield to the data LEAN downloads while backtesting
     lean_runner = container.lean_runner
-    lean_runner.run_lean(lean_config,
-                         environment_name,
-                         algorithm_file,
-                         output,
-                         engine_image,
-                         debugging_method,
-                         release,
-                         detach,
-                         loads(extra_docker_config),
-                         paths_to_mount)
+    with _claim_download_priority(data_provider_historical, detach):
+        lean_runner.run_lean(lean_config,
+                             environment_name,
+                             algorithm_file,
+                             output,
+                             engine_image,
+                             debugging_method,
+                             release,
+                             detach,
+                             loads(extra_docker_config),
+                             paths_to_mount)
@@ -79,7 +79,13 @@ def pull(project: Optional[str], pull_bootcamp: bool, encrypt: Optional[bool], d
         raise RuntimeError(f"Cannot encrypt or decrypt more than one project at a time.")
 
     # the encryption key info is available when reading the project individually from API
-    projects_to_pull = [api_client.projects.get(project.projectId, project.organizationId) if project.encrypted == True else project for project in projects_to_pull]
+    encrypted_projects = [project for project in projects_to_pull if project.encrypted == True]
+    if len(encrypted_projects) > 0:
+        async_api_client = container.async_api_client
+        reread_projects = iter(async_api_client.run(async_api_client.gather(
+            [async_api_client.projects.get(project.projectId, project.organizationId) for project in encrypted_projects])))
+        projects_to_pull = [next(reread_projects) if project.encrypted == True else project
+                            for project in projects_to_pull]
 
     pull_manager = container.pull_manager
     pull_manager.pull_projects(projects_to_pull, all_projects, encryption_action, key)
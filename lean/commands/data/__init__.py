@@ -15,7 +15,9 @@ from click import group
 from lean.components.util.click_aliased_command_group import AliasedCommandGroup
 
 from lean.commands.data.download import download
+from lean.commands.data.gc import gc
 from lean.commands.data.generate import generate
+from lean.commands.data.index import index
 
 
 @group(cls=AliasedCommandGroup)
@@ -27,4 +29,6 @@ def data() -> None:
 
 
 data.add_command(download)
+data.add_command(gc)
 data.add_command(generate)
+data.add_command(index)
@@ -14,20 +14,24 @@ from datetime import datetime
 from json import dump
 
 from docker.types import Mount
-from typing import Any, Dict, Iterable, List, Optional
-from click import command, option, confirm, pass_context, Context, prompt
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
+from click import command, option, confirm, pass_context, Context, prompt, FloatRange, IntRange
 from lean.click import LeanCommand, ensure_options, CaseInsensitiveChoice
 from lean.components.util.json_modules_handler import config_build_for_name
-from lean.constants import DEFAULT_ENGINE_IMAGE
+from lean.constants import DEFAULT_ENGINE_IMAGE, DOWNLOAD_PRIORITY_HIGH, DOWNLOAD_PRIORITY_LOW, DOWNLOAD_PRIORITY_NORMAL
 from lean.container import container
 from lean.models.api import QCDataInformation, QCDataVendor, QCFullOrganization, QCDatasetDelivery, QCResolution, QCSecurityType, QCDataType
 from lean.models.click_options import get_configs_for_options, options_from_json
-from lean.models.data import Dataset, DataFile, DatasetDateOption, DatasetTextOption, DatasetTextOptionTransform,OptionResult, Product
+from lean.models.data import Dataset, DataFile, DatasetDateOption, DatasetTextOption, DatasetTextOptionTransform,OptionResult, Product, merge_sorted_unique
 from lean.models.logger import Option
 from lean.models.cli import cli_data_downloaders
 from lean.constants import LIST_PENDING_DATASETS
 
+if TYPE_CHECKING:
+    from lean.components.util.data_vendor_matcher import DataVendorMatcher
+
 _data_information: Optional[QCDataInformation] = None
+_data_vendor_matcher: Optional["DataVendorMatcher"] = None
 _presigned_terms="""
 Data Terms of Use has been signed previously.
 Find full agreement at: {link}
@@ -54,54 +58,74 @@ def _get_data_information(organization: QCFullOrganization) -> QCDataInformation
     return _data_information
 
 
-def _map_data_files_to_vendors(organization: QCFullOrganization, data_files: Iterable[str]) -> List[DataFile]:
-    """Maps a list of data files to the available data vendors.
+def _get_data_vendor_matcher(organization: QCFullOrganization) -> "DataVendorMatcher":
+    """Retrieves the matcher which finds the vendor selling a data file.
+
+    :param organization: the organization to get the price information of
+    :return: the matcher indexing the vendors in the price information
+    """
+    from lean.components.util.data_vendor_matcher import DataVendorMatcher
+    global _data_vendor_matcher
+
+    if _data_vendor_matcher is None:
+        _data_vendor_matcher = DataVendorMatcher(_get_data_information(organization).prices)
+
+    return _data_vendor_matcher
+
+
+def _get_data_vendor(organization: QCFullOrganization, data_file: str) -> QCDataVendor:
+    """Returns the data vendor that sells a data file.
 
     Uses the API to get the latest price information.
-    Raises an error if there is no vendor that sells the data of a file in the given list.
+    Raises an error if there is no vendor that sells the data file.
 
     :param organization: the organization to use the price information of
-    :param data_files: the data files to map to the available vendors
-    :return: the list of data files containing the file and vendor for each file
+    :param data_file: the data file to find the vendor of
+    :return: the vendor that sells the data file
     """
-    data_information = _get_data_information(organization)
+    vendor = _get_data_vendor_matcher(organization).match(data_file)
+    if vendor is None:
+        raise RuntimeError(f"There is no data vendor that sells '{data_file}'")
 
-    last_vendor: Optional[QCDataVendor] = None
-    mapped_files = []
+    return vendor
 
-    for file in data_files:
-        if last_vendor is not None and last_vendor.regex.search(file):
-            mapped_files.append(DataFile(file=file, vendor=last_vendor))
-            continue
-
-        last_vendor = None
 
-        for vendor in data_information.prices:
-            if vendor.price is None:
-                continue
+def _map_data_files_to_vendors(organization: QCFullOrganization, data_files: Iterable[str]) -> Iterator[DataFile]:
+    """Maps data files to the available data vendors as they are generated.
 
-            if vendor.regex.search(file):
-                mapped_files.append(DataFile(file=file, vendor=vendor))
-                last_vendor = vendor
-                break
+    Raises an error if there is no vendor that sells the data of a file in the given files.
 
-        if last_vendor is None:
-            raise RuntimeError(f"There is no data vendor that sells '{file}'")
-
-    return mapped_files
+    :param organization: the organization to use the price information of
+    :param data_files: the data files to map to the available vendors
+    :return: an iterator yielding the data file containing the file and vendor for each file
+    """
+    for file in data_files:
+        yield DataFile(file=file, vendor=_get_data_vendor(organization, file))
 
 
-def _get_data_files(organization: QCFullOrganization, products: List[Product]) -> List[DataFile]:
+def _get_data_files(organization: QCFullOrganization, products: List[Product]) -> Iterator[DataFile]:
     """Returns the unique data files of a list of products mapped to their vendor.
 
+    The files are generated in sorted order as they are needed, so they are never all in memory at the same time.
+
     :param organization: the organization to use the price information of
     :param products: the list of products to get the data files from
-    :return: the list of unique data files containing the file and vendor for each file for each product
+    :return: an iterator yielding the unique data files containing the file and vendor for each file
     """
-    from itertools import chain
-    unique_data_files = sorted(list(set(chain(*[product.get_data_files() for product in products]))))
+    unique_data_files = merge_sorted_unique(("", product.get_data_files) for product in products)
     return _map_data_files_to_vendors(organization, unique_data_files)
 
+
+def _get_total_price(organization: QCFullOrganization, products: List[Product]) -> float:
+    """Returns the price of the unique data files of a list of products.
+
+    :param organization: the organization to use the price information of
+    :param products: the list of products to get the data files from
+    :return: the total price of the data files in QCC
+    """
+    return sum(data_file.vendor.price for data_file in _get_data_files(organization, products))
+
+
 def _display_products(organization: QCFullOrganization, products: List[Product]) -> None:
     """Previews a list of products in pretty tables.
 
@@ -117,9 +141,25 @@ def _display_products(organization: QCFullOrganization, products: List[Product])
     for column in ["Dataset", "Vendor", "Details", "File count", "Price"]:
         table.add_column(column, overflow="fold")
 
-    summed_price = 0
+    from heapq import merge
+    from itertools import repeat
+
+    file_counts = [0] * len(products)
+    prices = [0] * len(products)
+    total_price = 0
+
+    # The sorted files of all products are merged, so every file is mapped once and overlapping files are counted once
+    last_file = vendor = None
+    for file, index in merge(*[zip(product.get_data_files(), repeat(index)) for index, product in enumerate(products)]):
+        if file != last_file:
+            vendor = _get_data_vendor(organization, file)
+            total_price += vendor.price
+            last_file = file
+
+        file_counts[index] += 1
+        prices[index] += vendor.price
 
-    for product in products:
+    for index, product in enumerate(products):
         details = []
         for option_id, result in product.option_results.items():
             option = next(o for o in product.dataset.options if o.id == option_id)
@@ -137,22 +177,15 @@ def _display_products(organization: QCFullOrganization, products: List[Product])
         if len(details) == 0:
             details.append("-")
 
-        mapped_files = _map_data_files_to_vendors(organization, product.get_data_files())
-        price = sum(data_file.vendor.price for data_file in mapped_files)
-        summed_price += price
-
         table.add_row(product.dataset.name,
                       product.dataset.vendor,
                       "\n".join(details),
-                      f"{len(mapped_files):,.0f}",
-                      f"{price:,.0f} QCC")
+                      f"{file_counts[index]:,.0f}",
+                      f"{prices[index]:,.0f} QCC")
 
     logger.info(table)
 
-    all_data_files = _get_data_files(organization, products)
-    total_price = sum(data_file.vendor.price for data_file in all_data_files)
-
-    if total_price != summed_price:
+    if total_price != sum(prices):
         logger.warn("The total price is less than the sum of all separate prices because there is overlapping data")
 
     logger.info(f"Total price: {total_price:,.0f} QCC")
@@ -234,8 +267,7 @@ def _confirm_organization_balance(organization: QCFullOrganization, products: Li
     :param organization: the organization that the user selected
     :param products: the list of products selected by the user
     """
-    all_data_files = _get_data_files(organization, products)
-    total_price = sum(data_file.vendor.price for data_file in all_data_files)
+    total_price = _get_total_price(organization, products)
 
     if total_price > organization.credit.balance:
         raise RuntimeError("\n".join([
@@ -290,8 +322,7 @@ def _confirm_payment(organization: QCFullOrganization, products: List[Product])
     :param organization: the organization that will be charged
     :param products: the list of products selected by the user
     """
-    all_data_files = _get_data_files(organization, products)
-    total_price = sum(data_file.vendor.price for data_file in all_data_files)
+    total_price = _get_total_price(organization, products)
 
     organization_qcc = organization.credit.balance
 
@@ -562,6 +593,25 @@ def _replace_data_type(ctx, param, value):
 @option("--project",
         type=str,
         help="Name or id of the cloud project to use for brokerage OAuth authentication")
+@option("--max-concurrency",
+        type=IntRange(min=1),
+        help="The maximum number of QuantConnect data files to download at the same time (defaults to 32)")
+@option("--max-bandwidth",
+        type=FloatRange(min=0, min_open=True),
+        help="The maximum combined download speed of QuantConnect data files in MB/s (defaults to no limit)")
+@option("--priority",
+        type=CaseInsensitiveChoice([DOWNLOAD_PRIORITY_LOW, DOWNLOAD_PRIORITY_NORMAL, DOWNLOAD_PRIORITY_HIGH]),
+        default=DOWNLOAD_PRIORITY_NORMAL,
+        help="The priority of the downloads compared to downloads of other lean commands on this machine "
+             f"(defaults to {DOWNLOAD_PRIORITY_NORMAL})")
+@option("--dry-run",
+        is_flag=True,
+        default=False,
+        help="Show which QuantConnect data files would be downloaded and with which concurrency, without purchasing them")
+@option("--refresh-listings",
+        is_flag=True,
+        default=False,
+        help="Request the listings of QuantConnect data files again instead of using the cached listings")
 @pass_context
 def download(ctx: Context,
              data_provider_historical: Optional[str],
@@ -580,6 +630,11 @@ def download(ctx: Context,
              update: bool,
              no_update: bool,
              project: Optional[str],
+             max_concurrency: Optional[int],
+             max_bandwidth: Optional[float],
+             priority: str,
+             dry_run: bool,
+             refresh_listings: bool,
              **kwargs) -> None:
     """Purchase and download data directly from QuantConnect or download from supported data providers
 
@@ -596,6 +651,12 @@ def download(ctx: Context,
     accepting the CLI API Access and Data Agreement and payment.
     After this wizard the selected data will be downloaded automatically.
 
+    The number of QuantConnect data files downloaded at the same time adapts to the measured throughput and errors.
+    Use --max-concurrency and --max-bandwidth to cap it, or --dry-run to only show what would be downloaded.
+    Downloads pause while another lean command on this machine downloads data with a higher --priority,
+    `lean backtest --download-data` downloads with the highest priority for as long as it runs, unless it is detached.
+    The listings of available QuantConnect data files are cached for a few hours, use --refresh-listings to update them.
+
     If --dataset is given the command runs in non-interactive mode.
     In this mode the CLI does not prompt for input or confirmation but only halts when the agreement must be accepted.
     In non-interactive mode all options specific to the selected dataset are required.
@@ -613,6 +674,9 @@ def download(ctx: Context,
         data_provider_historical = _get_historical_data_provider()
 
     if data_provider_historical == 'QuantConnect':
+        if refresh_listings:
+            container.api_client.data.invalidate_list_files()
+
         is_interactive = dataset is None
         if not is_interactive:
             ensure_options(["dataset"])
@@ -623,13 +687,21 @@ def download(ctx: Context,
             products = _select_products_interactive(organization, datasets, force, ask_for_more_data=not auto_confirm)
 
         _confirm_organization_balance(organization, products)
-        _verify_accept_agreement(organization, is_interactive)
 
-        if is_interactive and not auto_confirm:
-            _confirm_payment(organization, products)
+        if not dry_run:
+            _verify_accept_agreement(organization, is_interactive)
+
+            if is_interactive and not auto_confirm:
+                _confirm_payment(organization, products)
 
         all_data_files = _get_data_files(organization, products)
-        container.data_downloader.download_files(all_data_files, overwrite, organization.id)
+        container.data_downloader.download_files(all_data_files,
+                                                 overwrite,
+                                                 organization.id,
+                                                 max_concurrency=max_concurrency,
+                                                 max_bandwidth=max_bandwidth * 1024 * 1024 if max_bandwidth else None,
+                                                 dry_run=dry_run,
+                                                 priority=priority.lower())
     else:
         data_downloader_provider = next(data_downloader for data_downloader in cli_data_downloaders
                                         if data_downloader.get_name() == data_provider_historical)
@@ -0,0 +1,36 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from click import command
+
+from lean.click import LeanCommand
+from lean.container import container
+
+
+@command(cls=LeanCommand)
+def gc() -> None:
+    """Remove files from the shared data store that no workspace uses anymore.
+
+    Data files are shared between workspaces when the data-store configuration option is set.
+    A stored file is no longer used once it has been removed from the data directories of all workspaces.
+    """
+    data_store = container.data_store
+    if data_store is None:
+        raise RuntimeError("No data store has been configured, "
+                           "you can configure one using `lean config set data-store ~/.lean/datastore`")
+
+    with data_store:
+        result = data_store.collect_garbage()
+
+    container.logger.info(f"Removed {result.removed_files:,} unused files from the data store, "
+                          f"freeing {result.freed_bytes / 1024 / 1024:,.1f} MB")
@@ -0,0 +1,44 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from click import command, option
+
+from lean.click import LeanCommand
+from lean.container import container
+
+
+@command(cls=LeanCommand, requires_lean_config=True)
+@option("--hash",
+        "compute_hashes",
+        is_flag=True,
+        default=False,
+        help="Compute the md5 hash of new and changed files (slow for large data directories)")
+def index(compute_hashes: bool) -> None:
+    """Rescan the local data directory and update its data inventory.
+
+    The data inventory is an index of the files in the data directory which is kept up-to-date by `lean data download`.
+    It is used to quickly check which files exist locally, without walking the data directory every time.
+    Rescanning is only necessary after files in the data directory have been added, changed or removed manually.
+    Only files which are new or of which the size or modification time changed are indexed again.
+    """
+    from lean.components.util.data_inventory import DataInventory
+
+    logger = container.logger
+    data_dir = container.lean_config_manager.get_data_directory()
+
+    logger.info(f"Indexing {data_dir}")
+    with DataInventory(logger, data_dir) as inventory:
+        result = inventory.rescan(compute_hashes)
+
+    logger.info(f"Indexed {result.files:,} files ({result.added:,} added, {result.updated:,} updated, "
+                f"{result.removed:,} removed)")
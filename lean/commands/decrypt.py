@@ -57,6 +57,7 @@ def decrypt(project: Path,
             f.write(decrypted)
 
     # Mark the project as decrypted
-    project_config.set('encrypted', False)
-    project_config.delete('encryption-key-path')
+    with project_config.batch():
+        project_config.set('encrypted', False)
+        project_config.delete('encryption-key-path')
     logger.info(f"Successfully decrypted project {project}")
@@ -56,8 +56,9 @@ def encrypt(project: Path,
             f.write(encrypted)
     
     # Mark the project as encrypted
-    project_config.set('encrypted', True)
-    project_config.set('encryption-key-path', str(encryption_key))
+    with project_config.batch():
+        project_config.set('encrypted', True)
+        project_config.set('encryption-key-path', str(encryption_key))
     logger.info(f"Local files encrypted successfully with key {encryption_key}")
 
 
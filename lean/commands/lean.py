@@ -15,12 +15,12 @@ from click import group, option, Context, pass_context, echo
 
 from lean import __version__
 from lean.click import verbose_option
-from lean.components.util.click_aliased_command_group import AliasedCommandGroup
+from lean.components.util.click_lazy_command_group import LazyCommandGroup
 from lean.container import container
 from lean.models.errors import MoreInfoError
 
 
-@group(cls=AliasedCommandGroup, invoke_without_command=True)
+@group(cls=LazyCommandGroup, invoke_without_command=True)
 @option("--version", is_flag=True, is_eager=True, help="Show the version and exit.")
 @verbose_option()
 @pass_context
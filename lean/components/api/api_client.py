@@ -11,66 +11,154 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, Dict
-
-from lean.components.api.auth0_client import Auth0Client
-from lean.components.api.account_client import AccountClient
-from lean.components.api.backtest_client import BacktestClient
-from lean.components.api.compile_client import CompileClient
-from lean.components.api.data_client import DataClient
-from lean.components.api.encryption_keys_client import EncryptionKeysClient
-from lean.components.api.file_client import FileClient
-from lean.components.api.lean_client import LeanClient
-from lean.components.api.live_client import LiveClient
-from lean.components.api.market_client import MarketClient
-from lean.components.api.module_client import ModuleClient
-from lean.components.api.node_client import NodeClient
-from lean.components.api.object_store_client import ObjectStoreClient
-from lean.components.api.optimization_client import OptimizationClient
-from lean.components.api.organization_client import OrganizationClient
-from lean.components.api.project_client import ProjectClient
-from lean.components.api.service_client import ServiceClient
-from lean.components.api.user_client import UserClient
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
 from lean.components.util.http_client import HTTPClient
 from lean.components.util.logger import Logger
+from lean.components.util.response_cache import CachedResponse, ResponseCache
+from lean.components.util.retry_policy import RetryPolicy, is_idempotent_endpoint
 from lean.constants import API_BASE_URL
 from lean.models.errors import AuthenticationError, RequestFailedError
 
+# The clients are only imported when they are first used, most commands only talk to a few endpoints
+if TYPE_CHECKING:
+    from lean.components.api.account_client import AccountClient
+    from lean.components.api.auth0_client import Auth0Client
+    from lean.components.api.backtest_client import BacktestClient
+    from lean.components.api.compile_client import CompileClient
+    from lean.components.api.data_client import DataClient
+    from lean.components.api.encryption_keys_client import EncryptionKeysClient
+    from lean.components.api.file_client import FileClient
+    from lean.components.api.lean_client import LeanClient
+    from lean.components.api.live_client import LiveClient
+    from lean.components.api.market_client import MarketClient
+    from lean.components.api.module_client import ModuleClient
+    from lean.components.api.node_client import NodeClient
+    from lean.components.api.object_store_client import ObjectStoreClient
+    from lean.components.api.optimization_client import OptimizationClient
+    from lean.components.api.organization_client import OrganizationClient
+    from lean.components.api.project_client import ProjectClient
+    from lean.components.api.service_client import ServiceClient
+    from lean.components.api.user_client import UserClient
+
 
 class APIClient:
     """The APIClient class manages communication with the QuantConnect API."""
 
-    def __init__(self, logger: Logger, http_client: HTTPClient, user_id: str, api_token: str) -> None:
+    def __init__(self,
+                 logger: Logger,
+                 http_client: HTTPClient,
+                 user_id: str,
+                 api_token: str,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 response_cache: Optional[ResponseCache] = None) -> None:
         """Creates a new APIClient instance.
 
         :param logger: the logger to use to print debug messages to
         :param http_client: the HTTP client to make HTTP requests with
         :param user_id: the QuantConnect user id to use when sending authenticated requests
         :param api_token: the QuantConnect API token to use when sending authenticated requests
+        :param retry_policy: the policy to retry failed requests with, defaults to a RetryPolicy with default settings
+        :param response_cache: the cache to store responses of read-mostly endpoints in, or None to disable caching
         """
         self._logger = logger
         self._http_client = http_client
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy(logger)
+        self.response_cache = response_cache
         self.set_user_token(user_id, api_token)
 
-        # Create the clients containing the methods to send requests to the various API endpoints
-        self.auth0 = Auth0Client(self)
-        self.accounts = AccountClient(self)
-        self.backtests = BacktestClient(self)
-        self.compiles = CompileClient(self)
-        self.data = DataClient(self, http_client)
-        self.encryption_keys = EncryptionKeysClient(self)
-        self.files = FileClient(self)
-        self.live = LiveClient(self)
-        self.market = MarketClient(self)
-        self.modules = ModuleClient(self)
-        self.nodes = NodeClient(self)
-        self.object_store = ObjectStoreClient(self)
-        self.optimizations = OptimizationClient(self)
-        self.organizations = OrganizationClient(self)
-        self.projects = ProjectClient(self)
-        self.services = ServiceClient(self)
-        self.users = UserClient(self)
-        self.lean = LeanClient(self)
+    # The clients containing the methods to send requests to the various API endpoints are created on first use
+
+    @cached_property
+    def accounts(self) -> "AccountClient":
+        from lean.components.api.account_client import AccountClient
+        return AccountClient(self)
+
+    @cached_property
+    def auth0(self) -> "Auth0Client":
+        from lean.components.api.auth0_client import Auth0Client
+        return Auth0Client(self)
+
+    @cached_property
+    def backtests(self) -> "BacktestClient":
+        from lean.components.api.backtest_client import BacktestClient
+        return BacktestClient(self)
+
+    @cached_property
+    def compiles(self) -> "CompileClient":
+        from lean.components.api.compile_client import CompileClient
+        return CompileClient(self)
+
+    @cached_property
+    def data(self) -> "DataClient":
+        from lean.components.api.data_client import DataClient
+        return DataClient(self, self._http_client, self.retry_policy)
+
+    @cached_property
+    def encryption_keys(self) -> "EncryptionKeysClient":
+        from lean.components.api.encryption_keys_client import EncryptionKeysClient
+        return EncryptionKeysClient(self)
+
+    @cached_property
+    def files(self) -> "FileClient":
+        from lean.components.api.file_client import FileClient
+        return FileClient(self)
+
+    @cached_property
+    def lean(self) -> "LeanClient":
+        from lean.components.api.lean_client import LeanClient
+        return LeanClient(self)
+
+    @cached_property
+    def live(self) -> "LiveClient":
+        from lean.components.api.live_client import LiveClient
+        return LiveClient(self)
+
+    @cached_property
+    def market(self) -> "MarketClient":
+        from lean.components.api.market_client import MarketClient
+        return MarketClient(self)
+
+    @cached_property
+    def modules(self) -> "ModuleClient":
+        from lean.components.api.module_client import ModuleClient
+        return ModuleClient(self)
+
+    @cached_property
+    def nodes(self) -> "NodeClient":
+        from lean.components.api.node_client import NodeClient
+        return NodeClient(self)
+
+    @cached_property
+    def object_store(self) -> "ObjectStoreClient":
+        from lean.components.api.object_store_client import ObjectStoreClient
+        return ObjectStoreClient(self)
+
+    @cached_property
+    def optimizations(self) -> "OptimizationClient":
+        from lean.components.api.optimization_client import OptimizationClient
+        return OptimizationClient(self)
+
+    @cached_property
+    def organizations(self) -> "OrganizationClient":
+        from lean.components.api.organization_client import OrganizationClient
+        return OrganizationClient(self)
+
+    @cached_property
+    def projects(self) -> "ProjectClient":
+        from lean.components.api.project_client import ProjectClient
+        return ProjectClient(self)
+
+    @cached_property
+    def services(self) -> "ServiceClient":
+        from lean.components.api.service_client import ServiceClient
+        return ServiceClient(self)
+
+    @cached_property
+    def users(self) -> "UserClient":
+        from lean.components.api.user_client import UserClient
+        return UserClient(self)
 
     def set_user_token(self, user_id: str, api_token: str):
         self._user_id = user_id
@@ -102,6 +190,25 @@ class APIClient:
             options.update(extra_options)
         return self._request("post", endpoint, options)
 
+    def invalidate_cache(self,
+                         endpoint: str,
+                         method: Optional[str] = None,
+                         payload: Optional[Dict[str, Any]] = None) -> None:
+        """Deletes cached responses of an endpoint, so the next request to it is sent to the API.
+
+        :param endpoint: the API endpoint to delete the cached responses of
+        :param method: the HTTP method of the single request to delete the cached response of, None for all requests
+        :param payload: the parameters or body of the single request to delete the cached response of
+        """
+        if self.response_cache is None:
+            return
+
+        if method is None:
+            self.response_cache.invalidate(endpoint)
+        else:
+            self.response_cache.delete(
+                self.response_cache.get_key(API_BASE_URL, self._user_id, method, endpoint, payload or {}))
+
     def is_authenticated(self) -> bool:
         """Checks whether the current credentials are valid.
 
@@ -115,27 +222,87 @@ class APIClient:
             self._logger.debug(format_exc().strip())
             return False
 
-    def _request(self, method: str, endpoint: str, options: Dict[str, Any] = {}, retry_http_5xx: bool = True) -> Any:
+    def _request(self, method: str, endpoint: str, options: Dict[str, Any] = {}) -> Any:
         """Makes an authenticated request to the given endpoint.
 
+        Transient failures are retried according to the retry policy.
+
         :param method: the HTTP method to use for the request
         :param endpoint: the API endpoint to send the request to
         :param options: additional options to pass on to requests.request()
-        :param retry_http_5xx: True if the request should be retried on an HTTP 5xx response, False if not
         :return: the parsed response of the request
         """
-        from hashlib import sha256
         from urllib.parse import urljoin
-        from lean import __version__
-        from time import time
 
         full_url = urljoin(API_BASE_URL, endpoint)
 
+        cache_key = cached_response = None
+        headers = {}
+        payload = next((options[key] for key in ["params", "json", "data"] if key in options), None) or {}
+        cache_ttl = self.response_cache.get_ttl(endpoint, payload) if self.response_cache is not None else None
+        if cache_ttl is not None:
+            cache_key = self.response_cache.get_key(API_BASE_URL, self._user_id, method, endpoint, payload)
+            cached_response = self.response_cache.get(cache_key)
+            if cached_response is not None:
+                if cached_response.is_fresh(cache_ttl):
+                    self._logger.debug("Using cached response for {} {}", method.upper(), endpoint)
+                    return self._parse_cached_response(cached_response)
+                headers = cached_response.get_conditional_headers()
+
+        stats = self._http_client.stats
+        response = self.retry_policy.run(lambda: self._send_request(method, full_url, endpoint, options, headers),
+                                         is_idempotent_endpoint(endpoint),
+                                         f"{method.upper()} {endpoint}",
+                                         (lambda: stats.record_retry(endpoint)) if stats is not None else None)
+
+        self._logger.debug(lambda: f"Request response: {response.text}")
+
+        if self.response_cache is not None:
+            self.response_cache.invalidate_after_request(endpoint)
+
+        if response.status_code == 304 and cached_response is not None:
+            self.response_cache.refresh(cache_key, cached_response)
+            return self._parse_cached_response(cached_response)
+
+        if response.status_code == 500:
+            raise AuthenticationError(response)
+
+        if response.status_code < 200 or response.status_code >= 300:
+            raise RequestFailedError(response)
+
+        data = self._parse_response(response)
+
+        if cache_key is not None:
+            self.response_cache.set(cache_key, response)
+
+        return data
+
+    def _send_request(self,
+                      method: str,
+                      full_url: str,
+                      endpoint: str,
+                      options: Dict[str, Any],
+                      extra_headers: Dict[str, str] = {}) -> Any:
+        """Sends a single authenticated request without checking its response.
+
+        :param method: the HTTP method to use for the request
+        :param full_url: the url to send the request to
+        :param endpoint: the API endpoint the url points to, used to aggregate the HTTP statistics
+        :param options: additional options to pass on to requests.request()
+        :param extra_headers: additional headers to send along with the request
+        :return: the response of the request
+        """
+        from hashlib import sha256
+        from lean import __version__
+        from time import time
+
         # Create the hash which is used to authenticate the user to the API
+        # The hash contains the current timestamp, so it's recreated for every attempt
         timestamp = str(int(time()))
         password = sha256(f"{self._api_token}:{timestamp}".encode("utf-8")).hexdigest()
 
         headers = {
+            **extra_headers,
             "Timestamp": timestamp
         }
 
@@ -144,26 +311,22 @@ class APIClient:
             version = 99999999
         headers["User-Agent"] = f"Lean CLI {version}"
 
-        response = self._http_client.request(method,
-                                             full_url,
-                                             headers=headers,
-                                             auth=(self._user_id, password),
-                                             raise_for_status=False,
-                                             **options)
+        return self._http_client.request(method,
+                                         full_url,
+                                         headers=headers,
+                                         auth=(self._user_id, password),
+                                         raise_for_status=False,
+                                         stats_endpoint=endpoint,
+                                         **options)
 
-        if self._logger.debug_logging_enabled:
-            self._logger.debug(f"Request response: {response.text}")
+    def _parse_cached_response(self, cached_response: CachedResponse) -> Any:
+        """Parses the data in a cached response.
 
-        if 500 <= response.status_code < 600 and retry_http_5xx:
-            return self._request(method, endpoint, options, False)
-
-        if response.status_code == 500:
-            raise AuthenticationError(response)
-
-        if response.status_code < 200 or response.status_code >= 300:
-            raise RequestFailedError(response)
-
-        return self._parse_response(response)
+        :param cached_response: the cached response of a previously successful request
+        :return: the data in the response
+        """
+        from json import loads
+        return loads(cached_response.body)
 
     def _parse_response(self, response) -> Any:
         """Parses the data in a response.
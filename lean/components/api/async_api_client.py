@@ -0,0 +1,180 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Iterable, List, Optional, TypeVar, Union
+
+from lean.components.api.api_client import APIClient
+from lean.models.api import QCFullFile, QCProject
+
+T = TypeVar("T")
+
+# The default maximum amount of requests an AsyncAPIClient has in flight at the same time
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+class AsyncAPIClient:
+    """The AsyncAPIClient class is an asyncio variant of the APIClient for commands which send many independent requests.
+
+    Requests are sent through the wrapped APIClient, so they use the same authentication, retries and
+    error handling as synchronous requests. Up to max_concurrency of them are in flight at the same time.
+    """
+
+    def __init__(self, api_client: APIClient, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> None:
+        """Creates a new AsyncAPIClient instance.
+
+        :param api_client: the APIClient instance to send the requests with
+        :param max_concurrency: the maximum amount of requests that are in flight at the same time
+        """
+        self._api = api_client
+        self._max_concurrency = max(1, max_concurrency)
+
+        self.files = AsyncFileClient(self, api_client)
+        self.projects = AsyncProjectClient(self, api_client)
+
+    @property
+    def max_concurrency(self) -> int:
+        """Returns the maximum amount of requests that are in flight at the same time.
+
+        :return: the maximum amount of requests that are in flight at the same time
+        """
+        return self._max_concurrency
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """Runs a coroutine to completion from synchronous code.
+
+        :param coroutine: the coroutine to run, usually a call to one of the batch helpers
+        :return: the return value of the coroutine
+        """
+        from asyncio import run
+        return run(coroutine)
+
+    async def get(self, endpoint: str, parameters: Dict[str, Any] = {}) -> Any:
+        """Makes an authenticated GET request to the given endpoint with the given parameters.
+
+        :param endpoint: the API endpoint to send the request to
+        :param parameters: the parameters to attach to the url
+        :return: the parsed response of the request
+        """
+        return await self.call(self._api.get, endpoint, parameters)
+
+    async def post(self, endpoint: str, data: Dict[str, Any] = {}, data_as_json: bool = True) -> Any:
+        """Makes an authenticated POST request to the given endpoint with the given data.
+
+        :param endpoint: the API endpoint to send the request to
+        :param data: the data to send in the body of the request
+        :param data_as_json: True if data needs to be sent as JSON, False if data needs to be sent as form data
+        :return: the parsed response of the request
+        """
+        return await self.call(self._api.post, endpoint, data, data_as_json)
+
+    async def call(self, function: Callable[..., T], *args: Any) -> T:
+        """Calls a blocking function of the APIClient without blocking the event loop.
+
+        :param function: the function to call, usually a method of the APIClient or one of its clients
+        :param args: the arguments to pass to the function
+        :return: the return value of the function
+        """
+        from asyncio import get_running_loop
+        return await get_running_loop().run_in_executor(None, function, *args)
+
+    async def gather(self,
+                     awaitables: Iterable[Awaitable[T]],
+                     return_exceptions: bool = False) -> List[Union[T, BaseException]]:
+        """Awaits multiple requests, running at most max_concurrency of them at the same time.
+
+        :param awaitables: the requests to await
+        :param return_exceptions: True to return errors in place of the results of failed requests,
+            False to raise the first error
+        :return: the results of the requests, in the same order as the requests were given
+        """
+        from asyncio import Semaphore, gather
+
+        # The semaphore is created here so it is bound to the event loop that is currently running
+        semaphore = Semaphore(self._max_concurrency)
+
+        async def limit(awaitable: Awaitable[T]) -> T:
+            async with semaphore:
+                return await awaitable
+
+        return await gather(*[limit(awaitable) for awaitable in awaitables], return_exceptions=return_exceptions)
+
+
+class AsyncProjectClient:
+    """The AsyncProjectClient class contains asynchronous methods to interact with projects/* API endpoints."""
+
+    def __init__(self, async_api_client: AsyncAPIClient, api_client: APIClient) -> None:
+        """Creates a new AsyncProjectClient instance.
+
+        :param async_api_client: the AsyncAPIClient instance to schedule requests with
+        :param api_client: the APIClient instance whose project client sends the requests
+        """
+        self._async_api = async_api_client
+        self._api = api_client
+
+    async def get(self, project_id: int, organization_id: Optional[str]) -> QCProject:
+        """Returns the details of a project.
+
+        :param project_id: the id of the project to retrieve the details of
+        :param organization_id: the id of the organization where the project is located
+        :return: the details of the specified project
+        """
+        return await self._async_api.call(self._api.projects.get, project_id, organization_id)
+
+    async def get_many(self,
+                       project_ids: List[int],
+                       organization_id: Optional[str],
+                       return_exceptions: bool = False) -> List[Union[QCProject, BaseException]]:
+        """Returns the details of multiple projects, requesting them concurrently.
+
+        :param project_ids: the ids of the projects to retrieve the details of
+        :param organization_id: the id of the organization where the projects are located
+        :param return_exceptions: True to return errors in place of projects that could not be retrieved,
+            False to raise the first error
+        :return: the details of the specified projects, in the same order as project_ids
+        """
+        return await self._async_api.gather([self.get(project_id, organization_id) for project_id in project_ids],
+                                            return_exceptions)
+
+
+class AsyncFileClient:
+    """The AsyncFileClient class contains asynchronous methods to interact with files/* API endpoints."""
+
+    def __init__(self, async_api_client: AsyncAPIClient, api_client: APIClient) -> None:
+        """Creates a new AsyncFileClient instance.
+
+        :param async_api_client: the AsyncAPIClient instance to schedule requests with
+        :param api_client: the APIClient instance whose file client sends the requests
+        """
+        self._async_api = async_api_client
+        self._api = api_client
+
+    async def get_all(self, project_id: int) -> List[QCFullFile]:
+        """Returns all files in a project.
+
+        :param project_id: the id of the project to retrieve the files of
+        :return: the files in the specified project
+        """
+        return await self._async_api.call(self._api.files.get_all, project_id)
+
+    async def get_all_many(self,
+                           project_ids: List[int],
+                           return_exceptions: bool = False) -> List[Union[List[QCFullFile], BaseException]]:
+        """Returns all files in multiple projects, requesting them concurrently.
+
+        :param project_ids: the ids of the projects to retrieve the files of
+        :param return_exceptions: True to return errors in place of the files of projects that could not be read,
+            False to raise the first error
+        :return: the files in the specified projects, in the same order as project_ids
+        """
+        return await self._async_api.gather([self.get_all(project_id) for project_id in project_ids],
+                                            return_exceptions)
@@ -14,7 +14,44 @@
 from lean.components.api.api_client import *
 from lean.models.api import QCDataInformation
 from lean.models.errors import AuthenticationError
-from typing import List, Callable, cast
+from pathlib import Path
+from typing import List, Callable, Optional, Tuple, cast
+
+# The amount of bytes after which the sidecar file of a download in progress is updated
+PARTIAL_DOWNLOAD_SAVE_INTERVAL = 16 * 1024 * 1024
+
+
+class _DownloadCancelledError(Exception):
+    """Raised in a byte range download when another byte range of the same file failed."""
+
+
+class _ReadCallbackStream:
+    """A read-only binary stream which calls a function with the amount of bytes read from the stream it wraps."""
+
+    def __init__(self, stream: Any, on_read: Callable[[int], None]) -> None:
+        """Creates a new _ReadCallbackStream instance.
+
+        :param stream: the binary stream to read from
+        :param on_read: the function to call with the amount of bytes returned by every read
+        """
+        self._stream = stream
+        self._on_read = on_read
+
+    def read(self, size: int = -1) -> bytes:
+        from requests.exceptions import ChunkedEncodingError, ConnectionError
+        from urllib3.exceptions import ProtocolError, ReadTimeoutError
+
+        # Errors are translated like Response.iter_content() does, so the retry policy recognizes them as transient
+        try:
+            data = self._stream.read(size if size >= 0 else None)
+        except ProtocolError as e:
+            raise ChunkedEncodingError(e)
+        except ReadTimeoutError as e:
+            raise ConnectionError(e)
+
+        if data:
+            self._on_read(len(data))
+        return data
 
 
 class DataClient:
@@ -22,23 +59,52 @@ class DataClient:
 
     _list_files_cache: Dict[str, List[str]] = {}
 
-    def __init__(self, api_client: 'APIClient', http_client: 'HTTPClient') -> None:
+    def __init__(self,
+                 api_client: 'APIClient',
+                 http_client: 'HTTPClient',
+                 retry_policy: Optional['RetryPolicy'] = None) -> None:
         """Creates a new DataClient instance.
 
         :param api_client: the APIClient instance to use when making requests
         :param http_client: the HTTPClient instance to use when downloading files
+        :param retry_policy: the policy to retry failed downloads with, or None to never retry downloads
         """
+        from threading import BoundedSemaphore
+
         self._api = api_client
         self._http_client = http_client
+        self._retry_policy = retry_policy
 
-    def download_file(self, relative_file_path: str, organization_id: str,
-                      local_filename: str, progress_callback: Callable[[float], None]) -> None:
+        # The byte ranges of all files downloaded at the same time share the connections of the HTTP client's pool
+        self._segment_slots = BoundedSemaphore(http_client.pool_size)
+
+    def download_file(self,
+                      relative_file_path: str,
+                      organization_id: str,
+                      local_filename: str,
+                      progress_callback: Callable[[float], None],
+                      segment_count: int = 1,
+                      segment_threshold: int = 0) -> None:
         """Downloads the content of a downloadable data file.
 
         :param relative_file_path: the relative path of the data file
         :param organization_id: the id of the organization that should be billed
         :param local_filename: the final local path where the data file will be stored
         :param progress_callback: the download progress callback
+        :param segment_count: the amount of byte ranges to download concurrently, 1 to download in a single stream
+        :param segment_threshold: the size in bytes above which the file is downloaded in multiple byte ranges
+        """
+        link = self.get_download_link(relative_file_path, organization_id)
+        self.download_url(link, local_filename, progress_callback, segment_count, segment_threshold)
+
+    def get_download_link(self, relative_file_path: str, organization_id: str) -> str:
+        """Returns a link the content of a downloadable data file can be downloaded from.
+
+        The organization is billed for the data file when the link is requested.
+
+        :param relative_file_path: the relative path of the data file
+        :param organization_id: the id of the organization that should be billed
+        :return: the url to download the data file from
         """
         data = self._api.post("data/read", {
             "format": "link",
@@ -46,45 +112,599 @@ class DataClient:
             "organizationId": organization_id
         })
 
-        self.download_url(data["link"], local_filename, progress_callback)
+        return data["link"]
 
-    def download_url(self, url: str, local_filename: str, progress_callback: Callable[[float], None]) -> None:
+    def download_url(self,
+                     url: str,
+                     local_filename: str,
+                     progress_callback: Callable[[float], None],
+                     segment_count: int = 1,
+                     segment_threshold: int = 0,
+                     on_chunk: Optional[Callable[[int], None]] = None,
+                     on_retry: Optional[Callable[[], None]] = None) -> None:
         """Downloads the content of a downloadable file.
+
+        Files larger than the segment threshold are downloaded in multiple byte ranges concurrently
+        if the server supports Range requests, all other files are downloaded in a single stream.
+        Transient failures restart the download, or the failed byte range, according to the retry policy.
+
         :param url: the url to download
         :param local_filename: the final local path where the data file will be stored
         :param progress_callback: the download progress callback
+        :param segment_count: the amount of byte ranges to download concurrently, 1 to download in a single stream
+        :param segment_threshold: the size in bytes above which the file is downloaded in multiple byte ranges
+        :param on_chunk: the function to call with the size of every received chunk, may block to limit bandwidth
+        :param on_retry: the function to call before every retry of (part of) the download
         """
-        from tempfile import NamedTemporaryFile
-        from shutil import move
-        from os import path, makedirs
+        description = f"download of {url.split('?')[0]}"
 
-        # we stream the data into a temporary file and later move it to it's final location
-        with self._http_client.get(url, stream=True) as r:
-            r.raise_for_status()
-            total_size = 0
-            try:
-                total_size = int(r.headers['Content-length'])
-            except:
-                pass
-            current_size = 0
-            with NamedTemporaryFile(delete=False) as f:
-                temp_file_name = f.name
-                for chunk in r.iter_content(chunk_size=1024 * 1024):
-                    if total_size != 0:
-                        previous = current_size / total_size
+        # A download that was interrupted earlier in a single stream is resumed in a single stream,
+        # a download that was interrupted earlier in byte ranges is resumed in its missing byte ranges
+        if segment_count > 1 and self._load_partial_download(Path(f"{local_filename}.part"),
+                                                             Path(f"{local_filename}.part.json")) is None:
+            probe = self._run_download(url, lambda: self._probe_ranges(url), description, on_retry)
+            if probe is not None and probe[0] > segment_threshold:
+                self._download_url_segmented(url, local_filename, progress_callback, segment_count, *probe,
+                                             on_chunk=on_chunk, on_retry=on_retry)
+                return
+
+        self._run_download(url,
+                           lambda: self._download_url(url, local_filename, progress_callback, on_chunk),
+                           description,
+                           on_retry)
+
+    def _run_download(self,
+                      url: str,
+                      download: Callable[[], Any],
+                      description: str,
+                      on_retry: Optional[Callable[[], None]] = None) -> Any:
+        """Runs (part of) a download, retrying it according to the retry policy.
+
+        :param url: the url that is downloaded
+        :param download: the function performing the download
+        :param description: the description of the download to log retries with
+        :param on_retry: the function to call before every retry, in addition to recording it in the statistics
+        :return: the return value of the download function
+        """
+        if self._retry_policy is None:
+            return download()
+
+        stats = self._http_client.stats
+        if stats is not None:
+            from lean.components.util.http_stats import get_default_endpoint
+            endpoint = get_default_endpoint("GET", url)
+            caller_on_retry = on_retry
+
+            def on_retry() -> None:
+                stats.record_retry(endpoint)
+                if caller_on_retry is not None:
+                    caller_on_retry()
+
+        return self._retry_policy.run(download, description=description, on_retry=on_retry)
+
+    def _download_url(self,
+                      url: str,
+                      local_filename: str,
+                      progress_callback: Callable[[float], None],
+                      on_chunk: Optional[Callable[[int], None]] = None) -> None:
+        """Performs a single attempt at downloading the content of a downloadable file.
+
+        The content is streamed into a partial file next to the final file, with a sidecar file recording the url,
+        the validator of the content and the amount of bytes written. When a previous attempt left a partial file
+        behind, the download resumes from where that attempt stopped using a Range request.
+        If the attempt fails, the progress it reported is reverted so a retry starts from the same position again.
+
+        :param url: the url to download
+        :param local_filename: the final local path where the data file will be stored
+        :param progress_callback: the download progress callback
+        :param on_chunk: the function to call with the size of every received chunk
+        """
+        from os import makedirs, path, replace
+
+        reported_progress = 0
+
+        def report_progress(advance: float) -> None:
+            nonlocal reported_progress
+            reported_progress += advance
+            progress_callback(advance)
 
-                    current_size += f.write(chunk)
+        part_path = Path(f"{local_filename}.part")
+        state_path = Path(f"{local_filename}.part.json")
+        makedirs(path.dirname(local_filename) or ".", exist_ok=True)
 
+        state = self._load_partial_download(part_path, state_path)
+        headers = {}
+        if state is not None:
+            headers["Range"] = f"bytes={state['offset']}-"
+            validator = state.get("etag") or state.get("lastModified")
+            if validator is not None:
+                headers["If-Range"] = validator
+
+        try:
+            with self._http_client.get(url, stream=True, headers=headers, raise_for_status=False) as r:
+                if r.status_code == 416 and state is not None:
+                    # The partial file doesn't match the remote file anymore, start over
+                    self._discard_partial_download(part_path, state_path)
+                    return self._download_url(url, local_filename, progress_callback, on_chunk)
+
+                r.raise_for_status()
+
+                resumed = state is not None and r.status_code == 206 \
+                          and self._get_content_range(r) == (state["offset"], state["size"])
+                if r.status_code == 206 and not resumed and state is not None:
+                    # The server sent a different range than requested, which happens when the remote file changed
+                    # while there was no validator to detect it with, the partial content can't be used
+                    self._discard_partial_download(part_path, state_path)
+                    return self._download_url(url, local_filename, progress_callback, on_chunk)
+
+                if not resumed:
+                    state = {
+                        "url": url.split("?")[0],
+                        "etag": r.headers.get("ETag"),
+                        "lastModified": r.headers.get("Last-Modified"),
+                        "size": int(r.headers.get("Content-Length", 0) or 0),
+                        "md5": self._get_expected_md5(r),
+                        "offset": 0
+                    }
+
+                total_size = state["size"]
+                md5 = None if state["md5"] is None else self._hash_file(part_path, state["offset"])
+
+                with open(part_path, "r+b" if resumed else "wb") as f:
+                    f.seek(state["offset"])
+                    f.truncate()
+                    self._save_partial_download(state_path, state)
+
+                    if total_size != 0 and state["offset"] != 0:
+                        report_progress(state["offset"] / total_size)
+
+                    unsaved_bytes = 0
+                    try:
+                        for chunk in r.iter_content(chunk_size=1024 * 1024):
+                            f.write(chunk)
+                            if md5 is not None:
+                                md5.update(chunk)
+
+                            state["offset"] += len(chunk)
+                            unsaved_bytes += len(chunk)
+                            if total_size != 0:
+                                # progressive progress update if we can
+                                report_progress(len(chunk) / total_size)
+
+                            if on_chunk is not None:
+                                on_chunk(len(chunk))
+
+                            if unsaved_bytes >= PARTIAL_DOWNLOAD_SAVE_INTERVAL:
+                                f.flush()
+                                self._save_partial_download(state_path, state)
+                                unsaved_bytes = 0
+                    finally:
+                        # Whatever got written is kept, so the next attempt can resume from here
+                        f.flush()
+                        self._save_partial_download(state_path, state)
+
+                if total_size == 0:
+                    # if total size not available update progress at the end
+                    report_progress(1)
+
+            self._verify_partial_download(part_path, state_path, state, md5)
+            replace(part_path, local_filename)
+            state_path.unlink()
+        except Exception:
+            if reported_progress != 0:
+                progress_callback(-reported_progress)
+            raise
+
+    def stream_url(self,
+                   url: str,
+                   process: Callable[[Any], None],
+                   progress_callback: Callable[[float], None],
+                   on_chunk: Optional[Callable[[int], None]] = None,
+                   on_retry: Optional[Callable[[], None]] = None) -> None:
+        """Streams the content of a downloadable file into a function, without storing it on disk.
+
+        Transient failures restart the stream from the start according to the retry policy,
+        so the processing function must be able to process the same content more than once.
+
+        :param url: the url to download
+        :param process: the function to pass a binary file-like object containing the content of the file to
+        :param progress_callback: the download progress callback
+        :param on_chunk: the function to call with the size of every received chunk, may block to limit bandwidth
+        :param on_retry: the function to call before every retry of the stream
+        """
+        self._run_download(url,
+                           lambda: self._stream_url(url, process, progress_callback, on_chunk),
+                           f"download of {url.split('?')[0]}",
+                           on_retry)
+
+    def _stream_url(self,
+                    url: str,
+                    process: Callable[[Any], None],
+                    progress_callback: Callable[[float], None],
+                    on_chunk: Optional[Callable[[int], None]] = None) -> None:
+        """Performs a single attempt at streaming the content of a downloadable file into a function.
+
+        If the attempt fails, the progress it reported is reverted so a retry starts from the same position again.
+
+        :param url: the url to download
+        :param process: the function to pass a binary file-like object containing the content of the file to
+        :param progress_callback: the download progress callback
+        :param on_chunk: the function to call with the size of every received chunk
+        """
+        reported_progress = 0
+
+        try:
+            with self._http_client.get(url, stream=True) as r:
+                total_size = int(r.headers.get("Content-Length", 0) or 0)
+
+                def on_read(amount: int) -> None:
+                    nonlocal reported_progress
                     if total_size != 0:
-                        # progressive progress update if we can
-                        progress_callback((current_size / total_size) - previous)
+                        reported_progress += amount / total_size
+                        progress_callback(amount / total_size)
+                    if on_chunk is not None:
+                        on_chunk(amount)
+
+                # The raw stream is read directly, so the content is decoded like iter_content() would do
+                r.raw.decode_content = True
+                process(_ReadCallbackStream(r.raw, on_read))
+
             if total_size == 0:
-                # if total size not available update progress at the end
+                reported_progress += 1
                 progress_callback(1)
+        except Exception:
+            if reported_progress != 0:
+                progress_callback(-reported_progress)
+            raise
+
+    def _probe_ranges(self, url: str) -> Optional[Tuple[int, Optional[str]]]:
+        """Checks whether the server supports Range requests for a url.
+
+        The check requests the first byte of the file, because presigned links are only valid for GET requests.
+
+        :param url: the url to check
+        :return: the size of the file and its validator, or None if the server doesn't support Range requests
+        """
+        with self._http_client.get(url, stream=True, headers={"Range": "bytes=0-0"}) as r:
+            content_range = self._get_content_range(r) if r.status_code == 206 else None
+            if content_range is None:
+                return None
+
+            return content_range[1], r.headers.get("ETag") or r.headers.get("Last-Modified")
+
+    def _download_url_segmented(self,
+                                url: str,
+                                local_filename: str,
+                                progress_callback: Callable[[float], None],
+                                segment_count: int,
+                                size: int,
+                                validator: Optional[str],
+                                on_chunk: Optional[Callable[[int], None]] = None,
+                                on_retry: Optional[Callable[[], None]] = None) -> None:
+        """Downloads the content of a downloadable file in multiple byte ranges concurrently.
+
+        The byte ranges are written into a preallocated partial file, which replaces the final file once all
+        byte ranges are complete. Failed byte ranges are retried individually according to the retry policy,
+        the other byte ranges are cancelled once a byte range fails for good. The amount of bytes written in every
+        byte range is recorded in a sidecar file, so a later attempt only downloads the missing bytes.
+        At most as many byte ranges as the HTTP client keeps connections alive are downloaded at the same time,
+        across all files that are downloaded concurrently.
+
+        :param url: the url to download
+        :param local_filename: the final local path where the data file will be stored
+        :param progress_callback: the download progress callback
+        :param segment_count: the amount of byte ranges to download concurrently
+        :param size: the size of the file in bytes
+        :param validator: the ETag or Last-Modified header of the file, used to detect changes between byte ranges
+        :param on_chunk: the function to call with the size of every received chunk
+        :param on_retry: the function to call before every retry of a byte range
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from os import makedirs, path, replace
+        from threading import Event, Lock
+
+        description = f"download of {url.split('?')[0]}"
+        part_path = Path(f"{local_filename}.part")
+        state_path = Path(f"{local_filename}.part.json")
+        makedirs(path.dirname(local_filename) or ".", exist_ok=True)
+
+        state = self._load_segmented_download(part_path, state_path, url, size, validator)
+        if state is None:
+            segment_size = -(-size // segment_count)
+            state = {
+                "url": url.split("?")[0],
+                "validator": validator,
+                "size": size,
+                "md5": self._get_md5_from_etag(validator),
+                # The first byte, the last byte and the amount of bytes written of every byte range
+                "segments": [[start, min(start + segment_size, size) - 1, 0] for start in range(0, size, segment_size)]
+            }
+
+            # The file is preallocated (sparse on most file systems) so every byte range can be written in place
+            with open(part_path, "wb") as f:
+                f.truncate(size)
+            self._save_partial_download(state_path, state)
+
+        reported_progress = 0
+        unsaved_bytes = 0
+        state_lock = Lock()
+
+        def report_progress(segment: List[int], advance: int) -> None:
+            nonlocal reported_progress, unsaved_bytes
+            with state_lock:
+                reported_progress += advance
+                segment[2] += advance
+                unsaved_bytes += max(0, advance)
+                if unsaved_bytes >= PARTIAL_DOWNLOAD_SAVE_INTERVAL:
+                    self._save_partial_download(state_path, state)
+                    unsaved_bytes = 0
+            progress_callback(advance / size)
+            if on_chunk is not None and advance > 0:
+                on_chunk(advance)
+
+        downloaded_bytes = sum(segment[2] for segment in state["segments"])
+        if downloaded_bytes != 0:
+            reported_progress += downloaded_bytes
+            progress_callback(downloaded_bytes / size)
+
+        pending_segments = [segment for segment in state["segments"] if segment[2] < segment[1] + 1 - segment[0]]
+        max_workers = min(len(pending_segments), self._http_client.pool_size)
+        cancelled = Event()
+
+        try:
+            if len(pending_segments) > 0:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [executor.submit(self._run_download,
+                                               url,
+                                               lambda segment=segment: self._download_segment(url,
+                                                                                              part_path,
+                                                                                              segment,
+                                                                                              size,
+                                                                                              validator,
+                                                                                              report_progress,
+                                                                                              cancelled),
+                                               f"{description} (bytes {segment[0]}-{segment[1]})",
+                                               on_retry)
+                               for segment in pending_segments]
+
+                    try:
+                        for future in as_completed(futures):
+                            future.result()
+                    except BaseException:
+                        # The other byte ranges stop at their next chunk, their progress is kept for the next attempt
+                        cancelled.set()
+                        for future in futures:
+                            future.cancel()
+                        raise
+
+            md5 = None if state["md5"] is None else self._hash_file(part_path, size)
+            self._verify_partial_download(part_path, state_path, state, md5)
+            replace(part_path, local_filename)
+            state_path.unlink(missing_ok=True)
+        except BaseException:
+            if reported_progress != 0:
+                progress_callback(-reported_progress / size)
+            if state_path.is_file():
+                with state_lock:
+                    self._save_partial_download(state_path, state)
+            raise
+
+    def _download_segment(self,
+                          url: str,
+                          part_path: Path,
+                          segment: List[int],
+                          size: int,
+                          validator: Optional[str],
+                          report_progress: Callable[[List[int], int], None],
+                          cancelled: Any) -> None:
+        """Performs a single attempt at downloading the missing bytes of a byte range into its preallocated file.
+
+        Every chunk is flushed before it is reported, so the recorded progress never exceeds what has been written.
+
+        :param url: the url to download
+        :param part_path: the path to the preallocated partial file
+        :param segment: the first byte, the last byte (inclusive) and the amount of bytes written of the byte range
+        :param size: the size of the complete file in bytes
+        :param validator: the ETag or Last-Modified header of the file, or None if the server provided neither
+        :param report_progress: the callback to report the amount of downloaded bytes of the byte range with
+        :param cancelled: the threading.Event which is set when the download of the file has failed
+        """
+        if cancelled.is_set():
+            raise _DownloadCancelledError()
+
+        start = segment[0] + segment[2]
+        end = segment[1]
+        headers = {"Range": f"bytes={start}-{end}"}
+        if validator is not None:
+            headers["If-Range"] = validator
+
+        written = 0
+        with self._segment_slots:
+            with self._http_client.get(url, stream=True, headers=headers) as r:
+                if r.status_code != 206 or self._get_content_range(r) != (start, size):
+                    raise RuntimeError(f"Download of {url.split('?')[0]} failed, "
+                                       "the file changed while it was being downloaded")
+
+                with open(part_path, "r+b") as f:
+                    f.seek(start)
+                    for chunk in r.iter_content(chunk_size=1024 * 1024):
+                        if cancelled.is_set():
+                            raise _DownloadCancelledError()
+
+                        chunk = chunk[:end + 1 - start - written]
+                        f.write(chunk)
+                        f.flush()
+                        written += len(chunk)
+                        report_progress(segment, len(chunk))
+
+        if written != end + 1 - start:
+            raise RuntimeError(f"Download of {url.split('?')[0]} is corrupted, "
+                               f"expected {end + 1 - start} bytes in bytes {start}-{end} "
+                               f"but received {written} bytes")
+
+    def _load_segmented_download(self,
+                                 part_path: Path,
+                                 state_path: Path,
+                                 url: str,
+                                 size: int,
+                                 validator: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Loads the state of a previously interrupted download in byte ranges.
+
+        :param part_path: the path to the preallocated partial file
+        :param state_path: the path to the sidecar file describing the partial file
+        :param url: the url that is downloaded
+        :param size: the current size of the file in bytes
+        :param validator: the current ETag or Last-Modified header of the file
+        :return: the state of the partial download, or None if there is no partial download that can be resumed
+        """
+        from json import loads
+
+        if not part_path.is_file() or not state_path.is_file():
+            return None
+
+        try:
+            state = loads(state_path.read_text(encoding="utf-8"))
+        except ValueError:
+            return None
+
+        # Without a validator a changed file can only be detected by its size, which is checked below as well
+        if "segments" not in state \
+                or state.get("url") != url.split("?")[0] \
+                or state.get("size") != size \
+                or state.get("validator") != validator \
+                or part_path.stat().st_size != size:
+            return None
+
+        return state
+
+    def _load_partial_download(self, part_path: Path, state_path: Path) -> Optional[Dict[str, Any]]:
+        """Loads the state of a previously interrupted download.
+
+        :param part_path: the path to the partial file
+        :param state_path: the path to the sidecar file describing the partial file
+        :return: the state of the partial download, or None if there is no partial download that can be resumed
+        """
+        from json import loads
+
+        if not part_path.is_file() or not state_path.is_file():
+            return None
+
+        try:
+            state = loads(state_path.read_text(encoding="utf-8"))
+        except ValueError:
+            return None
+
+        # Bytes written after the sidecar was last saved may not have been flushed completely
+        state["offset"] = min(state.get("offset", 0), part_path.stat().st_size)
+        if state["offset"] == 0 or state.get("size", 0) == 0:
+            return None
+
+        return state
 
-            directory = path.dirname(local_filename)
-            makedirs(directory, exist_ok=True)
-            move(temp_file_name, local_filename)
+    def _save_partial_download(self, state_path: Path, state: Dict[str, Any]) -> None:
+        """Saves the state of a download in progress to its sidecar file.
+
+        :param state_path: the path to the sidecar file
+        :param state: the state to save
+        """
+        from json import dumps
+        state_path.write_text(dumps(state), encoding="utf-8")
+
+    def _discard_partial_download(self, part_path: Path, state_path: Path) -> None:
+        """Deletes the partial file and sidecar file of a download.
+
+        :param part_path: the path to the partial file
+        :param state_path: the path to the sidecar file
+        """
+        for file in [part_path, state_path]:
+            if file.is_file():
+                file.unlink()
+
+    def _verify_partial_download(self, part_path: Path, state_path: Path, state: Dict[str, Any], md5: Any) -> None:
+        """Verifies the size and checksum of a completed download, discarding it when it is corrupted.
+
+        :param part_path: the path to the partial file containing the downloaded content
+        :param state_path: the path to the sidecar file
+        :param state: the state of the download
+        :param md5: the md5 hash of the downloaded content, or None if the server did not provide a checksum
+        """
+        error = None
+        actual_size = part_path.stat().st_size
+        if state["size"] != 0 and actual_size != state["size"]:
+            error = f"expected {state['size']} bytes but received {actual_size} bytes"
+        elif md5 is not None and md5.hexdigest() != state["md5"]:
+            error = f"expected md5 checksum {state['md5']} but the content has checksum {md5.hexdigest()}"
+
+        if error is not None:
+            self._discard_partial_download(part_path, state_path)
+            raise RuntimeError(f"Download of {state['url']} is corrupted, {error}")
+
+    def _get_content_range(self, response: Any) -> Optional[Tuple[int, int]]:
+        """Parses the Content-Range header of a partial response.
+
+        :param response: the response to parse the header of
+        :return: the first byte and the size of the complete content, or None if the header is missing or invalid
+        """
+        from re import fullmatch
+
+        match = fullmatch(r"bytes (\d+)-\d+/(\d+)", response.headers.get("Content-Range", "").strip())
+        if match is None:
+            return None
+
+        return int(match.group(1)), int(match.group(2))
+
+    def _get_expected_md5(self, response: Any) -> Optional[str]:
+        """Returns the md5 checksum of the content of a response, if the server provided it.
+
+        :param response: the response to get the checksum of
+        :return: the hex-encoded md5 checksum of the complete content, or None if it is unknown
+        """
+        content_md5 = response.headers.get("Content-MD5")
+        if content_md5 is not None:
+            from base64 import b64decode
+            from binascii import Error
+            try:
+                return b64decode(content_md5).hex()
+            except (Error, ValueError):
+                return None
+
+        return self._get_md5_from_etag(response.headers.get("ETag"))
+
+    def _get_md5_from_etag(self, etag: Optional[str]) -> Optional[str]:
+        """Returns the md5 checksum contained in an ETag header.
+
+        :param etag: the value of the ETag header, may be None
+        :return: the hex-encoded md5 checksum, or None if the ETag doesn't contain one
+        """
+        from re import fullmatch
+
+        # Object stores use the md5 checksum as ETag for objects that weren't uploaded in multiple parts
+        etag = (etag or "").strip('"')
+        if fullmatch(r"[0-9a-fA-F]{32}", etag):
+            return etag.lower()
+
+        return None
+
+    def _hash_file(self, file: Path, size: int) -> Any:
+        """Creates an md5 hash and feeds it the first bytes of a file.
+
+        :param file: the file to hash
+        :param size: the amount of bytes to hash, 0 to create an empty hash
+        :return: the hash object
+        """
+        from hashlib import md5
+
+        file_hash = md5()
+        if size > 0:
+            with file.open("rb") as f:
+                while size > 0:
+                    chunk = f.read(min(size, 1024 * 1024))
+                    if not chunk:
+                        break
+                    file_hash.update(chunk)
+                    size -= len(chunk)
+
+        return file_hash
 
     def download_public_file(self, data_endpoint: str) -> bytes:
         """Downloads the content of a downloadable public file.
@@ -93,7 +713,29 @@ class DataClient:
         :return: the content of the file
         """
         return self._http_client.get(data_endpoint).content
-    
+
+    def download_public_file_if_modified(self,
+                                         data_endpoint: str,
+                                         validators: Dict[str, str]) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        """Downloads the content of a downloadable public file unless it is unchanged since the last download.
+
+        :param data_endpoint: the url of the public file
+        :param validators: the ETag and Last-Modified headers of the last download, empty to always download the file
+        :return: None if the file is unchanged, otherwise the content of the file and the validators of this download
+        """
+        headers = {}
+        if "ETag" in validators:
+            headers["If-None-Match"] = validators["ETag"]
+        if "Last-Modified" in validators:
+            headers["If-Modified-Since"] = validators["Last-Modified"]
+
+        response = self._http_client.get(data_endpoint, headers=headers)
+        if response.status_code == 304:
+            return None
+
+        new_validators = {key: response.headers[key] for key in ["ETag", "Last-Modified"] if key in response.headers}
+        return response.content, new_validators
+
     def download_public_file_json(self, data_endpoint: str) -> Dict[str, Any]:
         """Downloads the content of a downloadable public file in json format.
 
@@ -105,6 +747,8 @@ class DataClient:
     def list_files(self, prefix: str) -> List[str]:
         """Lists all remote files with a given prefix.
 
+        Listings are cached in memory and, through the API client's response cache, on disk for a few hours.
+
         :param prefix: the prefix of the files to return
         :return: the list of files with the given prefix
         """
@@ -131,6 +775,18 @@ class DataClient:
 
         return files
 
+    def invalidate_list_files(self, prefix: Optional[str] = None) -> None:
+        """Deletes cached listings, so the next list_files() call requests them from the API again.
+
+        :param prefix: the prefix to delete the cached listing of, None to delete all cached listings
+        """
+        if prefix is None:
+            DataClient._list_files_cache.clear()
+            self._api.invalidate_cache("data/list")
+        else:
+            DataClient._list_files_cache.pop(prefix, None)
+            self._api.invalidate_cache("data/list", "post", {"filePath": prefix})
+
     def get_info(self, organization_id: str) -> QCDataInformation:
         """Returns the available data vendors, their prices and a link to the data agreement.
 
@@ -13,18 +13,70 @@
 
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Any, List, Callable
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Sized, Tuple
 
 from lean.components.api.api_client import APIClient
 from lean.components.config.lean_config_manager import LeanConfigManager
+from lean.components.config.storage import Storage
 from lean.components.util.logger import Logger
+from lean.constants import (BULK_DOWNLOAD_MODE_SEGMENTED, BULK_DOWNLOAD_MODE_STREAM, DEFAULT_MAX_DOWNLOAD_CONCURRENCY,
+                            DOWNLOAD_PRIORITY_NORMAL)
 from lean.models.errors import MoreInfoError, RequestFailedError
 
+if TYPE_CHECKING:
+    from lean.components.util.bandwidth_limiter import BandwidthLimiter, BandwidthSchedule
+    from lean.components.util.concurrency_controller import ConcurrencyController
+    from lean.components.util.data_inventory import DataInventory
+    from lean.components.util.data_store import DataStore
+    from lean.components.util.download_queue import DownloadQueue
+    from lean.components.util.progress_aggregator import ProgressAggregator
+
 
 def _store_local_file(file_content: bytes, file_path: Path):
+    from os import replace
+    from uuid import uuid4
+
+    # The file is replaced atomically, so LEAN never reads a partially written file
     file_path.parent.mkdir(parents=True, exist_ok=True)
-    with file_path.open("wb+") as f:
+    tmp_path = file_path.parent / f".{file_path.name}.{uuid4()}"
+    with tmp_path.open("wb+") as f:
         f.write(file_content)
+    replace(tmp_path, file_path)
+
+
+# The number of threads requesting download links from the API in parallel, which mostly wait on the API
+LINK_RESOLVER_THREAD_COUNT = 4
+
+# The number of threads extracting downloaded bulk files in parallel, which are limited by disk throughput
+BULK_EXTRACTION_THREAD_COUNT = 1
+
+# The number of data files of which the existence is checked at once, before they are passed to the pipeline
+EXISTENCE_CHECK_BATCH_SIZE = 1000
+
+
+class _PendingDownload(NamedTuple):
+    """A data file of which the download link has been requested, but which hasn't been transferred yet."""
+    relative_file: str
+    link: str
+    local_path: str
+    canary_path: Path
+    is_bulk: bool
+    vendor: str
+
+
+# The number of files which are downloaded concurrently at the start of a download,
+# the concurrency is adapted to the measured throughput from there on
+INITIAL_DOWNLOAD_CONCURRENCY = 4
+
+
+def get_download_thread_count() -> int:
+    """Returns the maximum number of threads used to download data files in parallel.
+
+    Downloading is bound by the network rather than by the CPU, so this doesn't depend on the amount of CPUs.
+
+    :return: the maximum number of files DataDownloader.download_files() downloads at the same time by default
+    """
+    return DEFAULT_MAX_DOWNLOAD_CONCURRENCY
 
 
 def parse_timedelta(database_update_frequency: str):
@@ -47,22 +99,55 @@ class DataDownloader:
                  logger: Logger,
                  api_client: APIClient,
                  lean_config_manager: LeanConfigManager,
-                 database_update_frequency: str):
+                 database_update_frequency: str,
+                 cache_storage: Optional[Storage] = None,
+                 segment_count: int = 1,
+                 segment_threshold: int = 0,
+                 bulk_download_mode: str = BULK_DOWNLOAD_MODE_SEGMENTED,
+                 data_store: Optional["DataStore"] = None,
+                 bandwidth_schedule: Optional["BandwidthSchedule"] = None,
+                 download_queue: Optional["DownloadQueue"] = None):
         """Creates a new CloudBacktestRunner instance.
 
         :param logger: the logger to use to log messages with
         :param api_client: the APIClient instance to use when communicating with the QuantConnect API
         :param lean_config_manager: the LeanConfigManager instance to retrieve the data directory from
         :param database_update_frequency: the value of the config option database-update-frequency
+        :param cache_storage: the Storage instance to remember the ETag and Last-Modified headers of the database files in
+        :param segment_count: the amount of byte ranges large bulk files are downloaded in concurrently
+        :param segment_threshold: the size in bytes above which bulk files are downloaded in multiple byte ranges
+        :param bulk_download_mode: BULK_DOWNLOAD_MODE_STREAM to extract bulk files while downloading them,
+                                   BULK_DOWNLOAD_MODE_SEGMENTED to download them to a temporary file first
+        :param data_store: the data store shared by multiple workspaces, None if data files are not shared
+        :param bandwidth_schedule: the time-of-day limits of the combined download speed, None if there are none
+        :param download_queue: the queue coordinating downloads with other processes, None to not coordinate them
         """
         self._logger = logger
         self._api_client = api_client
         self._lean_config_manager = lean_config_manager
+        self._cache_storage = cache_storage
+        self._segment_count = segment_count
+        self._segment_threshold = segment_threshold
+        self._bulk_download_mode = bulk_download_mode
+        self._data_store = data_store
+        self._bandwidth_schedule = bandwidth_schedule
+        self._download_queue = download_queue
         self.database_update_frequency = database_update_frequency
 
     def update_database_files(self):
         """Will update lean data folder database files if required
 
+        """
+        report = self.refresh_database_files()
+        if report is not None:
+            report()
+
+    def refresh_database_files(self) -> Optional[Callable[[], None]]:
+        """Updates the lean data folder database files if required, without logging errors yet.
+
+        This method is safe to call from a background thread, the returned function must be called on the main thread.
+
+        :return: a function logging the error that occurred while updating the files, or None if there is no error
         """
         try:
             now = datetime.now()
@@ -78,74 +163,233 @@ class DataDownloader:
             if not frequency:
                 self._logger.debug(f"Skipping database-update-frequency, frequency is:"
                                    f" {str(self.database_update_frequency)}")
-                return
+                return None
             self._logger.debug(f"database-update-frequency is: {str(frequency)}")
             if not last_update or now - last_update > frequency:
                 data_dir = self._lean_config_manager.get_data_directory()
                 self._lean_config_manager.set_properties({"file-database-last-update": now.strftime('%m/%d/%Y %H:%M:%S')})
 
-                _store_local_file(self._api_client.data.download_public_file(
-                    "https://raw.githubusercontent.com/QuantConnect/Lean/master/Data/symbol-properties/symbol-properties-database.csv"),
+                self._update_database_file(
+                    "https://raw.githubusercontent.com/QuantConnect/Lean/master/Data/symbol-properties/symbol-properties-database.csv",
                     data_dir / "symbol-properties" / "symbol-properties-database.csv")
-                _store_local_file(self._api_client.data.download_public_file(
-                    "https://raw.githubusercontent.com/QuantConnect/Lean/master/Data/market-hours/market-hours-database.json"),
+                self._update_database_file(
+                    "https://raw.githubusercontent.com/QuantConnect/Lean/master/Data/market-hours/market-hours-database.json",
                     data_dir / "market-hours" / "market-hours-database.json")
         except MoreInfoError as e:
-            if "not found" in str(e):
-                pass
-            else:
-                self._logger.error(str(e))
+            if "not found" not in str(e):
+                error = str(e)
+                return lambda: self._logger.error(error)
         except ValueError as e:
             self._logger.debug(f"Value of config option database-update-frequency is invalid: {str(e)}. "
                                f"Database update will be skipped")
         except Exception as e:
-            self._logger.error(str(e))
+            error = str(e)
+            return lambda: self._logger.error(error)
+
+        return None
+
+    def _update_database_file(self, url: str, file_path: Path) -> None:
+        """Downloads a database file if it changed since it was last downloaded.
+
+        :param url: the url of the database file
+        :param file_path: the local path of the database file
+        """
+        if self._cache_storage is None:
+            _store_local_file(self._api_client.data.download_public_file(url), file_path)
+            return
+
+        validators_key = f"database-file-validators-{url}"
+        validators = self._cache_storage.get(validators_key, {}) if file_path.is_file() else {}
+
+        download = self._api_client.data.download_public_file_if_modified(url, validators)
+        if download is None:
+            self._logger.debug(f"{file_path.name} is unchanged since it was last downloaded")
+            return
+
+        content, validators = download
+        _store_local_file(content, file_path)
+        self._cache_storage.set(validators_key, validators)
 
-    def download_files(self, data_files: List[Any], overwrite: bool, organization_id: str) -> None:
+    def download_files(self,
+                       data_files: Iterable[Any],
+                       overwrite: bool,
+                       organization_id: str,
+                       max_concurrency: Optional[int] = None,
+                       max_bandwidth: Optional[float] = None,
+                       dry_run: bool = False,
+                       priority: str = DOWNLOAD_PRIORITY_NORMAL) -> None:
         """Downloads files from QuantConnect Datasets to the local data directory.
 
-        :param data_files: the list of data files to download
+        The files pass through a pipeline of three stages, each with its own threads:
+        requesting the download links, transferring the files and extracting the bulk files.
+        This way the latency of requesting a link overlaps with the transfer of previously requested files.
+
+        The amount of concurrent transfers is adapted to the measured throughput and errors,
+        starting at INITIAL_DOWNLOAD_CONCURRENCY and never exceeding the maximum concurrency.
+
+        The data files are consumed as the pipeline needs them, so downloads start before all files are generated.
+
+        No download links are requested while another CLI process downloads with a higher priority.
+
+        :param data_files: the data files to download, may be a generator
         :param overwrite: whether existing files may be overwritten
         :param organization_id: the id of the organization that should be billed
+        :param max_concurrency: the maximum amount of files to transfer at the same time, None to use the default
+        :param max_bandwidth: the maximum combined download speed in bytes per second, None for no limit
+        :param dry_run: True to only log which files would be downloaded and how, without downloading anything
+        :param priority: the priority of the downloads compared to downloads of other processes
         """
-        from joblib import delayed, Parallel
-        from multiprocessing import cpu_count
-        progress = self._logger.progress(suffix="{task.percentage:0.0f}% ({task.completed:,.0f}/{task.total:,.0f})")
-        progress_task = progress.add_task("", total=len(data_files))
+        from lean.components.util.data_inventory import DataInventory
 
-        try:
-            parallel = Parallel(n_jobs=max(1, cpu_count() - 1), backend="threading")
+        max_concurrency = max_concurrency or get_download_thread_count()
+        data_dir = self._lean_config_manager.get_data_directory()
+
+        total_files = len(data_files) if isinstance(data_files, Sized) else None
+        config_properties = {}
+
+        with DataInventory(self._logger, data_dir) as inventory:
+            checked_files = self._check_existing_files(data_files, overwrite, data_dir, inventory, config_properties)
+
+            if dry_run:
+                file_count = existing_file_count = 0
+                for _, exists in checked_files:
+                    file_count += 1
+                    existing_file_count += 1 if exists else 0
+
+                self._log_download_plan(file_count, existing_file_count, max_concurrency, max_bandwidth)
+                return
+
+            self._run_download_pipeline(checked_files, total_files, data_dir, organization_id, inventory,
+                                        max_concurrency, max_bandwidth, priority, use_data_store=not overwrite)
+
+        # update our config after we download all files, and not in parallel!
+        if len(config_properties) > 0:
+            self._lean_config_manager.set_properties(config_properties)
 
-            data_dir = self._lean_config_manager.get_data_directory()
-            parallel(delayed(self._download_file)(data_file.file, overwrite, data_dir, organization_id,
-                                                  lambda advance: progress.update(progress_task, advance=advance))
-                     for data_file in data_files)
+    def _check_existing_files(self,
+                              data_files: Iterable[Any],
+                              overwrite: bool,
+                              data_directory: Path,
+                              inventory: "DataInventory",
+                              config_properties: Dict[str, str]) -> Iterator[Tuple[Any, bool]]:
+        """Checks which data files have been downloaded before, in batches as the data files are generated.
 
-            # update our config after we download all files, and not in parallel!
-            for datafile in data_files:
-                relative_file = datafile.file
+        :param data_files: the data files to check
+        :param overwrite: whether existing files may be overwritten, in which case no file is considered existing
+        :param data_directory: the path to the local data directory
+        :param inventory: the inventory of the data directory
+        :param config_properties: the dict to add the Lean config properties to which the data files require
+        :return: an iterator yielding every data file and whether it exists and must be skipped
+        """
+        from itertools import islice
+
+        data_files = iter(data_files)
+        while True:
+            batch = list(islice(data_files, EXISTENCE_CHECK_BATCH_SIZE))
+            if len(batch) == 0:
+                return
+
+            existing_files = set() if overwrite else self._get_existing_files(batch, data_directory, inventory)
+            for data_file in batch:
+                relative_file = data_file.file
                 if "/map_files/map_files_" in relative_file and relative_file.endswith(".zip"):
-                    self._lean_config_manager.set_properties({
-                        "map-file-provider": "QuantConnect.Data.Auxiliary.LocalZipMapFileProvider"
-                    })
+                    config_properties["map-file-provider"] = "QuantConnect.Data.Auxiliary.LocalZipMapFileProvider"
                 if "/factor_files/factor_files_" in relative_file and relative_file.endswith(".zip"):
-                    self._lean_config_manager.set_properties({
-                        "factor-file-provider": "QuantConnect.Data.Auxiliary.LocalZipFactorFileProvider"
-                    })
+                    config_properties["factor-file-provider"] = "QuantConnect.Data.Auxiliary.LocalZipFactorFileProvider"
+
+                yield data_file, relative_file in existing_files
+
+    def _run_download_pipeline(self,
+                               checked_files: Iterable[Tuple[Any, bool]],
+                               total_files: Optional[int],
+                               data_dir: Path,
+                               organization_id: str,
+                               inventory: "DataInventory",
+                               max_concurrency: int,
+                               max_bandwidth: Optional[float],
+                               priority: str,
+                               use_data_store: bool) -> None:
+        """Downloads files through the pipeline of link resolution, transfer and bulk extraction.
+
+        :param checked_files: the data files to download and whether they already exist and must be skipped
+        :param total_files: the amount of data files to download, None if unknown
+        :param data_dir: the path to the local data directory
+        :param organization_id: the id of the organization that should be billed
+        :param inventory: the inventory of the data directory to record downloaded files in
+        :param max_concurrency: the maximum amount of files to transfer at the same time
+        :param max_bandwidth: the maximum combined download speed in bytes per second, None for no limit
+        :param priority: the priority of the downloads compared to downloads of other processes
+        :param use_data_store: whether files stored in the data store are linked instead of downloaded
+        """
+        from contextlib import nullcontext
+        from lean.components.util.concurrency_controller import ConcurrencyController
+        from lean.components.util.pipeline import Pipeline, PipelineStage
+        from lean.components.util.progress_aggregator import PROGRESS_SUFFIX, PROGRESS_SUFFIX_WITHOUT_TOTAL, \
+            ProgressAggregator
+
+        controller = ConcurrencyController(self._logger,
+                                           INITIAL_DOWNLOAD_CONCURRENCY,
+                                           max_concurrency,
+                                           max_bytes_per_second=max_bandwidth)
+        bandwidth_limiter = None
+        if max_bandwidth is not None or self._bandwidth_schedule is not None:
+            from lean.components.util.bandwidth_limiter import BandwidthLimiter
+            bandwidth_limiter = BandwidthLimiter(max_bandwidth, self._bandwidth_schedule)
+
+        # Transfer threads report their progress to the aggregator, which updates the progress bar at a fixed rate
+        progress = self._logger.progress(suffix=PROGRESS_SUFFIX if total_files is not None
+                                         else PROGRESS_SUFFIX_WITHOUT_TOTAL)
+        progress_task = progress.add_task("", total=total_files, **ProgressAggregator.get_task_fields())
+        aggregator = ProgressAggregator(progress, progress_task, total_files)
+        progress_callback = aggregator.advance
+
+        claim = self._download_queue.claim(priority) if self._download_queue is not None else nullcontext()
+
+        try:
+            # The queues are kept short because download links expire some time after they have been requested
+            # After an error no new links are requested, but the links that have been requested already are billed,
+            # so the files they point to are still transferred and extracted
+            pipeline = Pipeline(self._logger, [
+                PipelineStage("resolve links",
+                              LINK_RESOLVER_THREAD_COUNT,
+                              lambda checked_file: self._resolve_download(checked_file[0], checked_file[1], data_dir,
+                                                                          organization_id, progress_callback,
+                                                                          inventory, use_data_store, priority)),
+                PipelineStage("transfer",
+                              max_concurrency,
+                              lambda download: self._transfer_download(download, data_dir, aggregator, controller,
+                                                                       bandwidth_limiter, inventory),
+                              finish_on_stop=True),
+                PipelineStage("extract bulk files",
+                              BULK_EXTRACTION_THREAD_COUNT,
+                              lambda download: self._extract_download(download, data_dir, inventory),
+                              finish_on_stop=True)
+            ], queue_size=INITIAL_DOWNLOAD_CONCURRENCY)
+
+            with claim, aggregator:
+                pipeline.run(checked_files)
+
+            concurrency_stats = controller.get_stats()
+            self._logger.debug("Download concurrency ranged from {} to {} transfers, ending at {}",
+                               concurrency_stats["lowestLimit"],
+                               concurrency_stats["highestLimit"],
+                               concurrency_stats["limit"])
 
             progress.stop()
         except KeyboardInterrupt as e:
             progress.stop()
             raise e
 
-    def _process_bulk(self, file: Path, destination: Path):
+    def _process_bulk(self, file: Path, destination: Path) -> List[str]:
         from tarfile import open
         tar = open(file)
         tar.errorlevel = 0
         tar.extractall(destination)
+        extracted_files = [member.name for member in tar.getmembers() if member.isfile()]
         tar.close()
         from os import remove
         remove(file)
+        return extracted_files
 
     def parse_last_update_date(self, last_update_date: str) -> datetime:
         formats = ['%m/%d/%Y', '%m/%d/%Y %H:%M:%S']
@@ -161,24 +405,83 @@ class DataDownloader:
             return input_string[:-len(suffix)]
         return input_string
 
-    def _download_file(self,
-                       relative_file: str,
-                       overwrite: bool,
-                       data_directory: Path,
-                       organization_id: str,
-                       progress_callback: Callable[[float], None]) -> None:
-        """Downloads a single file from QuantConnect Datasets to the local data directory.
+    def _resolve_download(self,
+                          data_file: Any,
+                          exists: bool,
+                          data_directory: Path,
+                          organization_id: str,
+                          progress_callback: Callable[[float], None],
+                          inventory: "DataInventory",
+                          use_data_store: bool,
+                          priority: str = DOWNLOAD_PRIORITY_NORMAL) -> Optional[_PendingDownload]:
+        """Requests the download link of a single file from QuantConnect Datasets.
+
+        Files which are in the data store are linked from there instead, without requesting a link.
+        The link is only requested once no other process downloads with a higher priority, because the organization
+        is billed when the link is requested and the link expires some time later.
+
+        :param data_file: the data file to download
+        :param exists: whether the data file already exists and must be skipped
+        :param data_directory: the path to the local data directory
+        :param organization_id: the id of the organization that should be billed
+        :param progress_callback: the download progress callback
+        :param inventory: the inventory of the data directory to record linked files in
+        :param use_data_store: whether the file is linked from the data store if it is stored there
+        :param priority: the priority of the download compared to downloads of other processes
+        :return: the download to transfer, or None if the file doesn't need to be downloaded
+        """
+        relative_file = data_file.file
+        local_path, canary_path, is_bulk = self._get_download_paths(relative_file, data_directory)
 
-        If this method downloads a map or factor files zip file,
-        it also updates the Lean config file to ensure LEAN uses those files instead of the csv files.
+        if exists:
+            self._logger.warn("\n".join([
+                f"{relative_file} already exists, use --overwrite to overwrite it",
+                "You have not been charged for this file"
+            ]))
+            progress_callback(1)
+            return None
 
-        :param relative_file: the relative path to the file in the data directory
-        :param overwrite: whether existing files may be overwritten
+        if use_data_store and self._data_store is not None and not is_bulk \
+                and self._data_store.materialize(relative_file, Path(local_path)):
+            inventory.record_file(relative_file, data_file.vendor.vendorName)
+            progress_callback(1)
+            return None
+
+        if self._download_queue is not None:
+            self._download_queue.wait_for_turn(priority)
+
+        try:
+            link = self._api_client.data.get_download_link(relative_file, organization_id)
+        except RequestFailedError as error:
+            self._logger.warn(f"{relative_file}: {error}\nYou have not been charged for this file")
+            progress_callback(1)
+            return None
+
+        return _PendingDownload(relative_file, link, str(local_path), canary_path, is_bulk, data_file.vendor.vendorName)
+
+    def _get_existing_files(self, data_files: List[Any], data_directory: Path, inventory: "DataInventory") -> Set[str]:
+        """Returns which data files have been downloaded before, using the inventory of the data directory.
+
+        :param data_files: the data files to check
         :param data_directory: the path to the local data directory
-        :param organization_id: the id of the organization that should be billed
-        :param callback: the lambda that is called just before the method returns
+        :param inventory: the inventory of the data directory
+        :return: the relative paths of the data files which have been downloaded before
         """
+        relative_files_by_canary = {}
+        for data_file in data_files:
+            canary_path = self._get_download_paths(data_file.file, data_directory)[1]
+            relative_files_by_canary[canary_path.relative_to(data_directory).as_posix()] = data_file.file
 
+        return {relative_files_by_canary[canary] for canary in inventory.get_existing_files(relative_files_by_canary)}
+
+    def _get_download_paths(self, relative_file: str, data_directory: Path) -> Tuple[str, Path, bool]:
+        """Returns where a file is downloaded to and which file indicates that it has been downloaded before.
+
+        :param relative_file: the relative path to the file in the data directory
+        :param data_directory: the path to the local data directory
+        :return: the path to download the file to, the path to the file that exists if the file was downloaded
+                 before, and whether the file is a bulk file
+        """
         local_path = canary_path = data_directory / relative_file
 
         is_bulk = "setup/" in relative_file and relative_file.endswith(".tar")
@@ -188,24 +491,180 @@ class DataDownloader:
             local_path = tempfile.gettempdir() + "/" + relative_file
             canary_path = Path(self.remove_suffix(str(data_directory / relative_file), ".tar") + ".log")
 
-        if canary_path.exists() and not overwrite:
-            self._logger.warn("\n".join([
-                f"{relative_file} already exists, use --overwrite to overwrite it",
-                "You have not been charged for this file"
-            ]))
-            progress_callback(1)
-            return
+        return str(local_path), canary_path, is_bulk
+
+    def _log_download_plan(self,
+                           file_count: int,
+                           existing_file_count: int,
+                           max_concurrency: int,
+                           max_bandwidth: Optional[float]) -> None:
+        """Logs which files download_files() would download and with which concurrency.
+
+        :param file_count: the amount of data files to download
+        :param existing_file_count: the amount of data files which already exist and would be skipped
+        :param max_concurrency: the maximum amount of files to transfer at the same time
+        :param max_bandwidth: the maximum combined download speed in bytes per second, None for no limit
+        """
+        self._logger.info(f"Dry run: {file_count - existing_file_count:,} files would be downloaded, "
+                          f"{existing_file_count:,} files already exist and would be skipped")
+        self._logger.info(f"Downloads would start with {min(INITIAL_DOWNLOAD_CONCURRENCY, max_concurrency)} "
+                          f"concurrent transfers, adapting between 1 and {max_concurrency} "
+                          "based on the measured throughput and errors")
+
+        if max_bandwidth is None:
+            self._logger.info("The download speed would not be limited")
+        else:
+            self._logger.info(f"The download speed would be limited to {max_bandwidth / 1024 / 1024:,.1f} MB/s")
+
+        if self._bandwidth_schedule is not None:
+            self._logger.info("The download speed would also follow the configured download-bandwidth-schedule")
+
+    def _transfer_download(self,
+                           download: _PendingDownload,
+                           data_directory: Path,
+                           progress: "ProgressAggregator",
+                           controller: "ConcurrencyController",
+                           bandwidth_limiter: Optional["BandwidthLimiter"],
+                           inventory: "DataInventory") -> Optional[_PendingDownload]:
+        """Transfers the content of a single file to its local path.
+
+        Bulk files are extracted while they are transferred if the bulk download mode is BULK_DOWNLOAD_MODE_STREAM.
+
+        :param download: the download to transfer
+        :param data_directory: the path to the local data directory
+        :param progress: the aggregator to report the transferred files and bytes to
+        :param controller: the controller limiting the amount of concurrent transfers
+        :param bandwidth_limiter: the limiter capping the combined download speed, None for no limit
+        :param inventory: the inventory of the data directory to record downloaded files in
+        :return: the download if it is a bulk file which needs to be extracted, None if not
+        """
+        progress_callback = progress.advance
+
+        def on_chunk(amount: int) -> None:
+            controller.record_bytes(amount)
+            progress.add_bytes(amount)
+            if bandwidth_limiter is not None:
+                bandwidth_limiter.consume(amount)
 
+        controller.acquire()
         try:
-            self._api_client.data.download_file(relative_file, organization_id, local_path, progress_callback)
-        except RequestFailedError as error:
-            self._logger.warn(f"{relative_file}: {error}\nYou have not been charged for this file")
-            progress_callback(1)
+            if not download.is_bulk:
+                self._api_client.data.download_url(download.link, download.local_path, progress_callback,
+                                                   on_chunk=on_chunk, on_retry=controller.record_error)
+                self._add_to_data_store([download.relative_file], data_directory)
+                inventory.record_file(download.relative_file, download.vendor)
+                return None
+
+            if self._bulk_download_mode == BULK_DOWNLOAD_MODE_STREAM:
+                extracted_files = set()
+                self._api_client.data.stream_url(download.link,
+                                                 lambda stream: extracted_files.update(
+                                                     self._extract_tar_stream(stream, data_directory)),
+                                                 progress_callback,
+                                                 on_chunk=on_chunk,
+                                                 on_retry=controller.record_error)
+                self._mark_bulk_extracted(download, data_directory, extracted_files, inventory)
+                return None
+
+            # Bulk files are large enough to benefit from downloading multiple byte ranges concurrently
+            self._api_client.data.download_url(download.link, download.local_path, progress_callback,
+                                               self._segment_count, self._segment_threshold,
+                                               on_chunk=on_chunk, on_retry=controller.record_error)
+            return download
+        except Exception:
+            controller.record_error()
+            raise
+        finally:
+            controller.release()
+
+    def _extract_download(self, download: _PendingDownload, data_directory: Path, inventory: "DataInventory") -> None:
+        """Extracts a downloaded bulk file into the local data directory.
+
+        :param download: the bulk file download to extract
+        :param data_directory: the path to the local data directory
+        :param inventory: the inventory of the data directory to record the extracted files in
+        """
+        extracted_files = self._process_bulk(download.local_path, data_directory)
+        self._mark_bulk_extracted(download, data_directory, extracted_files, inventory)
+
+    def _mark_bulk_extracted(self,
+                             download: _PendingDownload,
+                             data_directory: Path,
+                             extracted_files: Iterable[str],
+                             inventory: "DataInventory") -> None:
+        """Writes the canary file of a bulk file, which indicates that it doesn't need to be downloaded again.
+
+        :param download: the bulk file download which has been extracted completely
+        :param data_directory: the path to the local data directory
+        :param extracted_files: the paths of the extracted files relative to the data directory
+        :param inventory: the inventory of the data directory to record the extracted files and the canary file in
+        """
+        extracted_files = list(extracted_files)
+        self._add_to_data_store(extracted_files, data_directory)
+
+        download.canary_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(download.canary_path, 'a') as log_file:
+            log_file.write(f'Downloaded: {download.relative_file}\n')
+
+        inventory.record_files(extracted_files + [download.canary_path.relative_to(data_directory).as_posix()],
+                               download.vendor)
+
+    def _add_to_data_store(self, relative_files: Iterable[str], data_directory: Path) -> None:
+        """Adds downloaded files to the data store, if one is configured.
+
+        :param relative_files: the paths of the downloaded files relative to the data directory
+        :param data_directory: the path to the local data directory
+        """
+        if self._data_store is None:
             return
 
-        # Special case: bulk files need unpacked
-        if is_bulk:
-            canary_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(canary_path, 'a') as log_file:
-                log_file.write(f'Downloaded: {relative_file}\n')
-            self._process_bulk(local_path, data_directory)
+        for relative_file in relative_files:
+            self._data_store.add(relative_file, data_directory / relative_file)
+
+    def _extract_tar_stream(self, stream: Any, destination: Path) -> List[str]:
+        """Extracts a tar archive from a non-seekable stream, member by member as the members arrive.
+
+        Every file is written to a temporary file next to its destination and then renamed,
+        so LEAN never reads a partially extracted file, not even when the stream breaks off.
+        Members which are not regular files or directories, or which would end up outside the destination, are skipped.
+
+        :param stream: the binary stream containing the tar archive
+        :param destination: the directory to extract the archive into
+        :return: the paths of the extracted files relative to the destination
+        """
+        from os import replace
+        from shutil import copyfileobj
+        from tarfile import open
+        from uuid import uuid4
+
+        destination = destination.resolve()
+        extracted_files = []
+        with open(fileobj=stream, mode="r|*") as tar:
+            for member in tar:
+                target = (destination / member.name).resolve()
+                if target != destination and destination not in target.parents:
+                    self._logger.debug(f"Skipping {member.name}, it would be extracted outside {destination}")
+                    continue
+
+                if member.isdir():
+                    target.mkdir(parents=True, exist_ok=True)
+                    continue
+
+                if not member.isfile():
+                    self._logger.debug(f"Skipping {member.name}, it is not a regular file")
+                    continue
+
+                target.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = target.parent / f".{target.name}.{uuid4()}"
+                try:
+                    with tmp_path.open("wb") as f:
+                        copyfileobj(tar.extractfile(member), f, 1024 * 1024)
+                    replace(tmp_path, target)
+                except BaseException:
+                    if tmp_path.exists():
+                        tmp_path.unlink()
+                    raise
+
+                extracted_files.append(target.relative_to(destination).as_posix())
+
+        return extracted_files
@@ -12,11 +12,12 @@
 # limitations under the License.
 
 from pathlib import Path
-from typing import Set, List, Dict
+from typing import Set, List, Dict, Optional
 
 from lean.components.api.api_client import APIClient
 from lean.components.util.http_client import HTTPClient
 from lean.components.util.logger import Logger
+from lean.components.util.retry_policy import RetryPolicy
 from lean.constants import MODULES_DIRECTORY
 from lean.models.modules import NuGetPackage
 
@@ -24,16 +25,22 @@ from lean.models.modules import NuGetPackage
 class ModuleManager:
     """The ModuleManager class is responsible for downloading and updating modules."""
 
-    def __init__(self, logger: Logger, api_client: APIClient, http_client: HTTPClient) -> None:
+    def __init__(self,
+                 logger: Logger,
+                 api_client: APIClient,
+                 http_client: HTTPClient,
+                 retry_policy: Optional[RetryPolicy] = None) -> None:
         """Creates a new ModuleManager instance.
 
         :param logger: the logger to use
         :param api_client: the APIClient instance to use when communicating with the cloud
         :param http_client: the HTTPClient instance to use when downloading modules
+        :param retry_policy: the policy to retry failed downloads with, defaults to a RetryPolicy with default settings
         """
         self._logger = logger
         self._api_client = api_client
         self._http_client = http_client
+        self._retry_policy = retry_policy if retry_policy is not None else RetryPolicy(logger)
         self._installed_product_ids: Set[int] = set()
         self._installed_packages: Dict[int, List[NuGetPackage]] = {}
 
@@ -142,11 +149,15 @@ class ModuleManager:
 
         package_file.parent.mkdir(parents=True, exist_ok=True)
         link = self._api_client.modules.get_link(product_id, organization_id, package_file.name)
-        try:
+
+        def download() -> None:
             with self._http_client.get(link, stream=True) as response:
                 with package_file.open("wb+") as file:
                     for chunk in response.iter_content(chunk_size=8192):
                         file.write(chunk)
+
+        try:
+            self._retry_policy.run(download, description=f"download of {package_file.name}")
         except Exception as exception:
             package_file.unlink(missing_ok=True)
             raise exception
@@ -12,14 +12,15 @@
 # limitations under the License.
 
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple, Union
 from lean.components.api.api_client import APIClient
+from lean.components.api.async_api_client import AsyncAPIClient
 from lean.components.config.project_config_manager import ProjectConfigManager
 from lean.components.util.library_manager import LibraryManager
 from lean.components.util.logger import Logger
 from lean.components.util.platform_manager import PlatformManager
 from lean.components.util.project_manager import ProjectManager
-from lean.models.api import QCProject, QCLanguage, QCProjectLibrary
+from lean.models.api import QCFullFile, QCProject, QCLanguage, QCProjectLibrary
 from lean.components.util.organization_manager import OrganizationManager
 from lean.models.errors import RequestFailedError
 from lean.models.utils import LeanLibraryReference
@@ -36,7 +37,8 @@ class PullManager:
                  project_config_manager: ProjectConfigManager,
                  library_manager: LibraryManager,
                  platform_manager: PlatformManager,
-                 organization_manager: OrganizationManager) -> None:
+                 organization_manager: OrganizationManager,
+                 async_api_client: Optional[AsyncAPIClient] = None) -> None:
         """Creates a new PullManager instance.
 
         :param logger: the logger to use when printing messages
@@ -45,9 +47,12 @@ class PullManager:
         :param project_config_manager: the ProjectConfigManager instance to use
         :param library_manager: the LibraryManager instance to use when updating library references
         :param platform_manager: the PlatformManager used when checking which operating system is in use
+        :param async_api_client: the AsyncAPIClient instance to use when sending many requests at once,
+            defaults to one wrapping api_client
         """
         self._logger = logger
         self._api_client = api_client
+        self._async_api_client = async_api_client if async_api_client is not None else AsyncAPIClient(api_client)
         self._project_manager = project_manager
         self._project_config_manager = project_config_manager
         self._library_manager = library_manager
@@ -68,28 +73,40 @@ class PullManager:
 
         libraries = []
         inaccessible_libraries = []
-        for library in project.libraries:
-            if library.projectId in seen_projects:
-                continue
-
-            if not library.access:
-                inaccessible_libraries.append(library)
-                continue
 
-            seen_projects.append(library.projectId)
-
-            try:
-                library_project = self._api_client.projects.get(library.projectId, project.organizationId)
-            except RequestFailedError:
-                # the library could not be fetched, probably because it was deleted
-                inaccessible_libraries.append(library)
-                continue
-
-            libraries.append(library_project)
+        # The library tree is walked level by level, so all libraries on the same level are requested concurrently
+        parents = [project]
+        while len(parents) > 0:
+            libraries_to_fetch = []
+            for parent in parents:
+                for library in parent.libraries:
+                    if library.projectId in seen_projects:
+                        continue
+
+                    if not library.access:
+                        inaccessible_libraries.append(library)
+                        continue
+
+                    seen_projects.append(library.projectId)
+                    libraries_to_fetch.append(library)
+
+            if len(libraries_to_fetch) == 0:
+                break
+
+            library_projects = self._async_api_client.run(self._async_api_client.projects.get_many(
+                [library.projectId for library in libraries_to_fetch], project.organizationId, return_exceptions=True))
+
+            parents = []
+            for library, library_project in zip(libraries_to_fetch, library_projects):
+                if isinstance(library_project, RequestFailedError):
+                    # the library could not be fetched, probably because it was deleted
+                    inaccessible_libraries.append(library)
+                    continue
+                if isinstance(library_project, BaseException):
+                    raise library_project
 
-            libraries_for_library, inaccessible_libs_for_library = self._get_libraries(library_project, seen_projects)
-            libraries.extend(libraries_for_library)
-            inaccessible_libraries.extend(inaccessible_libs_for_library)
+                libraries.append(library_project)
+                parents.append(library_project)
 
         return libraries, inaccessible_libraries
 
@@ -134,10 +151,13 @@ class PullManager:
         projects_to_pull = sorted(projects_to_pull, key=lambda p: p.name)
         projects_with_paths = []
 
-        for index, project in enumerate(projects_to_pull, start=1):
+        for index, (project, cloud_files) in enumerate(self._get_cloud_files(projects_to_pull), start=1):
             try:
                 self._logger.info(f"[{index}/{len(projects_to_pull)}] Pulling '{project.name}'")
-                projects_with_paths.append((project, self._pull_project(project, encryption_action, encryption_key)))
+                projects_with_paths.append((project, self._pull_project(project,
+                                                                        encryption_action,
+                                                                        encryption_key,
+                                                                        cloud_files)))
             except Exception as ex:
                 from traceback import format_exc
                 self._logger.debug(format_exc().strip())
@@ -149,12 +169,35 @@ class PullManager:
 
         self._update_local_library_references(projects_with_paths)
 
-    def _pull_project(self, project: QCProject, encryption_action: Optional[ActionType], encryption_key: Optional[Path]) -> Path:
+    def _get_cloud_files(self,
+                         projects: List[QCProject]) -> Iterator[Tuple[QCProject, Union[List[QCFullFile], BaseException]]]:
+        """Yields the files of the given projects, requesting them concurrently in bounded windows.
+
+        The files of the next window are only requested once the projects of the current window have been handled,
+        so the files of at most one window of projects are held in memory at the same time.
+
+        :param projects: the projects to retrieve the files of
+        :return: the projects with their files, or the error that occurred while retrieving them, in the given order
+        """
+        window_size = self._async_api_client.max_concurrency
+        for start in range(0, len(projects), window_size):
+            window = projects[start:start + window_size]
+            yield from zip(window, self._async_api_client.run(
+                self._async_api_client.files.get_all_many([project.projectId for project in window],
+                                                          return_exceptions=True)))
+
+    def _pull_project(self,
+                      project: QCProject,
+                      encryption_action: Optional[ActionType],
+                      encryption_key: Optional[Path],
+                      cloud_files: Union[List[QCFullFile], BaseException, None] = None) -> Path:
         """Pulls a single project from the cloud to the local drive.
 
         Raises an error with a descriptive message if the project cannot be pulled.
 
         :param project: the cloud project to pull
+        :param cloud_files: the prefetched files of the project, the error that occurred while fetching them,
+            or None if they still need to be fetched
         :return the actual local path of the project
         """
         local_project_path = self._project_manager.get_local_project_path(project.name, project.projectId,
@@ -186,38 +229,50 @@ class PullManager:
         validate_key_and_encryption_state_for_cloud_project(project, local_encryption_state, encryption_key, local_encryption_key, self._logger)
 
         # Pull the cloud files to the local drive
-        self._pull_files(project, local_project_path, encryption_action, encryption_key)
+        self._pull_files(project, local_project_path, encryption_action, encryption_key, cloud_files)
 
-        # Update the local project config with the latest details
+        # Update the local project config with the latest details, writing it once
         project_config = self._project_config_manager.get_project_config(local_project_path)
-        project_config.set("cloud-id", project.projectId)
-        project_config.set("algorithm-language", project.language.name)
-        project_config.set("parameters", {parameter.key: parameter.value for parameter in project.parameters})
-        project_config.set("description", project.description)
-        project_config.set("organization-id", project.organizationId)
-        project_config.set("python-venv", project.leanEnvironment)
-        if encryption_key:
-            project_config.set("encrypted", encryption_action == ActionType.ENCRYPT)
-        else:
-            project_config.set('encrypted', project.encrypted)
+        with project_config.batch():
+            project_config.set("cloud-id", project.projectId)
+            project_config.set("algorithm-language", project.language.name)
+            project_config.set("parameters", {parameter.key: parameter.value for parameter in project.parameters})
+            project_config.set("description", project.description)
+            project_config.set("organization-id", project.organizationId)
+            project_config.set("python-venv", project.leanEnvironment)
+            if encryption_key:
+                project_config.set("encrypted", encryption_action == ActionType.ENCRYPT)
+            else:
+                project_config.set('encrypted', project.encrypted)
 
-        if not project.leanPinnedToMaster:
-            project_config.set("lean-engine", project.leanVersionId)
-        else:
-            project_config.delete("lean-engine")
+            if not project.leanPinnedToMaster:
+                project_config.set("lean-engine", project.leanVersionId)
+            else:
+                project_config.delete("lean-engine")
 
         return local_project_path
 
-    def _pull_files(self, project: QCProject, local_project_path: Path, encryption_action: Optional[ActionType], encryption_key: Optional[Path]) -> None:
+    def _pull_files(self,
+                    project: QCProject,
+                    local_project_path: Path,
+                    encryption_action: Optional[ActionType],
+                    encryption_key: Optional[Path],
+                    cloud_files: Union[List[QCFullFile], BaseException, None] = None) -> None:
         """Pull the files of a single project.
 
         :param project: the cloud project of which the files need to be pulled
         :param local_project_path: the path to the local project directory
+        :param cloud_files: the prefetched files of the project, the error that occurred while fetching them,
+            or None if they still need to be fetched
         """
+        if isinstance(cloud_files, BaseException):
+            raise cloud_files
+
         if not local_project_path.exists():
             self._project_manager.create_new_project(local_project_path, project.language)
 
-        cloud_files = self._api_client.files.get_all(project.projectId)
+        if cloud_files is None:
+            cloud_files = self._api_client.files.get_all(project.projectId)
         if encryption_key:
             from lean.components.util.encryption_helper import get_appropriate_files_from_cloud_project
             organization_id = self._organization_manager.try_get_working_organization_id()
@@ -144,8 +144,9 @@ class PushManager:
             cloud_project = self._api_client.projects.create(project_name,
                                                              QCLanguage[project_config.get("algorithm-language")],
                                                              organization_id)
-            project_config.set("cloud-id", cloud_project.projectId)
-            project_config.set("organization-id", cloud_project.organizationId)
+            with project_config.batch():
+                project_config.set("cloud-id", cloud_project.projectId)
+                project_config.set("organization-id", cloud_project.organizationId)
 
             if cloud_project.name != project_name:
                 # cloud project name was changed. Repeat steps to validate the new name locally.
@@ -14,10 +14,12 @@
 from typing import Optional
 
 from lean.components.config.storage import Storage
-from lean.constants import DEFAULT_ENGINE_IMAGE, DEFAULT_RESEARCH_IMAGE
+from lean.components.util.retry_policy import DEFAULT_MAX_RETRIES, DEFAULT_RETRY_BUDGET
+from lean.constants import DEFAULT_ENGINE_IMAGE, DEFAULT_RESEARCH_IMAGE, DEFAULT_DOWNLOAD_SEGMENTS, \
+    DEFAULT_SEGMENTED_DOWNLOAD_THRESHOLD, BULK_DOWNLOAD_MODE_SEGMENTED, BULK_DOWNLOAD_MODE_STREAM
 from lean.models.docker import DockerImage
 from lean.models.errors import MoreInfoError
-from lean.models.options import ChoiceOption, Option
+from lean.models.options import BandwidthScheduleOption, ChoiceOption, IntegerOption, Option
 
 
 class CLIConfigManager:
@@ -65,13 +67,101 @@ class CLIConfigManager:
                                                 False,
                                                 general_storage)
 
+        self.http_pool_size = IntegerOption("http-pool-size",
+                                            "The maximum number of connections kept alive per host when making HTTP "
+                                            "requests. If unset, it equals the number of parallel data downloads.",
+                                            False,
+                                            general_storage,
+                                            min_value=1)
+
+        self.http_keep_alive = ChoiceOption("http-keep-alive",
+                                            "Whether HTTP connections are reused between requests.",
+                                            ["true", "false"],
+                                            False,
+                                            general_storage,
+                                            "true")
+
+        self.http_max_retries = IntegerOption("http-max-retries",
+                                              "The maximum number of times a failed HTTP request is retried "
+                                              f"({DEFAULT_MAX_RETRIES} if not set).",
+                                              False,
+                                              general_storage,
+                                              DEFAULT_MAX_RETRIES,
+                                              min_value=0)
+
+        self.http_retry_budget = IntegerOption("http-retry-budget",
+                                               "The maximum number of HTTP retries a single command may perform "
+                                               f"across all its requests ({DEFAULT_RETRY_BUDGET} if not set).",
+                                               False,
+                                               general_storage,
+                                               DEFAULT_RETRY_BUDGET,
+                                               min_value=0)
+
+        self.download_segments = IntegerOption("download-segments",
+                                               "The number of byte ranges large bulk data files are downloaded in "
+                                               "concurrently, 1 downloads them in a single stream "
+                                               f"({DEFAULT_DOWNLOAD_SEGMENTS} if not set).",
+                                               False,
+                                               general_storage,
+                                               DEFAULT_DOWNLOAD_SEGMENTS,
+                                               min_value=1)
+
+        self.segmented_download_threshold = IntegerOption("segmented-download-threshold",
+                                                          "The size in megabytes above which bulk data files are "
+                                                          "downloaded in multiple byte ranges concurrently "
+                                                          f"({DEFAULT_SEGMENTED_DOWNLOAD_THRESHOLD} if not set).",
+                                                          False,
+                                                          general_storage,
+                                                          DEFAULT_SEGMENTED_DOWNLOAD_THRESHOLD,
+                                                          min_value=0)
+
+        self.bulk_download_mode = ChoiceOption("bulk-download-mode",
+                                               "How bulk data files are downloaded. "
+                                               f"'{BULK_DOWNLOAD_MODE_SEGMENTED}' downloads them to a temporary file "
+                                               "before extracting them, "
+                                               f"'{BULK_DOWNLOAD_MODE_STREAM}' extracts them while they are "
+                                               "downloaded, which needs no temporary disk space "
+                                               f"({BULK_DOWNLOAD_MODE_SEGMENTED} if not set).",
+                                               [BULK_DOWNLOAD_MODE_SEGMENTED, BULK_DOWNLOAD_MODE_STREAM],
+                                               False,
+                                               general_storage,
+                                               BULK_DOWNLOAD_MODE_SEGMENTED)
+
+        self.download_bandwidth_schedule = BandwidthScheduleOption("download-bandwidth-schedule",
+                                                                   "The time-of-day limits of the combined speed of "
+                                                                   "data downloads, as comma-separated windows like "
+                                                                   "09:00-17:30=2,17:30-09:00=unlimited in megabytes "
+                                                                   "per second. Windows may wrap around midnight, times "
+                                                                   "outside all windows are unlimited (unlimited if not "
+                                                                   "set).",
+                                                                   False,
+                                                                   general_storage)
+
+        self.data_store = Option("data-store",
+                                 "The directory in which downloaded data files are shared between workspaces, like "
+                                 "~/.lean/datastore. Data files are hard-linked into the data directories of the "
+                                 "workspaces, so the directory must be on the same file system as them "
+                                 "(data files are not shared if not set). Daily, hour, map and factor files are "
+                                 "always downloaded, other files are shared for up to 7 days after downloading them.",
+                                 False,
+                                 general_storage)
+
         self.all_options = [
             self.user_id,
             self.api_token,
             self.default_language,
             self.engine_image,
             self.research_image,
-            self.database_update_frequency
+            self.database_update_frequency,
+            self.http_pool_size,
+            self.http_keep_alive,
+            self.http_max_retries,
+            self.http_retry_budget,
+            self.download_segments,
+            self.segmented_download_threshold,
+            self.bulk_download_mode,
+            self.download_bandwidth_schedule,
+            self.data_store
         ]
 
     def get_option_by_key(self, key: str) -> Option:
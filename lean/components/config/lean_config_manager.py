@@ -11,19 +11,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from functools import cached_property
 from os.path import normcase, normpath
 from pathlib import Path
-from typing import Any, Dict, Optional, List, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, List, Tuple
 
-from lean.components.cloud.module_manager import ModuleManager
 from lean.components.config.cli_config_manager import CLIConfigManager
 from lean.components.config.project_config_manager import ProjectConfigManager
-from lean.components.config.storage import Storage, safe_save
+from lean.components.config.storage import Storage, update_file
 from lean.components.util.logger import Logger
 from lean.constants import DEFAULT_LEAN_CONFIG_FILE_NAME
 from lean.models.errors import MoreInfoError
 from lean.models.utils import DebuggingMethod
 
+# Every command reads the Lean config, but only few of them need the modules, which talk to the API
+if TYPE_CHECKING:
+    from lean.components.cloud.module_manager import ModuleManager
+
 
 class LeanConfigManager:
     """The LeanConfigManager class contains utilities to work with files containing LEAN engine configuration."""
@@ -32,24 +36,31 @@ class LeanConfigManager:
                  logger: Logger,
                  cli_config_manager: CLIConfigManager,
                  project_config_manager: ProjectConfigManager,
-                 module_manager: ModuleManager,
+                 get_module_manager: Callable[[], "ModuleManager"],
                  cache_storage: Storage) -> None:
         """Creates a new LeanConfigManager instance.
 
         :param logger: the logger to log messages with
         :param cli_config_manager: the CLIConfigManager instance to use when retrieving credentials
         :param project_config_manager: the ProjectConfigManager instance to use when retrieving project parameters
-        :param module_manager: the ModuleManager to use
+        :param get_module_manager: the function returning the ModuleManager to use, called on first use
         :param cache_storage: the Storage instance to store known Lean config paths in
         """
         self._logger = logger
         self._cli_config_manager = cli_config_manager
         self._project_config_manager = project_config_manager
-        self._module_manager = module_manager
+        self._get_module_manager = get_module_manager
         self._cache_storage = cache_storage
         self._default_path = None
         self._lean_config_path = None
 
+        # Parsed Lean config files by path, as the modification time and size of the file and its content as plain JSON
+        self._parsed_config_cache: Dict[Path, Tuple[int, int, str]] = {}
+
+    @cached_property
+    def _module_manager(self) -> "ModuleManager":
+        return self._get_module_manager()
+
     def get_lean_config_path(self) -> Path:
         """Returns the path to the closest Lean config file.
 
@@ -141,19 +152,24 @@ class LeanConfigManager:
         """Sets a properties in the Lean config file.
 
         If a property does not exist yet it is added automatically.
-        Comments in the Lean config file are preserved.
+        The config is read and written while holding a lock shared by all processes,
+        so concurrent updates of different properties are merged instead of lost.
 
         :param updates: the key -> new value updates to apply to the current config
         """
         from json import dumps
 
-        config_path = self.get_lean_config_path()
-        json_config = self.get_lean_config()
+        def apply_updates(content: Optional[str]) -> str:
+            json_config = self.parse_json(content) if content is not None else {}
 
-        for key, value in reversed(list(updates.items())):
-            json_config[key] = value
+            for key, value in reversed(list(updates.items())):
+                json_config[key] = value
 
-        safe_save(path=config_path, data=dumps(json_config, indent=4))
+            return dumps(json_config, indent=4)
+
+        config_path = self.get_lean_config_path()
+        update_file(config_path, apply_updates)
+        self._parsed_config_cache.pop(config_path, None)
 
     def clean_lean_config(self, config: str) -> str:
         """Removes the properties from a Lean config file which can be set in get_complete_lean_config().
@@ -314,38 +330,33 @@ class LeanConfigManager:
     def get_lean_config(self) -> Dict[str, Any]:
         """Reads the Lean config into a dict.
 
-        :return: a dict containing the contents of the Lean config file
+        The file is only parsed again if its modification time or size changed since it was last parsed.
+
+        :return: a dict containing the contents of the Lean config file, which the caller may modify
         """
+        from json import dumps, loads
+
         path = self.get_lean_config_path()
-        content = path.read_text(encoding="utf-8")
-        return self.parse_json(content)
+        stat = path.stat()
+
+        cached = self._parsed_config_cache.get(path)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            # Loading plain JSON is cheap and returns a new dict, so changes by the caller don't affect the cache
+            return loads(cached[2])
+
+        config = self.parse_json(path.read_text(encoding="utf-8"))
+        self._parsed_config_cache[path] = (stat.st_mtime_ns, stat.st_size, dumps(config))
+        return config
 
     def parse_json(self, content) -> Dict[str, Any]:
-        try:
-            from json import loads
-            from re import sub
-
-            # remove multi line or single line comments without double quotes
-            config = sub(r'/\*.*?\*/|//[^\r\n"]*[\r\n]', '', content)
-
-            # let's handle single line comments with double quotes in them
-            new_config = ''
-            for line in config.split('\n'):
-                double_quotes_count = 0
-                previous_element = ''
-                for current_element in line:
-                    if current_element == '/' and double_quotes_count % 2 == 0:
-                        if previous_element == '/':
-                            break
-                    else:
-                        # count not escaped double quotes
-                        if current_element == '"' and previous_element != '\\':
-                            double_quotes_count = double_quotes_count + 1
-                        new_config += current_element
-                    previous_element = current_element
-            result = loads(new_config)
-            return result
+        """Parses a JSON document which may contain comments and trailing commas, like the Lean config.
 
+        :param content: the JSON document to parse
+        :return: the parsed document
+        """
+        try:
+            from lean.components.util.jsonc import loads
+            return loads(content)
         except Exception as e:
             self._logger.error(str(e))
 
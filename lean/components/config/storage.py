@@ -11,46 +11,63 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from threading import RLock
+from typing import Any, Callable, Dict, Iterator, Optional
 
 
-def safe_save(data: str, path: Path, _retry: int = 0):
+def safe_save(data: str, path: Path) -> None:
+    """Atomically replaces the content of a file, serializing writes of concurrent processes.
+
+    :param data: the new content of the file
+    :param path: the path to the file
+    """
+    update_file(path, lambda _: data)
+
+
+def update_file(path: Path, update: Callable[[Optional[str]], Optional[str]]) -> None:
+    """Atomically reads, modifies and writes a file while holding a lock shared by all processes.
+
+    Because the current content is read while holding the lock, concurrent updates of different parts of the file
+    are merged instead of overwriting each other.
+
+    :param path: the path to the file
+    :param update: the function returning the new content given the current content, which is None if the file
+                   doesn't exist, returning None deletes the file
+    """
+    from os import replace
     from uuid import uuid4
-    from shutil import move
-    from os import unlink, path as os_path
-    from time import time, sleep
-
-    # make sure the parent folder exists
-    path.parent.mkdir(parents=True, exist_ok=True)
-
-    lock_file = Path(str(path) + '.lock').resolve()
-    try:
-        with open(lock_file, 'x') as _:
-            # we create a tmp file we will use to write to. This was we avoid concurrency issues corrupting the file
-            tmp_file = Path(str(path) + '.' + str(uuid4())).resolve()
-            with open(tmp_file, "w+", encoding="utf-8") as targetFile:
-                targetFile.write(data)
-
-            # atomic move when on the same filesystem which is this case, they are side by side
-            move(tmp_file, path)
-        unlink(lock_file)
-    except FileExistsError:
-        try:
-            # lock is taken, delete if old, else wait and retry
-            if time() - os_path.getmtime(lock_file) >= 2:
-                unlink(lock_file)
-            else:
-                sleep(0.250)
-        except:
-            # some else might have deleted it
-            pass
-        if _retry < 10:
-            safe_save(data, path, ++_retry)
+
+    from lean.components.util.file_lock import FileLock
+
+    path = path.resolve()
+
+    with FileLock(path):
+        current = path.read_text(encoding="utf-8") if path.is_file() else None
+        new = update(current)
+
+        if new is None:
+            path.unlink(missing_ok=True)
+            return
+
+        # The new content is written to a temporary file first, so readers never see a partially written file
+        tmp_file = path.parent / f"{path.name}.{uuid4()}"
+        with open(tmp_file, "w+", encoding="utf-8") as file:
+            file.write(new)
+        replace(tmp_file, path)
+
+
+# The value of a pending change which deletes a key
+_DELETED = object()
 
 
 class Storage:
-    """A Storage instance manages the data in a single JSON file."""
+    """A Storage instance manages the data in a single JSON file.
+
+    Saving merges the changes made through this instance into the current content of the file, so multiple processes
+    changing different keys of the same file don't overwrite each other's changes.
+    """
 
     def __init__(self, file: str) -> None:
         """Creates a new Storage instance.
@@ -61,6 +78,17 @@ class Storage:
 
         self.file = Path(file)
 
+        # Background housekeeping tasks may update the same storage while a command runs
+        self._lock = RLock()
+
+        # The amount of batches that are currently open, changes are only saved when the outermost batch ends
+        self._batch_depth = 0
+        self._batch_dirty = False
+
+        # The changes which haven't been saved yet, and whether the file was cleared before them
+        self._pending_changes: Dict[str, Any] = {}
+        self._pending_clear = False
+
         if self.file.exists():
             try:
                 content = self.file.read_text(encoding="utf-8")
@@ -104,16 +132,52 @@ class Storage:
         :param key: the key to assign the value to
         :param value: the json-serializable value to assign to the given key
         """
-        self._data[key] = value
-        self._save()
+        with self._lock:
+            self._data[key] = value
+            self._pending_changes[key] = value
+            self._save()
 
     def delete(self, key: str) -> None:
         """Deletes a key.
 
         :param key: the key to delete
         """
-        self._data.pop(key, None)
-        self._save()
+        with self._lock:
+            self._data.pop(key, None)
+            self._pending_changes[key] = _DELETED
+            self._save()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Groups multiple changes into a single write of the underlying file.
+
+        Changes made while the context is active are saved at once when it ends. If the context raises an error,
+        all changes made in it are discarded instead. Batches may be nested, only the outermost batch saves.
+        Other threads wait while a batch is active, so they never see its changes partially applied.
+        """
+        with self._lock:
+            if self._batch_depth > 0:
+                self._batch_depth += 1
+                try:
+                    yield
+                finally:
+                    self._batch_depth -= 1
+                return
+
+            snapshot = (dict(self._data), dict(self._pending_changes), self._pending_clear)
+            self._batch_depth = 1
+            self._batch_dirty = False
+            try:
+                yield
+            except BaseException:
+                self._data, self._pending_changes, self._pending_clear = snapshot
+                raise
+            finally:
+                self._batch_depth = 0
+
+            if self._batch_dirty:
+                self._batch_dirty = False
+                self._save()
 
     def has(self, key: str) -> bool:
         """Returns whether the Storage instance has a value assigned to the given key.
@@ -125,15 +189,46 @@ class Storage:
 
     def clear(self) -> None:
         """Clears the Storage instance and deletes the underlying file."""
-        self._data.clear()
-        self._save()
+        with self._lock:
+            self._data.clear()
+            self._pending_changes.clear()
+            self._pending_clear = True
+            self._save()
 
     def _save(self) -> None:
-        from json import dumps
+        """Merges the pending changes into the underlying file, deleting the file if there is no data left."""
+        if self._batch_depth > 0:
+            self._batch_dirty = True
+            return
 
-        """Saves the data to the underlying file, deleting the file if there is no data."""
-        if len(self._data) > 0:
-            safe_save(data=dumps(self._data, indent=4) + "\n", path=self.file.resolve())
-        else:
-            if self.file.exists():
-                self.file.unlink()
+        update_file(self.file, self._merge_pending_changes)
+        self._pending_changes.clear()
+        self._pending_clear = False
+
+    def _merge_pending_changes(self, content: Optional[str]) -> Optional[str]:
+        """Applies the pending changes to the current content of the underlying file.
+
+        :param content: the current content of the file, None if it doesn't exist
+        :return: the new content of the file, None if the file should be deleted
+        """
+        from json import dumps, loads
+
+        data = {}
+        if content and not self._pending_clear:
+            try:
+                data = loads(content)
+            except ValueError:
+                # The file got corrupted, the data of this instance is the best we have
+                data = dict(self._data)
+
+        for key, value in self._pending_changes.items():
+            if value is _DELETED:
+                data.pop(key, None)
+            else:
+                data[key] = value
+
+        self._data = data
+
+        if len(data) == 0:
+            return None
+        return dumps(data, indent=4) + "\n"
@@ -90,9 +90,15 @@ class LeanRunner:
         :param extra_docker_config: additional docker configurations
         :param paths_to_mount: additional paths to mount to the container
         """
-        self._logger.debug(f'LeanRunner().run_lean: lean_config: {lean_config}')
+        self._logger.debug("LeanRunner().run_lean: lean_config: {}", lean_config)
         project_dir = algorithm_file.parent
 
+        from lean.constants import HOUSEKEEPING_TASK_DATABASE_FILES
+        from lean.container import container
+
+        # LEAN reads the market hours and symbol properties databases, which may still be updating in the background
+        container.housekeeping_manager.wait(HOUSEKEEPING_TASK_DATABASE_FILES)
+
         # The dict containing all options passed to `docker run`
         # See all available options at https://docker-py.readthedocs.io/en/stable/containers.html
         run_options = self.get_basic_docker_config(lean_config,
@@ -332,13 +338,14 @@ class LeanRunner:
 
         if output_dir:
             output_config = self._output_config_manager.get_output_config(output_dir)
-            output_config.set("container", run_options["name"])
-            if "backtest-name" in lean_config:
-                output_config.set("backtest-name", lean_config["backtest-name"])
-            if "environment" in lean_config and "environments" in lean_config:
-                environment = lean_config["environments"][lean_config["environment"]]
-                if "live-mode-brokerage" in environment:
-                    output_config.set("brokerage", environment["live-mode-brokerage"].split(".")[-1])
+            with output_config.batch():
+                output_config.set("container", run_options["name"])
+                if "backtest-name" in lean_config:
+                    output_config.set("backtest-name", lean_config["backtest-name"])
+                if "environment" in lean_config and "environments" in lean_config:
+                    environment = lean_config["environments"][lean_config["environment"]]
+                    if "live-mode-brokerage" in environment:
+                        output_config.set("brokerage", environment["live-mode-brokerage"].split(".")[-1])
 
     def _setup_installed_packages(self, run_options: Dict[str, Any], image: DockerImage,
                                   lean_config: Dict[str, Any], target_path: str = "/Lean/Launcher/bin/Debug"):
@@ -861,6 +868,8 @@ for library_id, library_data in project_assets["targets"][project_target].items(
         """
         from re import sub
         from datetime import datetime
+        from itertools import chain
+        from lean.components.util.data_inventory import DataInventory
 
         if lean_config.get(config_key, None) != zip_provider:
             return
@@ -868,8 +877,15 @@ for library_id, library_data in project_assets["targets"][project_target].items(
         # Keep the zip provider as long as any market has a recent map/factor file zip: the disk
         # provider only reads loose csv, so downgrading would silently drop zip-shipped files (e.g.
         # futures map files). We only need to know a recent zip exists, so we stop at the first one.
+        # The zips in the data inventory are checked first, so the data directory is usually not walked at all.
+        # The inventory is not created here, and a data directory which was changed outside the CLI
+        # still falls back to walking the data directory.
+        pattern = f"*/*/{auxiliary_dir_name}/*.zip"
+        with DataInventory(self._logger, data_dir, create=False) as inventory:
+            indexed_zip_files = [data_dir / entry.path for entry in inventory.find_files(pattern)]
+
         now = datetime.now()
-        for zip_file in data_dir.glob(f"*/*/{auxiliary_dir_name}/*.zip"):
+        for zip_file in chain((file for file in indexed_zip_files if file.is_file()), data_dir.glob(pattern)):
             try:
                 zip_date = datetime.strptime(sub(r"[^\d]", "", zip_file.name), "%Y%m%d")
             except ValueError:
@@ -12,7 +12,7 @@
 # limitations under the License.
 
 from lean.models.api import QCAuth0Authorization
-from lean.components.api.api_client import Auth0Client
+from lean.components.api.auth0_client import Auth0Client
 from lean.components.util.logger import Logger
 
 
@@ -0,0 +1,165 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime, time
+from threading import Lock
+from typing import Callable, List, NamedTuple, Optional
+
+
+class _BandwidthWindow(NamedTuple):
+    start: time
+    end: time
+    bytes_per_second: Optional[float]
+
+    def contains(self, moment: time) -> bool:
+        if self.start <= self.end:
+            return self.start <= moment < self.end
+
+        # The window wraps around midnight
+        return moment >= self.start or moment < self.end
+
+
+class BandwidthSchedule:
+    """The BandwidthSchedule class contains download speed limits which depend on the time of day.
+
+    A schedule is written as comma-separated windows like "09:00-17:30=2,17:30-09:00=unlimited", in which every window
+    limits the download speed to a number of megabytes per second between two local times. Windows may wrap around
+    midnight, the first window containing the current time applies and times outside all windows are unlimited.
+    """
+
+    def __init__(self, windows: List[_BandwidthWindow]) -> None:
+        """Creates a new BandwidthSchedule instance.
+
+        :param windows: the windows of the schedule, in order of precedence
+        """
+        self._windows = windows
+
+    @staticmethod
+    def parse(value: str) -> "BandwidthSchedule":
+        """Parses a schedule.
+
+        :param value: the schedule to parse, like "09:00-17:30=2,17:30-09:00=unlimited"
+        :return: the parsed schedule
+        """
+        windows = []
+
+        for window in value.split(","):
+            try:
+                times, limit = window.split("=")
+                start, end = times.split("-")
+                start = datetime.strptime(start.strip(), "%H:%M").time()
+                end = datetime.strptime(end.strip(), "%H:%M").time()
+
+                limit = limit.strip().lower()
+                bytes_per_second = None if limit == "unlimited" else float(limit) * 1024 * 1024
+            except ValueError:
+                raise ValueError(f"Invalid bandwidth window '{window.strip()}', "
+                                 "the format is HH:MM-HH:MM=<megabytes per second or unlimited>")
+
+            if bytes_per_second is not None and bytes_per_second <= 0:
+                raise ValueError(f"Invalid bandwidth window '{window.strip()}', the limit must be positive")
+
+            windows.append(_BandwidthWindow(start, end, bytes_per_second))
+
+        return BandwidthSchedule(windows)
+
+    def get_limit(self, moment: datetime) -> Optional[float]:
+        """Returns the download speed limit at a given moment.
+
+        :param moment: the local date and time to get the limit at
+        :return: the maximum download speed in bytes per second, None if it is unlimited
+        """
+        moment = moment.time()
+        return next((window.bytes_per_second for window in self._windows if window.contains(moment)), None)
+
+
+class BandwidthLimiter:
+    """The BandwidthLimiter class caps the combined throughput of concurrent transfers using a token bucket.
+
+    Transfers call consume() after receiving a chunk, which sleeps for as long as the transfers are ahead of the cap.
+    If a schedule is given the cap follows the time of day, the lowest of the fixed cap and the scheduled cap applies.
+    """
+
+    def __init__(self,
+                 bytes_per_second: Optional[float],
+                 schedule: Optional[BandwidthSchedule] = None,
+                 clock: Optional[Callable[[], float]] = None,
+                 sleep: Optional[Callable[[float], None]] = None,
+                 now: Optional[Callable[[], datetime]] = None) -> None:
+        """Creates a new BandwidthLimiter instance.
+
+        :param bytes_per_second: the maximum combined throughput in bytes per second, None to only follow the schedule
+        :param schedule: the schedule containing the time-of-day limits, None if there is no schedule
+        :param clock: the function returning the current monotonic time, defaults to time.monotonic
+        :param sleep: the function to wait with, defaults to time.sleep
+        :param now: the function returning the current local date and time, defaults to datetime.now
+        """
+        if clock is None:
+            from time import monotonic
+            clock = monotonic
+        if sleep is None:
+            from time import sleep
+
+        self._fixed_bytes_per_second = bytes_per_second
+        self._schedule = schedule
+        self._clock = clock
+        self._sleep = sleep
+        self._now = now or datetime.now
+
+        self._bytes_per_second = self._get_limit()
+
+        # Up to one second of bandwidth may be used in a burst
+        self._tokens = self._bytes_per_second or 0.0
+        self._last_refill = clock()
+        self._lock = Lock()
+
+    def consume(self, amount: int) -> None:
+        """Registers that an amount of bytes has been transferred, waiting if the cap has been exceeded.
+
+        :param amount: the amount of transferred bytes
+        """
+        with self._lock:
+            now = self._clock()
+
+            bytes_per_second = self._get_limit()
+            if bytes_per_second is None:
+                self._bytes_per_second = None
+                self._last_refill = now
+                return
+
+            if self._bytes_per_second is None:
+                # The cap starts now, transfers may use a full burst of the new cap
+                self._tokens = bytes_per_second
+            else:
+                self._tokens += (now - self._last_refill) * bytes_per_second
+
+            self._bytes_per_second = bytes_per_second
+            self._tokens = min(bytes_per_second, self._tokens)
+            self._last_refill = now
+            self._tokens -= amount
+            delay = -self._tokens / bytes_per_second if self._tokens < 0 else 0.0
+
+        if delay > 0:
+            self._sleep(delay)
+
+    def _get_limit(self) -> Optional[float]:
+        """Returns the cap which currently applies.
+
+        :return: the maximum combined throughput in bytes per second, None if it is currently unlimited
+        """
+        limits = [self._fixed_bytes_per_second]
+        if self._schedule is not None:
+            limits.append(self._schedule.get_limit(self._now()))
+
+        limits = [limit for limit in limits if limit is not None]
+        return min(limits) if len(limits) > 0 else None
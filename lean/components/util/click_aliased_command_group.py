@@ -11,7 +11,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, Callable, Optional, Union, overload
+from typing import Any, Callable, List, Optional, Union, overload
 
 from click import Command, Context, Group, UsageError
 
@@ -32,19 +32,29 @@ class AliasedCommandGroup(Group):
         if rv is not None:
             return rv
 
-        matches = []
-        for name in self.list_commands(ctx):
-            command = super().get_command(ctx, name)
-            if command is not None and not command.hidden and name.startswith(cmd_name):
-                matches.append(name)
+        matches = self._get_prefix_matches(ctx, cmd_name)
 
         if not matches:
             return None
         elif len(matches) == 1:
-            return super().get_command(ctx, matches[0])
+            return self.get_command(ctx, matches[0])
 
         raise AmbiguousCommandError(f"Too many matches: {', '.join(sorted(matches))}", ctx)
 
+    def _get_prefix_matches(self, ctx: Context, prefix: str) -> List[str]:
+        """Returns the names of the visible commands starting with the given prefix.
+
+        :param ctx: the click context
+        :param prefix: the prefix the user typed
+        :return: the names of the matching commands
+        """
+        matches = []
+        for name in self.commands:
+            command = super().get_command(ctx, name)
+            if command is not None and not command.hidden and name.startswith(prefix):
+                matches.append(name)
+        return matches
+
     @overload
     def command(self, __func: CommandCallback) -> Command:
         ...
@@ -0,0 +1,97 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict, List, NamedTuple, Optional
+
+from click import Command, Context, HelpFormatter
+
+from lean.components.util.click_aliased_command_group import AliasedCommandGroup
+
+
+class LazyCommand(NamedTuple):
+    """The LazyCommand class describes a command of which the module has not been imported yet."""
+
+    # The path to the command, like "lean.commands.backtest:backtest"
+    import_path: str
+
+    # The help text shown for the command in the help of its group
+    short_help: str
+
+
+class LazyCommandGroup(AliasedCommandGroup):
+    """An AliasedCommandGroup which only imports the modules of its commands when they are needed.
+
+    A command registered with add_lazy_command() is imported when it is invoked or when its own help is rendered.
+    The help of the group itself is rendered from the registered help texts, so it doesn't import any command.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._lazy_commands: Dict[str, LazyCommand] = {}
+
+    def add_lazy_command(self, name: str, import_path: str, short_help: str) -> None:
+        """Registers a command which is imported the first time it is needed.
+
+        :param name: the name of the command
+        :param import_path: the module containing the command and the name of the command in it, separated by a colon
+        :param short_help: the help text to show for the command in the help of this group
+        """
+        self._lazy_commands[name] = LazyCommand(import_path, short_help)
+
+    def list_commands(self, ctx: Context) -> List[str]:
+        return sorted(set(self.commands) | set(self._lazy_commands))
+
+    def get_command(self, ctx: Context, cmd_name: str) -> Optional[Command]:
+        if cmd_name in self._lazy_commands and cmd_name not in self.commands:
+            self._load_command(cmd_name)
+
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx: Context, formatter: HelpFormatter) -> None:
+        # Mirrors Group.format_commands, but uses placeholder commands for the commands which are not imported yet
+        # The placeholders shorten the registered help texts exactly like click shortens the help of real commands
+        commands = []
+        for name in self.list_commands(ctx):
+            command = self.commands.get(name)
+            if command is None:
+                command = Command(name, help=self._lazy_commands[name].short_help)
+            if not command.hidden:
+                commands.append((name, command))
+
+        if len(commands) == 0:
+            return
+
+        limit = formatter.width - 6 - max(len(name) for name, _ in commands)
+        with formatter.section("Commands"):
+            formatter.write_dl([(name, command.get_short_help_str(limit)) for name, command in commands])
+
+    def _get_prefix_matches(self, ctx: Context, prefix: str) -> List[str]:
+        # Lazy commands are never hidden, so they can be matched without importing them
+        matches = super()._get_prefix_matches(ctx, prefix)
+        matches.extend(name for name in self._lazy_commands
+                       if name not in self.commands and name.startswith(prefix))
+        return matches
+
+    def _load_command(self, name: str) -> None:
+        """Imports a lazy command and adds it to this group.
+
+        :param name: the name of the command to load
+        """
+        from importlib import import_module
+
+        module_name, attribute = self._lazy_commands[name].import_path.split(":")
+        module = import_module(module_name)
+
+        # Commands registered with an alias add themselves to this group when their module is imported
+        if name not in self.commands:
+            self.add_command(getattr(module, attribute), name)
@@ -0,0 +1,150 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from threading import Condition
+from typing import Any, Callable, Dict, Optional
+
+from lean.components.util.logger import Logger
+
+
+class ConcurrencyController:
+    """The ConcurrencyController class limits the amount of concurrent transfers using AIMD.
+
+    The limit is adjusted at the end of every measurement window, based on the throughput in that window:
+    - additive increase: the limit grows by one while the throughput keeps improving
+    - additive decrease: the limit shrinks by one when the throughput drops, because the extra transfers didn't help
+    - multiplicative decrease: the limit is halved when transfers were retried or failed, for example because
+      the server responded with 429 Too Many Requests
+    """
+
+    def __init__(self,
+                 logger: Logger,
+                 initial_limit: int,
+                 max_limit: int,
+                 max_bytes_per_second: Optional[float] = None,
+                 window_seconds: float = 2.0,
+                 clock: Optional[Callable[[], float]] = None) -> None:
+        """Creates a new ConcurrencyController instance.
+
+        :param logger: the logger to log limit changes with
+        :param initial_limit: the amount of concurrent transfers to start with
+        :param max_limit: the maximum amount of concurrent transfers
+        :param max_bytes_per_second: the throughput above which the limit isn't increased anymore, None for no cap
+        :param window_seconds: the duration of a single measurement window
+        :param clock: the function returning the current monotonic time, defaults to time.monotonic
+        """
+        if clock is None:
+            from time import monotonic
+            clock = monotonic
+
+        self._logger = logger
+        self._max_limit = max(1, max_limit)
+        self._max_bytes_per_second = max_bytes_per_second
+        self._window_seconds = window_seconds
+        self._clock = clock
+
+        self._condition = Condition()
+        self._limit = min(max(1, initial_limit), self._max_limit)
+        self._in_flight = 0
+
+        self._window_start = clock()
+        self._window_bytes = 0
+        self._window_errors = 0
+        self._previous_throughput: Optional[float] = None
+
+        self._lowest_limit = self._limit
+        self._highest_limit = self._limit
+
+    @property
+    def limit(self) -> int:
+        """Returns the current maximum amount of concurrent transfers.
+
+        :return: the amount of transfers that may run at the same time
+        """
+        with self._condition:
+            return self._limit
+
+    def acquire(self) -> None:
+        """Waits until a new transfer may start and registers it as in-flight."""
+        with self._condition:
+            while self._in_flight >= self._limit:
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self) -> None:
+        """Registers that an in-flight transfer has finished, successfully or not."""
+        with self._condition:
+            self._in_flight -= 1
+            self._adjust()
+            self._condition.notify_all()
+
+    def record_bytes(self, amount: int) -> None:
+        """Records that an amount of bytes has been transferred.
+
+        :param amount: the amount of transferred bytes
+        """
+        with self._condition:
+            self._window_bytes += amount
+            self._adjust()
+
+    def record_error(self) -> None:
+        """Records that a transfer was retried or failed, which is treated as a sign of congestion."""
+        with self._condition:
+            self._window_errors += 1
+            self._adjust()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns the range of limits the controller has used.
+
+        :return: a dict containing the current, lowest and highest limit
+        """
+        with self._condition:
+            return {
+                "limit": self._limit,
+                "lowestLimit": self._lowest_limit,
+                "highestLimit": self._highest_limit,
+                "maxLimit": self._max_limit
+            }
+
+    def _adjust(self) -> None:
+        """Adjusts the limit if the current measurement window is over, must be called while holding the lock."""
+        now = self._clock()
+        elapsed = now - self._window_start
+        if elapsed < self._window_seconds:
+            return
+
+        throughput = self._window_bytes / elapsed
+        previous_throughput = self._previous_throughput
+        new_limit = self._limit
+
+        if self._window_errors > 0:
+            new_limit = max(1, self._limit // 2)
+        elif self._max_bytes_per_second is not None and throughput >= self._max_bytes_per_second:
+            pass
+        elif previous_throughput is None or throughput >= previous_throughput * 1.05:
+            new_limit = min(self._max_limit, self._limit + 1)
+        elif throughput <= previous_throughput * 0.9:
+            new_limit = max(1, self._limit - 1)
+
+        if new_limit != self._limit:
+            self._logger.debug("Changing the download concurrency from {} to {} ({:,.0f} B/s, {} errors)",
+                               self._limit, new_limit, throughput, self._window_errors)
+            self._limit = new_limit
+            self._lowest_limit = min(self._lowest_limit, new_limit)
+            self._highest_limit = max(self._highest_limit, new_limit)
+            self._condition.notify_all()
+
+        self._previous_throughput = throughput
+        self._window_start = now
+        self._window_bytes = 0
+        self._window_errors = 0
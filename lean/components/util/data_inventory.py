@@ -0,0 +1,458 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from lean.components.util.logger import Logger
+from lean.constants import DATA_INVENTORY_FILE_NAME
+
+# The version of the schema of the inventory database, a database with another version is rebuilt from scratch
+_SCHEMA_VERSION = 1
+
+# The maximum amount of parameters passed to a single query, SQLite limits this to 999 in older versions
+_QUERY_BATCH_SIZE = 500
+
+# The amount of seconds to wait for another process to release its lock on the database
+_BUSY_TIMEOUT_SECONDS = 5
+
+# The allowed difference between the modification time in the inventory and on disk,
+# file systems like FAT and some network file systems only store modification times with a limited precision
+_MTIME_TOLERANCE_SECONDS = 2
+
+
+class InventoryEntry(NamedTuple):
+    """A single file in the data inventory."""
+    path: str
+    size: int
+    mtime: float
+    hash: Optional[str]
+    vendor: Optional[str]
+    downloaded_at: Optional[float]
+
+
+class RescanResult(NamedTuple):
+    """The changes made to the data inventory by a rescan of the data directory."""
+    files: int
+    added: int
+    updated: int
+    removed: int
+
+
+class DataInventory:
+    """The DataInventory class keeps a persistent index of the files in a local data directory.
+
+    The index is an SQLite database in the root of the data directory. It records the path relative to the data
+    directory, the size, the modification time, an optional md5 hash, the vendor and the download time of every file.
+    It is updated incrementally when files are downloaded, and can be brought in sync with the data directory by
+    rescanning the data directory, so files can be looked up in bulk instead of one at a time on the file system.
+
+    The inventory is a cache, if the database can't be opened or is corrupted the inventory behaves as if it is empty.
+    Every write is committed right away, so multiple processes downloading into the same data directory only lock
+    the database for the duration of a single write. When the database stays locked by another process anyway,
+    reads behave as if the inventory is empty and writes are skipped.
+    """
+
+    def __init__(self, logger: Logger, data_directory: Path, create: bool = True) -> None:
+        """Creates a new DataInventory instance.
+
+        :param logger: the logger to use
+        :param data_directory: the path to the data directory to keep an index of
+        :param create: whether the database should be created if it doesn't exist yet
+        """
+        self._logger = logger
+        self._data_directory = data_directory
+        self._database_path = data_directory / DATA_INVENTORY_FILE_NAME
+        self._create = create
+        self._lock = Lock()
+        self._connection: Optional[Any] = None
+        self._opened = False
+
+    def __enter__(self) -> "DataInventory":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the database."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+            self._opened = False
+
+    def is_empty(self) -> bool:
+        """Returns whether the inventory contains no files, for example because the data directory was never indexed.
+
+        :return: True if the inventory doesn't contain any files, False if it does
+        """
+        import sqlite3
+
+        with self._lock:
+            connection = self._get_connection()
+            if connection is None:
+                return True
+
+            try:
+                return connection.execute("SELECT 1 FROM files LIMIT 1").fetchone() is None
+            except sqlite3.OperationalError as error:
+                self._log_unavailable(error)
+                return True
+
+    def record_file(self,
+                    relative_path: str,
+                    vendor: Optional[str] = None,
+                    file_hash: Optional[str] = None) -> None:
+        """Records a file which has just been written to the data directory.
+
+        :param relative_path: the path of the file relative to the data directory
+        :param vendor: the name of the vendor the file was downloaded from, None if unknown
+        :param file_hash: the md5 hash of the file, None if unknown
+        """
+        from time import time
+
+        try:
+            stat = (self._data_directory / relative_path).stat()
+        except OSError:
+            return
+
+        self._upsert([(self._normalize(relative_path), stat.st_size, stat.st_mtime, file_hash, vendor, time())])
+
+    def record_files(self, relative_paths: Iterable[str], vendor: Optional[str] = None) -> None:
+        """Records multiple files which have just been written to the data directory, like the files in a bulk file.
+
+        :param relative_paths: the paths of the files relative to the data directory
+        :param vendor: the name of the vendor the files were downloaded from, None if unknown
+        """
+        from time import time
+
+        rows = []
+        now = time()
+        for relative_path in relative_paths:
+            try:
+                stat = (self._data_directory / relative_path).stat()
+            except OSError:
+                continue
+            rows.append((self._normalize(relative_path), stat.st_size, stat.st_mtime, None, vendor, now))
+
+        self._upsert(rows)
+
+    def get_files(self, relative_paths: Iterable[str]) -> Dict[str, InventoryEntry]:
+        """Returns the inventory entries of multiple files at once.
+
+        :param relative_paths: the paths of the files relative to the data directory
+        :return: the inventory entries by relative path, files which are not in the inventory are omitted
+        """
+        import sqlite3
+
+        paths = list({self._normalize(path) for path in relative_paths})
+        entries = {}
+
+        with self._lock:
+            connection = self._get_connection()
+            if connection is None:
+                return entries
+
+            try:
+                for start in range(0, len(paths), _QUERY_BATCH_SIZE):
+                    batch = paths[start:start + _QUERY_BATCH_SIZE]
+                    rows = connection.execute("SELECT path, size, mtime, hash, vendor, downloaded_at FROM files "
+                                              f"WHERE path IN ({','.join('?' * len(batch))})", batch)
+                    for row in rows:
+                        entries[row[0]] = InventoryEntry(*row)
+            except sqlite3.OperationalError as error:
+                self._log_unavailable(error)
+                return {}
+
+        return entries
+
+    def get_existing_files(self, relative_paths: Iterable[str]) -> Set[str]:
+        """Returns which of the given files exist completely in the data directory.
+
+        Every directory containing one of the files is listed once, instead of checking every file separately.
+        A file which is in the inventory only exists completely if its size still matches, so files which were
+        truncated after they were recorded are considered missing. The modification time is not compared,
+        because copying a data directory changes it and downloading a file again costs QCC.
+        A file which is not in the inventory yet exists if it's on disk, and is added to the inventory.
+
+        :param relative_paths: the paths of the files relative to the data directory
+        :return: the normalized relative paths of the files which exist completely
+        """
+        from os import scandir
+
+        paths = {self._normalize(path) for path in relative_paths}
+        entries = self.get_files(paths)
+
+        paths_by_directory: Dict[str, List[str]] = {}
+        for path in paths:
+            directory, _, _ = path.rpartition("/")
+            paths_by_directory.setdefault(directory, []).append(path)
+
+        existing_files = set()
+        new_rows = []
+        for directory, directory_paths in paths_by_directory.items():
+            try:
+                with scandir(self._data_directory / directory) as iterator:
+                    listing = {item.name: item for item in iterator}
+            except OSError:
+                continue
+
+            for path in directory_paths:
+                item = listing.get(path.rpartition("/")[2])
+                if item is None:
+                    continue
+
+                try:
+                    stat = item.stat()
+                except OSError:
+                    continue
+
+                entry = entries.get(path)
+                if entry is None:
+                    existing_files.add(path)
+                    new_rows.append((path, stat.st_size, stat.st_mtime, None, None, None))
+                elif entry.size == stat.st_size:
+                    existing_files.add(path)
+
+        if len(new_rows) > 0:
+            self._upsert(new_rows)
+
+        return existing_files
+
+    def find_files(self, pattern: str) -> List[InventoryEntry]:
+        """Returns all files in the inventory matching a glob pattern.
+
+        The pattern is matched like Path.glob() does, "*" never matches across directories.
+
+        :param pattern: the glob pattern relative to the data directory, like "*/*/map_files/*.zip"
+        :return: the inventory entries of all matching files
+        """
+        import sqlite3
+        from fnmatch import fnmatchcase
+
+        pattern_parts = pattern.split("/")
+
+        with self._lock:
+            connection = self._get_connection()
+            if connection is None:
+                return []
+
+            # SQLite's GLOB does match across directories, so it only pre-filters the candidates
+            try:
+                rows = connection.execute("SELECT path, size, mtime, hash, vendor, downloaded_at FROM files "
+                                          "WHERE path GLOB ?", (pattern,)).fetchall()
+            except sqlite3.OperationalError as error:
+                self._log_unavailable(error)
+                return []
+
+        matches = []
+        for row in rows:
+            path_parts = row[0].split("/")
+            if len(path_parts) == len(pattern_parts) \
+                    and all(fnmatchcase(part, pattern_part) for part, pattern_part in zip(path_parts, pattern_parts)):
+                matches.append(InventoryEntry(*row))
+
+        return matches
+
+    def rescan(self, compute_hashes: bool = False) -> RescanResult:
+        """Brings the inventory in sync with the files in the data directory.
+
+        Only files which are new or of which the size or modification time changed are updated,
+        files which no longer exist are removed from the inventory.
+
+        :param compute_hashes: True to compute the md5 hash of files which are new, changed or don't have a hash yet
+        :return: the amount of files in the data directory and the amount of added, updated and removed entries
+        """
+        entries = {entry.path: entry for entry in self._get_all_files()}
+
+        added = []
+        updated = []
+        seen = set()
+        for path, size, mtime in self._walk():
+            seen.add(path)
+            entry = entries.get(path)
+            if entry is not None and self._matches(entry, size, mtime) and (entry.hash is not None or not compute_hashes):
+                continue
+
+            file_hash = self._hash_file(path) if compute_hashes else None
+            if entry is None:
+                added.append((path, size, mtime, file_hash, None, None))
+            else:
+                updated.append((path, size, mtime, file_hash, entry.vendor, entry.downloaded_at))
+
+        removed = [path for path in entries.keys() if path not in seen]
+
+        self._upsert(added + updated)
+        self._write("DELETE FROM files WHERE path = ?", [(path,) for path in removed])
+
+        return RescanResult(len(seen), len(added), len(updated), len(removed))
+
+    def _get_all_files(self) -> List[InventoryEntry]:
+        import sqlite3
+
+        with self._lock:
+            connection = self._get_connection()
+            if connection is None:
+                return []
+
+            try:
+                rows = connection.execute("SELECT path, size, mtime, hash, vendor, downloaded_at FROM files").fetchall()
+            except sqlite3.OperationalError as error:
+                self._log_unavailable(error)
+                return []
+
+        return [InventoryEntry(*row) for row in rows]
+
+    def _walk(self) -> Iterable[Tuple[str, int, float]]:
+        """Yields all files in the data directory, except for the inventory itself and temporary files.
+
+        :return: the relative path, size and modification time of every file
+        """
+        from os import scandir
+
+        directories = [("", self._data_directory)]
+        while len(directories) > 0:
+            relative_directory, directory = directories.pop()
+            try:
+                with scandir(directory) as iterator:
+                    items = list(iterator)
+            except OSError:
+                continue
+
+            for item in items:
+                relative_path = f"{relative_directory}{item.name}"
+                if item.is_dir(follow_symlinks=False):
+                    directories.append((f"{relative_path}/", Path(item.path)))
+                    continue
+
+                if item.name.startswith(DATA_INVENTORY_FILE_NAME) or item.name.endswith((".part", ".part.json")):
+                    continue
+
+                try:
+                    stat = item.stat()
+                except OSError:
+                    continue
+
+                yield relative_path, stat.st_size, stat.st_mtime
+
+    def _hash_file(self, relative_path: str) -> Optional[str]:
+        from hashlib import md5
+
+        file_hash = md5()
+        try:
+            with (self._data_directory / relative_path).open("rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    file_hash.update(chunk)
+        except OSError:
+            return None
+
+        return file_hash.hexdigest()
+
+    def _matches(self, entry: InventoryEntry, size: int, mtime: float) -> bool:
+        return entry.size == size and abs(entry.mtime - mtime) <= _MTIME_TOLERANCE_SECONDS
+
+    def _normalize(self, relative_path: str) -> str:
+        return str(relative_path).replace("\\", "/").strip("/")
+
+    def _upsert(self, rows: List[Tuple[str, int, float, Optional[str], Optional[str], Optional[float]]]) -> None:
+        """Inserts or replaces inventory entries.
+
+        :param rows: the path, size, mtime, hash, vendor and download time of the entries to write
+        """
+        self._write("INSERT OR REPLACE INTO files (path, size, mtime, hash, vendor, downloaded_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def _write(self, query: str, rows: List[Tuple[Any, ...]]) -> None:
+        """Executes a query for every row in a single transaction which is committed right away.
+
+        The transaction is rolled back and the rows are not written if the database is locked by another process.
+
+        :param query: the query to execute
+        :param rows: the parameters of the query for every row
+        """
+        if len(rows) == 0:
+            return
+
+        import sqlite3
+
+        with self._lock:
+            connection = self._get_connection()
+            if connection is None:
+                return
+
+            try:
+                with connection:
+                    connection.executemany(query, rows)
+            except sqlite3.OperationalError as error:
+                self._log_unavailable(error)
+
+    def _log_unavailable(self, error: Exception) -> None:
+        self._logger.debug(f"Could not use the data inventory at {self._database_path}: {error}")
+
+    def _get_connection(self) -> Optional[Any]:
+        """Returns the connection to the database, opening it if necessary. Must be called while holding the lock.
+
+        :return: the connection to the database, or None if the database can't be used
+        """
+        if self._opened:
+            return self._connection
+        self._opened = True
+
+        if not self._create and not self._database_path.is_file():
+            return None
+
+        import sqlite3
+
+        for attempt in range(2):
+            connection = None
+            try:
+                self._database_path.parent.mkdir(parents=True, exist_ok=True)
+
+                # The connection is shared by the download threads, access to it is serialized by the lock
+                connection = sqlite3.connect(str(self._database_path),
+                                             timeout=_BUSY_TIMEOUT_SECONDS,
+                                             check_same_thread=False)
+                version = connection.execute("PRAGMA user_version").fetchone()[0]
+                if version != _SCHEMA_VERSION:
+                    connection.execute("DROP TABLE IF EXISTS files")
+                    connection.execute("""
+                        CREATE TABLE files (
+                            path TEXT PRIMARY KEY,
+                            size INTEGER NOT NULL,
+                            mtime REAL NOT NULL,
+                            hash TEXT,
+                            vendor TEXT,
+                            downloaded_at REAL
+                        )
+                    """)
+                    connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+                    connection.commit()
+
+                self._connection = connection
+                return connection
+            except (sqlite3.Error, OSError) as error:
+                self._logger.debug(f"Could not open the data inventory at {self._database_path}: {error}")
+                if connection is not None:
+                    connection.close()
+
+                # A corrupted inventory is rebuilt, it only caches information about the data directory
+                # Operational errors like a locked or read-only database are not a sign of corruption
+                corrupted = isinstance(error, sqlite3.DatabaseError) and not isinstance(error, sqlite3.OperationalError)
+                if attempt == 0 and corrupted and self._database_path.is_file():
+                    self._database_path.unlink()
+                    continue
+                return None
+
+        return None
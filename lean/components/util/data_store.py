@@ -0,0 +1,317 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from threading import Lock
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+from lean.components.util.logger import Logger
+
+# The name of the SQLite database mapping data file paths to the hashes of their contents
+_INDEX_FILE_NAME = "index.db"
+
+# The name of the directory containing the stored files, named after the hashes of their contents
+_OBJECTS_DIRECTORY_NAME = "objects"
+
+# The version of the schema of the index, an index with another version is rebuilt from scratch
+_SCHEMA_VERSION = 2
+
+# The amount of seconds to wait for another process to release its lock on the index
+_BUSY_TIMEOUT_SECONDS = 5
+
+# The default maximum age in seconds of a stored file before it is downloaded again instead of linked
+DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+# The resolutions of which all data of a security is kept in a single file, which is regenerated as new data arrives
+_REGENERATED_RESOLUTIONS = {"daily", "hour"}
+
+# The directories of auxiliary files which are regenerated in place when corporate actions happen
+_REGENERATED_DIRECTORIES = {"map_files", "factor_files", "symbol-properties", "market-hours"}
+
+
+class GarbageCollectionResult(NamedTuple):
+    removed_files: int
+    freed_bytes: int
+
+
+class DataStore:
+    """The DataStore class manages a content-addressed store of data files shared by multiple workspaces.
+
+    Every stored file is kept once under the sha256 hash of its contents. Workspaces use the stored files through
+    hard links in their data directories, so a file downloaded in one workspace is available in all other workspaces
+    without downloading or storing it again. An index maps the paths of data files relative to a data directory
+    to the hashes of their contents.
+
+    Because workspaces use hard links, a stored file is still used as long as its link count is larger than one.
+    Hard links can't cross file systems, if the store is on another file system than a data directory it isn't used.
+
+    Only files which never change once they have been published are shared. Files which are regenerated in place,
+    like daily and hour data with the full history of a security in a single file and map and factor files,
+    are always downloaded. Stored files are only linked for a limited time after they have been downloaded,
+    after which they are downloaded again so changes made to published files still reach all workspaces.
+    """
+
+    def __init__(self, logger: Logger, directory: Path, max_age: float = DEFAULT_MAX_AGE_SECONDS) -> None:
+        """Creates a new DataStore instance.
+
+        :param logger: the logger to use
+        :param directory: the directory containing the store
+        :param max_age: the maximum amount of seconds after downloading a file during which it is linked
+        """
+        self._logger = logger
+        self._directory = directory
+        self._max_age = max_age
+        self._objects_directory = directory / _OBJECTS_DIRECTORY_NAME
+        self._lock = Lock()
+        self._connection: Optional[Any] = None
+
+    def materialize(self, relative_path: str, destination: Path) -> bool:
+        """Links the stored copy of a data file into a data directory.
+
+        :param relative_path: the path of the data file relative to the data directory
+        :param destination: the path to link the stored file to
+        :return: True if the file was stored and has been linked, False if it must be downloaded
+        """
+        from time import time
+
+        if not self.is_shareable(relative_path):
+            return False
+
+        entry = self._get_entry(relative_path)
+        if entry is None:
+            return False
+
+        file_hash, stored_at = entry
+        if time() - stored_at > self._max_age:
+            return False
+
+        object_path = self._get_object_path(file_hash)
+        if not object_path.is_file():
+            self._remove_hashes([file_hash])
+            return False
+
+        if not self._link(object_path, destination):
+            return False
+
+        self._logger.debug(f"Linked {relative_path} from the data store at {self._directory}")
+        return True
+
+    def add(self, relative_path: str, source: Path) -> None:
+        """Stores a data file which has been downloaded to a data directory.
+
+        If a file with the same contents is stored already, the data file is replaced by a link to the stored file.
+        Files which are regenerated in place are not stored.
+
+        :param relative_path: the path of the data file relative to the data directory
+        :param source: the path to the downloaded data file
+        """
+        if not self.is_shareable(relative_path):
+            return
+
+        try:
+            file_hash = self._hash_file(source)
+            object_path = self._get_object_path(file_hash)
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+
+            if object_path.is_file():
+                linked = self._link(object_path, source)
+            else:
+                linked = self._link(source, object_path)
+        except OSError as error:
+            self._logger.debug(f"Could not add {relative_path} to the data store at {self._directory}: {error}")
+            return
+
+        if linked:
+            self._set_hash(relative_path, file_hash, source.stat().st_size)
+
+    def is_shareable(self, relative_path: str) -> bool:
+        """Returns whether a data file never changes once it has been published, so it can be shared.
+
+        :param relative_path: the path of the data file relative to the data directory
+        :return: False if the data file is regenerated in place, True if not
+        """
+        parts = relative_path.replace("\\", "/").strip("/").split("/")
+
+        # Data files are stored under <security type>/<market>/<resolution>/...
+        if len(parts) >= 4 and parts[2] in _REGENERATED_RESOLUTIONS:
+            return False
+
+        return not any(part in _REGENERATED_DIRECTORIES for part in parts[:-1])
+
+    def collect_garbage(self) -> GarbageCollectionResult:
+        """Removes the stored files which are not linked into any data directory anymore.
+
+        :return: the amount of removed files and the amount of bytes freed
+        """
+        removed_hashes = []
+        freed_bytes = 0
+
+        if self._objects_directory.is_dir():
+            for object_path in self._objects_directory.glob("*/*"):
+                try:
+                    stat = object_path.stat()
+                    if stat.st_nlink > 1:
+                        continue
+                    object_path.unlink()
+                except OSError:
+                    continue
+
+                removed_hashes.append(object_path.parent.name + object_path.name)
+                freed_bytes += stat.st_size
+
+        self._remove_hashes(removed_hashes)
+
+        return GarbageCollectionResult(len(removed_hashes), freed_bytes)
+
+    def __enter__(self) -> "DataStore":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the index of the store."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _link(self, source: Path, destination: Path) -> bool:
+        """Atomically replaces a file by a hard link to another file.
+
+        :param source: the file to link to
+        :param destination: the path of the link, which may exist already
+        :return: True if the link has been created, False if the files are on different file systems
+        """
+        from os import link, replace
+        from uuid import uuid4
+
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = destination.parent / f".{destination.name}.{uuid4()}"
+
+        try:
+            link(source, tmp_path)
+        except OSError as error:
+            self._logger.debug(f"Could not link {source} to {destination}: {error}")
+            return False
+
+        try:
+            replace(tmp_path, destination)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        return True
+
+    def _hash_file(self, path: Path) -> str:
+        from hashlib import sha256
+
+        file_hash = sha256()
+        with path.open("rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+
+    def _get_object_path(self, file_hash: str) -> Path:
+        return self._objects_directory / file_hash[:2] / file_hash[2:]
+
+    def _get_entry(self, relative_path: str) -> Optional[Tuple[str, float]]:
+        """Returns the hash of the stored contents of a data file and the time the contents were downloaded.
+
+        :param relative_path: the path of the data file relative to the data directory
+        :return: the hash and the download time as a Unix timestamp, or None if the data file is not stored
+        """
+        import sqlite3
+
+        with self._lock:
+            connection = self._get_connection()
+            if connection is None:
+                return None
+
+            try:
+                row = connection.execute("SELECT hash, stored_at FROM files WHERE path = ?",
+                                         (relative_path,)).fetchone()
+            except sqlite3.OperationalError as error:
+                self._log_unavailable(error)
+                return None
+
+            return (row[0], row[1]) if row is not None else None
+
+    def _set_hash(self, relative_path: str, file_hash: str, size: int) -> None:
+        from time import time
+
+        self._write("INSERT OR REPLACE INTO files (path, hash, size, stored_at) VALUES (?, ?, ?, ?)",
+                    [(relative_path, file_hash, size, time())])
+
+    def _remove_hashes(self, file_hashes: List[str]) -> None:
+        self._write("DELETE FROM files WHERE hash = ?", [(file_hash,) for file_hash in file_hashes])
+
+    def _write(self, query: str, rows: List[Tuple[Any, ...]]) -> None:
+        """Executes a query for every row in a single transaction which is committed right away.
+
+        The transaction is rolled back and the rows are not written if the index is locked by another process.
+
+        :param query: the query to execute
+        :param rows: the parameters of the query for every row
+        """
+        if len(rows) == 0:
+            return
+
+        import sqlite3
+
+        with self._lock:
+            connection = self._get_connection()
+            if connection is None:
+                return
+
+            try:
+                with connection:
+                    connection.executemany(query, rows)
+            except sqlite3.OperationalError as error:
+                self._log_unavailable(error)
+
+    def _log_unavailable(self, error: Exception) -> None:
+        self._logger.debug(f"Could not use the data store index at {self._directory}: {error}")
+
+    def _get_connection(self) -> Optional[Any]:
+        """Returns the connection to the index, opening it if necessary. Must be called while holding the lock.
+
+        :return: the connection to the index, or None if the index can't be used
+        """
+        if self._connection is not None:
+            return self._connection
+
+        import sqlite3
+
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+
+            # The store is shared by multiple CLI processes, SQLite serializes their writes
+            connection = sqlite3.connect(str(self._directory / _INDEX_FILE_NAME),
+                                         timeout=_BUSY_TIMEOUT_SECONDS,
+                                         check_same_thread=False)
+
+            # Entries of older versions have no download time, their files are downloaded again and stored anew
+            if connection.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS files")
+                connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            connection.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, hash TEXT NOT NULL, "
+                               "size INTEGER NOT NULL, stored_at REAL NOT NULL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS files_hash ON files (hash)")
+            connection.commit()
+        except (sqlite3.Error, OSError) as error:
+            self._logger.debug(f"Could not open the data store index at {self._directory}: {error}")
+            return None
+
+        self._connection = connection
+        return connection
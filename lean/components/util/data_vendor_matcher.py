@@ -0,0 +1,178 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Dict, List, Optional
+
+from lean.models.api import QCDataVendor
+
+# Characters which end the literal prefix of a regex, because they are not matched literally
+_SPECIAL_CHARACTERS = set(".^$*+?{}[]()|\\")
+
+# Characters which make the character in front of them optional or repeated
+_QUANTIFIERS = set("*?{")
+
+
+class _TrieNode:
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.vendor_indices: List[int] = []
+
+
+class DataVendorMatcher:
+    """The DataVendorMatcher class finds the data vendor selling a data file.
+
+    A file is sold by the first vendor with a price whose regex matches the file.
+    Instead of testing the regexes of all vendors for every file, the vendors are indexed once:
+    - regexes anchored at the start of the path are stored in a prefix trie under their literal leading part,
+      so only the regexes of vendors whose prefix the file starts with are tested
+    - the remaining regexes are combined into a single alternation, which rejects most files in one search
+    """
+
+    def __init__(self, vendors: List[QCDataVendor]) -> None:
+        """Creates a new DataVendorMatcher instance.
+
+        :param vendors: the vendors in order of precedence, vendors without a price are ignored
+        """
+        self._vendors = [vendor for vendor in vendors if vendor.price is not None]
+        self._root = _TrieNode()
+        self._unindexed_vendor_indices: List[int] = []
+
+        for index, vendor in enumerate(self._vendors):
+            prefix = self._get_literal_prefix(vendor.regex)
+            if prefix is None:
+                self._unindexed_vendor_indices.append(index)
+                continue
+
+            node = self._root
+            for character in prefix:
+                node = node.children.setdefault(character, _TrieNode())
+            node.vendor_indices.append(index)
+
+        self._unindexed_regex = self._combine([self._vendors[index].regex
+                                               for index in self._unindexed_vendor_indices])
+
+    def match(self, file: str) -> Optional[QCDataVendor]:
+        """Returns the vendor selling a data file.
+
+        :param file: the path to the data file, relative to the data directory
+        :return: the first vendor whose regex matches the file, or None if no vendor sells the file
+        """
+        candidates = list(self._root.vendor_indices)
+        node = self._root
+        for character in file:
+            node = node.children.get(character)
+            if node is None:
+                break
+            candidates.extend(node.vendor_indices)
+
+        if len(self._unindexed_vendor_indices) > 0 \
+                and (self._unindexed_regex is None or self._unindexed_regex.search(file) is not None):
+            candidates.extend(self._unindexed_vendor_indices)
+
+        for index in sorted(candidates):
+            vendor = self._vendors[index]
+            if vendor.regex.search(file):
+                return vendor
+
+        return None
+
+    def _get_literal_prefix(self, regex: Any) -> Optional[str]:
+        """Returns the text every string matched by a regex starts with.
+
+        :param regex: the compiled regex to get the literal prefix of
+        :return: the literal prefix, or None if the regex may match anywhere in a string
+        """
+        from re import IGNORECASE, MULTILINE, VERBOSE
+
+        pattern = regex.pattern
+        if not isinstance(pattern, str) or not pattern.startswith("^") or regex.flags & (IGNORECASE | MULTILINE | VERBOSE):
+            return None
+
+        # A top-level alternation like "^a|b" makes the anchor apply to the first branch only
+        if self._has_top_level_alternation(pattern):
+            return None
+
+        prefix = []
+        index = 1
+        while index < len(pattern):
+            character = pattern[index]
+            if character == "\\":
+                if index + 1 >= len(pattern) or pattern[index + 1].isalnum():
+                    # Escapes like \d or \1 don't match a single literal character
+                    break
+                prefix.append(pattern[index + 1])
+                index += 2
+            elif character in _SPECIAL_CHARACTERS:
+                break
+            else:
+                prefix.append(character)
+                index += 1
+
+            if index < len(pattern) and pattern[index] in _QUANTIFIERS:
+                prefix.pop()
+                break
+
+        return "".join(prefix)
+
+    def _has_top_level_alternation(self, pattern: str) -> bool:
+        depth = 0
+        in_class = False
+        index = 0
+        while index < len(pattern):
+            character = pattern[index]
+            if character == "\\":
+                index += 2
+                continue
+
+            if in_class:
+                in_class = character != "]"
+            elif character == "[":
+                in_class = True
+                # A "]" directly after "[" or "[^" is a literal character
+                if pattern[index + 1:index + 2] == "^":
+                    index += 1
+                if pattern[index + 1:index + 2] == "]":
+                    index += 1
+            elif character == "(":
+                depth += 1
+            elif character == ")":
+                depth -= 1
+            elif character == "|" and depth == 0:
+                return True
+
+            index += 1
+
+        return False
+
+    def _combine(self, regexes: List[Any]) -> Optional[Any]:
+        """Combines regexes into a single alternation which matches if any of them matches.
+
+        :param regexes: the compiled regexes to combine
+        :return: the combined regex, or None if the regexes can't be combined safely
+        """
+        from re import compile, error, search
+
+        if len(regexes) == 0:
+            return None
+
+        # Groups are renumbered when patterns are combined, which breaks backreferences and duplicate named groups
+        if any(regex.groupindex or search(r"\\[1-9]", regex.pattern) for regex in regexes):
+            return None
+
+        if len(set(regex.flags for regex in regexes)) != 1:
+            return None
+
+        try:
+            return compile("|".join(f"(?:{regex.pattern})" for regex in regexes), regexes[0].flags)
+        except error:
+            return None
@@ -0,0 +1,152 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Callable, Iterator, Optional, Tuple
+
+from lean.components.util.logger import Logger
+from lean.constants import DOWNLOAD_PRIORITY_HIGH, DOWNLOAD_PRIORITY_LOW, DOWNLOAD_PRIORITY_NORMAL
+
+# The priorities in ascending order of importance
+DOWNLOAD_PRIORITIES = [DOWNLOAD_PRIORITY_LOW, DOWNLOAD_PRIORITY_NORMAL, DOWNLOAD_PRIORITY_HIGH]
+
+# The amount of seconds between updates of the modification time of a claim file by the process owning it
+CLAIM_HEARTBEAT_SECONDS = 10
+
+# The amount of seconds after which a claim file which hasn't been updated belongs to a process that has stopped
+CLAIM_TIMEOUT_SECONDS = 3 * CLAIM_HEARTBEAT_SECONDS
+
+# The amount of seconds a download waits before checking again whether it is its turn
+TURN_POLL_SECONDS = 1
+
+
+class DownloadQueue:
+    """The DownloadQueue class coordinates the downloads of multiple CLI processes on the same machine.
+
+    Every process downloading data claims a priority by creating a file in a shared directory, which it keeps up-to-date
+    for as long as it downloads. Before starting a transfer, a process waits until no other process has claimed a
+    higher priority, so downloads of a running backtest take precedence over a bulk download in the background.
+    Claims of processes which stopped without removing their file expire after CLAIM_TIMEOUT_SECONDS.
+    """
+
+    def __init__(self,
+                 logger: Logger,
+                 directory: Path,
+                 clock: Optional[Callable[[], float]] = None,
+                 sleep: Optional[Callable[[float], None]] = None) -> None:
+        """Creates a new DownloadQueue instance.
+
+        :param logger: the logger to use
+        :param directory: the directory containing the claim files of all processes
+        :param clock: the function returning the current time in seconds since the epoch, defaults to time.time
+        :param sleep: the function to wait with, defaults to time.sleep
+        """
+        if clock is None:
+            from time import time
+            clock = time
+        if sleep is None:
+            from time import sleep
+
+        self._logger = logger
+        self._directory = directory
+        self._clock = clock
+        self._sleep = sleep
+
+        self._lock = Lock()
+        self._highest_claimed_priority: Optional[Tuple[float, int]] = None
+
+    @contextmanager
+    def claim(self, priority: str) -> Iterator[None]:
+        """Claims a priority for the downloads of this process while the context is active.
+
+        :param priority: the priority of the downloads, one of DOWNLOAD_PRIORITIES
+        """
+        from uuid import uuid4
+
+        rank = DOWNLOAD_PRIORITIES.index(priority)
+        claim_file = self._directory / f"{rank}-{uuid4()}.claim"
+
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            claim_file.touch()
+        except OSError as error:
+            self._logger.debug(f"Could not claim download priority '{priority}': {error}")
+            yield
+            return
+
+        stopped = Event()
+        heartbeat = Thread(target=self._keep_claim_alive, args=(claim_file, stopped), daemon=True)
+        heartbeat.start()
+
+        try:
+            yield
+        finally:
+            stopped.set()
+            heartbeat.join()
+            claim_file.unlink(missing_ok=True)
+
+    def wait_for_turn(self, priority: str) -> None:
+        """Waits until no other process has claimed a higher download priority.
+
+        :param priority: the priority of the download that is about to start, one of DOWNLOAD_PRIORITIES
+        """
+        rank = DOWNLOAD_PRIORITIES.index(priority)
+        if rank == len(DOWNLOAD_PRIORITIES) - 1:
+            return
+
+        waiting = False
+        while self._get_highest_claimed_rank() > rank:
+            if not waiting:
+                self._logger.debug("Waiting for higher priority downloads of other processes to finish")
+                waiting = True
+            self._sleep(TURN_POLL_SECONDS)
+
+        if waiting:
+            self._logger.debug("Resuming downloads")
+
+    def _get_highest_claimed_rank(self) -> int:
+        """Returns the highest priority any process has claimed, reading the claims at most once per poll interval.
+
+        :return: the rank of the highest claimed priority in DOWNLOAD_PRIORITIES, -1 if there are no claims
+        """
+        with self._lock:
+            now = self._clock()
+            if self._highest_claimed_priority is not None and now - self._highest_claimed_priority[0] < TURN_POLL_SECONDS:
+                return self._highest_claimed_priority[1]
+
+            highest_rank = -1
+            for claim_file in self._get_claim_files():
+                try:
+                    if now - claim_file.stat().st_mtime > CLAIM_TIMEOUT_SECONDS:
+                        claim_file.unlink(missing_ok=True)
+                        continue
+                    highest_rank = max(highest_rank, int(claim_file.name.split("-")[0]))
+                except (OSError, ValueError):
+                    continue
+
+            self._highest_claimed_priority = (now, highest_rank)
+            return highest_rank
+
+    def _get_claim_files(self) -> Iterator[Path]:
+        if not self._directory.is_dir():
+            return iter([])
+        return self._directory.glob("*.claim")
+
+    def _keep_claim_alive(self, claim_file: Path, stopped: Event) -> None:
+        while not stopped.wait(CLAIM_HEARTBEAT_SECONDS):
+            try:
+                claim_file.touch()
+            except OSError:
+                pass
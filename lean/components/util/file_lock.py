@@ -0,0 +1,171 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from typing import IO, Any, Optional
+
+from lean.constants import FILE_LOCKS_DIRECTORY
+
+# The default amount of seconds to wait for a lock held by another process
+DEFAULT_LOCK_TIMEOUT_SECONDS = 30
+
+# The amount of seconds between attempts to acquire a lock held by another process
+LOCK_POLL_SECONDS = 0.01
+
+# The maximum amount of seconds between attempts, the interval doubles up to it while the lock stays taken
+LOCK_MAX_POLL_SECONDS = 0.1
+
+
+class FileLock:
+    """The FileLock class is an exclusive advisory lock on a file, shared by all processes on the machine.
+
+    The lock is taken on a lock file in FILE_LOCKS_DIRECTORY named after the locked path, using fcntl on Unix and
+    msvcrt on Windows. The operating system releases the lock when the process holding it exits, so a crashed process
+    never leaves a stale lock behind. Acquiring the lock waits for at most a given amount of seconds.
+
+    The lock file is removed when the lock is released, so FILE_LOCKS_DIRECTORY doesn't grow with every locked path.
+    On Unix the holder removes the lock file before unlocking it, and a process which acquires the lock on a file
+    that has been removed in the meantime opens the lock file again. On Windows a file can't be removed while another
+    process has it open, so the lock file is only removed after unlocking it if no other process is waiting on it.
+    """
+
+    def __init__(self, path: Path, timeout: float = DEFAULT_LOCK_TIMEOUT_SECONDS) -> None:
+        """Creates a new FileLock instance.
+
+        :param path: the path to the file to lock
+        :param timeout: the maximum amount of seconds to wait for the lock
+        """
+        from hashlib import sha1
+
+        self._lock_path = Path(FILE_LOCKS_DIRECTORY) / f"{sha1(str(path.resolve()).encode('utf-8')).hexdigest()}.lock"
+        self._timeout = timeout
+        self._file: Optional[IO[Any]] = None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+    def acquire(self) -> None:
+        """Acquires the lock, waiting while another process or thread holds it.
+
+        Raises a TimeoutError if the lock is not acquired within the timeout.
+        """
+        from time import monotonic, sleep
+
+        deadline = monotonic() + self._timeout
+        interval = LOCK_POLL_SECONDS
+        while True:
+            self._lock_path.parent.mkdir(parents=True, exist_ok=True)
+            file = open(self._lock_path, "a+b")
+
+            while not _try_lock(file):
+                if monotonic() >= deadline:
+                    file.close()
+                    raise TimeoutError(f"Could not lock {self._lock_path} within {self._timeout} seconds, "
+                                       "another lean command may be stuck")
+                sleep(interval)
+                interval = min(interval * 2, LOCK_MAX_POLL_SECONDS)
+
+            # The previous holder may have removed the lock file after this process opened it
+            if _is_same_file(file, self._lock_path):
+                self._file = file
+                return
+
+            _unlock(file)
+            file.close()
+
+    def release(self) -> None:
+        """Releases the lock and removes the lock file."""
+        if self._file is None:
+            return
+
+        if _can_remove_open_files():
+            self._lock_path.unlink(missing_ok=True)
+            _unlock(self._file)
+            self._file.close()
+        else:
+            _unlock(self._file)
+            self._file.close()
+            try:
+                self._lock_path.unlink(missing_ok=True)
+            except OSError:
+                # Another process has the lock file open and is waiting for the lock
+                pass
+
+        self._file = None
+
+
+def _can_remove_open_files() -> bool:
+    """Returns whether files can be removed while they are open, which is the case everywhere except on Windows.
+
+    :return: True if open files can be removed, False if not
+    """
+    from os import name
+    return name != "nt"
+
+
+def _is_same_file(file: IO[Any], path: Path) -> bool:
+    """Returns whether an open file is still the file at a given path.
+
+    :param file: the open file
+    :param path: the path the file was opened at
+    :return: True if the path still refers to the open file, False if it has been removed or replaced
+    """
+    from os import fstat, stat
+
+    try:
+        path_stat = stat(path)
+    except OSError:
+        return False
+
+    file_stat = fstat(file.fileno())
+    return (file_stat.st_dev, file_stat.st_ino) == (path_stat.st_dev, path_stat.st_ino)
+
+
+def _try_lock(file: IO[Any]) -> bool:
+    """Tries to take an exclusive lock on an open file without waiting.
+
+    :param file: the file to lock
+    :return: True if the lock has been taken, False if another file handle holds it
+    """
+    try:
+        import fcntl
+    except ImportError:
+        import msvcrt
+        try:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    try:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(file: IO[Any]) -> None:
+    try:
+        import fcntl
+    except ImportError:
+        import msvcrt
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+        return
+
+    fcntl.flock(file.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,125 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, List, Optional
+
+from lean.components.util.logger import Logger
+
+# A report is called on the main thread when the command finishes, so background tasks don't interleave their output
+# with the output of the command
+Report = Callable[[], None]
+
+
+class _HousekeepingTask:
+    """A single housekeeping task running in a background thread."""
+
+    def __init__(self, name: str, task: Callable[[], Optional[Report]], deadline: float) -> None:
+        """Creates a new _HousekeepingTask instance.
+
+        :param name: the name of the task
+        :param task: the function to run, returning the report of the task or None if there is nothing to report
+        :param deadline: the monotonic time after which nobody waits for the task anymore
+        """
+        self.name = name
+        self.deadline = deadline
+        self.report: Optional[Report] = None
+        self.error: Optional[Exception] = None
+        self.done = Event()
+
+        self._task = task
+
+    def run(self) -> None:
+        try:
+            self.report = self._task()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done.set()
+
+
+class HousekeepingManager:
+    """The HousekeepingManager class runs housekeeping tasks in the background while a command runs.
+
+    Housekeeping tasks, like checking for updates or refreshing the database files, mostly wait on network I/O.
+    They run concurrently in daemon threads. The CLI only waits for a task when a command needs its results,
+    and then only until the task's hard deadline.
+    """
+
+    def __init__(self, logger: Logger, deadline_seconds: float) -> None:
+        """Creates a new HousekeepingManager instance.
+
+        :param logger: the logger to use when a task fails or exceeds its deadline
+        :param deadline_seconds: the amount of seconds after which the CLI stops waiting for a task
+        """
+        self._logger = logger
+        self._deadline_seconds = deadline_seconds
+        self._tasks: List[_HousekeepingTask] = []
+        self._tasks_by_name: Dict[str, _HousekeepingTask] = {}
+        self._lock = Lock()
+
+    def submit(self, name: str, task: Callable[[], Optional[Report]]) -> None:
+        """Starts running a task in a background thread.
+
+        :param name: the name of the task, which can be passed to wait() by code that needs the task's results
+        :param task: the function to run, returning a function that reports its results or None if there's nothing to report
+        """
+        from time import monotonic
+
+        housekeeping_task = _HousekeepingTask(name, task, monotonic() + self._deadline_seconds)
+        with self._lock:
+            self._tasks.append(housekeeping_task)
+            self._tasks_by_name[name] = housekeeping_task
+
+        Thread(target=housekeeping_task.run, name=f"housekeeping-{name}", daemon=True).start()
+
+    def wait(self, name: str) -> None:
+        """Waits until a task is done or its deadline has passed.
+
+        Returns immediately if no task with the given name has been submitted.
+
+        :param name: the name of the task to wait for
+        """
+        with self._lock:
+            housekeeping_task = self._tasks_by_name.get(name)
+
+        if housekeeping_task is not None:
+            self._wait_for_task(housekeeping_task)
+
+    def finish(self) -> None:
+        """Reports the results of the tasks that are done, without waiting for the tasks that are still running.
+
+        Tasks that are still running keep running in their daemon thread until the process exits,
+        but their results are discarded.
+        """
+        with self._lock:
+            tasks = self._tasks
+            self._tasks = []
+            self._tasks_by_name = {}
+
+        for housekeeping_task in tasks:
+            if not housekeeping_task.done.is_set():
+                self._logger.debug(f"Housekeeping task '{housekeeping_task.name}' is still running, skipping it")
+            elif housekeeping_task.error is not None:
+                self._logger.debug(f"Housekeeping task '{housekeeping_task.name}' failed: {housekeeping_task.error}")
+            elif housekeeping_task.report is not None:
+                housekeeping_task.report()
+
+    def _wait_for_task(self, housekeeping_task: _HousekeepingTask) -> bool:
+        """Waits until a task is done or its deadline has passed.
+
+        :param housekeeping_task: the task to wait for
+        :return: True if the task is done, False if its deadline passed before it was done
+        """
+        from time import monotonic
+        return housekeeping_task.done.wait(max(0.0, housekeeping_task.deadline - monotonic()))
@@ -10,20 +10,62 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from lean.components.util.logger import Logger
 
+if TYPE_CHECKING:
+    from lean.components.util.http_stats import HTTPStats
+
+# The number of connections kept alive per host when no pool size is given, equal to the requests library's default
+DEFAULT_POOL_SIZE = 10
+
 
 class HTTPClient:
-    """The HTTPClient class is a lightweight wrapper around the requests library with additional logging."""
+    """The HTTPClient class is a lightweight wrapper around the requests library with additional logging.
 
-    def __init__(self, logger: Logger) -> None:
+    Requests are sent through long-lived sessions, one per scheme and host,
+    so that consecutive requests to the same host reuse their TCP and TLS connections.
+    """
+
+    def __init__(self, logger: Logger, pool_size: Optional[int] = None, keep_alive: bool = True) -> None:
         """Creates a new HTTPClient instance.
 
         :param logger: the logger to log debug messages with
+        :param pool_size: the maximum number of connections to keep alive per host
+        :param keep_alive: True if connections should be reused between requests, False to open one per request
         """
         self._logger = logger
+        self._pool_size = max(1, pool_size) if pool_size is not None else DEFAULT_POOL_SIZE
+        self._keep_alive = keep_alive
+        self._sessions: Dict[str, Any] = {}
+        self._sessions_lock = Lock()
+
+        # The statistics of the sent requests, None while the statistics are disabled
+        self.stats: Optional["HTTPStats"] = None
+
+    def enable_stats(self) -> "HTTPStats":
+        """Starts recording the timings and sizes of all requests sent through this client.
+
+        :return: the HTTPStats instance the requests are recorded in
+        """
+        if self.stats is None:
+            from lean.components.util.http_stats import HTTPStats
+            self.stats = HTTPStats()
+
+            # Pooled connections can't be timed, new sessions are created with adapters that time new connections
+            self.close()
+
+        return self.stats
+
+    @property
+    def pool_size(self) -> int:
+        """Returns the maximum number of connections kept alive per host.
+
+        :return: the maximum number of connections kept alive per host
+        """
+        return self._pool_size
 
     def get(self, url: str, **kwargs):
         """A wrapper around requests.get().
@@ -52,18 +94,25 @@ class HTTPClient:
 
         An error is raised if the response is unsuccessful unless kwargs["raise_for_status"] == False.
 
+        The request is recorded under kwargs["stats_endpoint"] when statistics are enabled,
+        requests without it are recorded under their method and host.
+
         :param method: the request method
         :param url: the request url
         :param kwargs: any kwargs to pass on to requests.request()
         :return: the response of the request
         """
-        from requests import request, exceptions
+        from requests import exceptions
 
         self._log_request(method, url, **kwargs)
 
         raise_for_status = kwargs.pop("raise_for_status", True)
+        stats_endpoint = kwargs.pop("stats_endpoint", None)
         try:
-            response = request(method, url, **kwargs)
+            if self.stats is None:
+                response = self._send(method, url, **kwargs)
+            else:
+                response = self._send_recorded(method, url, stats_endpoint, **kwargs)
         except exceptions.SSLError as e:
             raise Exception(f"""
 Detected SSL error, this might be due to custom certificates in your environment or system trust store.
@@ -75,29 +124,112 @@ Related issue https://github.com/psf/requests/issues/2966
         self._check_response(response, raise_for_status)
         return response
 
+    def _send(self, method: str, url: str, **kwargs):
+        """Sends a request without checking its response.
+
+        :param method: the request method
+        :param url: the request url
+        :param kwargs: any kwargs to pass on to requests.request()
+        :return: the response of the request
+        """
+        if self._keep_alive:
+            return self._get_session(url).request(method, url, **kwargs)
+
+        from requests import request
+        return request(method, url, **kwargs)
+
+    def _send_recorded(self, method: str, url: str, stats_endpoint: Optional[str], **kwargs):
+        """Sends a request and records its timings and sizes in the statistics.
+
+        :param method: the request method
+        :param url: the request url
+        :param stats_endpoint: the endpoint template to record the request under, None to use the method and host
+        :param kwargs: any kwargs to pass on to requests.request()
+        :return: the response of the request
+        """
+        if stats_endpoint is None:
+            from lean.components.util.http_stats import get_default_endpoint
+            stats_endpoint = get_default_endpoint(method, url)
+
+        stats = self.stats
+        start = stats.start_request()
+        try:
+            response = self._send(method, url, **kwargs)
+        except Exception:
+            stats.record_request(stats_endpoint, start)
+            raise
+
+        stats.record_request(stats_endpoint, start, response, kwargs.get("stream", False))
+        return response
+
+    def close(self) -> None:
+        """Closes all pooled sessions and the connections they keep alive."""
+        with self._sessions_lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+
+        for session in sessions:
+            session.close()
+
     def log_unsuccessful_response(self, response) -> None:
         """Logs an unsuccessful response's status code and body.
 
         :param response: the response to log
         """
-        body = f"body:\n{response.text}" if response.text != "" else "empty body"
-        self._logger.debug(f"Request was not successful, status code {response.status_code}, {body}")
+        self._logger.debug(lambda: f"Request was not successful, status code {response.status_code}, "
+                                   + (f"body:\n{response.text}" if response.text != "" else "empty body"))
+
+    def _get_session(self, url: str) -> Any:
+        """Returns the pooled session for the host of the given url, creating it if it doesn't exist yet.
+
+        :param url: the url that is about to be requested
+        :return: the session that should be used to request the url
+        """
+        from urllib.parse import urlsplit
+
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}".lower()
+
+        with self._sessions_lock:
+            session = self._sessions.get(key)
+            if session is None:
+                from requests import Session
+                if self.stats is None:
+                    from requests.adapters import HTTPAdapter
+                else:
+                    from lean.components.util.http_stats import TimedHTTPAdapter as HTTPAdapter
+
+                # Redirects may lead to other hosts, so the session keeps a small pool for those as well
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self._pool_size)
+
+                session = Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+
+                self._sessions[key] = session
+
+            return session
 
     def _log_request(self, method: str, url: str, **kwargs) -> None:
         """Logs a request.
 
+        The message is rendered lazily, because the data of requests like projects/update contains entire files.
+
         :param method: the request method
         :param url: the request url
         :param kwargs: any kwargs passed to a request.* method
         """
-        from json import dumps
-        message = f"--> {method.upper()} {url}"
+        def render() -> str:
+            from json import dumps
+            message = f"--> {method.upper()} {url}"
+
+            data = next((kwargs.get(key) for key in ["json", "data", "params"] if key in kwargs), None)
+            if data is not None and data != {}:
+                message += f" with data:\n{dumps(data, indent=4)}"
 
-        data = next((kwargs.get(key) for key in ["json", "data", "params"] if key in kwargs), None)
-        if data is not None and data != {}:
-            message += f" with data:\n{dumps(data, indent=4)}"
+            return message
 
-        self._logger.debug(message)
+        self._logger.debug(render)
 
     def _check_response(self, response, raise_for_status: bool) -> None:
         """Checks a response, logging a debug message if it wasn't successful.
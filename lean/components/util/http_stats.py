@@ -0,0 +1,287 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from threading import Lock, local
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from lean.components.util.logger import Logger
+
+# The time spent opening new connections by the request that is currently being sent on this thread
+_connect_timings = local()
+
+
+def _reset_connect_timing() -> None:
+    _connect_timings.seconds = 0.0
+    _connect_timings.connections = 0
+
+
+def _get_connect_timing() -> Tuple[float, int]:
+    return getattr(_connect_timings, "seconds", 0.0), getattr(_connect_timings, "connections", 0)
+
+
+def get_default_endpoint(method: str, url: str) -> str:
+    """Returns the endpoint template to record a request under when its caller didn't provide one.
+
+    :param method: the request method
+    :param url: the request url
+    :return: the method and host of the request, like "GET cdn.quantconnect.com"
+    """
+    from urllib.parse import urlsplit
+    return f"{method.upper()} {urlsplit(url).netloc}"
+
+
+class _ConnectTimingMixin:
+    """Measures the time it takes to open a connection and adds it to the current thread's connect timing."""
+
+    def connect(self) -> None:
+        start = perf_counter()
+        super().connect()
+        seconds, connections = _get_connect_timing()
+        _connect_timings.seconds = seconds + perf_counter() - start
+        _connect_timings.connections = connections + 1
+
+
+class _TimedHTTPConnection(_ConnectTimingMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_ConnectTimingMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """An HTTPAdapter which measures the time it takes to open new connections.
+
+    The measured time includes the DNS lookup, the TCP handshake and, for HTTPS, the TLS handshake.
+    """
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool
+        }
+
+
+class EndpointStats:
+    """The aggregated statistics of all requests sent to a single endpoint."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.new_connections = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.connect_seconds = 0.0
+        self.ttfb_seconds = 0.0
+        self.total_seconds: List[float] = []
+        self.status_codes: Dict[str, int] = {}
+
+    def get_percentile(self, percentile: float) -> float:
+        """Returns a percentile of the total duration of the requests.
+
+        :param percentile: the percentile to return, between 0 and 100
+        :return: the total duration in seconds below which the given percentage of requests finished
+        """
+        if len(self.total_seconds) == 0:
+            return 0.0
+
+        durations = sorted(self.total_seconds)
+        index = min(len(durations) - 1, int(round(percentile / 100 * (len(durations) - 1))))
+        return durations[index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the statistics as a json-serializable dict.
+
+        :return: a dict containing the statistics of the endpoint
+        """
+        requests = max(1, self.requests)
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "errors": self.errors,
+            "statusCodes": self.status_codes,
+            "newConnections": self.new_connections,
+            "bytesSent": self.bytes_sent,
+            "bytesReceived": self.bytes_received,
+            "averageConnectSeconds": self.connect_seconds / max(1, self.new_connections),
+            "averageTtfbSeconds": self.ttfb_seconds / requests,
+            "averageTotalSeconds": sum(self.total_seconds) / requests,
+            "p50TotalSeconds": self.get_percentile(50),
+            "p95TotalSeconds": self.get_percentile(95),
+            "maxTotalSeconds": max(self.total_seconds, default=0.0),
+            "sumTotalSeconds": sum(self.total_seconds)
+        }
+
+
+class HTTPStats:
+    """The HTTPStats class aggregates the timings and sizes of HTTP requests per endpoint.
+
+    Requests to the QuantConnect API are aggregated per API endpoint, like "projects/read".
+    Other requests are aggregated per method and host, like "GET cdn.quantconnect.com".
+    """
+
+    def __init__(self) -> None:
+        """Creates a new HTTPStats instance."""
+        self._endpoints: Dict[str, EndpointStats] = {}
+        self._lock = Lock()
+
+    def start_request(self) -> float:
+        """Marks the start of a request on the current thread.
+
+        :return: the start time to pass to record_request()
+        """
+        _reset_connect_timing()
+        return perf_counter()
+
+    def record_request(self,
+                       endpoint: str,
+                       start: float,
+                       response: Any = None,
+                       stream: bool = False) -> None:
+        """Records a request which has been sent on the current thread.
+
+        :param endpoint: the endpoint template to aggregate the request under
+        :param start: the value returned by start_request() when the request was started
+        :param response: the response of the request, or None if the request raised an error
+        :param stream: True if the body of the response is streamed and has not been read yet
+        """
+        total_seconds = perf_counter() - start
+        connect_seconds, new_connections = _get_connect_timing()
+
+        bytes_sent = 0
+        bytes_received = 0
+        ttfb_seconds = total_seconds
+        status_code = "error"
+        if response is not None:
+            status_code = str(response.status_code)
+            ttfb_seconds = response.elapsed.total_seconds()
+            bytes_sent = self._get_body_size(response.request.body)
+            if stream:
+                bytes_received = int(response.headers.get("Content-Length", 0) or 0)
+            else:
+                bytes_received = len(response.content or b"")
+
+        with self._lock:
+            stats = self._get_endpoint(endpoint)
+            stats.requests += 1
+            stats.new_connections += new_connections
+            stats.connect_seconds += connect_seconds
+            stats.ttfb_seconds += ttfb_seconds
+            stats.total_seconds.append(total_seconds)
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            stats.status_codes[status_code] = stats.status_codes.get(status_code, 0) + 1
+            if response is None or response.status_code >= 400:
+                stats.errors += 1
+
+    def record_retry(self, endpoint: str) -> None:
+        """Records that a request to an endpoint is retried.
+
+        :param endpoint: the endpoint template of the request
+        """
+        with self._lock:
+            self._get_endpoint(endpoint).retries += 1
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the statistics of all endpoints as a json-serializable dict.
+
+        :return: a dict containing the statistics by endpoint template
+        """
+        with self._lock:
+            return {endpoint: stats.to_dict() for endpoint, stats in sorted(self._endpoints.items())}
+
+    def write_json(self, path: Path) -> None:
+        """Writes the statistics of all endpoints to a JSON file.
+
+        :param path: the path of the file to write
+        """
+        from json import dumps
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(dumps({"endpoints": self.to_dict()}, indent=4) + "\n", encoding="utf-8")
+
+    def log_summary(self, logger: Logger) -> None:
+        """Logs a table summarizing the statistics of all endpoints.
+
+        :param logger: the logger to log the table with
+        """
+        from rich import box
+        from rich.table import Table
+
+        endpoints = self.to_dict()
+        if len(endpoints) == 0:
+            logger.info("No HTTP requests were sent")
+            return
+
+        table = Table(title="HTTP statistics", box=box.SQUARE)
+        for column in ["Endpoint", "Requests", "Retries", "Errors", "New conn.", "Avg connect", "Avg TTFB",
+                       "Avg total", "p95 total", "Sent", "Received"]:
+            table.add_column(column, justify="left" if column == "Endpoint" else "right")
+
+        for endpoint, stats in endpoints.items():
+            table.add_row(endpoint,
+                          str(stats["requests"]),
+                          str(stats["retries"]),
+                          str(stats["errors"]),
+                          str(stats["newConnections"]),
+                          self._format_seconds(stats["averageConnectSeconds"]),
+                          self._format_seconds(stats["averageTtfbSeconds"]),
+                          self._format_seconds(stats["averageTotalSeconds"]),
+                          self._format_seconds(stats["p95TotalSeconds"]),
+                          self._format_bytes(stats["bytesSent"]),
+                          self._format_bytes(stats["bytesReceived"]))
+
+        logger.info(table)
+
+    def _get_endpoint(self, endpoint: str) -> EndpointStats:
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = EndpointStats()
+            self._endpoints[endpoint] = stats
+        return stats
+
+    def _get_body_size(self, body: Optional[Any]) -> int:
+        if body is None:
+            return 0
+        if isinstance(body, str):
+            return len(body.encode("utf-8"))
+        if isinstance(body, (bytes, bytearray)):
+            return len(body)
+
+        # Streamed bodies like file uploads don't have a known size
+        return 0
+
+    def _format_seconds(self, seconds: float) -> str:
+        return f"{seconds * 1000:,.0f} ms"
+
+    def _format_bytes(self, size: int) -> str:
+        for unit in ["B", "KB", "MB"]:
+            if size < 1024:
+                return f"{size:,.0f} {unit}"
+            size /= 1024
+        return f"{size:,.1f} GB"
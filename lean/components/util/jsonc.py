@@ -0,0 +1,64 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from re import compile
+from typing import Any
+
+_STRING = r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"'
+_BLOCK_COMMENT = r"/\*[^*]*\*+(?:[^/*][^*]*\*+)*/"
+
+# Every match is either a run of JSON to keep, captured in the group, or a comment to remove
+# String literals are part of the runs as a whole, so comment markers inside them are never removed
+# A lone quote is kept as well, so an unterminated string still fails to parse afterwards
+_COMMENT_PATTERN = compile(rf'((?:[^"/]+|{_STRING}|"|/(?![/*]))+)|//[^\n]*|{_BLOCK_COMMENT}')
+
+# The same approach, matching runs of JSON without trailing commas and the trailing commas between them
+_TRAILING_COMMA_PATTERN = compile(rf'((?:[^",]+|{_STRING}|"|,(?!\s*[}}\]]))+)|,')
+
+
+def strip_comments(content: str) -> str:
+    """Removes the // and /* */ comments from a JSON document in a single pass.
+
+    The document is scanned by the regex engine, only the runs between comments are joined in Python.
+
+    :param content: the JSON document containing comments
+    :return: the same document without comments
+    """
+    return "".join(_COMMENT_PATTERN.findall(content))
+
+
+def strip_trailing_commas(content: str) -> str:
+    """Removes the commas after the last element of arrays and objects from a JSON document without comments.
+
+    :param content: the JSON document without comments containing trailing commas
+    :return: the same document without trailing commas
+    """
+    return "".join(_TRAILING_COMMA_PATTERN.findall(content))
+
+
+def loads(content: str) -> Any:
+    """Parses a JSON document which may contain comments and trailing commas.
+
+    Trailing commas are rare, so they are only removed when the document without comments isn't valid JSON.
+    Raises a ValueError if the document is invalid.
+
+    :param content: the JSON document to parse
+    :return: the parsed document
+    """
+    from json import loads
+
+    content = strip_comments(content)
+    try:
+        return loads(content)
+    except ValueError:
+        return loads(strip_trailing_commas(content))
@@ -27,13 +27,24 @@ class Logger:
         self._console = Console(markup=False, highlight=False, emoji=False, width=None)
         self.debug_logging_enabled = False
 
-    def debug(self, message: Any) -> None:
+    def debug(self, message: Any, *args: Any) -> None:
         """Logs a debug message if debug logging is enabled.
 
-        :param message: the message to log
+        Expensive messages can be passed lazily, they are only rendered when debug logging is enabled.
+        A lazy message is either a function returning the message, or a str.format() template with its args.
+
+        :param message: the message to log, a function returning the message, or a template to format with args
+        :param args: the args to format the message template with
         """
-        if self.debug_logging_enabled:
-            self._console.print(message, style="grey50")
+        if not self.debug_logging_enabled:
+            return
+
+        if args:
+            message = message.format(*args)
+        elif callable(message):
+            message = message()
+
+        self._console.print(message, style="grey50")
 
     def info(self, message: Any) -> None:
         """Logs an info message.
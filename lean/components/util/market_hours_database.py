@@ -59,6 +59,12 @@ class MarketHoursDatabase:
         if self._entries is not None:
             return self._entries
 
+        from lean.constants import HOUSEKEEPING_TASK_DATABASE_FILES
+        from lean.container import container
+
+        # The market hours database may still be updating in the background
+        container.housekeeping_manager.wait(HOUSEKEEPING_TASK_DATABASE_FILES)
+
         data_dir = self._lean_config_manager.get_data_directory()
         market_hours_database_path = data_dir / "market-hours" / "market-hours-database.json"
 
@@ -0,0 +1,199 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from queue import Queue
+from threading import Event, Lock, Thread
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from lean.components.util.logger import Logger
+
+# The item workers pass on to the next stage when their own stage has no more work
+_END_OF_STAGE = object()
+
+
+class PipelineStage:
+    """A single stage of a Pipeline, processing items with its own pool of worker threads."""
+
+    def __init__(self,
+                 name: str,
+                 worker_count: int,
+                 process: Callable[[Any], Optional[Any]],
+                 finish_on_stop: bool = False) -> None:
+        """Creates a new PipelineStage instance.
+
+        :param name: the display-friendly name of the stage
+        :param worker_count: the amount of threads processing items in this stage concurrently
+        :param process: the function processing an item, returning the item for the next stage or None to drop it
+        :param finish_on_stop: True if items which reached this stage are still processed after an error,
+                               False if they are dropped
+        """
+        self.name = name
+        self.worker_count = max(1, worker_count)
+        self.process = process
+        self.finish_on_stop = finish_on_stop
+
+        self.processed = 0
+        self.busy_seconds = 0.0
+        self.first_start: Optional[float] = None
+        self.last_finish: Optional[float] = None
+
+        self._lock = Lock()
+        self._running_workers = self.worker_count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns the throughput of this stage.
+
+        :return: a dict containing the amount of processed items, the time spent and the items processed per second
+        """
+        with self._lock:
+            wall_seconds = 0.0
+            if self.first_start is not None and self.last_finish is not None:
+                wall_seconds = self.last_finish - self.first_start
+
+            return {
+                "workers": self.worker_count,
+                "processed": self.processed,
+                "busySeconds": self.busy_seconds,
+                "wallSeconds": wall_seconds,
+                "itemsPerSecond": self.processed / wall_seconds if wall_seconds > 0 else 0.0
+            }
+
+    def _record(self, start: float, finish: float) -> None:
+        with self._lock:
+            self.processed += 1
+            self.busy_seconds += finish - start
+            self.first_start = start if self.first_start is None else min(self.first_start, start)
+            self.last_finish = finish if self.last_finish is None else max(self.last_finish, finish)
+
+    def _finish_worker(self) -> bool:
+        """Marks one of the workers of this stage as finished.
+
+        :return: True if this was the last running worker of the stage, False if not
+        """
+        with self._lock:
+            self._running_workers -= 1
+            return self._running_workers == 0
+
+
+class Pipeline:
+    """The Pipeline class runs items through a sequence of stages which work concurrently.
+
+    Every stage has its own worker threads, so a slow stage doesn't limit the concurrency of the other stages.
+    Stages are connected by bounded queues, so a fast stage can't run arbitrarily far ahead of the next one.
+    When a stage raises an error, the pipeline stops processing new items and the error is raised by run().
+    Items which already reached a stage that finishes on stop are still processed before run() returns.
+    """
+
+    def __init__(self, logger: Logger, stages: List[PipelineStage], queue_size: int) -> None:
+        """Creates a new Pipeline instance.
+
+        :param logger: the logger to log the throughput of the stages with
+        :param stages: the stages to pass every item through, in order
+        :param queue_size: the maximum amount of items waiting in front of every stage
+        """
+        self._logger = logger
+        self._stages = stages
+        self._queues = [Queue(maxsize=max(1, queue_size)) for _ in stages]
+        self._stopped = Event()
+        self._error: Optional[BaseException] = None
+        self._error_lock = Lock()
+
+    def run(self, items: Iterable[Any]) -> None:
+        """Passes all items through all stages and waits until they are processed.
+
+        :param items: the items to pass to the first stage
+        """
+        threads = []
+        for index, stage in enumerate(self._stages):
+            for worker in range(stage.worker_count):
+                thread = Thread(target=self._run_worker,
+                                args=(index,),
+                                name=f"pipeline-{stage.name}-{worker}",
+                                daemon=True)
+                thread.start()
+                threads.append(thread)
+
+        try:
+            for item in items:
+                if self._stopped.is_set():
+                    break
+                self._queues[0].put(item)
+
+            for _ in range(self._stages[0].worker_count):
+                self._queues[0].put(_END_OF_STAGE)
+
+            for thread in threads:
+                thread.join()
+        except BaseException:
+            # The workers are daemon threads, they are abandoned when the CLI exits because of a KeyboardInterrupt
+            self._stopped.set()
+            raise
+
+        self._log_stats()
+
+        if self._error is not None:
+            raise self._error
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the throughput of all stages.
+
+        :return: a dict containing the throughput of every stage by stage name
+        """
+        return {stage.name: stage.get_stats() for stage in self._stages}
+
+    def _run_worker(self, index: int) -> None:
+        """Processes the items of a stage until the previous stage is done.
+
+        :param index: the index of the stage to process items of
+        """
+        stage = self._stages[index]
+        next_queue = self._queues[index + 1] if index + 1 < len(self._queues) else None
+
+        while True:
+            item = self._queues[index].get()
+            if item is _END_OF_STAGE:
+                break
+
+            # After an error the remaining items are drained without processing them, so no put() blocks forever
+            if self._stopped.is_set() and not stage.finish_on_stop:
+                continue
+
+            start = perf_counter()
+            try:
+                result = stage.process(item)
+            except BaseException as error:
+                if self._stopped.is_set():
+                    self._logger.debug(f"Pipeline stage '{stage.name}' failed after the pipeline stopped: {error}")
+                self._stop(error)
+                continue
+            stage._record(start, perf_counter())
+
+            if result is not None and next_queue is not None:
+                next_queue.put(result)
+
+        if stage._finish_worker() and next_queue is not None:
+            for _ in range(self._stages[index + 1].worker_count):
+                next_queue.put(_END_OF_STAGE)
+
+    def _stop(self, error: BaseException) -> None:
+        with self._error_lock:
+            if self._error is None:
+                self._error = error
+        self._stopped.set()
+
+    def _log_stats(self) -> None:
+        for name, stats in self.get_stats().items():
+            self._logger.debug("Pipeline stage '{}': {:,} items in {:.2f} s ({:,.1f} items/s, {} workers)",
+                               name, stats["processed"], stats["wallSeconds"], stats["itemsPerSecond"],
+                               stats["workers"])
@@ -0,0 +1,162 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import deque
+from threading import Event, Lock, Thread, local
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+# The amount of times per second the aggregated progress is passed to the progress bar
+PROGRESS_REFRESH_PER_SECOND = 4
+
+# The amount of seconds over which the throughput shown in the progress bar is averaged
+THROUGHPUT_WINDOW_SECONDS = 5
+
+# The suffix of a progress bar showing the fields set by the ProgressAggregator, for tasks with and without a total
+PROGRESS_SUFFIX = "{task.percentage:0.0f}% ({task.completed:,.0f}/{task.total:,.0f}) " \
+                  "{task.fields[files_per_second]:,.1f} files/s {task.fields[megabytes_per_second]:,.1f} MB/s " \
+                  "ETA {task.fields[eta]}"
+PROGRESS_SUFFIX_WITHOUT_TOTAL = "{task.completed:,.0f} files " \
+                                "{task.fields[files_per_second]:,.1f} files/s " \
+                                "{task.fields[megabytes_per_second]:,.1f} MB/s"
+
+
+class _Counter:
+    """The progress reported by a single thread, which is only written to by that thread."""
+    __slots__ = ("completed", "bytes")
+
+    def __init__(self) -> None:
+        self.completed = 0.0
+        self.bytes = 0
+
+
+class ProgressAggregator:
+    """The ProgressAggregator class collects the progress of many threads and shows it at a fixed rate.
+
+    Every thread adds its progress to a counter of its own, so reporting progress never waits on a lock or on the
+    console. A background thread sums the counters PROGRESS_REFRESH_PER_SECOND times per second and updates the
+    progress bar with the total progress, the throughput in files and megabytes per second and the estimated time left.
+    """
+
+    def __init__(self,
+                 progress: Any,
+                 task_id: Any,
+                 total: Optional[float],
+                 clock: Optional[Callable[[], float]] = None) -> None:
+        """Creates a new ProgressAggregator instance.
+
+        :param progress: the rich Progress instance to show the progress in
+        :param task_id: the id of the task in the progress bar, created with the fields in get_task_fields()
+        :param total: the amount of files that will be completed, None if unknown
+        :param clock: the function returning the current monotonic time, defaults to time.monotonic
+        """
+        if clock is None:
+            from time import monotonic
+            clock = monotonic
+
+        self._progress = progress
+        self._task_id = task_id
+        self._total = total
+        self._clock = clock
+
+        self._local = local()
+        self._counters: List[_Counter] = []
+        self._counters_lock = Lock()
+
+        self._samples: Deque[Tuple[float, float, int]] = deque()
+        self._stopped = Event()
+        self._refresher: Optional[Thread] = None
+
+    @staticmethod
+    def get_task_fields() -> dict:
+        """Returns the fields a progress bar task needs to have before the aggregator updates it.
+
+        :return: the initial values of the fields shown by PROGRESS_SUFFIX and PROGRESS_SUFFIX_WITHOUT_TOTAL
+        """
+        return {"files_per_second": 0.0, "megabytes_per_second": 0.0, "eta": "-:--:--"}
+
+    def __enter__(self) -> "ProgressAggregator":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Starts refreshing the progress bar in the background."""
+        self._samples.append((self._clock(), 0.0, 0))
+        self._refresher = Thread(target=self._refresh_periodically, daemon=True)
+        self._refresher.start()
+
+    def stop(self) -> None:
+        """Stops refreshing the progress bar, after showing the final progress."""
+        self._stopped.set()
+        if self._refresher is not None:
+            self._refresher.join()
+            self._refresher = None
+        self.refresh()
+
+    def advance(self, amount: float) -> None:
+        """Registers progress of the current thread.
+
+        :param amount: the amount of files completed, may be a fraction or negative when a download restarts
+        """
+        self._get_counter().completed += amount
+
+    def add_bytes(self, amount: int) -> None:
+        """Registers bytes transferred by the current thread.
+
+        :param amount: the amount of bytes transferred
+        """
+        self._get_counter().bytes += amount
+
+    def refresh(self) -> None:
+        """Updates the progress bar with the progress registered by all threads."""
+        with self._counters_lock:
+            counters = list(self._counters)
+
+        completed = sum(counter.completed for counter in counters)
+        transferred_bytes = sum(counter.bytes for counter in counters)
+
+        now = self._clock()
+        self._samples.append((now, completed, transferred_bytes))
+        while len(self._samples) > 2 and now - self._samples[1][0] >= THROUGHPUT_WINDOW_SECONDS:
+            self._samples.popleft()
+
+        start_time, start_completed, start_bytes = self._samples[0]
+        elapsed = now - start_time
+        files_per_second = (completed - start_completed) / elapsed if elapsed > 0 else 0.0
+        bytes_per_second = (transferred_bytes - start_bytes) / elapsed if elapsed > 0 else 0.0
+
+        eta = "-:--:--"
+        if self._total is not None and files_per_second > 0:
+            from datetime import timedelta
+            eta = str(timedelta(seconds=round(max(0.0, self._total - completed) / files_per_second)))
+
+        self._progress.update(self._task_id,
+                              completed=completed,
+                              files_per_second=files_per_second,
+                              megabytes_per_second=bytes_per_second / 1024 / 1024,
+                              eta=eta)
+
+    def _refresh_periodically(self) -> None:
+        while not self._stopped.wait(1 / PROGRESS_REFRESH_PER_SECOND):
+            self.refresh()
+
+    def _get_counter(self) -> _Counter:
+        counter = getattr(self._local, "counter", None)
+        if counter is None:
+            counter = _Counter()
+            self._local.counter = counter
+            with self._counters_lock:
+                self._counters.append(counter)
+        return counter
@@ -189,9 +189,10 @@ class ProjectManager:
         project_dir.mkdir(parents=True, exist_ok=True)
 
         project_config = self._project_config_manager.get_project_config(project_dir)
-        project_config.set("algorithm-language", language.name)
-        project_config.set("parameters", {})
-        project_config.set("description", "")
+        with project_config.batch():
+            project_config.set("algorithm-language", language.name)
+            project_config.set("parameters", {})
+            project_config.set("description", "")
 
         if language == QCLanguage.Python:
             self._generate_python_library_projects_config()
@@ -0,0 +1,251 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from lean.components.util.logger import Logger
+from lean.models.pydantic import WrappedBaseModel
+
+# The API endpoints of which responses are cached, mapped to the amount of seconds a cached response stays fresh
+CACHEABLE_ENDPOINTS = {
+    "data/prices": 24 * 60 * 60,
+    # Listings of data directories gain files when new data is published, which happens at most a few times a day
+    "data/list": 6 * 60 * 60,
+    "market/data/list": 24 * 60 * 60,
+    "lean/environments/read": 24 * 60 * 60,
+    "projects/read": 60
+}
+
+# Request parameters which make a request to a cacheable endpoint uncacheable
+# Single projects are read right after they are changed, so only the organization-wide listing is cached
+UNCACHEABLE_PARAMETERS = {
+    "projects/read": ["projectId"]
+}
+
+# Cached endpoints mapped to the prefixes of the endpoints that change what they return
+INVALIDATING_ENDPOINTS = {
+    "projects/read": ["projects/", "files/"]
+}
+
+# The last part of endpoints which never change anything, like the "read" in "projects/read"
+READ_ONLY_ACTIONS = ["read", "list", "get", "prices", "properties", "estimate", "authenticate"]
+
+
+class CachedResponse(WrappedBaseModel):
+    # The unix timestamp of the moment the response was stored or last revalidated
+    stored_at: float
+
+    # The validators the server returned with the response, if any
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    # The raw body of the response
+    body: str
+
+    def is_fresh(self, ttl: int) -> bool:
+        """Returns whether the response is young enough to be used without asking the server.
+
+        :param ttl: the amount of seconds responses of the endpoint stay fresh
+        :return: True if the response can be used as is, False if it needs to be revalidated
+        """
+        from time import time
+        return time() - self.stored_at < ttl
+
+    def get_conditional_headers(self) -> Dict[str, str]:
+        """Returns the headers which ask the server to only send the response if it changed.
+
+        :return: the If-None-Match and If-Modified-Since headers for the stored validators
+        """
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """The ResponseCache class stores responses of read-mostly API endpoints on disk.
+
+    Every response is stored gzip-compressed in its own file, so concurrent CLI processes never corrupt each other's
+    entries. Stale responses are revalidated with the validators the server sent along with them.
+    The cache is only an optimization, so failing to write to it never fails the request that was cached.
+    """
+
+    def __init__(self, logger: Logger, directory: str) -> None:
+        """Creates a new ResponseCache instance.
+
+        :param logger: the logger to log failed writes to
+        :param directory: the directory to store cached responses in
+        """
+        self._logger = logger
+        self._directory = Path(directory)
+        self.bypass = False
+
+    def get_ttl(self, endpoint: str, parameters: Dict[str, Any]) -> Optional[int]:
+        """Returns how long the response of a request stays fresh.
+
+        :param endpoint: the API endpoint the request is sent to
+        :param parameters: the parameters or body of the request
+        :return: the amount of seconds the response stays fresh, or None if the response may not be cached
+        """
+        endpoint = endpoint.strip("/")
+        ttl = CACHEABLE_ENDPOINTS.get(endpoint)
+        if ttl is None:
+            return None
+
+        if any(key in parameters for key in UNCACHEABLE_PARAMETERS.get(endpoint, [])):
+            return None
+
+        return ttl
+
+    def get_key(self, base_url: str, user_id: str, method: str, endpoint: str, parameters: Dict[str, Any]) -> str:
+        """Returns the key under which the response of a request is stored.
+
+        :param base_url: the base url of the API the request is sent to, responses are never shared between APIs
+        :param user_id: the id of the user sending the request, responses are never shared between users
+        :param method: the HTTP method of the request
+        :param endpoint: the API endpoint the request is sent to
+        :param parameters: the parameters or body of the request
+        :return: the key of the request, which starts with the endpoint so entries can be invalidated by endpoint
+        """
+        from hashlib import sha256
+        from json import dumps
+
+        fingerprint = dumps([base_url, user_id, method.upper(), parameters], sort_keys=True, default=str)
+        return f"{endpoint.strip('/').replace('/', '-')}-{sha256(fingerprint.encode('utf-8')).hexdigest()}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Returns the stored response for the given key.
+
+        :param key: the key of the request, as returned by get_key()
+        :return: the stored response, or None if nothing is stored or the cache is bypassed
+        """
+        if self.bypass:
+            return None
+
+        from gzip import decompress
+        from json import loads
+
+        try:
+            return CachedResponse(**loads(decompress(self._get_path(key).read_bytes())))
+        except Exception:
+            # The entry doesn't exist or is corrupted, both are treated as a cache miss
+            return None
+
+    def set(self, key: str, response: Any) -> None:
+        """Stores a successful response.
+
+        :param key: the key of the request, as returned by get_key()
+        :param response: the requests response to store
+        """
+        from time import time
+
+        self._write(key, CachedResponse(stored_at=time(),
+                                        etag=response.headers.get("ETag"),
+                                        last_modified=response.headers.get("Last-Modified"),
+                                        body=response.text))
+
+    def refresh(self, key: str, cached_response: CachedResponse) -> None:
+        """Marks a stored response as fresh again after the server confirmed it did not change.
+
+        :param key: the key of the request, as returned by get_key()
+        :param cached_response: the stored response that was revalidated
+        """
+        from time import time
+
+        cached_response.stored_at = time()
+        self._write(key, cached_response)
+
+    def delete(self, key: str) -> None:
+        """Deletes a single stored response.
+
+        :param key: the key of the request, as returned by get_key()
+        """
+        self._delete(self._get_path(key))
+
+    def invalidate(self, endpoint: str) -> None:
+        """Deletes all stored responses of an endpoint.
+
+        :param endpoint: the endpoint to delete the stored responses of, like "projects/read"
+        """
+        prefix = endpoint.strip("/").replace("/", "-") + "-"
+        for path in self._get_matching_paths(prefix):
+            self._delete(path)
+
+    def invalidate_after_request(self, endpoint: str) -> None:
+        """Deletes the stored responses that may have been changed by a request to the given endpoint.
+
+        :param endpoint: the endpoint a request was sent to, like "projects/update"
+        """
+        endpoint = endpoint.strip("/")
+        if endpoint.split("/")[-1] in READ_ONLY_ACTIONS:
+            return
+
+        for cached_endpoint, prefixes in INVALIDATING_ENDPOINTS.items():
+            if any(endpoint.startswith(prefix) for prefix in prefixes):
+                self.invalidate(cached_endpoint)
+
+    def _get_matching_paths(self, prefix: str) -> List[Path]:
+        """Returns the paths of all stored responses whose keys start with the given prefix.
+
+        :param prefix: the key prefix to match
+        :return: the paths of the matching entries
+        """
+        try:
+            return [path for path in self._directory.iterdir() if path.name.startswith(prefix)]
+        except OSError:
+            return []
+
+    def _delete(self, path: Path) -> None:
+        """Deletes a stored response from disk, logging instead of raising when that fails.
+
+        :param path: the path to the file containing the stored response
+        """
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as error:
+            self._logger.debug(f"Could not delete cached response {path}: {error}")
+
+    def _write(self, key: str, cached_response: CachedResponse) -> None:
+        """Atomically writes a stored response to disk, logging instead of raising when that fails.
+
+        :param key: the key of the request, as returned by get_key()
+        :param cached_response: the response to store
+        """
+        from gzip import compress
+        from os import replace
+        from uuid import uuid4
+
+        path = self._get_path(key)
+        tmp_path = path.parent / f".{path.name}.{uuid4()}"
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(compress(cached_response.model_dump_json().encode("utf-8")))
+            replace(tmp_path, path)
+        except OSError as error:
+            self._logger.debug(f"Could not store cached response in {path}: {error}")
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def _get_path(self, key: str) -> Path:
+        """Returns the path to the file containing the stored response for the given key.
+
+        :param key: the key of the request
+        :return: the path to the file in the cache directory
+        """
+        return self._directory / f"{key}.json.gz"
@@ -0,0 +1,231 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from threading import Lock
+from typing import Any, Callable, Optional, TypeVar
+
+from lean.components.util.logger import Logger
+
+T = TypeVar("T")
+
+# The default amount of times a single request is retried
+DEFAULT_MAX_RETRIES = 3
+
+# The default amount of retries a single command may perform in total, across all of its requests
+DEFAULT_RETRY_BUDGET = 50
+
+# API endpoints which are not safe to send twice, in addition to all endpoints ending with "/create"
+NON_IDEMPOTENT_ENDPOINTS = ["live/commands/broadcast", "live/update/liquidate"]
+
+
+def is_idempotent_endpoint(endpoint: str) -> bool:
+    """Returns whether sending a request to the given API endpoint twice has the same effect as sending it once.
+
+    :param endpoint: the API endpoint, like "projects/read"
+    :return: True if the request may be repeated when it is unknown whether the server processed it, False if not
+    """
+    endpoint = endpoint.strip("/")
+    return not endpoint.endswith("/create") and endpoint not in NON_IDEMPOTENT_ENDPOINTS
+
+
+class RetryPolicy:
+    """The RetryPolicy class retries failed HTTP requests using exponential backoff with jitter.
+
+    One instance is shared by all components of a single command, its retry budget limits the total
+    amount of retries the command performs so an unavailable API makes the command fail fast.
+    """
+
+    def __init__(self,
+                 logger: Logger,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 retry_budget: int = DEFAULT_RETRY_BUDGET,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 30,
+                 sleep: Optional[Callable[[float], None]] = None) -> None:
+        """Creates a new RetryPolicy instance.
+
+        :param logger: the logger to log retries with
+        :param max_retries: the maximum amount of times a single request is retried
+        :param retry_budget: the maximum amount of retries across all requests made through this policy
+        :param backoff_base: the delay in seconds before the first retry, doubled on every following retry
+        :param backoff_max: the maximum delay in seconds between two attempts, also applied to Retry-After
+        :param sleep: the function to wait with, defaults to time.sleep
+        """
+        self._logger = logger
+        self._max_retries = max(0, max_retries)
+        self._retry_budget = max(0, retry_budget)
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._budget_lock = Lock()
+
+        if sleep is None:
+            from time import sleep
+        self._sleep = sleep
+
+    def run(self,
+            send: Callable[[], T],
+            idempotent: bool = True,
+            description: str = "request",
+            on_retry: Optional[Callable[[], None]] = None) -> T:
+        """Runs a request, retrying it when it fails with a transient error.
+
+        The request is retried when it raises a transient error or when it returns a response with a transient
+        status code. Errors after which it is unknown whether the server processed the request are only retried
+        when the request is idempotent. When no retries are left the last response is returned or the last
+        error is raised, so callers handle failures exactly like they would without retries.
+
+        :param send: the function that sends the request and returns its response
+        :param idempotent: True if the request may safely be sent more than once, False if not
+        :param description: a display-friendly description of the request, used in debug messages
+        :param on_retry: the function to call before every retry, or None if nothing needs to happen
+        :return: the return value of the last call to send
+        """
+        attempt = 0
+        while True:
+            try:
+                result = send()
+            except Exception as exception:
+                if not self._should_retry_exception(exception, attempt, idempotent) or not self._consume_budget():
+                    raise
+                reason = type(exception).__name__
+                delay = self._get_delay(attempt, getattr(exception, "response", None))
+            else:
+                status_code = getattr(result, "status_code", None)
+                if status_code is None \
+                        or not self._should_retry_status(status_code, attempt, idempotent) \
+                        or not self._consume_budget():
+                    return result
+                reason = f"HTTP {status_code}"
+                delay = self._get_delay(attempt, result)
+
+                # The response is discarded, release its connection back to the pool
+                close = getattr(result, "close", None)
+                if close is not None:
+                    close()
+
+            attempt += 1
+            self._logger.debug(f"Retrying {description} in {delay:.2f} seconds after {reason} "
+                               f"(retry {attempt} of {self._max_retries})")
+            if on_retry is not None:
+                on_retry()
+            self._sleep(delay)
+
+    def _should_retry_status(self, status_code: int, attempt: int, idempotent: bool) -> bool:
+        """Returns whether a request which returned a response with the given status code should be retried.
+
+        :param status_code: the status code of the response
+        :param attempt: the amount of retries that have already been performed for the request
+        :param idempotent: whether the request may safely be sent more than once
+        :return: True if the request should be retried, False if not
+        """
+        if attempt >= self._max_retries:
+            return False
+
+        # The server explicitly did not process the request, so it's always safe to send it again
+        if status_code == 429:
+            return True
+
+        if not idempotent:
+            return False
+
+        # The API also responds with HTTP 500 when the credentials are invalid, so that is only retried once
+        if status_code == 500:
+            return attempt == 0
+
+        return 500 < status_code < 600
+
+    def _should_retry_exception(self, exception: Exception, attempt: int, idempotent: bool) -> bool:
+        """Returns whether a request which raised the given error should be retried.
+
+        :param exception: the error raised while sending the request or reading its response
+        :param attempt: the amount of retries that have already been performed for the request
+        :param idempotent: whether the request may safely be sent more than once
+        :return: True if the request should be retried, False if not
+        """
+        from requests import exceptions
+
+        if isinstance(exception, exceptions.HTTPError) and exception.response is not None:
+            return self._should_retry_status(exception.response.status_code, attempt, idempotent)
+
+        if attempt >= self._max_retries:
+            return False
+
+        # The connection was never established, so the server cannot have received the request
+        if isinstance(exception, exceptions.ConnectTimeout):
+            return True
+
+        if not idempotent:
+            return False
+
+        return isinstance(exception, (exceptions.ConnectionError,
+                                      exceptions.Timeout,
+                                      exceptions.ChunkedEncodingError))
+
+    def _consume_budget(self) -> bool:
+        """Takes a single retry from the retry budget.
+
+        :return: True if a retry was available, False if the budget is exhausted
+        """
+        with self._budget_lock:
+            if self._retry_budget <= 0:
+                self._logger.debug("Not retrying request because the retry budget of this command is exhausted")
+                return False
+
+            self._retry_budget -= 1
+            return True
+
+    def _get_delay(self, attempt: int, response: Any) -> float:
+        """Returns the amount of seconds to wait before the next attempt.
+
+        The Retry-After header is honored when the response has one,
+        otherwise exponential backoff with full jitter is used.
+
+        :param attempt: the amount of retries that have already been performed for the request
+        :param response: the response of the failed attempt, or None if no response was received
+        :return: the amount of seconds to wait
+        """
+        retry_after = self._parse_retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self._backoff_max)
+
+        from random import uniform
+        return uniform(0, min(self._backoff_max, self._backoff_base * (2 ** attempt)))
+
+    def _parse_retry_after(self, response: Any) -> Optional[float]:
+        """Parses the Retry-After header of a response.
+
+        :param response: the response to parse the header of, may be None
+        :return: the amount of seconds the server asked to wait, or None if the response has no valid header
+        """
+        headers = getattr(response, "headers", None)
+        if headers is None:
+            return None
+
+        value = headers.get("Retry-After")
+        if value is None:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        from datetime import datetime, timezone
+        from email.utils import parsedate_to_datetime
+        try:
+            retry_at = parsedate_to_datetime(value)
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
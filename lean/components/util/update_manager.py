@@ -11,14 +11,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from functools import cached_property
+from typing import TYPE_CHECKING, Callable, Optional
+
 from lean.components.config.storage import Storage
-from lean.components.docker.docker_manager import DockerManager
 from lean.components.util.http_client import HTTPClient
 from lean.components.util.logger import Logger
 from lean.constants import (UPDATE_CHECK_INTERVAL_ANNOUNCEMENTS, UPDATE_CHECK_INTERVAL_CLI,
                             UPDATE_CHECK_INTERVAL_DOCKER_IMAGE)
 from lean.models.docker import DockerImage
 
+# The DockerManager is only needed to update Docker images, not for the update checks every command runs
+if TYPE_CHECKING:
+    from lean.components.docker.docker_manager import DockerManager
+
 
 class UpdateManager:
     """The UpdateManager class contains methods to check for and warn the user about available updates."""
@@ -27,18 +33,23 @@ class UpdateManager:
                  logger: Logger,
                  http_client: HTTPClient,
                  cache_storage: Storage,
-                 docker_manager: DockerManager) -> None:
+                 get_docker_manager: Callable[[], "DockerManager"]) -> None:
         """Creates a new UpdateManager instance.
 
         :param logger: the logger to use when warning the user when something is outdated
         :param http_client: the HTTPClient instance to use for HTTP requests
         :param cache_storage: the Storage instance to use for getting/setting the last time a certain update check was performed
-        :param docker_manager: the DockerManager instance to use to check for Docker updates
+        :param get_docker_manager: the function returning the DockerManager instance to use to check for Docker updates,
+            which is called the first time a Docker image is checked
         """
         self._logger = logger
         self._http_client = http_client
         self._cache_storage = cache_storage
-        self._docker_manager = docker_manager
+        self._get_docker_manager = get_docker_manager
+
+    @cached_property
+    def _docker_manager(self) -> "DockerManager":
+        return self._get_docker_manager()
 
     def warn_if_cli_outdated(self, force: bool = False) -> None:
         """Warns the user if the CLI is outdated.
@@ -47,32 +58,60 @@ class UpdateManager:
 
         :param force: whether the update check interval should be bypassed (defaults to False)
         """
+        report = self.check_cli_outdated(force)
+        if report is not None:
+            report()
+
+    def check_cli_outdated(self, force: bool = False) -> Optional[Callable[[], None]]:
+        """Checks whether the CLI is outdated without warning the user yet.
+
+        This method is safe to call from a background thread, the returned function must be called on the main thread.
+        The update check only counts as performed once the returned function has been called, so a check of which
+        the result is never reported is performed again on the next run.
+
+        :param force: whether the update check interval should be bypassed (defaults to False)
+        :return: a function warning the user if the CLI is outdated, or None if no update check was due
+        """
         from lean import __version__
         current_version = __version__
 
         # A development version is never considered outdated
         if "dev" in current_version:
-            return
+            return None
+
+        if not force and not self._is_update_check_due("cli", UPDATE_CHECK_INTERVAL_CLI):
+            return None
+
+        latest_version = self._get_latest_cli_version()
+
+        def report() -> None:
+            self._record_update_check("cli")
 
-        if not force and not self._should_check_for_updates("cli", UPDATE_CHECK_INTERVAL_CLI):
-            return
+            from packaging.version import Version
+            if latest_version is None or Version(latest_version) <= Version(current_version):
+                return
+
+            self._logger.warn(f"A new release of the Lean CLI is available ({current_version} -> {latest_version})")
+            self._logger.warn("Run `pip install --upgrade lean` to update to the latest version")
+
+        return report
+
+    def _get_latest_cli_version(self) -> Optional[str]:
+        """Returns the latest version of the CLI on PyPI.
 
+        :return: the latest version of the CLI, or None if it could not be retrieved
+        """
         from requests import exceptions
         try:
             response = self._http_client.get("https://pypi.org/pypi/lean/json", raise_for_status=False)
         except exceptions.ConnectionError:
             # The user may be offline, do nothing
-            return
+            return None
 
         if not response.ok:
-            return
+            return None
 
-        latest_version = response.json()["info"]["version"]
-        from packaging.version import Version
-
-        if Version(latest_version) > Version(current_version):
-            self._logger.warn(f"A new release of the Lean CLI is available ({current_version} -> {latest_version})")
-            self._logger.warn("Run `pip install --upgrade lean` to update to the latest version")
+        return response.json()["info"]["version"]
 
     def pull_docker_image_if_necessary(self, image: DockerImage, force: bool, no_update = False) -> None:
         """Pulls a Docker image if necessary.
@@ -118,14 +157,30 @@ class UpdateManager:
 
         We check for new announcements once every UPDATE_CHECK_INTERVAL_ANNOUNCEMENTS hours.
         """
+        report = self.check_announcements()
+        if report is not None:
+            report()
+
+    def check_announcements(self) -> Optional[Callable[[], None]]:
+        """Checks whether the announcements have been updated without showing them yet.
+
+        This method is safe to call from a background thread, the returned function must be called on the main thread.
+        The check and the announcements only count as seen once the returned function has been called,
+        so announcements of which the check is never reported are shown on the next run.
+
+        :return: a function showing the updated announcements, or None if no check was due
+        """
         from requests import exceptions
         from hashlib import md5
         from rich import box
         from rich.panel import Panel
         from rich.table import Table
 
-        if not self._should_check_for_updates("announcements", UPDATE_CHECK_INTERVAL_ANNOUNCEMENTS):
-            return
+        if not self._is_update_check_due("announcements", UPDATE_CHECK_INTERVAL_ANNOUNCEMENTS):
+            return None
+
+        def record_check() -> None:
+            self._record_update_check("announcements")
 
         try:
             response = self._http_client.get(
@@ -134,10 +189,10 @@ class UpdateManager:
             )
         except exceptions.ConnectionError:
             # The user may be offline, do nothing
-            return
+            return record_check
 
         if not response.ok:
-            return
+            return record_check
 
         hash_cache_key = "last-announcements-hash"
 
@@ -145,13 +200,9 @@ class UpdateManager:
         local_hash = self._cache_storage.get(hash_cache_key, None)
 
         if local_hash == remote_hash:
-            return
-
-        self._cache_storage.set(hash_cache_key, remote_hash)
+            return record_check
 
         announcements = response.json()["announcements"]
-        if len(announcements) == 0:
-            return
 
         table = Table.grid(padding=(0, 1))
         table.add_column(overflow="fold")
@@ -160,7 +211,13 @@ class UpdateManager:
         for announcement in announcements:
             table.add_row(announcement["date"] + ":", announcement["message"])
 
-        self._logger.info(Panel.fit(table, title="Announcements", box=box.SQUARE))
+        def report() -> None:
+            record_check()
+            self._cache_storage.set(hash_cache_key, remote_hash)
+            if len(announcements) > 0:
+                self._logger.info(Panel.fit(table, title="Announcements", box=box.SQUARE))
+
+        return report
 
     def force_refresh_modules_json(self) -> None:
         """Forces a re-download of the modules JSON file, bypassing the 24-hour cache interval."""
@@ -176,6 +233,21 @@ class UpdateManager:
 
         When this method returns True, for the next <interval_hours> hours it returns False for <key>.
 
+        :param key: the key which is used to identify the current update check
+        :param interval_hours: the amount of hours between update checks for the given key
+        :return: True if an update check should be performed, False if not
+        """
+        should_check = self._is_update_check_due(key, interval_hours)
+
+        if should_check:
+            # Save the current timestamp so for the next <interval_hours> hours we can return False for <key>
+            self._record_update_check(key)
+
+        return should_check
+
+    def _is_update_check_due(self, key: str, interval_hours: int) -> bool:
+        """Returns whether an update check should be performed, without recording that it is performed.
+
         :param key: the key which is used to identify the current update check
         :param interval_hours: the amount of hours between update checks for the given key
         :return: True if an update check should be performed, False if not
@@ -183,21 +255,21 @@ class UpdateManager:
         from datetime import datetime, timedelta, timezone
 
         storage_key = f"last-update-check-{key}"
-        should_check = False
 
         if not self._cache_storage.has(storage_key):
             # Perform an update check if we haven't ran one yet
-            should_check = True
-        else:
-            last_update_check = datetime.fromtimestamp(self._cache_storage.get(storage_key), tz=timezone.utc)
-            time_since_last_update_check = datetime.now(tz=timezone.utc) - last_update_check
+            return True
 
-            if time_since_last_update_check >= timedelta(hours=interval_hours):
-                # Perform an update check if the time since the last update check is greater than the given interval
-                should_check = True
+        last_update_check = datetime.fromtimestamp(self._cache_storage.get(storage_key), tz=timezone.utc)
+        time_since_last_update_check = datetime.now(tz=timezone.utc) - last_update_check
 
-        if should_check:
-            # Save the current timestamp so for the next <interval_hours> hours we can return False for <key>
-            self._cache_storage.set(storage_key, datetime.now(tz=timezone.utc).timestamp())
+        # Perform an update check if the time since the last update check is greater than the given interval
+        return time_since_last_update_check >= timedelta(hours=interval_hours)
 
-        return should_check
+    def _record_update_check(self, key: str) -> None:
+        """Records that an update check has been performed, so it isn't due again for its interval.
+
+        :param key: the key which is used to identify the update check
+        """
+        from datetime import datetime, timezone
+        self._cache_storage.set(f"last-update-check-{key}", datetime.now(tz=timezone.utc).timestamp())
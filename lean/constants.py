@@ -44,9 +44,18 @@ CREDENTIALS_CONFIG_PATH = str(Path("~/.lean/credentials").expanduser())
 # The file in which we store when we last checked for updates
 CACHE_PATH = str(Path("~/.lean/cache").expanduser())
 
+# The directory in which responses of read-mostly API endpoints are cached
+RESPONSE_CACHE_DIRECTORY = str(Path("~/.lean/response-cache").expanduser())
+
+# The directory containing the lock files which serialize writes of concurrent processes to the same file
+FILE_LOCKS_DIRECTORY = str(Path("~/.lean/locks").expanduser())
+
 # The directory in which modules are stored
 MODULES_DIRECTORY = str(Path("~/.lean/modules").expanduser())
 
+# The directory in which the modules JSON file and the catalog of parsed modules are cached
+MODULES_JSON_DIRECTORY = str(Path("~/.lean/modules-json").expanduser())
+
 # The file in which we send live commands to running docker container
 COMMAND_FILE_BASENAME = "command"
 
@@ -93,6 +102,42 @@ UPDATE_CHECK_INTERVAL_DOCKER_IMAGE = 24 * 7
 # The interval in hours at which the CLI checks for new announcements
 UPDATE_CHECK_INTERVAL_ANNOUNCEMENTS = 24
 
+# The amount of seconds after which the CLI stops waiting for background housekeeping tasks like update checks
+HOUSEKEEPING_DEADLINE_SECONDS = 5
+
+# The name of the housekeeping task which updates the market hours and symbol properties databases
+HOUSEKEEPING_TASK_DATABASE_FILES = "database-files"
+
+# The default maximum number of data files which are downloaded concurrently
+DEFAULT_MAX_DOWNLOAD_CONCURRENCY = 32
+
+# The default amount of byte ranges a large bulk data file is downloaded in concurrently
+DEFAULT_DOWNLOAD_SEGMENTS = 8
+
+# The default size in megabytes above which bulk data files are downloaded in multiple byte ranges concurrently
+DEFAULT_SEGMENTED_DOWNLOAD_THRESHOLD = 100
+
+# Bulk data files are downloaded to a temporary file, possibly in multiple byte ranges, before they are extracted
+BULK_DOWNLOAD_MODE_SEGMENTED = "segmented"
+
+# Bulk data files are extracted while they are downloaded, without storing them in a temporary file
+BULK_DOWNLOAD_MODE_STREAM = "stream"
+
+# The directory in which CLI processes downloading data register the priority of their downloads
+DOWNLOAD_QUEUE_DIRECTORY = str(Path("~/.lean/download-queue").expanduser())
+
+# Downloads which yield to downloads of all other priorities, like large background downloads
+DOWNLOAD_PRIORITY_LOW = "low"
+
+# The priority of downloads started by `lean data download` by default
+DOWNLOAD_PRIORITY_NORMAL = "normal"
+
+# Downloads which other downloads yield to, like the data downloaded while running a backtest
+DOWNLOAD_PRIORITY_HIGH = "high"
+
+# The name of the file in the root of the data directory containing the index of the data directory
+DATA_INVENTORY_FILE_NAME = ".lean-data-inventory.db"
+
 # The name of the Docker network which all Lean CLI containers are ran on
 DOCKER_NETWORK = "lean_cli"
 
@@ -12,166 +12,380 @@
 # limitations under the License.
 
 from pathlib import Path
-from typing import Union, Any, Optional, Tuple
-
-from lean.components.api.api_client import APIClient
-from lean.components.config.lean_config_manager import LeanConfigManager
-from lean.components.config.project_config_manager import ProjectConfigManager
-from lean.components.util.path_manager import PathManager
-from lean.components.cloud.cloud_project_manager import CloudProjectManager
-from lean.components.cloud.cloud_runner import CloudRunner
-from lean.components.cloud.data_downloader import DataDownloader
-from lean.components.cloud.module_manager import ModuleManager
-from lean.components.cloud.pull_manager import PullManager
-from lean.components.cloud.push_manager import PushManager
-from lean.components.config.cli_config_manager import CLIConfigManager
-from lean.components.config.optimizer_config_manager import OptimizerConfigManager
-from lean.components.config.output_config_manager import OutputConfigManager
-from lean.components.config.storage import Storage
-from lean.components.docker.docker_manager import DockerManager
-from lean.components.docker.lean_runner import LeanRunner
-from lean.components.util.http_client import HTTPClient
-from lean.components.util.library_manager import LibraryManager
-from lean.components.util.logger import Logger
-from lean.components.util.market_hours_database import MarketHoursDatabase
-from lean.components.util.name_generator import NameGenerator
-from lean.components.util.organization_manager import OrganizationManager
-from lean.components.util.platform_manager import PlatformManager
-from lean.components.util.project_manager import ProjectManager
-from lean.components.util.task_manager import TaskManager
-from lean.components.util.temp_manager import TempManager
-from lean.components.util.update_manager import UpdateManager
-from lean.components.util.xml_manager import XMLManager
-from lean.constants import CACHE_PATH, CREDENTIALS_CONFIG_PATH, GENERAL_CONFIG_PATH, DEFAULT_RESEARCH_IMAGE
-from lean.constants import DEFAULT_ENGINE_IMAGE, CONTAINER_LABEL_LEAN_VERSION_NAME
-from lean.models.docker import DockerImage
+from threading import RLock
+from typing import TYPE_CHECKING, Any, Callable, Generic, Optional, Tuple, TypeVar, Union
+
+from lean.constants import DEFAULT_RESEARCH_IMAGE, DEFAULT_ENGINE_IMAGE, CONTAINER_LABEL_LEAN_VERSION_NAME
+
+# Components are only imported when they are first used, so commands don't pay for the components they don't need
+if TYPE_CHECKING:
+    from lean.components.api.api_client import APIClient
+    from lean.components.api.async_api_client import AsyncAPIClient
+    from lean.components.cloud.cloud_project_manager import CloudProjectManager
+    from lean.components.cloud.cloud_runner import CloudRunner
+    from lean.components.cloud.data_downloader import DataDownloader
+    from lean.components.cloud.module_manager import ModuleManager
+    from lean.components.cloud.pull_manager import PullManager
+    from lean.components.cloud.push_manager import PushManager
+    from lean.components.config.cli_config_manager import CLIConfigManager
+    from lean.components.config.lean_config_manager import LeanConfigManager
+    from lean.components.config.optimizer_config_manager import OptimizerConfigManager
+    from lean.components.config.output_config_manager import OutputConfigManager
+    from lean.components.config.project_config_manager import ProjectConfigManager
+    from lean.components.config.storage import Storage
+    from lean.components.docker.docker_manager import DockerManager
+    from lean.components.docker.lean_runner import LeanRunner
+    from lean.components.util.data_store import DataStore
+    from lean.components.util.download_queue import DownloadQueue
+    from lean.components.util.housekeeping_manager import HousekeepingManager
+    from lean.components.util.http_client import HTTPClient
+    from lean.components.util.library_manager import LibraryManager
+    from lean.components.util.logger import Logger
+    from lean.components.util.market_hours_database import MarketHoursDatabase
+    from lean.components.util.name_generator import NameGenerator
+    from lean.components.util.organization_manager import OrganizationManager
+    from lean.components.util.path_manager import PathManager
+    from lean.components.util.platform_manager import PlatformManager
+    from lean.components.util.project_manager import ProjectManager
+    from lean.components.util.response_cache import ResponseCache
+    from lean.components.util.retry_policy import RetryPolicy
+    from lean.components.util.task_manager import TaskManager
+    from lean.components.util.temp_manager import TempManager
+    from lean.components.util.update_manager import UpdateManager
+    from lean.components.util.xml_manager import XMLManager
+    from lean.models.docker import DockerImage
+
+T = TypeVar("T")
+
+
+class component(Generic[T]):
+    """The component decorator turns a method of the Container into a lazily created component.
+
+    The method is called the first time the component is accessed, after which its return value is stored on the
+    container so later accesses are plain attribute lookups. Assigning to the attribute replaces the component.
+    """
+
+    def __init__(self, factory: Callable[[Any], T]) -> None:
+        """Creates a new component instance.
+
+        :param factory: the function creating the component, called with the container as only argument
+        """
+        self._factory = factory
+        self._name = factory.__name__
+
+    def __set_name__(self, owner: Any, name: str) -> None:
+        self._name = name
+
+    def __get__(self, instance: Any, owner: Any = None) -> T:
+        if instance is None:
+            return self
+
+        # Components may be accessed from background threads, the lock makes sure each component is created once
+        with instance._lock:
+            if self._name not in instance.__dict__:
+                instance.__dict__[self._name] = self._factory(instance)
+            return instance.__dict__[self._name]
 
 
 class Container:
 
     def __init__(self):
-        self.project_config_manager = None
-        self.cli_config_manager = None
+        self._lock = RLock()
         self.initialize()
 
     def initialize(self,
-                   docker_manager: Union[DockerManager, Any] = None,
-                   api_client: Union[APIClient, Any] = None,
-                   lean_runner: Union[LeanRunner, Any] = None,
-                   cloud_runner: Union[CloudRunner, Any] = None,
-                   push_manager: Union[PushManager, Any] = None,
-                   organization_manager: Union[OrganizationManager, Any] = None,
-                   project_config_manager: Union[ProjectConfigManager, Any] = None):
-        """The Container class wires all reusable components together."""
-        self.logger = Logger()
-
-        self.platform_manager = PlatformManager()
-        self.task_manager = TaskManager(self.logger)
-        self.name_generator = NameGenerator()
-        self.temp_manager = TempManager(self.logger)
-        self.xml_manager = XMLManager()
-        self.http_client = HTTPClient(self.logger)
-
-        self.general_storage = Storage(file=GENERAL_CONFIG_PATH)
-        self.credentials_storage = Storage(file=CREDENTIALS_CONFIG_PATH)
-        self.cache_storage = Storage(file=CACHE_PATH)
-
-        self.cli_config_manager = CLIConfigManager(self.general_storage, self.credentials_storage)
-
-        self.api_client = api_client
-        if not self.api_client:
-            self.api_client = APIClient(self.logger,
-                                        self.http_client,
-                                        user_id=self.cli_config_manager.user_id.get_value(),
-                                        api_token=self.cli_config_manager.api_token.get_value())
-
-        self.module_manager = ModuleManager(self.logger, self.api_client, self.http_client)
-
-        self.project_config_manager = project_config_manager
-        if not self.project_config_manager:
-            self.project_config_manager = ProjectConfigManager(self.xml_manager)
-
-        self.lean_config_manager = LeanConfigManager(self.logger,
-                                                     self.cli_config_manager,
-                                                     self.project_config_manager,
-                                                     self.module_manager,
-                                                     self.cache_storage)
-        self.path_manager = PathManager(self.lean_config_manager, self.platform_manager)
-        self.output_config_manager = OutputConfigManager(self.lean_config_manager)
-        self.optimizer_config_manager = OptimizerConfigManager(self.logger)
-
-        self.docker_manager = docker_manager
-        if not self.docker_manager:
-            self.docker_manager = DockerManager(self.logger, self.temp_manager, self.platform_manager)
-
-        self.project_manager = ProjectManager(self.logger,
-                                              self.project_config_manager,
-                                              self.lean_config_manager,
-                                              self.path_manager,
-                                              self.xml_manager,
-                                              self.platform_manager,
-                                              self.cli_config_manager,
-                                              self.docker_manager)
-        self.library_manager = LibraryManager(self.logger,
-                                              self.project_manager,
-                                              self.project_config_manager,
-                                              self.lean_config_manager,
-                                              self.path_manager,
-                                              self.xml_manager)
-
-        self.organization_manager = organization_manager
-        if not self.organization_manager:
-            self.organization_manager = OrganizationManager(self.logger, self.lean_config_manager)
-
-        self.cloud_runner = cloud_runner
-        if not cloud_runner:
-            self.cloud_runner = CloudRunner(self.logger, self.api_client, self.task_manager)
-        self.pull_manager = PullManager(self.logger,
-                                        self.api_client,
-                                        self.project_manager,
-                                        self.project_config_manager,
-                                        self.library_manager,
-                                        self.platform_manager,
-                                        self.organization_manager)
-
-        self.push_manager = push_manager
-        if not push_manager:
-            self.push_manager = PushManager(self.logger,
-                                            self.api_client,
-                                            self.project_manager,
-                                            self.project_config_manager,
-                                            self.organization_manager)
-        self.data_downloader = DataDownloader(self.logger,
-                                              self.api_client,
-                                              self.lean_config_manager,
-                                              self.cli_config_manager.database_update_frequency.get_value())
-        self.cloud_project_manager = CloudProjectManager(self.api_client,
-                                                         self.project_config_manager,
-                                                         self.pull_manager,
-                                                         self.push_manager,
-                                                         self.path_manager,
-                                                         self.project_manager,
-                                                         self.organization_manager)
-
-        self.lean_runner = lean_runner
-        if not self.lean_runner:
-            self.lean_runner = LeanRunner(self.logger,
-                                          self.project_config_manager,
-                                          self.lean_config_manager,
-                                          self.output_config_manager,
-                                          self.docker_manager,
-                                          self.module_manager,
-                                          self.project_manager,
-                                          self.temp_manager,
-                                          self.xml_manager)
-
-        self.market_hours_database = MarketHoursDatabase(self.lean_config_manager)
-
-        self.update_manager = UpdateManager(self.logger, self.http_client, self.cache_storage, self.docker_manager)
+                   docker_manager: Union["DockerManager", Any] = None,
+                   api_client: Union["APIClient", Any] = None,
+                   lean_runner: Union["LeanRunner", Any] = None,
+                   cloud_runner: Union["CloudRunner", Any] = None,
+                   push_manager: Union["PushManager", Any] = None,
+                   organization_manager: Union["OrganizationManager", Any] = None,
+                   project_config_manager: Union["ProjectConfigManager", Any] = None):
+        """The Container class wires all reusable components together.
+
+        Components are created when they are first accessed, the given components are used instead of creating them.
+        """
+        with self._lock:
+            # Forget the components created since the previous initialization, they are recreated on first access
+            for name, value in vars(type(self)).items():
+                if isinstance(value, component):
+                    self.__dict__.pop(name, None)
+
+            overrides = {
+                "docker_manager": docker_manager,
+                "api_client": api_client,
+                "lean_runner": lean_runner,
+                "cloud_runner": cloud_runner,
+                "push_manager": push_manager,
+                "organization_manager": organization_manager,
+                "project_config_manager": project_config_manager
+            }
+
+            for name, value in overrides.items():
+                if value:
+                    self.__dict__[name] = value
+
+    @component
+    def logger(self) -> "Logger":
+        from lean.components.util.logger import Logger
+        return Logger()
+
+    @component
+    def platform_manager(self) -> "PlatformManager":
+        from lean.components.util.platform_manager import PlatformManager
+        return PlatformManager()
+
+    @component
+    def task_manager(self) -> "TaskManager":
+        from lean.components.util.task_manager import TaskManager
+        return TaskManager(self.logger)
+
+    @component
+    def name_generator(self) -> "NameGenerator":
+        from lean.components.util.name_generator import NameGenerator
+        return NameGenerator()
+
+    @component
+    def temp_manager(self) -> "TempManager":
+        from lean.components.util.temp_manager import TempManager
+        return TempManager(self.logger)
+
+    @component
+    def xml_manager(self) -> "XMLManager":
+        from lean.components.util.xml_manager import XMLManager
+        return XMLManager()
+
+    @component
+    def general_storage(self) -> "Storage":
+        from lean.components.config.storage import Storage
+        from lean.constants import GENERAL_CONFIG_PATH
+        return Storage(file=GENERAL_CONFIG_PATH)
+
+    @component
+    def credentials_storage(self) -> "Storage":
+        from lean.components.config.storage import Storage
+        from lean.constants import CREDENTIALS_CONFIG_PATH
+        return Storage(file=CREDENTIALS_CONFIG_PATH)
+
+    @component
+    def cache_storage(self) -> "Storage":
+        from lean.components.config.storage import Storage
+        from lean.constants import CACHE_PATH
+        return Storage(file=CACHE_PATH)
+
+    @component
+    def cli_config_manager(self) -> "CLIConfigManager":
+        from lean.components.config.cli_config_manager import CLIConfigManager
+        return CLIConfigManager(self.general_storage, self.credentials_storage)
+
+    @component
+    def http_client(self) -> "HTTPClient":
+        from lean.components.util.http_client import HTTPClient
+        from lean.constants import DEFAULT_MAX_DOWNLOAD_CONCURRENCY
+
+        # The connection pool is sized so every parallel data download can keep its own connection alive
+        return HTTPClient(self.logger,
+                          pool_size=self.cli_config_manager.http_pool_size.get_int_value()
+                                    or DEFAULT_MAX_DOWNLOAD_CONCURRENCY,
+                          keep_alive=self.cli_config_manager.http_keep_alive.get_value("true") == "true")
+
+    @component
+    def retry_policy(self) -> "RetryPolicy":
+        from lean.components.util.retry_policy import RetryPolicy
+        return RetryPolicy(self.logger,
+                           max_retries=self.cli_config_manager.http_max_retries.get_int_value(),
+                           retry_budget=self.cli_config_manager.http_retry_budget.get_int_value())
+
+    @component
+    def response_cache(self) -> "ResponseCache":
+        from lean.components.util.response_cache import ResponseCache
+        from lean.constants import RESPONSE_CACHE_DIRECTORY
+        return ResponseCache(self.logger, RESPONSE_CACHE_DIRECTORY)
+
+    @component
+    def api_client(self) -> "APIClient":
+        from lean.components.api.api_client import APIClient
+        return APIClient(self.logger,
+                         self.http_client,
+                         user_id=self.cli_config_manager.user_id.get_value(),
+                         api_token=self.cli_config_manager.api_token.get_value(),
+                         retry_policy=self.retry_policy,
+                         response_cache=self.response_cache)
+
+    @component
+    def async_api_client(self) -> "AsyncAPIClient":
+        from lean.components.api.async_api_client import AsyncAPIClient
+        return AsyncAPIClient(self.api_client)
+
+    @component
+    def module_manager(self) -> "ModuleManager":
+        from lean.components.cloud.module_manager import ModuleManager
+        return ModuleManager(self.logger, self.api_client, self.http_client, self.retry_policy)
+
+    @component
+    def project_config_manager(self) -> "ProjectConfigManager":
+        from lean.components.config.project_config_manager import ProjectConfigManager
+        return ProjectConfigManager(self.xml_manager)
+
+    @component
+    def lean_config_manager(self) -> "LeanConfigManager":
+        from lean.components.config.lean_config_manager import LeanConfigManager
+        return LeanConfigManager(self.logger,
+                                 self.cli_config_manager,
+                                 self.project_config_manager,
+                                 lambda: self.module_manager,
+                                 self.cache_storage)
+
+    @component
+    def path_manager(self) -> "PathManager":
+        from lean.components.util.path_manager import PathManager
+        return PathManager(self.lean_config_manager, self.platform_manager)
+
+    @component
+    def output_config_manager(self) -> "OutputConfigManager":
+        from lean.components.config.output_config_manager import OutputConfigManager
+        return OutputConfigManager(self.lean_config_manager)
+
+    @component
+    def optimizer_config_manager(self) -> "OptimizerConfigManager":
+        from lean.components.config.optimizer_config_manager import OptimizerConfigManager
+        return OptimizerConfigManager(self.logger)
+
+    @component
+    def docker_manager(self) -> "DockerManager":
+        from lean.components.docker.docker_manager import DockerManager
+        return DockerManager(self.logger, self.temp_manager, self.platform_manager)
+
+    @component
+    def project_manager(self) -> "ProjectManager":
+        from lean.components.util.project_manager import ProjectManager
+        return ProjectManager(self.logger,
+                              self.project_config_manager,
+                              self.lean_config_manager,
+                              self.path_manager,
+                              self.xml_manager,
+                              self.platform_manager,
+                              self.cli_config_manager,
+                              self.docker_manager)
+
+    @component
+    def library_manager(self) -> "LibraryManager":
+        from lean.components.util.library_manager import LibraryManager
+        return LibraryManager(self.logger,
+                              self.project_manager,
+                              self.project_config_manager,
+                              self.lean_config_manager,
+                              self.path_manager,
+                              self.xml_manager)
+
+    @component
+    def organization_manager(self) -> "OrganizationManager":
+        from lean.components.util.organization_manager import OrganizationManager
+        return OrganizationManager(self.logger, self.lean_config_manager)
+
+    @component
+    def cloud_runner(self) -> "CloudRunner":
+        from lean.components.cloud.cloud_runner import CloudRunner
+        return CloudRunner(self.logger, self.api_client, self.task_manager)
+
+    @component
+    def pull_manager(self) -> "PullManager":
+        from lean.components.cloud.pull_manager import PullManager
+        return PullManager(self.logger,
+                           self.api_client,
+                           self.project_manager,
+                           self.project_config_manager,
+                           self.library_manager,
+                           self.platform_manager,
+                           self.organization_manager,
+                           self.async_api_client)
+
+    @component
+    def push_manager(self) -> "PushManager":
+        from lean.components.cloud.push_manager import PushManager
+        return PushManager(self.logger,
+                           self.api_client,
+                           self.project_manager,
+                           self.project_config_manager,
+                           self.organization_manager)
+
+    @component
+    def data_downloader(self) -> "DataDownloader":
+        from lean.components.cloud.data_downloader import DataDownloader
+        from lean.constants import BULK_DOWNLOAD_MODE_SEGMENTED
+        return DataDownloader(self.logger,
+                              self.api_client,
+                              self.lean_config_manager,
+                              self.cli_config_manager.database_update_frequency.get_value(),
+                              self.cache_storage,
+                              self.cli_config_manager.download_segments.get_int_value(),
+                              self.cli_config_manager.segmented_download_threshold.get_int_value() * 1024 * 1024,
+                              self.cli_config_manager.bulk_download_mode.get_value(BULK_DOWNLOAD_MODE_SEGMENTED),
+                              self.data_store,
+                              self.cli_config_manager.download_bandwidth_schedule.get_schedule(),
+                              self.download_queue)
+
+    @component
+    def download_queue(self) -> "DownloadQueue":
+        from pathlib import Path
+        from lean.components.util.download_queue import DownloadQueue
+        from lean.constants import DOWNLOAD_QUEUE_DIRECTORY
+        return DownloadQueue(self.logger, Path(DOWNLOAD_QUEUE_DIRECTORY))
+
+    @component
+    def data_store(self) -> Optional["DataStore"]:
+        from pathlib import Path
+        from lean.components.util.data_store import DataStore
+
+        directory = self.cli_config_manager.data_store.get_value()
+        if directory is None:
+            return None
+
+        return DataStore(self.logger, Path(directory).expanduser())
+
+    @component
+    def cloud_project_manager(self) -> "CloudProjectManager":
+        from lean.components.cloud.cloud_project_manager import CloudProjectManager
+        return CloudProjectManager(self.api_client,
+                                   self.project_config_manager,
+                                   self.pull_manager,
+                                   self.push_manager,
+                                   self.path_manager,
+                                   self.project_manager,
+                                   self.organization_manager)
+
+    @component
+    def lean_runner(self) -> "LeanRunner":
+        from lean.components.docker.lean_runner import LeanRunner
+        return LeanRunner(self.logger,
+                          self.project_config_manager,
+                          self.lean_config_manager,
+                          self.output_config_manager,
+                          self.docker_manager,
+                          self.module_manager,
+                          self.project_manager,
+                          self.temp_manager,
+                          self.xml_manager)
+
+    @component
+    def market_hours_database(self) -> "MarketHoursDatabase":
+        from lean.components.util.market_hours_database import MarketHoursDatabase
+        return MarketHoursDatabase(self.lean_config_manager)
+
+    @component
+    def update_manager(self) -> "UpdateManager":
+        from lean.components.util.update_manager import UpdateManager
+        return UpdateManager(self.logger, self.http_client, self.cache_storage, lambda: self.docker_manager)
+
+    @component
+    def housekeeping_manager(self) -> "HousekeepingManager":
+        from lean.components.util.housekeeping_manager import HousekeepingManager
+        from lean.constants import HOUSEKEEPING_DEADLINE_SECONDS
+        return HousekeepingManager(self.logger, HOUSEKEEPING_DEADLINE_SECONDS)
 
     def manage_docker_image(self, image: Optional[str], update: bool, no_update: bool,
                             project_directory: Path = None,
-                            is_engine_image: bool = True) -> Tuple[DockerImage, str, Optional[Storage]]:
+                            is_engine_image: bool = True) -> Tuple["DockerImage", str, Optional["Storage"]]:
         """
         Manages the Docker image for the LEAN engine by:
         1. Retrieving the engine image from the provided image or project config.
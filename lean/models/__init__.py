@@ -12,18 +12,45 @@
 # limitations under the License.
 
 from os import path
-from json import load
 from pathlib import Path
+from threading import Thread
 from time import time
+from typing import Any, List
+
+from lean.constants import MODULES_JSON_DIRECTORY
 
-json_modules = {}
 file_name = "modules-1.14.json"
 directory = Path(__file__).parent
-file_path = directory.parent / file_name
+file_path = Path(MODULES_JSON_DIRECTORY) / file_name
+
+# Older versions of the CLI stored the modules JSON file in the package directory,
+# such a file is only used when the file can't be downloaded to the modules JSON directory
+legacy_file_path = directory.parent / file_name
 
 # check if new file is available online
 url = f"https://cdn.quantconnect.com/cli/{file_name}"
 
+# The amount of seconds after which the modules JSON file is refreshed
+refresh_interval = 86400
+
+# The amount of seconds after which a temporary file is considered to be left behind by a process that exited mid-write
+stale_temporary_file_age = 3600
+
+
+def remove_stale_temporary_files(target_path: Path) -> None:
+    """Removes the temporary files left behind by processes which exited while atomically writing a file.
+
+    The refresh runs in a daemon thread, so a short command may exit before it replaced the file.
+
+    :param target_path: the path of the file which is written through temporary files named .<name>.<uuid>
+    """
+    try:
+        for tmp_path in target_path.parent.glob(f".{target_path.name}.*"):
+            if time() - tmp_path.stat().st_mtime > stale_temporary_file_age:
+                tmp_path.unlink(missing_ok=True)
+    except OSError:
+        pass
+
 
 def _download_modules_json() -> None:
     """Downloads the modules JSON file from the CDN and saves it to disk."""
@@ -31,29 +58,91 @@ def _download_modules_json() -> None:
     res = get(url, timeout=5)
     if res.ok:
         from json import dump
+        from os import replace
+        from uuid import uuid4
+
+        # The file is replaced atomically, so other CLI processes never read a partially written file
+        tmp_path = file_path.parent / f".{file_name}.{uuid4()}"
         file_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            dump(res.json(), f, ensure_ascii=False, indent=4)
+        remove_stale_temporary_files(file_path)
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                dump(res.json(), f, ensure_ascii=False, indent=4)
+            replace(tmp_path, file_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
     else:
         res.raise_for_status()
 
 
-error = None
-try:
-    # fetch if file not available or fetched before 1 day
-    if not path.exists(file_path) or (time() - path.getmtime(file_path) > 86400):
+def _refresh_modules_json() -> None:
+    """Downloads the latest modules JSON file, ignoring failures because the current file remains usable."""
+    try:
         _download_modules_json()
-except Exception as e:
-    # No need to do anything if file isn't available
-    error = str(e)
-    pass
-
-# check if file exists
-if not Path(file_path).is_file():
-    error_message = f": {error}" if error is not None else ""
-    raise FileNotFoundError(
-        f"Modules json not found in the given path {file_path}{error_message}")
-
-with open(file_path) as f:
-    data = load(f)
-    json_modules = data['modules']
+    except Exception:
+        pass
+
+
+def _load_json_modules() -> List[Any]:
+    """Reads the modules from the modules JSON file."""
+    from json import load
+    with open(file_path) as f:
+        return load(f)['modules']
+
+
+def __getattr__(name: str) -> Any:
+    # The file is only parsed when the raw modules are needed, most commands use the precompiled module catalog
+    if name != "json_modules":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    global json_modules
+    json_modules = _load_json_modules()
+    return json_modules
+
+
+def _copy_legacy_modules_json() -> None:
+    """Atomically copies the modules JSON file of an older version of the CLI to the modules JSON directory."""
+    from os import replace
+    from shutil import copy2
+    from uuid import uuid4
+
+    # The modification time is copied as well, so an outdated file is still refreshed
+    tmp_path = file_path.parent / f".{file_name}.{uuid4()}"
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        copy2(legacy_file_path, tmp_path)
+        replace(tmp_path, file_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _ensure_modules_json() -> None:
+    """Makes sure the modules JSON file exists, refreshing it in the background when it is outdated."""
+    global file_path
+
+    error = None
+    if not path.exists(file_path) and path.exists(legacy_file_path):
+        # The file of an older version of the CLI is moved into place, it's refreshed below if it's outdated
+        try:
+            _copy_legacy_modules_json()
+        except OSError:
+            file_path = legacy_file_path
+
+    if not path.exists(file_path):
+        # Without a file there is nothing to fall back on, so the CLI has to wait for the download
+        try:
+            _download_modules_json()
+        except Exception as e:
+            error = str(e)
+    elif time() - path.getmtime(file_path) > refresh_interval:
+        # The current file is used while the latest version is downloaded in the background for the next command
+        Thread(target=_refresh_modules_json, daemon=True).start()
+
+    # check if file exists
+    if not Path(file_path).is_file():
+        error_message = f": {error}" if error is not None else ""
+        raise FileNotFoundError(
+            f"Modules json not found in the given path {file_path}{error_message}")
+
+
+_ensure_modules_json()
@@ -10,35 +10,44 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import List
+from typing import Any, Dict, List
 
 from lean.constants import MODULE_BROKERAGE, MODULE_TYPE, MODULE_PLATFORM, MODULE_CLI_PLATFORM, \
     MODULE_DATA_DOWNLOADER, MODULE_HISTORY_PROVIDER, MODULE_DATA_QUEUE_HANDLER, MODULE_ADDON, MODULE_COMPUTE
-from lean.models import json_modules
 from lean.models.json_module import JsonModule
 
-# load the modules
-cli_brokerages: List[JsonModule] = []
-cli_addon_modules: List[JsonModule] = []
-cli_data_downloaders: List[JsonModule] = []
-cli_history_provider: List[JsonModule] = []
-cli_data_queue_handlers: List[JsonModule] = []
-cli_compute: List[JsonModule] = []
-
-for json_module in json_modules:
-    module_type = json_module[MODULE_TYPE]
-    platform = json_module[MODULE_PLATFORM]
-
-    if MODULE_CLI_PLATFORM in platform:
-        if MODULE_BROKERAGE in module_type:
-            cli_brokerages.append(JsonModule(json_module, MODULE_BROKERAGE, MODULE_CLI_PLATFORM))
-        if MODULE_DATA_DOWNLOADER in module_type:
-            cli_data_downloaders.append(JsonModule(json_module, MODULE_DATA_DOWNLOADER, MODULE_CLI_PLATFORM))
-        if MODULE_HISTORY_PROVIDER in module_type:
-            cli_history_provider.append(JsonModule(json_module, MODULE_HISTORY_PROVIDER, MODULE_CLI_PLATFORM))
-        if MODULE_DATA_QUEUE_HANDLER in module_type:
-            cli_data_queue_handlers.append(JsonModule(json_module, MODULE_DATA_QUEUE_HANDLER, MODULE_CLI_PLATFORM))
-        if MODULE_ADDON in module_type:
-            cli_addon_modules.append(JsonModule(json_module, MODULE_ADDON, MODULE_CLI_PLATFORM))
-        if MODULE_COMPUTE in module_type:
-            cli_compute.append(JsonModule(json_module, MODULE_COMPUTE, MODULE_CLI_PLATFORM))
+# The module types exposed by this package, mapped to the names of the lists containing the modules of that type
+_module_lists = {
+    MODULE_BROKERAGE: "cli_brokerages",
+    MODULE_ADDON: "cli_addon_modules",
+    MODULE_DATA_DOWNLOADER: "cli_data_downloaders",
+    MODULE_HISTORY_PROVIDER: "cli_history_provider",
+    MODULE_DATA_QUEUE_HANDLER: "cli_data_queue_handlers",
+    MODULE_COMPUTE: "cli_compute"
+}
+
+
+def _parse_modules(json_modules: List[Dict[str, Any]]) -> Dict[str, List[JsonModule]]:
+    """Parses the modules available on the CLI platform, grouped by the name of the list exposing them."""
+    modules = {name: [] for name in _module_lists.values()}
+    for json_module in json_modules:
+        module_type = json_module[MODULE_TYPE]
+        platform = json_module[MODULE_PLATFORM]
+
+        if MODULE_CLI_PLATFORM in platform:
+            for type_name, list_name in _module_lists.items():
+                if type_name in module_type:
+                    modules[list_name].append(JsonModule(json_module, type_name, MODULE_CLI_PLATFORM))
+
+    return modules
+
+
+def __getattr__(name: str) -> Any:
+    # The modules are loaded the first time one of the lists is imported, instead of whenever this package is imported
+    if name not in _module_lists.values():
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from lean.models.module_catalog import get_modules
+    modules = get_modules()
+    globals().update({list_name: modules[list_name] for list_name in _module_lists.values()})
+    return globals()[name]
@@ -10,23 +10,40 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import List
+from typing import Any, Dict, List
 
 from lean.constants import MODULE_BROKERAGE, MODULE_TYPE, MODULE_CLOUD_PLATFORM, MODULE_PLATFORM, \
     MODULE_DATA_QUEUE_HANDLER
-from lean.models import json_modules
 from lean.models.json_module import JsonModule
 
-# load the modules
-cloud_brokerages: List[JsonModule] = []
-cloud_data_queue_handlers: List[JsonModule] = []
+# The module types exposed by this package, mapped to the names of the lists containing the modules of that type
+_module_lists = {
+    MODULE_BROKERAGE: "cloud_brokerages",
+    MODULE_DATA_QUEUE_HANDLER: "cloud_data_queue_handlers"
+}
 
-for json_module in json_modules:
-    module_type = json_module[MODULE_TYPE]
-    platform = json_module[MODULE_PLATFORM]
 
-    if MODULE_CLOUD_PLATFORM in platform:
-        if MODULE_BROKERAGE in module_type:
-            cloud_brokerages.append(JsonModule(json_module, MODULE_BROKERAGE, MODULE_CLOUD_PLATFORM))
-        if MODULE_DATA_QUEUE_HANDLER in module_type:
-            cloud_data_queue_handlers.append(JsonModule(json_module, MODULE_DATA_QUEUE_HANDLER, MODULE_CLOUD_PLATFORM))
+def _parse_modules(json_modules: List[Dict[str, Any]]) -> Dict[str, List[JsonModule]]:
+    """Parses the modules available on the cloud platform, grouped by the name of the list exposing them."""
+    modules = {name: [] for name in _module_lists.values()}
+    for json_module in json_modules:
+        module_type = json_module[MODULE_TYPE]
+        platform = json_module[MODULE_PLATFORM]
+
+        if MODULE_CLOUD_PLATFORM in platform:
+            for type_name, list_name in _module_lists.items():
+                if type_name in module_type:
+                    modules[list_name].append(JsonModule(json_module, type_name, MODULE_CLOUD_PLATFORM))
+
+    return modules
+
+
+def __getattr__(name: str) -> Any:
+    # The modules are loaded the first time one of the lists is imported, instead of whenever this package is imported
+    if name not in _module_lists.values():
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from lean.models.module_catalog import get_modules
+    modules = get_modules()
+    globals().update({list_name: modules[list_name] for list_name in _module_lists.values()})
+    return globals()[name]
@@ -102,7 +102,7 @@ class Configuration(ABC):
             self._log_message = config_json_object["log-message"]
         if "filters" in config_json_object.keys():
             self._filter = Filter(config_json_object["filters"])
-            self.has_filter_dependency = Filter.has_conditions
+            self.has_filter_dependency = self._filter.has_conditions
         else:
             self._filter = Filter([])
         self._input_default = config_json_object["input-default"] if "input-default" in config_json_object else None
@@ -15,7 +15,7 @@ from abc import ABC
 from datetime import datetime
 from enum import Enum
 from re import Pattern
-from typing import List, Any, Optional, Dict, Set, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 from click import prompt
 
@@ -373,19 +373,72 @@ class DataFileLatestGroup(DataFileGroup):
         return set()
 
 
+class _DataFileGroupSource(NamedTuple):
+    # The prefix the files of the group start with, which is used to list the files available in the cloud
+    prefix: str
+
+    # A value which is smaller than or equal to all files of the group
+    lower_bound: str
+
+    # The function creating the group, which holds all possible files of the group in memory
+    create_group: Callable[[], DataFileGroup]
+
+
+def merge_sorted_unique(sources: Iterable[Tuple[str, Callable[[], Iterator[str]]]]) -> Iterator[str]:
+    """Merges sorted iterators into a single sorted iterator without duplicates.
+
+    Every source consists of a lower bound of its values and a function creating the sorted iterator of its values.
+    A source's iterator is only created once the merged values reach its lower bound,
+    so the values of sources which don't overlap are never in memory at the same time.
+
+    :param sources: the lower bounds and iterator factories of the sources to merge
+    :return: an iterator yielding the values of all sources in sorted order, without duplicates
+    """
+    from heapq import heappop, heappush
+
+    pending_sources = sorted(sources, key=lambda source: source[0])
+    next_source = 0
+    heap = []
+    last_value = None
+
+    while True:
+        # Open all sources which may contain a value smaller than the next value to yield
+        while next_source < len(pending_sources) and (len(heap) == 0 or pending_sources[next_source][0] <= heap[0][0]):
+            iterator = pending_sources[next_source][1]()
+            value = next(iterator, None)
+            if value is not None:
+                heappush(heap, (value, next_source, iterator))
+            next_source += 1
+
+        if len(heap) == 0:
+            return
+
+        value, index, iterator = heappop(heap)
+        if value != last_value:
+            yield value
+            last_value = value
+
+        value = next(iterator, None)
+        if value is not None:
+            heappush(heap, (value, index, iterator))
+
+
 class Product(WrappedBaseModel):
     dataset: Dataset
     option_results: Dict[str, OptionResult]
 
-    def get_data_files(self) -> List[str]:
+    def get_data_files(self) -> Iterator[str]:
         """Returns all data files for the given product configuration.
 
-        :return: the list of files that need to be downloaded for this product
+        The files are generated in sorted order without duplicates. Instead of keeping all files in memory,
+        only the possible files of the groups which overlap with the files being generated are kept in memory.
+
+        :return: an iterator yielding the files that need to be downloaded for this product
         """
         from multiprocessing import cpu_count
         from joblib import Parallel, delayed
 
-        groups = []
+        sources = []
         variables = {option_id: result.value for option_id, result in self.option_results.items()}
 
         multiple_option = next((o for o in self.dataset.options if isinstance(o, DatasetTextOption) and o.multiple),
@@ -394,31 +447,35 @@ class Product(WrappedBaseModel):
             result = self.option_results[multiple_option.id]
 
             for index in range(len(result.value)):
-                groups.extend(self._get_data_file_groups({
+                sources.extend(self._get_data_file_group_sources({
                     **variables,
                     multiple_option.id: result.value[index]
                 }))
         else:
-            groups.extend(self._get_data_file_groups(variables))
+            sources.extend(self._get_data_file_group_sources(variables))
 
-        prefixes = set(group.prefix for group in groups)
+        prefixes = set(source.prefix for source in sources)
         prefixes_to_files = {}
 
         parallel = Parallel(n_jobs=max(1, cpu_count() - 1), backend="threading")
         for prefix, files_with_prefix in parallel(delayed(self._list_files)(prefix) for prefix in prefixes):
             prefixes_to_files[prefix] = files_with_prefix
 
-        data_files = set()
-        for group in groups:
-            data_files.update(group.get_valid_files(prefixes_to_files[group.prefix]))
+        return merge_sorted_unique(
+            (source.lower_bound,
+             lambda source=source: iter(sorted(source.create_group().get_valid_files(prefixes_to_files[source.prefix]))))
+            for source in sources
+        )
 
-        return sorted(list(data_files))
+    def _get_data_file_group_sources(self, variables: Dict[str, Any]) -> List[_DataFileGroupSource]:
+        """Returns the groups of data files for a single set of variables, without creating the groups yet.
 
-    def _get_data_file_groups(self, variables: Dict[str, Any]) -> List[DataFileGroup]:
-        from dateutil.rrule import rrule, DAILY
+        :param variables: the values of the options of the dataset
+        :return: the sources of the groups, which create the groups on demand
+        """
         from re import split, compile
 
-        groups = []
+        sources = []
 
         for path in self.dataset.paths:
             if path.condition is None or path.condition.check(self.option_results):
@@ -428,36 +485,56 @@ class Product(WrappedBaseModel):
             raise RuntimeError(f"No eligible path templates found")
 
         for template in path_to_use.templates.all:
-            has_start_end = any(isinstance(o, DatasetDateOption) and o.start_end for o in self.dataset.options)
-            start = variables.get("start", None)
-            end = variables.get("end", None)
-
-            possible_files = set()
-
-            if has_start_end and start is not None and end is not None:
-                variables_to_use = {**variables}
-                for date in rrule(DAILY, dtstart=start, until=end):
-                    variables_to_use["date"] = date
-                    variables_to_use["year"] = date.strftime("%Y")
-                    variables_to_use["month"] = date.strftime("%m")
-                    variables_to_use["day"] = date.strftime("%d")
-                    possible_files.add(self._render_template(template, variables_to_use))
-            else:
-                possible_files.add(self._render_template(template, variables))
-
-            prefix = self._get_common_prefix(list(possible_files))
-
-            groups.append(DataFileAllGroup(prefix=prefix, possible_files=possible_files))
+            # The possible files are rendered once to find their prefix and lower bound without storing them
+            prefix = None
+            lower_bound = None
+            for possible_file in self._render_possible_files(template, variables):
+                prefix = possible_file if prefix is None else self._get_common_prefix([prefix, possible_file])
+                lower_bound = possible_file if lower_bound is None else min(lower_bound, possible_file)
+
+            sources.append(_DataFileGroupSource(
+                prefix=prefix,
+                lower_bound=lower_bound,
+                create_group=lambda template=template, prefix=prefix: DataFileAllGroup(
+                    prefix=prefix,
+                    possible_files=set(self._render_possible_files(template, variables))
+                )
+            ))
 
         for regex_template in path_to_use.templates.latest:
             rendered_regex = self._render_template(regex_template, variables)
 
             prefix = split(r"[\\[\]()]", rendered_regex)[0]
-            compiled_regex = compile(rendered_regex)
+            group = DataFileLatestGroup(prefix=prefix, regex=compile(rendered_regex))
+
+            # The latest group contains a single file, which is cheap to keep in memory from the start
+            sources.append(_DataFileGroupSource(prefix=prefix, lower_bound="", create_group=lambda group=group: group))
 
-            groups.append(DataFileLatestGroup(prefix=prefix, regex=compiled_regex))
+        return sources
 
-        return groups
+    def _render_possible_files(self, template: str, variables: Dict[str, Any]) -> Iterator[str]:
+        """Renders a template of data files for every date between the selected start and end date.
+
+        :param template: the template to render
+        :param variables: the values of the options of the dataset
+        :return: an iterator yielding the rendered files
+        """
+        from dateutil.rrule import rrule, DAILY
+
+        has_start_end = any(isinstance(o, DatasetDateOption) and o.start_end for o in self.dataset.options)
+        start = variables.get("start", None)
+        end = variables.get("end", None)
+
+        if has_start_end and start is not None and end is not None:
+            variables_to_use = {**variables}
+            for date in rrule(DAILY, dtstart=start, until=end):
+                variables_to_use["date"] = date
+                variables_to_use["year"] = date.strftime("%Y")
+                variables_to_use["month"] = date.strftime("%m")
+                variables_to_use["day"] = date.strftime("%d")
+                yield self._render_template(template, variables_to_use)
+        else:
+            yield self._render_template(template, variables)
 
     def _list_files(self, prefix: str) -> Tuple[str, Optional[List[str]]]:
         if len(prefix.split("/")) < 3:
@@ -0,0 +1,128 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from lean.models.json_module import JsonModule
+
+# The version of the catalog format, increment it whenever the pickled classes change in an incompatible way
+# Changes to the source of the models also rebuild the catalog, so development versions never load stale classes
+CATALOG_VERSION = 2
+
+_catalog: Optional[Dict[str, List[JsonModule]]] = None
+
+
+def get_catalog_path() -> Path:
+    """Returns the path to the precompiled module catalog, which is stored in the modules JSON directory."""
+    from lean.constants import MODULES_JSON_DIRECTORY
+    from lean.models import file_path
+    return Path(MODULES_JSON_DIRECTORY) / f"{file_path.stem}.catalog"
+
+
+def get_modules() -> Dict[str, List[JsonModule]]:
+    """Returns the parsed modules of all platforms, keyed by the name of the list exposing them.
+
+    Parsing every module is slow, so the parsed modules are stored in a catalog in the modules JSON directory.
+    The catalog is keyed by the hash of the JSON file, the CLI version and the source of the models,
+    it's rebuilt when any of them changes.
+
+    :return: a dict containing the module lists of lean.models.cli and lean.models.cloud
+    """
+    global _catalog
+    if _catalog is None:
+        _catalog = _load_catalog()
+    return _catalog
+
+
+def _load_catalog() -> Dict[str, List[JsonModule]]:
+    """Loads the module catalog, rebuilding it if it's missing or outdated.
+
+    :return: the parsed modules of all platforms, keyed by the name of the list exposing them
+    """
+    from hashlib import sha256
+    from pickle import loads
+    from lean import __version__
+    from lean.models import file_path
+
+    json_bytes = file_path.read_bytes()
+    key = f"{CATALOG_VERSION}:{__version__}:{_get_source_fingerprint()}:{sha256(json_bytes).hexdigest()}"
+
+    catalog_path = get_catalog_path()
+    try:
+        stored_key, modules = loads(catalog_path.read_bytes())
+        if stored_key == key:
+            return modules
+    except Exception:
+        # The catalog doesn't exist yet or can't be read, both are fixed by rebuilding it
+        pass
+
+    from json import loads as json_loads
+    modules = _parse_modules(json_loads(json_bytes)["modules"])
+    _store_catalog(catalog_path, key, modules)
+    return modules
+
+
+def _get_source_fingerprint() -> str:
+    """Returns a fingerprint of the source files of the models, which changes whenever one of them changes.
+
+    The size and modification time of the files are used instead of their content, so no source file is read.
+
+    :return: the fingerprint of the files in the lean.models package
+    """
+    from hashlib import sha256
+
+    models_directory = Path(__file__).parent
+    fingerprint = sha256()
+    for source_path in sorted(models_directory.rglob("*.py")):
+        stat = source_path.stat()
+        fingerprint.update(f"{source_path.relative_to(models_directory)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return fingerprint.hexdigest()
+
+
+def _parse_modules(json_modules: List[dict]) -> Dict[str, List[JsonModule]]:
+    """Parses the modules of all platforms.
+
+    :param json_modules: the modules as read from the modules JSON file
+    :return: the parsed modules, keyed by the name of the list exposing them
+    """
+    from lean.models.cli import _parse_modules as parse_cli_modules
+    from lean.models.cloud import _parse_modules as parse_cloud_modules
+    return {**parse_cli_modules(json_modules), **parse_cloud_modules(json_modules)}
+
+
+def _store_catalog(catalog_path: Path, key: str, modules: Dict[str, List[JsonModule]]) -> None:
+    """Atomically stores the module catalog, ignoring failures because the catalog is only an optimization.
+
+    :param catalog_path: the path to store the catalog at
+    :param key: the key identifying the modules JSON file and CLI version the catalog was built from
+    :param modules: the parsed modules to store
+    """
+    from os import replace
+    from pickle import HIGHEST_PROTOCOL, dumps
+    from uuid import uuid4
+    from lean.models import remove_stale_temporary_files
+
+    tmp_path = catalog_path.parent / f".{catalog_path.name}.{uuid4()}"
+    try:
+        catalog_path.parent.mkdir(parents=True, exist_ok=True)
+        remove_stale_temporary_files(catalog_path)
+        tmp_path.write_bytes(dumps((key, modules), protocol=HIGHEST_PROTOCOL))
+        replace(tmp_path, catalog_path)
+    except Exception:
+        pass
+    finally:
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
@@ -11,10 +11,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 from lean.components.config.storage import Storage
 
+if TYPE_CHECKING:
+    from lean.components.util.bandwidth_limiter import BandwidthSchedule
+
 
 class Option:
     """An Option instance manages a single value in a Storage instance."""
@@ -100,3 +103,106 @@ class ChoiceOption(Option):
                 f"Invalid value, '{self.key}' only accepts the following values: {', '.join(self.allowed_values)}")
 
         super().set_value(matching_value)
+
+
+class IntegerOption(Option):
+    """A variant of Option where only whole numbers within an optional range are allowed.
+
+    Values are stored as strings like all other options, get_int_value() parses them back.
+    """
+
+    def __init__(self,
+                 key: str,
+                 description: str,
+                 is_sensitive: bool,
+                 storage: Storage,
+                 default_value: Optional[int] = None,
+                 min_value: Optional[int] = None,
+                 max_value: Optional[int] = None) -> None:
+        """Creates a new IntegerOption instance.
+
+        :param key: the name of the key of the option in the given file, should use hyphens for separation
+        :param description: a display-friendly description of the option
+        :param is_sensitive: whether the contents of this option may be logged without masking it
+        :param storage: the Storage instance to store this option in
+        :param default_value: the value returned by get_int_value() when the option is not set
+        :param min_value: the smallest allowed value, or None if there is no lower bound
+        :param max_value: the largest allowed value, or None if there is no upper bound
+        """
+        self.default_value = default_value
+        self.min_value = min_value
+        self.max_value = max_value
+
+        super().__init__(key, description, is_sensitive, storage)
+
+    def get_int_value(self) -> Optional[int]:
+        """Retrieves the current value of the option as an integer.
+
+        :return: the current value, or the default value if the option is not set or contains an invalid value
+        """
+        value = self.get_value()
+        if value is None:
+            return self.default_value
+
+        try:
+            return self._validate(value)
+        except ValueError:
+            return self.default_value
+
+    def set_value(self, value: str) -> None:
+        """Sets the new value of the option.
+
+        :param value: the new value of the option, must be a whole number within the allowed range
+        """
+        super().set_value(str(self._validate(value)))
+
+    def _validate(self, value: str) -> int:
+        """Parses a value and checks whether it lies within the allowed range.
+
+        :param value: the value to validate
+        :return: the parsed value
+        """
+        try:
+            parsed_value = int(str(value).strip())
+        except ValueError:
+            raise ValueError(f"Invalid value, '{self.key}' only accepts whole numbers")
+
+        if self.min_value is not None and parsed_value < self.min_value:
+            raise ValueError(f"Invalid value, '{self.key}' must be at least {self.min_value}")
+
+        if self.max_value is not None and parsed_value > self.max_value:
+            raise ValueError(f"Invalid value, '{self.key}' must be at most {self.max_value}")
+
+        return parsed_value
+
+
+class BandwidthScheduleOption(Option):
+    """A variant of Option containing time-of-day download speed limits.
+
+    Values are stored as strings like all other options, get_schedule() parses them back.
+    """
+
+    def get_schedule(self) -> Optional["BandwidthSchedule"]:
+        """Retrieves the current value of the option as a schedule.
+
+        :return: the current schedule, or None if the option is not set or contains an invalid value
+        """
+        value = self.get_value()
+        if value is None:
+            return None
+
+        from lean.components.util.bandwidth_limiter import BandwidthSchedule
+        try:
+            return BandwidthSchedule.parse(value)
+        except ValueError:
+            return None
+
+    def set_value(self, value: str) -> None:
+        """Sets the new value of the option.
+
+        :param value: the new value of the option, must be a valid schedule
+        """
+        from lean.components.util.bandwidth_limiter import BandwidthSchedule
+        BandwidthSchedule.parse(value)
+
+        super().set_value(value)
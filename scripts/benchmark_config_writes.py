@@ -0,0 +1,74 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This program stress tests concurrent writes to the same Lean config file by many CLI processes
+# It starts N processes which all set their own properties in one lean.json through LeanConfigManager.set_properties
+# Afterwards it checks that no property got lost and reports how long the slowest write waited
+# It should be ran using `python scripts/benchmark_config_writes.py [process count]` from the root of the project
+
+from multiprocessing import get_context
+from pathlib import Path
+from sys import argv
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import List
+
+DEFAULT_PROCESS_COUNT = 40
+WRITES_PER_PROCESS = 10
+
+
+def write_properties(lean_config_path: str, process_index: int) -> List[float]:
+    from lean.container import container
+
+    lean_config_manager = container.lean_config_manager
+    lean_config_manager.set_default_lean_config_path(Path(lean_config_path))
+
+    durations = []
+    for write_index in range(WRITES_PER_PROCESS):
+        start = perf_counter()
+        lean_config_manager.set_properties({f"process-{process_index}-write-{write_index}": write_index})
+        durations.append(perf_counter() - start)
+
+    return durations
+
+
+def main() -> None:
+    process_count = int(argv[1]) if len(argv) > 1 else DEFAULT_PROCESS_COUNT
+
+    with TemporaryDirectory() as tmp_dir:
+        lean_config_path = Path(tmp_dir) / "lean.json"
+        lean_config_path.write_text('{\n    // The data directory\n    "data-folder": "data"\n}\n', encoding="utf-8")
+
+        # Spawning instead of forking makes every writer a fresh CLI process, like `lean backtest` runs
+        start = perf_counter()
+        with get_context("spawn").Pool(process_count) as pool:
+            results = pool.starmap(write_properties,
+                                   [(str(lean_config_path), index) for index in range(process_count)])
+        elapsed = perf_counter() - start
+
+        from json import loads
+        config = loads(lean_config_path.read_text(encoding="utf-8"))
+
+    durations = sorted(duration for durations in results for duration in durations)
+    expected = process_count * WRITES_PER_PROCESS
+    written = sum(1 for key in config if key.startswith("process-"))
+
+    print(f"{process_count} processes writing {WRITES_PER_PROCESS} properties each to the same lean.json:")
+    print(f"  Total time:          {elapsed:,.2f} s")
+    print(f"  Median write:        {durations[len(durations) // 2] * 1000:,.1f} ms")
+    print(f"  Slowest write:       {durations[-1] * 1000:,.1f} ms")
+    print(f"  Properties written:  {written:,} of {expected:,} ({expected - written:,} lost)")
+
+
+if __name__ == "__main__":
+    main()
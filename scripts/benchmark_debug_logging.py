@@ -0,0 +1,72 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This program measures the logging overhead of pushing a 5 MB project through the HTTPClient
+# It sends the files/update requests of a push to a mocked API with debug logging disabled and enabled
+# It should be ran using `python scripts/benchmark_debug_logging.py` from the root of the project
+
+from io import StringIO
+from time import perf_counter
+
+from responses import RequestsMock
+from rich.console import Console
+
+from lean.components.util.http_client import HTTPClient
+from lean.components.util.logger import Logger
+
+PROJECT_SIZE = 5 * 1024 * 1024
+FILE_COUNT = 50
+ROUNDS = 5
+URL = "https://www.quantconnect.com/api/v2/files/update"
+
+
+def push_project(http_client: HTTPClient) -> None:
+    file_size = PROJECT_SIZE // FILE_COUNT
+    content = ("# " + "x" * 98 + "\n") * (file_size // 101)
+
+    for index in range(FILE_COUNT):
+        http_client.post(URL, json={"projectId": 1, "name": f"file{index}.py", "content": content})
+
+
+def benchmark(debug_logging_enabled: bool) -> float:
+    logger = Logger()
+    logger.debug_logging_enabled = debug_logging_enabled
+
+    # Rendering to an in-memory console keeps terminal speed out of the results
+    logger._console = Console(file=StringIO(), markup=False, highlight=False, emoji=False, width=120)
+
+    http_client = HTTPClient(logger)
+
+    with RequestsMock() as requests_mock:
+        requests_mock.add(requests_mock.POST, URL, '{ "success": true }')
+
+        fastest = float("inf")
+        for _ in range(ROUNDS):
+            start = perf_counter()
+            push_project(http_client)
+            fastest = min(fastest, perf_counter() - start)
+
+    return fastest
+
+
+def main() -> None:
+    disabled = benchmark(False)
+    enabled = benchmark(True)
+
+    print(f"Pushing a {PROJECT_SIZE // (1024 * 1024)} MB project in {FILE_COUNT} files, best of {ROUNDS} rounds:")
+    print(f"  Debug logging disabled: {disabled * 1000:,.1f} ms")
+    print(f"  Debug logging enabled:  {enabled * 1000:,.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
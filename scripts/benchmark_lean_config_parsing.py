@@ -0,0 +1,110 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This program measures how long it takes to read a Lean config file the size of the stock ~1000-line Launcher config
+# It compares the previous line-by-line comment stripping, the single-pass parser and reading the cached config
+# It should be ran using `python scripts/benchmark_lean_config_parsing.py` from the root of the project
+
+from json import dumps, loads
+from pathlib import Path
+from re import sub
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Callable, Dict
+from unittest import mock
+
+from lean.components.config.lean_config_manager import LeanConfigManager
+from lean.components.util import jsonc
+
+CONFIG_LINES = 1000
+ROUNDS = 200
+
+
+def generate_config() -> str:
+    """Generates a config resembling the stock Lean config, with a commented block above every property."""
+    lines = ["{"]
+
+    index = 0
+    while len(lines) < CONFIG_LINES:
+        lines.append(f"  // Documentation of property-{index}, see https://www.quantconnect.com/docs/v2/lean-cli")
+        lines.append(f"  /* \"property-{index}\": \"a disabled value\", */")
+        if index % 10 == 0:
+            lines.append(f"  \"environment-{index}\": {{")
+            lines.append(f"    \"live-mode\": false, // \"true\" enables live trading")
+            lines.append(f"    \"handlers\": [\"QuantConnect.Lean.Engine.Handler{index}\", \"https://example.com/{index}\"]")
+            lines.append("  },")
+        else:
+            lines.append(f"  \"property-{index}\": \"value with a \\\"quote\\\" and a // slash\",")
+        index += 1
+
+    lines.append("  \"last-property\": true")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def parse_line_by_line(content: str) -> Dict[str, Any]:
+    """The comment stripping LeanConfigManager.parse_json() used before the single-pass parser."""
+    config = sub(r'/\*.*?\*/|//[^\r\n"]*[\r\n]', '', content)
+
+    new_config = ''
+    for line in config.split('\n'):
+        double_quotes_count = 0
+        previous_element = ''
+        for current_element in line:
+            if current_element == '/' and double_quotes_count % 2 == 0:
+                if previous_element == '/':
+                    break
+            else:
+                if current_element == '"' and previous_element != '\\':
+                    double_quotes_count = double_quotes_count + 1
+                new_config += current_element
+            previous_element = current_element
+    return loads(new_config)
+
+
+def benchmark(func: Callable[[], Any]) -> float:
+    fastest = float("inf")
+    for _ in range(ROUNDS):
+        start = perf_counter()
+        func()
+        fastest = min(fastest, perf_counter() - start)
+    return fastest
+
+
+def main() -> None:
+    content = generate_config()
+    assert parse_line_by_line(content) == jsonc.loads(content)
+
+    with TemporaryDirectory() as directory:
+        config_path = Path(directory) / "lean.json"
+        config_path.write_text(content, encoding="utf-8")
+
+        cache_storage = mock.Mock()
+        cache_storage.get.return_value = []
+
+        lean_config_manager = LeanConfigManager(mock.Mock(), mock.Mock(), mock.Mock(), mock.Mock(), cache_storage)
+        lean_config_manager.set_default_lean_config_path(config_path)
+        lean_config_manager.get_lean_config()
+
+        line_by_line = benchmark(lambda: parse_line_by_line(config_path.read_text(encoding="utf-8")))
+        single_pass = benchmark(lambda: jsonc.loads(config_path.read_text(encoding="utf-8")))
+        cached = benchmark(lean_config_manager.get_lean_config)
+
+    print(f"Reading a {content.count(chr(10)) + 1}-line Lean config of {len(content) // 1024} KB, best of {ROUNDS} rounds:")
+    print(f"  Line-by-line comment stripping: {line_by_line * 1000:,.2f} ms")
+    print(f"  Single-pass comment stripping:  {single_pass * 1000:,.2f} ms")
+    print(f"  Cached config:                  {cached * 1000:,.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -47,7 +47,8 @@ def get_commands(group: Group, parent_names: List[str] = []) -> List[NamedComman
     """
     all_commands = []
 
-    for obj in group.commands.values():
+    for name in group.list_commands(None):
+        obj = group.get_command(None, name)
         if isinstance(obj, DefaultCommandGroup):
             name_parts = parent_names + [group.name, obj.name]
             all_commands.append(NamedCommand(name=" ".join(name_parts), command=obj))
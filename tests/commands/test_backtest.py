@@ -809,3 +809,23 @@ def test_backtest_parameters_override_config_json() -> None:
     assert parameters["float"] == "456.789"
     assert parameters["string"] == "hello world"
     assert parameters["negative"] == "-42.5"
+
+
+@pytest.mark.parametrize("data_provider_historical,detach,claimed", [("QuantConnect", False, True),
+                                                                     ("QuantConnect", True, False),
+                                                                     ("Local", False, False)])
+def test_backtest_claims_high_download_priority_only_for_attached_quantconnect_data(data_provider_historical: str,
+                                                                                   detach: bool,
+                                                                                   claimed: bool) -> None:
+    from lean.commands.backtest import _claim_download_priority
+    from lean.constants import DOWNLOAD_PRIORITY_HIGH
+
+    download_queue = mock.MagicMock()
+    with mock.patch.object(type(container), "download_queue", new=download_queue):
+        with _claim_download_priority(data_provider_historical, detach):
+            pass
+
+    if claimed:
+        download_queue.claim.assert_called_once_with(DOWNLOAD_PRIORITY_HIGH)
+    else:
+        download_queue.claim.assert_not_called()
@@ -13,6 +13,7 @@
 
 import json
 import re
+from pathlib import Path
 from typing import Any
 from unittest import mock
 
@@ -21,6 +22,8 @@ from responses import RequestsMock
 
 from lean.components.api.api_client import APIClient
 from lean.components.util.http_client import HTTPClient
+from lean.components.util.response_cache import ResponseCache
+from lean.components.util.retry_policy import RetryPolicy
 from lean.constants import API_BASE_URL
 from lean.models.errors import AuthenticationError, RequestFailedError
 
@@ -31,6 +34,10 @@ def test_get_logger():
     logger.debug_logging_enabled = False
     return logger
 
+def create_retry_policy(logger, sleep=None) -> RetryPolicy:
+    return RetryPolicy(logger, sleep=sleep if sleep is not None else mock.Mock())
+
+
 def test_get_makes_get_request_to_given_endpoint(requests_mock: RequestsMock) -> None:
     requests_mock.add(requests_mock.GET, API_BASE_URL + "endpoint", '{ "success": true }')
 
@@ -206,23 +213,51 @@ def test_api_client_raises_request_failed_error_when_response_contains_internal_
     assert str(error.value) == "Internal Error 21"
 
 
-@pytest.mark.parametrize("method,status_code,expected_error", [("get", 500, AuthenticationError),
-                                                               ("post", 500, AuthenticationError),
-                                                               ("get", 502, RequestFailedError),
-                                                               ("post", 502, RequestFailedError)])
+@pytest.mark.parametrize("method,status_code,expected_error,expected_calls", [("get", 500, AuthenticationError, 2),
+                                                                              ("post", 500, AuthenticationError, 2),
+                                                                              ("get", 502, RequestFailedError, 4),
+                                                                              ("post", 502, RequestFailedError, 4)])
 def test_api_client_retries_request_when_response_is_http_5xx_error(method: str,
                                                                     status_code: int,
                                                                     expected_error: Any,
+                                                                    expected_calls: int,
                                                                     requests_mock: RequestsMock) -> None:
     requests_mock.add(method.upper(), API_BASE_URL + "endpoint", status=status_code)
 
     logger = test_get_logger()
-    api = APIClient(logger, HTTPClient(logger), "123", "456")
+    api = APIClient(logger, HTTPClient(logger), "123", "456", create_retry_policy(logger))
 
     with pytest.raises(expected_error):
         getattr(api, method)("endpoint")
 
+    requests_mock.assert_call_count(API_BASE_URL + "endpoint", expected_calls)
+
+
+@pytest.mark.parametrize("method", ["get", "post"])
+def test_api_client_retries_request_when_response_is_http_429_error(method: str, requests_mock: RequestsMock) -> None:
+    requests_mock.add(method.upper(), API_BASE_URL + "endpoint", status=429, headers={"Retry-After": "2"})
+    requests_mock.add(method.upper(), API_BASE_URL + "endpoint", '{ "success": true }')
+
+    logger = test_get_logger()
+    sleep = mock.Mock()
+    api = APIClient(logger, HTTPClient(logger), "123", "456", create_retry_policy(logger, sleep))
+
+    assert getattr(api, method)("endpoint")["success"]
+
     requests_mock.assert_call_count(API_BASE_URL + "endpoint", 2)
+    sleep.assert_called_once_with(2.0)
+
+
+def test_api_client_does_not_retry_http_5xx_error_on_non_idempotent_endpoint(requests_mock: RequestsMock) -> None:
+    requests_mock.add(requests_mock.POST, API_BASE_URL + "backtests/create", status=502)
+
+    logger = test_get_logger()
+    api = APIClient(logger, HTTPClient(logger), "123", "456", create_retry_policy(logger))
+
+    with pytest.raises(RequestFailedError):
+        api.post("backtests/create")
+
+    requests_mock.assert_call_count(API_BASE_URL + "backtests/create", 1)
 
 
 @pytest.mark.parametrize("method", ["get", "post"])
@@ -259,3 +294,66 @@ def test_is_authenticated_returns_false_when_authenticated_request_fails(request
     api = APIClient(logger, HTTPClient(logger), "123", "456")
 
     assert not api.is_authenticated()
+
+
+def test_get_uses_cached_response_of_cacheable_endpoint(requests_mock: RequestsMock) -> None:
+    requests_mock.add(requests_mock.GET, API_BASE_URL + "data/prices", '{ "success": true, "calls": 1 }')
+
+    logger = test_get_logger()
+    api = APIClient(logger, HTTPClient(logger), "123", "456", response_cache=ResponseCache(mock.Mock(), str(Path.cwd() / "cache")))
+
+    assert api.get("data/prices") == {"success": True, "calls": 1}
+    assert api.get("data/prices") == {"success": True, "calls": 1}
+
+    assert len(requests_mock.calls) == 1
+
+
+def test_get_revalidates_stale_cached_response(requests_mock: RequestsMock) -> None:
+    requests_mock.add(requests_mock.GET, API_BASE_URL + "data/prices", '{ "success": true }', headers={"ETag": '"v1"'})
+
+    logger = test_get_logger()
+    cache = ResponseCache(mock.Mock(), str(Path.cwd() / "cache"))
+    api = APIClient(logger, HTTPClient(logger), "123", "456", response_cache=cache)
+    api.get("data/prices")
+
+    key = cache.get_key(API_BASE_URL, "123", "get", "data/prices", {})
+    cached_response = cache.get(key)
+    cached_response.stored_at = 0
+    cache._write(key, cached_response)
+
+    requests_mock.replace(requests_mock.GET, API_BASE_URL + "data/prices", status=304)
+
+    assert api.get("data/prices") == {"success": True}
+    assert requests_mock.calls[1].request.headers["If-None-Match"] == '"v1"'
+    assert cache.get(key).is_fresh(60)
+
+
+def test_post_invalidates_cached_responses_of_changed_endpoint(requests_mock: RequestsMock) -> None:
+    requests_mock.add(requests_mock.POST, API_BASE_URL + "projects/read", '{ "success": true }')
+    requests_mock.add(requests_mock.POST, API_BASE_URL + "projects/update", '{ "success": true }')
+
+    logger = test_get_logger()
+    api = APIClient(logger, HTTPClient(logger), "123", "456", response_cache=ResponseCache(mock.Mock(), str(Path.cwd() / "cache")))
+
+    api.post("projects/read")
+    api.post("projects/update", {"projectId": 1})
+    api.post("projects/read")
+
+    assert len(requests_mock.calls) == 3
+
+
+def test_invalidate_cache_deletes_cached_response_of_single_request(requests_mock: RequestsMock) -> None:
+    requests_mock.add(requests_mock.POST, API_BASE_URL + "data/list", '{ "success": true, "objects": [] }')
+
+    logger = test_get_logger()
+    api = APIClient(logger, HTTPClient(logger), "123", "456", response_cache=ResponseCache(mock.Mock(), str(Path.cwd() / "cache")))
+
+    api.post("data/list", {"filePath": "equity/usa/daily/"})
+    api.post("data/list", {"filePath": "equity/usa/minute/"})
+    assert len(requests_mock.calls) == 2
+
+    api.invalidate_cache("data/list", "post", {"filePath": "equity/usa/daily/"})
+
+    api.post("data/list", {"filePath": "equity/usa/daily/"})
+    api.post("data/list", {"filePath": "equity/usa/minute/"})
+    assert len(requests_mock.calls) == 3
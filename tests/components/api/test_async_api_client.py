@@ -0,0 +1,104 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from threading import Lock
+from time import sleep
+from unittest import mock
+
+import pytest
+from responses import RequestsMock
+
+from lean.components.api.api_client import APIClient
+from lean.components.api.async_api_client import AsyncAPIClient
+from lean.components.util.http_client import HTTPClient
+from lean.constants import API_BASE_URL
+from lean.models.errors import RequestFailedError
+
+
+def test_get_sends_authenticated_request_through_api_client(requests_mock: RequestsMock) -> None:
+    requests_mock.add(requests_mock.GET, API_BASE_URL + "endpoint", '{ "success": true }')
+
+    logger = mock.Mock()
+    logger.debug_logging_enabled = False
+    async_api_client = AsyncAPIClient(APIClient(logger, HTTPClient(logger), "123", "456"))
+
+    response = async_api_client.run(async_api_client.get("endpoint"))
+
+    assert response["success"]
+    assert requests_mock.calls[0].request.headers["Authorization"].startswith("Basic ")
+    assert "Timestamp" in requests_mock.calls[0].request.headers
+
+
+def test_projects_get_many_returns_projects_in_requested_order() -> None:
+    api_client = mock.Mock()
+    api_client.projects.get.side_effect = lambda project_id, organization_id: f"{organization_id}/{project_id}"
+
+    async_api_client = AsyncAPIClient(api_client)
+
+    projects = async_api_client.run(async_api_client.projects.get_many([3, 1, 2], "abc"))
+
+    assert projects == ["abc/3", "abc/1", "abc/2"]
+
+
+def test_files_get_all_many_returns_errors_in_place_when_requested() -> None:
+    error = RequestFailedError(mock.Mock(), "Project not found")
+
+    def get_all(project_id: int):
+        if project_id == 2:
+            raise error
+        return [project_id]
+
+    api_client = mock.Mock()
+    api_client.files.get_all.side_effect = get_all
+
+    async_api_client = AsyncAPIClient(api_client)
+
+    files = async_api_client.run(async_api_client.files.get_all_many([1, 2, 3], return_exceptions=True))
+
+    assert files == [[1], error, [3]]
+
+
+def test_files_get_all_many_raises_first_error_by_default() -> None:
+    api_client = mock.Mock()
+    api_client.files.get_all.side_effect = RequestFailedError(mock.Mock(), "Project not found")
+
+    async_api_client = AsyncAPIClient(api_client)
+
+    with pytest.raises(RequestFailedError):
+        async_api_client.run(async_api_client.files.get_all_many([1, 2, 3]))
+
+
+def test_gather_limits_amount_of_requests_in_flight() -> None:
+    lock = Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def get(project_id: int, organization_id: str) -> int:
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        sleep(0.01)
+        with lock:
+            in_flight -= 1
+        return project_id
+
+    api_client = mock.Mock()
+    api_client.projects.get.side_effect = get
+
+    async_api_client = AsyncAPIClient(api_client, max_concurrency=3)
+
+    projects = async_api_client.run(async_api_client.projects.get_many(list(range(20)), "abc"))
+
+    assert projects == list(range(20))
+    assert 1 < max_in_flight <= 3
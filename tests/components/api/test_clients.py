@@ -12,13 +12,17 @@
 # limitations under the License.
 
 import contextlib
+import hashlib
+import json
 import os
 from datetime import datetime
+from pathlib import Path
 from time import sleep
 from typing import ContextManager
 from unittest import mock
 
 import pytest
+import requests
 from responses import RequestsMock
 
 from lean.components.api.account_client import AccountClient
@@ -31,6 +35,7 @@ from lean.components.api.node_client import NodeClient
 from lean.components.api.organization_client import OrganizationClient
 from lean.components.api.project_client import ProjectClient
 from lean.components.util.http_client import HTTPClient
+from lean.components.util.retry_policy import RetryPolicy
 from lean.constants import API_BASE_URL
 from lean.models.api import QCCompileState, QCLanguage, QCParameter, QCProject
 from lean.models.errors import AuthenticationError
@@ -281,6 +286,24 @@ def test_data_client_list_files_raises_data_not_available_error_when_api_returns
     assert "support@quantconnect.com" in str(error.value)
 
 
+def test_data_client_invalidate_list_files_deletes_cached_listing_of_prefix() -> None:
+    api_client = mock.Mock()
+    api_client.post.return_value = {"objects": ["usa/daily/spy.zip"]}
+    data_client = DataClient(api_client, HTTPClient(mock.Mock()))
+
+    data_client.list_files("equity/usa/daily/")
+    data_client.list_files("equity/usa/daily/")
+    assert api_client.post.call_count == 1
+
+    data_client.invalidate_list_files("equity/usa/daily/")
+    api_client.invalidate_cache.assert_called_once_with("data/list", "post", {"filePath": "equity/usa/daily/"})
+
+    data_client.list_files("equity/usa/daily/")
+    assert api_client.post.call_count == 2
+
+    data_client.invalidate_list_files()
+
+
 def test_data_client_list_files_raises_authentication_error_when_credentials_are_invalid() -> None:
     api_client = mock.Mock()
     api_client.post.side_effect = AuthenticationError()
@@ -292,6 +315,328 @@ def test_data_client_list_files_raises_authentication_error_when_credentials_are
     assert "Invalid credentials" in str(error.value)
 
 
+def test_data_client_download_url_retries_and_reverts_progress_of_failed_attempt(requests_mock: RequestsMock) -> None:
+    url = "https://example.com/data.zip"
+    requests_mock.add(requests_mock.GET, url, body=requests.exceptions.ConnectionError("Connection reset by peer"))
+    requests_mock.add(requests_mock.GET, url, body=b"data", headers={"Content-Length": "4"})
+
+    progress_callback = mock.Mock()
+    retry_policy = RetryPolicy(mock.Mock(), sleep=mock.Mock())
+    data_client = DataClient(mock.Mock(), HTTPClient(mock.Mock()), retry_policy)
+
+    local_file = Path.cwd() / "data.zip"
+    data_client.download_url(url, str(local_file), progress_callback)
+
+    assert local_file.read_bytes() == b"data"
+    assert sum(call[0][0] for call in progress_callback.call_args_list) == 1
+
+
+def test_data_client_download_url_resumes_partial_download(requests_mock: RequestsMock) -> None:
+    url = "https://example.com/data.zip"
+    requests_mock.add(requests_mock.GET, url, body=b"data", status=206,
+                      headers={"Content-Range": "bytes 4-7/8", "ETag": '"' + hashlib.md5(b"somedata").hexdigest() + '"'})
+
+    local_file = Path.cwd() / "data.zip"
+    Path(f"{local_file}.part").write_bytes(b"some")
+    Path(f"{local_file}.part.json").write_text(json.dumps({
+        "url": url,
+        "etag": '"' + hashlib.md5(b"somedata").hexdigest() + '"',
+        "lastModified": None,
+        "size": 8,
+        "md5": hashlib.md5(b"somedata").hexdigest(),
+        "offset": 4
+    }), encoding="utf-8")
+
+    progress_callback = mock.Mock()
+    data_client = DataClient(mock.Mock(), HTTPClient(mock.Mock()))
+    data_client.download_url(url, str(local_file), progress_callback)
+
+    assert requests_mock.calls[0].request.headers["Range"] == "bytes=4-"
+    assert requests_mock.calls[0].request.headers["If-Range"] == '"' + hashlib.md5(b"somedata").hexdigest() + '"'
+    assert local_file.read_bytes() == b"somedata"
+    assert not Path(f"{local_file}.part").exists()
+    assert not Path(f"{local_file}.part.json").exists()
+    assert sum(call[0][0] for call in progress_callback.call_args_list) == 1
+
+
+def test_data_client_download_url_restarts_when_server_sends_complete_file(requests_mock: RequestsMock) -> None:
+    url = "https://example.com/data.zip"
+    requests_mock.add(requests_mock.GET, url, body=b"new data", headers={"Content-Length": "8"})
+
+    local_file = Path.cwd() / "data.zip"
+    Path(f"{local_file}.part").write_bytes(b"old")
+    Path(f"{local_file}.part.json").write_text(json.dumps({
+        "url": url, "etag": '"old"', "lastModified": None, "size": 16, "md5": None, "offset": 3
+    }), encoding="utf-8")
+
+    data_client = DataClient(mock.Mock(), HTTPClient(mock.Mock()))
+    data_client.download_url(url, str(local_file), mock.Mock())
+
+    assert local_file.read_bytes() == b"new data"
+
+
+def test_data_client_download_url_restarts_when_server_sends_different_range_without_validator(
+        requests_mock: RequestsMock) -> None:
+    url = "https://example.com/data.zip"
+    content = b"the remote file changed"
+
+    def callback(request):
+        if "Range" not in request.headers:
+            return 200, {"Content-Length": str(len(content))}, content
+        # The remote file grew, so the requested range doesn't match the partial download anymore
+        return 206, {"Content-Range": f"bytes 4-{len(content) - 1}/{len(content)}"}, content[4:]
+
+    requests_mock.add_callback(requests_mock.GET, url, callback=callback)
+
+    local_file = Path.cwd() / "data.zip"
+    Path(f"{local_file}.part").write_bytes(b"some")
+    Path(f"{local_file}.part.json").write_text(json.dumps({
+        "url": url, "etag": None, "lastModified": None, "size": 8, "md5": None, "offset": 4
+    }), encoding="utf-8")
+
+    progress_callback = mock.Mock()
+    data_client = DataClient(mock.Mock(), HTTPClient(mock.Mock()))
+    data_client.download_url(url, str(local_file), progress_callback)
+
+    assert [call.request.headers.get("Range") for call in requests_mock.calls] == ["bytes=4-", None]
+    assert "If-Range" not in requests_mock.calls[0].request.headers
+    assert local_file.read_bytes() == content
+    assert not Path(f"{local_file}.part").exists()
+    assert not Path(f"{local_file}.part.json").exists()
+    assert sum(call.args[0] for call in progress_callback.call_args_list) == pytest.approx(1)
+
+
+def test_data_client_download_url_keeps_partial_download_when_interrupted(requests_mock: RequestsMock) -> None:
+    url = "https://example.com/data.zip"
+    requests_mock.add(requests_mock.GET, url, body=b"somedata", headers={"Content-Length": "8", "ETag": '"abc"'})
+    requests_mock.add(requests_mock.GET, url, body=b"data", status=206,
+                      headers={"Content-Range": "bytes 4-7/8", "ETag": '"abc"'})
+
+    local_file = Path.cwd() / "data.zip"
+    data_client = DataClient(mock.Mock(), HTTPClient(mock.Mock()))
+
+    def interrupted_iter_content(*args, **kwargs):
+        yield b"some"
+        raise requests.exceptions.ChunkedEncodingError("Connection broken")
+
+    with mock.patch.object(requests.Response, "iter_content", interrupted_iter_content):
+        with pytest.raises(requests.exceptions.ChunkedEncodingError):
+            data_client.download_url(url, str(local_file), mock.Mock())
+
+    assert not local_file.exists()
+    assert Path(f"{local_file}.part").read_bytes() == b"some"
+    assert json.loads(Path(f"{local_file}.part.json").read_text(encoding="utf-8"))["offset"] == 4
+
+    data_client.download_url(url, str(local_file), mock.Mock())
+
+    assert requests_mock.calls[1].request.headers["Range"] == "bytes=4-"
+    assert local_file.read_bytes() == b"somedata"
+
+
+def test_data_client_download_url_discards_download_with_invalid_checksum(requests_mock: RequestsMock) -> None:
+    url = "https://example.com/data.zip"
+    requests_mock.add(requests_mock.GET, url, body=b"data",
+                      headers={"Content-Length": "4", "ETag": '"' + hashlib.md5(b"other").hexdigest() + '"'})
+
+    local_file = Path.cwd() / "data.zip"
+    data_client = DataClient(mock.Mock(), HTTPClient(mock.Mock()))
+
+    with pytest.raises(RuntimeError) as error:
+        data_client.download_url(url, str(local_file), mock.Mock())
+
+    assert "checksum" in str(error.value)
+    assert not local_file.exists()
+    assert not Path(f"{local_file}.part").exists()
+    assert not Path(f"{local_file}.part.json").exists()
+
+
+def test_data_client_stream_url_passes_content_to_function_and_retries_broken_stream(requests_mock: RequestsMock) -> None:
+    url = "https://example.com/data.tar"
+    requests_mock.add(requests_mock.GET, url, body=b"some", headers={"Content-Length": "8"})
+    requests_mock.add(requests_mock.GET, url, body=b"somedata", headers={"Content-Length": "8"})
+
+    contents = []
+
+    def process(stream) -> None:
+        content = b""
+        while True:
+            data = stream.read(4)
+            if not data:
+                break
+            content += data
+
+        contents.append(content)
+
+    progress_callback = mock.Mock()
+    retry_policy = RetryPolicy(mock.Mock(), sleep=mock.Mock())
+    DataClient(mock.Mock(), HTTPClient(mock.Mock()), retry_policy).stream_url(url, process, progress_callback)
+
+    # The first response breaks off before its declared length, which is retried like any other transient error
+    assert contents == [b"somedata"]
+    assert len(requests_mock.calls) == 2
+    assert sum(call.args[0] for call in progress_callback.call_args_list) == pytest.approx(1)
+
+
+def _add_ranged_file(requests_mock: RequestsMock, url: str, content: bytes) -> None:
+    def callback(request):
+        if "Range" not in request.headers:
+            return 200, {"ETag": '"abc"'}, content
+
+        start, end = map(int, request.headers["Range"][len("bytes="):].split("-"))
+        return 206, {"Content-Range": f"bytes {start}-{end}/{len(content)}", "ETag": '"abc"'}, content[start:end + 1]
+
+    requests_mock.add_callback(requests_mock.GET, url, callback=callback)
+
+
+def test_data_client_download_url_downloads_large_file_in_segments(requests_mock: RequestsMock) -> None:
+    url = "https://example.com/data.tar"
+    content = bytes(range(256)) * 4
+    _add_ranged_file(requests_mock, url, content)
+
+    local_file = Path.cwd() / "data.tar"
+    progress_callback = mock.Mock()
+    DataClient(mock.Mock(), HTTPClient(mock.Mock())).download_url(url, str(local_file), progress_callback,
+                                                                  segment_count=4, segment_threshold=100)
+
+    assert local_file.read_bytes() == content
+    assert not Path(f"{local_file}.part").exists()
+    assert sorted(call.request.headers["Range"] for call in requests_mock.calls) == \
+           ["bytes=0-0", "bytes=0-255", "bytes=256-511", "bytes=512-767", "bytes=768-1023"]
+    assert sum(call.args[0] for call in progress_callback.call_args_list) == pytest.approx(1)
+
+
+def test_data_client_download_url_retries_failed_segment_only(requests_mock: RequestsMock) -> None:
+    url = "https://example.com/data.tar"
+    content = bytes(range(256)) * 4
+    attempts = {}
+
+    def callback(request):
+        start, end = request.headers["Range"][len("bytes="):].split("-")
+        attempts[start] = attempts.get(start, 0) + 1
+        if start == "512" and attempts[start] == 1:
+            return 503, {}, b""
+        return 206, {"Content-Range": f"bytes {start}-{end}/{len(content)}"}, content[int(start):int(end) + 1]
+
+    requests_mock.add_callback(requests_mock.GET, url, callback=callback)
+
+    local_file = Path.cwd() / "data.tar"
+    progress_callback = mock.Mock()
+    retry_policy = RetryPolicy(mock.Mock(), sleep=lambda seconds: None)
+    DataClient(mock.Mock(), HTTPClient(mock.Mock()), retry_policy).download_url(url, str(local_file),
+                                                                                progress_callback,
+                                                                                segment_count=4,
+                                                                                segment_threshold=100)
+
+    assert local_file.read_bytes() == content
+    assert attempts == {"0": 2, "256": 1, "512": 2, "768": 1}
+    assert sum(call.args[0] for call in progress_callback.call_args_list) == pytest.approx(1)
+
+
+def test_data_client_download_url_resumes_missing_segments_after_failure(requests_mock: RequestsMock) -> None:
+    url = "https://example.com/data.tar"
+    content = bytes(range(256)) * 4
+    fail = {"enabled": True}
+    ranges = []
+
+    def callback(request):
+        start, end = map(int, request.headers["Range"][len("bytes="):].split("-"))
+        ranges.append(request.headers["Range"])
+        if start == 512 and fail["enabled"]:
+            return 404, {"ETag": '"abc"'}, b""
+        return 206, {"Content-Range": f"bytes {start}-{end}/{len(content)}", "ETag": '"abc"'}, content[start:end + 1]
+
+    requests_mock.add_callback(requests_mock.GET, url, callback=callback)
+
+    local_file = Path.cwd() / "data.tar"
+    progress_callback = mock.Mock()
+    data_client = DataClient(mock.Mock(), HTTPClient(mock.Mock(), pool_size=1))
+
+    with pytest.raises(Exception):
+        data_client.download_url(url, str(local_file), progress_callback, segment_count=4, segment_threshold=100)
+
+    assert not local_file.exists()
+    assert Path(f"{local_file}.part").is_file()
+    assert Path(f"{local_file}.part.json").is_file()
+    assert sum(call.args[0] for call in progress_callback.call_args_list) == pytest.approx(0)
+
+    assert "bytes=512-767" in ranges
+
+    # A byte range may be cancelled before or after it has been requested, the sidecar records what was written
+    segments = json.loads(Path(f"{local_file}.part.json").read_text(encoding="utf-8"))["segments"]
+    missing_ranges = [f"bytes={start + written}-{end}" for start, end, written in segments
+                      if written < end + 1 - start]
+    assert "bytes=512-767" in missing_ranges
+
+    fail["enabled"] = False
+    ranges.clear()
+    progress_callback.reset_mock()
+    data_client.download_url(url, str(local_file), progress_callback, segment_count=4, segment_threshold=100)
+
+    assert local_file.read_bytes() == content
+    assert not Path(f"{local_file}.part").exists()
+    assert not Path(f"{local_file}.part.json").exists()
+    # Only the byte ranges that were not completed in the first attempt are requested again
+    assert ranges[0] == "bytes=0-0"
+    assert sorted(ranges[1:]) == sorted(missing_ranges)
+    assert sum(call.args[0] for call in progress_callback.call_args_list) == pytest.approx(1)
+
+
+def test_data_client_download_url_limits_concurrent_segments_to_pool_size(requests_mock: RequestsMock) -> None:
+    from threading import Lock
+
+    url = "https://example.com/data.tar"
+    content = bytes(range(256)) * 4
+    lock = Lock()
+    active = {"current": 0, "max": 0}
+
+    def callback(request):
+        start, end = map(int, request.headers["Range"][len("bytes="):].split("-"))
+        with lock:
+            active["current"] += 1
+            active["max"] = max(active["max"], active["current"])
+        sleep(0.05)
+        with lock:
+            active["current"] -= 1
+        return 206, {"Content-Range": f"bytes {start}-{end}/{len(content)}"}, content[start:end + 1]
+
+    requests_mock.add_callback(requests_mock.GET, url, callback=callback)
+
+    local_file = Path.cwd() / "data.tar"
+    DataClient(mock.Mock(), HTTPClient(mock.Mock(), pool_size=2)).download_url(url, str(local_file), mock.Mock(),
+                                                                               segment_count=8,
+                                                                               segment_threshold=100)
+
+    assert local_file.read_bytes() == content
+    assert active["max"] == 2
+
+
+def test_data_client_download_url_downloads_small_file_in_single_stream(requests_mock: RequestsMock) -> None:
+    url = "https://example.com/data.tar"
+    content = b"somedata"
+    _add_ranged_file(requests_mock, url, content)
+
+    local_file = Path.cwd() / "data.tar"
+    DataClient(mock.Mock(), HTTPClient(mock.Mock())).download_url(url, str(local_file), mock.Mock(),
+                                                                  segment_count=4, segment_threshold=100)
+
+    assert local_file.read_bytes() == content
+    assert [call.request.headers.get("Range") for call in requests_mock.calls] == ["bytes=0-0", None]
+
+
+def test_data_client_download_url_falls_back_to_single_stream_without_range_support(
+        requests_mock: RequestsMock) -> None:
+    url = "https://example.com/data.tar"
+    content = bytes(range(256)) * 4
+    requests_mock.add(requests_mock.GET, url, body=content)
+
+    local_file = Path.cwd() / "data.tar"
+    DataClient(mock.Mock(), HTTPClient(mock.Mock())).download_url(url, str(local_file), mock.Mock(),
+                                                                  segment_count=4, segment_threshold=100)
+
+    assert local_file.read_bytes() == content
+    assert len(requests_mock.calls) == 2
+
+
 def test_data_client_get_info() -> None:
     api_client = create_api_client()
     account_client = AccountClient(api_client)
@@ -0,0 +1,255 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from pyfakefs.fake_filesystem import FakeFilesystem
+
+from lean.components.cloud.data_downloader import DataDownloader
+from lean.models.errors import RequestFailedError
+
+
+def _create_data_downloader(api_client: mock.Mock, logger: mock.Mock) -> DataDownloader:
+    lean_config_manager = mock.Mock()
+    lean_config_manager.get_data_directory.return_value = Path.cwd() / "data"
+    return DataDownloader(logger, api_client, lean_config_manager, "1.00:00:00")
+
+
+def test_download_files_resolves_links_and_transfers_files() -> None:
+    api_client = mock.Mock()
+    api_client.data.get_download_link.side_effect = lambda relative_file, organization_id: f"https://{relative_file}"
+
+    data_files = [mock.Mock(file=f"equity/usa/minute/spy/2024010{day}_trade.zip") for day in range(1, 6)]
+    _create_data_downloader(api_client, mock.Mock()).download_files(data_files, False, "abc")
+
+    assert sorted(call.args for call in api_client.data.get_download_link.call_args_list) == \
+           sorted((data_file.file, "abc") for data_file in data_files)
+    assert sorted(call.args[:2] for call in api_client.data.download_url.call_args_list) == \
+           sorted((f"https://{data_file.file}", str(Path.cwd() / "data" / data_file.file)) for data_file in data_files)
+
+
+def test_download_files_consumes_data_files_from_generator() -> None:
+    api_client = mock.Mock()
+    api_client.data.get_download_link.side_effect = lambda relative_file, organization_id: f"https://{relative_file}"
+
+    relative_files = [f"equity/usa/minute/spy/2024010{day}_trade.zip" for day in range(1, 6)]
+    data_files = (mock.Mock(file=relative_file) for relative_file in relative_files)
+    _create_data_downloader(api_client, mock.Mock()).download_files(data_files, False, "abc")
+
+    assert sorted(call.args[0] for call in api_client.data.get_download_link.call_args_list) == relative_files
+
+
+def test_download_files_skips_existing_files_without_requesting_link() -> None:
+    existing_file = Path.cwd() / "data" / "equity/usa/minute/spy/20240101_trade.zip"
+    existing_file.parent.mkdir(parents=True)
+    existing_file.touch()
+
+    api_client = mock.Mock()
+    logger = mock.Mock()
+    _create_data_downloader(api_client, logger).download_files([mock.Mock(file="equity/usa/minute/spy/20240101_trade.zip")],
+                                                               False,
+                                                               "abc")
+
+    api_client.data.get_download_link.assert_not_called()
+    api_client.data.download_url.assert_not_called()
+    logger.warn.assert_called_once()
+
+
+def test_download_files_transfers_remaining_files_when_link_request_fails() -> None:
+    def get_download_link(relative_file: str, organization_id: str) -> str:
+        if relative_file.endswith("20240101_trade.zip"):
+            raise RequestFailedError(mock.Mock(), "Not available")
+        return f"https://{relative_file}"
+
+    api_client = mock.Mock()
+    api_client.data.get_download_link.side_effect = get_download_link
+
+    logger = mock.Mock()
+    data_files = [mock.Mock(file=f"equity/usa/minute/spy/2024010{day}_trade.zip") for day in range(1, 3)]
+    _create_data_downloader(api_client, logger).download_files(data_files, False, "abc")
+
+    api_client.data.download_url.assert_called_once()
+    assert api_client.data.download_url.call_args.args[0] == "https://equity/usa/minute/spy/20240102_trade.zip"
+    logger.warn.assert_called_once()
+
+
+def test_download_files_transfers_requested_links_when_transfer_fails() -> None:
+    api_client = mock.Mock()
+    api_client.data.get_download_link.side_effect = lambda relative_file, organization_id: f"https://{relative_file}"
+
+    def download_url(url: str, *args, **kwargs) -> None:
+        if url.endswith("20240101_trade.zip"):
+            raise RuntimeError("Oops")
+
+    api_client.data.download_url.side_effect = download_url
+
+    data_files = [mock.Mock(file=f"equity/usa/minute/spy/202401{day:02d}_trade.zip") for day in range(1, 31)]
+    with pytest.raises(RuntimeError, match="Oops"):
+        _create_data_downloader(api_client, mock.Mock()).download_files(data_files, False, "abc")
+
+    # Every file the organization has been billed for is transferred, even after another transfer failed
+    assert sorted(f"https://{call.args[0]}" for call in api_client.data.get_download_link.call_args_list) == \
+           sorted(call.args[0] for call in api_client.data.download_url.call_args_list)
+
+
+def test_download_files_links_stored_file_without_requesting_link(fs: FakeFilesystem) -> None:
+    from tempfile import TemporaryDirectory
+    from lean.components.util.data_store import DataStore
+
+    relative_file = "equity/usa/minute/spy/20240101_trade.zip"
+    api_client = mock.Mock()
+
+    # SQLite writes to the real file system, which pyfakefs can't intercept
+    fs.pause()
+    try:
+        with TemporaryDirectory() as tmp_dir:
+            source = Path(tmp_dir) / "workspace-1/data" / relative_file
+            source.parent.mkdir(parents=True)
+            source.write_bytes(b"spy")
+
+            lean_config_manager = mock.Mock()
+            lean_config_manager.get_data_directory.return_value = Path(tmp_dir) / "workspace-2/data"
+
+            with DataStore(mock.Mock(), Path(tmp_dir) / "store") as data_store:
+                data_store.add(relative_file, source)
+
+                data_downloader = DataDownloader(mock.Mock(), api_client, lean_config_manager, "1.00:00:00",
+                                                 data_store=data_store)
+                data_file = mock.Mock(file=relative_file, vendor=mock.Mock(vendorName="QuantConnect"))
+                data_downloader.download_files([data_file], False, "abc")
+
+            destination = Path(tmp_dir) / "workspace-2/data" / relative_file
+            assert destination.read_bytes() == b"spy"
+            assert destination.stat().st_ino == source.stat().st_ino
+    finally:
+        fs.resume()
+
+    api_client.data.get_download_link.assert_not_called()
+    api_client.data.download_url.assert_not_called()
+
+
+def test_download_files_waits_for_turn_before_requesting_link() -> None:
+    calls = mock.MagicMock()
+    api_client = calls.api_client
+    api_client.data.get_download_link.return_value = "https://example.com/file.zip"
+    download_queue = calls.download_queue
+
+    lean_config_manager = mock.Mock()
+    lean_config_manager.get_data_directory.return_value = Path.cwd() / "data"
+    data_downloader = DataDownloader(mock.Mock(), api_client, lean_config_manager, "1.00:00:00",
+                                     download_queue=download_queue)
+    data_downloader.download_files([mock.Mock(file="equity/usa/minute/spy/20240101_trade.zip")], False, "abc",
+                                   priority="low")
+
+    call_names = [name for name, _, _ in calls.mock_calls]
+    assert call_names.index("download_queue.wait_for_turn") < call_names.index("api_client.data.get_download_link")
+    download_queue.wait_for_turn.assert_called_once_with("low")
+
+
+def test_download_files_dry_run_logs_plan_without_requesting_links() -> None:
+    existing_file = Path.cwd() / "data" / "equity/usa/minute/spy/20240101_trade.zip"
+    existing_file.parent.mkdir(parents=True)
+    existing_file.touch()
+
+    api_client = mock.Mock()
+    logger = mock.Mock()
+    data_files = [mock.Mock(file=f"equity/usa/minute/spy/2024010{day}_trade.zip") for day in range(1, 4)]
+    _create_data_downloader(api_client, logger).download_files(data_files, False, "abc",
+                                                               max_concurrency=8, max_bandwidth=2 * 1024 * 1024,
+                                                               dry_run=True)
+
+    api_client.data.get_download_link.assert_not_called()
+    api_client.data.download_url.assert_not_called()
+
+    messages = [call.args[0] for call in logger.info.call_args_list]
+    assert "2 files would be downloaded, 1 files already exist" in messages[0]
+    assert "between 1 and 8" in messages[1]
+    assert "2.0 MB/s" in messages[2]
+
+
+def _create_tar(files: dict) -> bytes:
+    import tarfile
+    from io import BytesIO
+
+    buffer = BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, BytesIO(content))
+    return buffer.getvalue()
+
+
+def test_download_files_extracts_bulk_files_while_streaming() -> None:
+    from io import BytesIO
+    from lean.constants import BULK_DOWNLOAD_MODE_STREAM
+
+    content = _create_tar({"equity/usa/minute/spy/20240101_trade.zip": b"spy",
+                           "equity/usa/minute/qqq/20240101_trade.zip": b"qqq"})
+
+    api_client = mock.Mock()
+    api_client.data.get_download_link.return_value = "https://example.com/bulk.tar"
+    api_client.data.stream_url.side_effect = lambda url, process, *args, **kwargs: process(BytesIO(content))
+
+    lean_config_manager = mock.Mock()
+    lean_config_manager.get_data_directory.return_value = Path.cwd() / "data"
+    data_downloader = DataDownloader(mock.Mock(), api_client, lean_config_manager, "1.00:00:00",
+                                     bulk_download_mode=BULK_DOWNLOAD_MODE_STREAM)
+
+    data_downloader.download_files([mock.Mock(file="setup/equity_usa_minute.tar")], False, "abc")
+
+    data_dir = Path.cwd() / "data"
+    assert (data_dir / "equity/usa/minute/spy/20240101_trade.zip").read_bytes() == b"spy"
+    assert (data_dir / "equity/usa/minute/qqq/20240101_trade.zip").read_bytes() == b"qqq"
+    assert (data_dir / "setup/equity_usa_minute.log").is_file()
+    assert sorted(path.name for path in (data_dir / "equity/usa/minute/spy").iterdir()) == ["20240101_trade.zip"]
+    api_client.data.download_url.assert_not_called()
+
+
+def test_download_files_does_not_mark_bulk_file_as_downloaded_when_stream_breaks_off() -> None:
+    from io import BytesIO
+    from lean.constants import BULK_DOWNLOAD_MODE_STREAM
+
+    content = _create_tar({"equity/usa/minute/spy/20240101_trade.zip": b"spy" * 10000})
+
+    api_client = mock.Mock()
+    api_client.data.get_download_link.return_value = "https://example.com/bulk.tar"
+    api_client.data.stream_url.side_effect = lambda url, process, *args, **kwargs: \
+        process(BytesIO(content[:len(content) // 2]))
+
+    lean_config_manager = mock.Mock()
+    lean_config_manager.get_data_directory.return_value = Path.cwd() / "data"
+    data_downloader = DataDownloader(mock.Mock(), api_client, lean_config_manager, "1.00:00:00",
+                                     bulk_download_mode=BULK_DOWNLOAD_MODE_STREAM)
+
+    with pytest.raises(Exception):
+        data_downloader.download_files([mock.Mock(file="setup/equity_usa_minute.tar")], False, "abc")
+
+    data_dir = Path.cwd() / "data"
+    assert not (data_dir / "setup/equity_usa_minute.log").exists()
+    assert not (data_dir / "equity/usa/minute/spy/20240101_trade.zip").exists()
+
+
+def test_extract_tar_stream_skips_members_outside_destination() -> None:
+    from io import BytesIO
+
+    content = _create_tar({"../outside.txt": b"outside", "inside.txt": b"inside"})
+
+    destination = Path.cwd() / "data"
+    destination.mkdir()
+    _create_data_downloader(mock.Mock(), mock.Mock())._extract_tar_stream(BytesIO(content), destination)
+
+    assert (destination / "inside.txt").read_bytes() == b"inside"
+    assert not (Path.cwd() / "outside.txt").exists()
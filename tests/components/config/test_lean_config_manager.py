@@ -148,6 +148,55 @@ def test_get_data_directory_returns_path_to_data_directory_when_config_contains_
     assert manager.get_data_directory() == Path.cwd() / "sub1" / "sub2" / "sub3" / "data"
 
 
+def test_get_lean_config_does_not_parse_unchanged_config_again() -> None:
+    with (Path.cwd() / "lean.json").open("w+", encoding="utf-8") as file:
+        file.write('{ "data-folder": "data" }')
+
+    manager = _create_lean_config_manager()
+
+    with mock.patch.object(manager, "parse_json", wraps=manager.parse_json) as parse_json:
+        assert manager.get_lean_config() == {"data-folder": "data"}
+        assert manager.get_lean_config() == {"data-folder": "data"}
+
+    parse_json.assert_called_once()
+
+
+def test_get_lean_config_parses_config_again_when_file_changed() -> None:
+    config_path = Path.cwd() / "lean.json"
+    config_path.write_text('{ "data-folder": "data" }', encoding="utf-8")
+
+    manager = _create_lean_config_manager()
+    assert manager.get_lean_config() == {"data-folder": "data"}
+
+    config_path.write_text('{ "data-folder": "other-data" }', encoding="utf-8")
+
+    assert manager.get_lean_config() == {"data-folder": "other-data"}
+
+
+def test_get_lean_config_returns_new_dict_every_call() -> None:
+    with (Path.cwd() / "lean.json").open("w+", encoding="utf-8") as file:
+        file.write('{ "data-folder": "data", "environments": { "backtesting": {} } }')
+
+    manager = _create_lean_config_manager()
+
+    config = manager.get_lean_config()
+    config["data-folder"] = "modified"
+    config["environments"]["backtesting"]["modified"] = True
+
+    assert manager.get_lean_config() == {"data-folder": "data", "environments": {"backtesting": {}}}
+
+
+def test_set_properties_invalidates_parsed_config() -> None:
+    with (Path.cwd() / "lean.json").open("w+", encoding="utf-8") as file:
+        file.write('{ "data-folder": "data" }')
+
+    manager = _create_lean_config_manager()
+    manager.get_lean_config()
+    manager.set_properties({"my-property": "my-value"})
+
+    assert manager.get_lean_config()["my-property"] == "my-value"
+
+
 def test_set_properties_adds_property_when_not_part_of_config_yet() -> None:
     with (Path.cwd() / "lean.json").open("w+", encoding="utf-8") as file:
         file.write("""
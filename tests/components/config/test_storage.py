@@ -13,8 +13,11 @@
 
 import json
 from pathlib import Path
+from unittest import mock
 
-from lean.components.config.storage import Storage
+import pytest
+
+from lean.components.config.storage import Storage, update_file
 
 
 def test_get_reads_key_from_file() -> None:
@@ -119,3 +122,61 @@ def test_clear_deletes_file() -> None:
     storage.clear()
 
     assert not path.exists()
+
+
+def test_batch_writes_file_once_when_it_ends() -> None:
+    path = Path.cwd() / "config.json"
+    storage = Storage(str(path))
+
+    with mock.patch("lean.components.config.storage.update_file", wraps=update_file) as save:
+        with storage.batch():
+            storage.set("key1", "value1")
+            storage.set("key2", "value2")
+            storage.delete("key1")
+
+            assert not path.exists()
+
+    save.assert_called_once()
+    assert json.loads(path.read_text(encoding="utf-8")) == {"key2": "value2"}
+
+
+def test_batch_only_writes_when_outermost_batch_ends() -> None:
+    path = Path.cwd() / "config.json"
+    storage = Storage(str(path))
+
+    with storage.batch():
+        with storage.batch():
+            storage.set("key", "value")
+
+        assert not path.exists()
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"key": "value"}
+
+
+def test_batch_discards_changes_when_error_is_raised() -> None:
+    path = Path.cwd() / "config.json"
+    with path.open("w+", encoding="utf-8") as file:
+        file.write('{ "key": "value" }')
+
+    storage = Storage(str(path))
+
+    with pytest.raises(ValueError):
+        with storage.batch():
+            storage.set("key", "new-value")
+            raise ValueError()
+
+    assert storage.get("key") == "value"
+    assert json.loads(path.read_text(encoding="utf-8")) == {"key": "value"}
+
+
+def test_set_merges_changes_of_other_instances() -> None:
+    path = Path.cwd() / "config.json"
+    first = Storage(str(path))
+    second = Storage(str(path))
+
+    first.set("key1", "value1")
+    second.set("key2", "value2")
+    second.delete("key3")
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"key1": "value1", "key2": "value2"}
+    assert second.get("key1") == "value1"
@@ -0,0 +1,94 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime
+from unittest import mock
+
+import pytest
+
+from lean.components.util.bandwidth_limiter import BandwidthLimiter, BandwidthSchedule
+
+
+def test_consume_does_not_wait_within_burst() -> None:
+    sleep = mock.Mock()
+    limiter = BandwidthLimiter(1000, clock=lambda: 0.0, sleep=sleep)
+
+    limiter.consume(1000)
+
+    sleep.assert_not_called()
+
+
+def test_consume_waits_until_transferred_bytes_fit_within_limit() -> None:
+    sleep = mock.Mock()
+    limiter = BandwidthLimiter(1000, clock=lambda: 0.0, sleep=sleep)
+
+    limiter.consume(1000)
+    limiter.consume(500)
+
+    sleep.assert_called_once_with(pytest.approx(0.5))
+
+
+def test_consume_refills_over_time() -> None:
+    now = [0.0]
+    sleep = mock.Mock()
+    limiter = BandwidthLimiter(1000, clock=lambda: now[0], sleep=sleep)
+
+    limiter.consume(1000)
+    now[0] = 1.0
+    limiter.consume(1000)
+
+    sleep.assert_not_called()
+
+
+@pytest.mark.parametrize("moment,expected", [(datetime(2024, 1, 1, 9, 0), 2 * 1024 * 1024),
+                                             (datetime(2024, 1, 1, 17, 29), 2 * 1024 * 1024),
+                                             (datetime(2024, 1, 1, 17, 30), None),
+                                             (datetime(2024, 1, 1, 23, 0), 0.5 * 1024 * 1024),
+                                             (datetime(2024, 1, 1, 5, 59), 0.5 * 1024 * 1024),
+                                             (datetime(2024, 1, 1, 6, 0), None)])
+def test_bandwidth_schedule_get_limit_returns_limit_of_window_containing_moment(moment: datetime, expected) -> None:
+    schedule = BandwidthSchedule.parse("09:00-17:30=2, 22:00-06:00=0.5, 17:30-22:00=unlimited")
+
+    assert schedule.get_limit(moment) == expected
+
+
+def test_consume_follows_schedule() -> None:
+    moment = [datetime(2024, 1, 1, 12, 0)]
+    sleep = mock.Mock()
+    limiter = BandwidthLimiter(None,
+                               BandwidthSchedule.parse("09:00-17:00=1"),
+                               clock=lambda: 0.0,
+                               sleep=sleep,
+                               now=lambda: moment[0])
+
+    limiter.consume(1024 * 1024)
+    limiter.consume(512 * 1024)
+    sleep.assert_called_once_with(pytest.approx(0.5))
+
+    sleep.reset_mock()
+    moment[0] = datetime(2024, 1, 1, 18, 0)
+    limiter.consume(10 * 1024 * 1024)
+    sleep.assert_not_called()
+
+
+def test_consume_applies_lowest_of_fixed_and_scheduled_limit() -> None:
+    sleep = mock.Mock()
+    limiter = BandwidthLimiter(1000,
+                               BandwidthSchedule.parse("00:00-23:59=1"),
+                               clock=lambda: 0.0,
+                               sleep=sleep,
+                               now=lambda: datetime(2024, 1, 1, 12, 0))
+
+    limiter.consume(1500)
+
+    sleep.assert_called_once_with(pytest.approx(0.5))
@@ -0,0 +1,106 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from threading import Thread
+from unittest import mock
+
+from lean.components.util.concurrency_controller import ConcurrencyController
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _run_window(controller: ConcurrencyController, clock: FakeClock, transferred_bytes: int, errors: int = 0) -> None:
+    for _ in range(errors):
+        controller.record_error()
+    clock.now += 1
+    controller.record_bytes(transferred_bytes)
+
+
+def test_limit_increases_additively_while_throughput_improves() -> None:
+    clock = FakeClock()
+    controller = ConcurrencyController(mock.Mock(), 4, 32, window_seconds=1, clock=clock)
+
+    _run_window(controller, clock, 100)
+    _run_window(controller, clock, 200)
+    _run_window(controller, clock, 300)
+
+    assert controller.limit == 7
+
+
+def test_limit_is_halved_when_transfers_fail() -> None:
+    clock = FakeClock()
+    controller = ConcurrencyController(mock.Mock(), 8, 32, window_seconds=1, clock=clock)
+
+    _run_window(controller, clock, 100, errors=1)
+
+    assert controller.limit == 4
+
+
+def test_limit_decreases_when_throughput_drops() -> None:
+    clock = FakeClock()
+    controller = ConcurrencyController(mock.Mock(), 4, 32, window_seconds=1, clock=clock)
+
+    _run_window(controller, clock, 1000)
+    _run_window(controller, clock, 500)
+
+    assert controller.limit == 4
+
+
+def test_limit_holds_when_throughput_plateaus() -> None:
+    clock = FakeClock()
+    controller = ConcurrencyController(mock.Mock(), 4, 32, window_seconds=1, clock=clock)
+
+    _run_window(controller, clock, 1000)
+    _run_window(controller, clock, 1010)
+
+    assert controller.limit == 5
+
+
+def test_limit_never_exceeds_max_limit() -> None:
+    clock = FakeClock()
+    controller = ConcurrencyController(mock.Mock(), 4, 5, window_seconds=1, clock=clock)
+
+    for transferred_bytes in [100, 200, 300]:
+        _run_window(controller, clock, transferred_bytes)
+
+    assert controller.limit == 5
+
+
+def test_limit_does_not_increase_above_max_bytes_per_second() -> None:
+    clock = FakeClock()
+    controller = ConcurrencyController(mock.Mock(), 4, 32, max_bytes_per_second=150, window_seconds=1, clock=clock)
+
+    _run_window(controller, clock, 100)
+    _run_window(controller, clock, 200)
+
+    assert controller.limit == 5
+
+
+def test_acquire_blocks_while_limit_is_reached() -> None:
+    controller = ConcurrencyController(mock.Mock(), 1, 1)
+    controller.acquire()
+
+    thread = Thread(target=controller.acquire)
+    thread.start()
+    thread.join(timeout=0.1)
+    assert thread.is_alive()
+
+    controller.release()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
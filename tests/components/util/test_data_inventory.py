@@ -0,0 +1,181 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from pyfakefs.fake_filesystem import FakeFilesystem
+
+from lean.components.util.data_inventory import DataInventory
+from lean.constants import DATA_INVENTORY_FILE_NAME
+
+
+@pytest.fixture
+def data_dir(fs: FakeFilesystem) -> Path:
+    from tempfile import TemporaryDirectory
+
+    # SQLite writes to the real file system, which pyfakefs can't intercept
+    fs.pause()
+    with TemporaryDirectory() as tmp_dir:
+        yield Path(tmp_dir)
+    fs.resume()
+
+
+def _create_file(data_dir: Path, relative_path: str, content: str = "content") -> None:
+    path = data_dir / relative_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def test_record_file_persists_entry(data_dir: Path) -> None:
+    _create_file(data_dir, "equity/usa/daily/spy.zip")
+
+    with DataInventory(mock.Mock(), data_dir) as inventory:
+        inventory.record_file("equity/usa/daily/spy.zip", "QuantConnect", "abc")
+
+    with DataInventory(mock.Mock(), data_dir) as inventory:
+        entry = inventory.get_files(["equity/usa/daily/spy.zip"])["equity/usa/daily/spy.zip"]
+
+    assert entry.size == len("content")
+    assert entry.vendor == "QuantConnect"
+    assert entry.hash == "abc"
+    assert entry.downloaded_at is not None
+
+
+def test_get_existing_files_ignores_missing_and_truncated_files(data_dir: Path) -> None:
+    _create_file(data_dir, "equity/usa/daily/spy.zip")
+    _create_file(data_dir, "equity/usa/daily/aapl.zip")
+    _create_file(data_dir, "equity/usa/daily/ibm.zip")
+
+    with DataInventory(mock.Mock(), data_dir) as inventory:
+        inventory.record_files(["equity/usa/daily/spy.zip", "equity/usa/daily/aapl.zip", "equity/usa/daily/ibm.zip"])
+
+        (data_dir / "equity/usa/daily/aapl.zip").write_text("", encoding="utf-8")
+        (data_dir / "equity/usa/daily/ibm.zip").unlink()
+
+        existing_files = inventory.get_existing_files(["equity/usa/daily/spy.zip",
+                                                       "equity/usa/daily/aapl.zip",
+                                                       "equity/usa/daily/ibm.zip",
+                                                       "equity/usa/daily/msft.zip"])
+
+    assert existing_files == {"equity/usa/daily/spy.zip"}
+
+
+def test_get_existing_files_indexes_unknown_files_on_disk(data_dir: Path) -> None:
+    _create_file(data_dir, "equity/usa/daily/spy.zip")
+
+    with DataInventory(mock.Mock(), data_dir) as inventory:
+        assert inventory.get_existing_files(["equity/usa/daily/spy.zip"]) == {"equity/usa/daily/spy.zip"}
+        assert "equity/usa/daily/spy.zip" in inventory.get_files(["equity/usa/daily/spy.zip"])
+
+
+def test_find_files_does_not_match_across_directories(data_dir: Path) -> None:
+    _create_file(data_dir, "equity/usa/map_files/map_files_20240101.zip")
+    _create_file(data_dir, "equity/usa/map_files/nested/map_files_20240101.zip")
+    _create_file(data_dir, "equity/usa/factor_files/factor_files_20240101.zip")
+
+    with DataInventory(mock.Mock(), data_dir) as inventory:
+        inventory.rescan()
+        matches = inventory.find_files("*/*/map_files/*.zip")
+
+    assert [entry.path for entry in matches] == ["equity/usa/map_files/map_files_20240101.zip"]
+
+
+def test_rescan_adds_updates_and_removes_entries(data_dir: Path) -> None:
+    _create_file(data_dir, "equity/usa/daily/spy.zip")
+    _create_file(data_dir, "equity/usa/daily/aapl.zip")
+    _create_file(data_dir, "equity/usa/daily/spy.zip.part")
+
+    with DataInventory(mock.Mock(), data_dir) as inventory:
+        result = inventory.rescan()
+        assert (result.files, result.added, result.updated, result.removed) == (2, 2, 0, 0)
+
+        assert inventory.rescan() == (2, 0, 0, 0)
+
+        _create_file(data_dir, "equity/usa/daily/spy.zip", "new content")
+        (data_dir / "equity/usa/daily/aapl.zip").unlink()
+        _create_file(data_dir, "equity/usa/daily/ibm.zip")
+
+        result = inventory.rescan()
+        assert (result.files, result.added, result.updated, result.removed) == (2, 1, 1, 1)
+
+
+def test_rescan_computes_hashes(data_dir: Path) -> None:
+    from hashlib import md5
+
+    _create_file(data_dir, "equity/usa/daily/spy.zip")
+
+    with DataInventory(mock.Mock(), data_dir) as inventory:
+        inventory.rescan(compute_hashes=True)
+        entry = inventory.get_files(["equity/usa/daily/spy.zip"])["equity/usa/daily/spy.zip"]
+
+    assert entry.hash == md5(b"content").hexdigest()
+
+
+def test_recorded_files_are_visible_to_other_processes_right_away(data_dir: Path) -> None:
+    _create_file(data_dir, "equity/usa/daily/spy.zip")
+
+    with DataInventory(mock.Mock(), data_dir) as writer, DataInventory(mock.Mock(), data_dir) as reader:
+        reader.is_empty()
+        writer.record_file("equity/usa/daily/spy.zip")
+        assert "equity/usa/daily/spy.zip" in reader.get_files(["equity/usa/daily/spy.zip"])
+
+        writer.record_file("equity/usa/daily/spy.zip", "QuantConnect")
+        assert reader.get_files(["equity/usa/daily/spy.zip"])["equity/usa/daily/spy.zip"].vendor == "QuantConnect"
+
+
+def test_locked_inventory_behaves_as_empty(data_dir: Path) -> None:
+    import sqlite3
+
+    _create_file(data_dir, "equity/usa/daily/spy.zip")
+    with DataInventory(mock.Mock(), data_dir) as inventory:
+        inventory.record_file("equity/usa/daily/spy.zip")
+
+    with mock.patch("lean.components.util.data_inventory._BUSY_TIMEOUT_SECONDS", 0.1):
+        with DataInventory(mock.Mock(), data_dir) as inventory:
+            assert not inventory.is_empty()
+
+            # Another process holding a write transaction locks the database for reading and writing
+            other_process = sqlite3.connect(str(data_dir / DATA_INVENTORY_FILE_NAME), isolation_level=None)
+            other_process.execute("BEGIN EXCLUSIVE")
+
+            try:
+                assert inventory.is_empty()
+                assert inventory.get_files(["equity/usa/daily/spy.zip"]) == {}
+                assert inventory.get_existing_files(["equity/usa/daily/spy.zip"]) == {"equity/usa/daily/spy.zip"}
+                inventory.record_file("equity/usa/daily/spy.zip", "QuantConnect")
+            finally:
+                other_process.execute("ROLLBACK")
+                other_process.close()
+
+    with DataInventory(mock.Mock(), data_dir) as inventory:
+        assert inventory.get_files(["equity/usa/daily/spy.zip"])["equity/usa/daily/spy.zip"].vendor is None
+
+
+def test_corrupted_inventory_is_rebuilt(data_dir: Path) -> None:
+    (data_dir / DATA_INVENTORY_FILE_NAME).write_text("this is not a database", encoding="utf-8")
+    _create_file(data_dir, "equity/usa/daily/spy.zip")
+
+    with DataInventory(mock.Mock(), data_dir) as inventory:
+        assert inventory.is_empty()
+        inventory.record_file("equity/usa/daily/spy.zip")
+        assert not inventory.is_empty()
+
+
+def test_inventory_is_not_created_when_create_is_false(data_dir: Path) -> None:
+    with DataInventory(mock.Mock(), data_dir, create=False) as inventory:
+        assert inventory.is_empty()
+        assert inventory.find_files("*") == []
+
+    assert not (data_dir / DATA_INVENTORY_FILE_NAME).exists()
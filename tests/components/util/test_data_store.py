@@ -0,0 +1,166 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from pyfakefs.fake_filesystem import FakeFilesystem
+
+from lean.components.util.data_store import DataStore
+
+
+@pytest.fixture
+def tmp_dir(fs: FakeFilesystem) -> Path:
+    from tempfile import TemporaryDirectory
+
+    # SQLite writes to the real file system, which pyfakefs can't intercept
+    fs.pause()
+    with TemporaryDirectory() as tmp_dir:
+        yield Path(tmp_dir)
+    fs.resume()
+
+
+def _create_file(path: Path, content: str = "content") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def test_materialize_links_stored_file_into_other_data_directory(tmp_dir: Path) -> None:
+    source = _create_file(tmp_dir / "workspace-1/data/equity/usa/minute/spy/20240101_trade.zip")
+    destination = tmp_dir / "workspace-2/data/equity/usa/minute/spy/20240101_trade.zip"
+
+    with DataStore(mock.Mock(), tmp_dir / "store") as data_store:
+        data_store.add("equity/usa/minute/spy/20240101_trade.zip", source)
+        assert data_store.materialize("equity/usa/minute/spy/20240101_trade.zip", destination)
+
+    assert destination.read_text(encoding="utf-8") == "content"
+    assert destination.stat().st_ino == source.stat().st_ino
+
+
+def test_materialize_returns_false_for_unknown_file(tmp_dir: Path) -> None:
+    destination = tmp_dir / "data/equity/usa/minute/spy/20240101_trade.zip"
+
+    with DataStore(mock.Mock(), tmp_dir / "store") as data_store:
+        assert not data_store.materialize("equity/usa/minute/spy/20240101_trade.zip", destination)
+
+    assert not destination.exists()
+
+
+def test_add_stores_identical_files_once(tmp_dir: Path) -> None:
+    first = _create_file(tmp_dir / "workspace-1/data/equity/usa/minute/spy/20240101_trade.zip")
+    second = _create_file(tmp_dir / "workspace-2/data/equity/usa/minute/qqq/20240101_trade.zip")
+
+    with DataStore(mock.Mock(), tmp_dir / "store") as data_store:
+        data_store.add("equity/usa/minute/spy/20240101_trade.zip", first)
+        data_store.add("equity/usa/minute/qqq/20240101_trade.zip", second)
+
+    assert len(list((tmp_dir / "store/objects").glob("*/*"))) == 1
+    assert first.stat().st_ino == second.stat().st_ino
+
+
+def test_collect_garbage_removes_files_no_longer_linked_into_data_directories(tmp_dir: Path) -> None:
+    used = _create_file(tmp_dir / "data/equity/usa/minute/spy/20240101_trade.zip", "spy")
+    unused = _create_file(tmp_dir / "data/equity/usa/minute/qqq/20240101_trade.zip", "qqq")
+
+    with DataStore(mock.Mock(), tmp_dir / "store") as data_store:
+        data_store.add("equity/usa/minute/spy/20240101_trade.zip", used)
+        data_store.add("equity/usa/minute/qqq/20240101_trade.zip", unused)
+        unused.unlink()
+
+        result = data_store.collect_garbage()
+
+        assert result.removed_files == 1
+        assert result.freed_bytes == len("qqq")
+        assert not data_store.materialize("equity/usa/minute/qqq/20240101_trade.zip", tmp_dir / "other/qqq.zip")
+        assert data_store.materialize("equity/usa/minute/spy/20240101_trade.zip", tmp_dir / "other/spy.zip")
+
+
+@pytest.mark.parametrize("relative_path", ["equity/usa/daily/spy.zip",
+                                           "crypto/coinbase/hour/btcusd_trade.zip",
+                                           "equity/usa/map_files/spy.csv",
+                                           "equity/usa/factor_files/spy.csv",
+                                           "symbol-properties/symbol-properties-database.csv"])
+def test_files_regenerated_in_place_are_not_shared(tmp_dir: Path, relative_path: str) -> None:
+    source = _create_file(tmp_dir / "workspace-1/data" / relative_path)
+
+    with DataStore(mock.Mock(), tmp_dir / "store") as data_store:
+        data_store.add(relative_path, source)
+        assert not data_store.materialize(relative_path, tmp_dir / "workspace-2/data" / relative_path)
+
+    assert not (tmp_dir / "store/objects").exists()
+    assert source.stat().st_nlink == 1
+
+
+def test_materialize_returns_false_for_file_stored_longer_than_max_age(tmp_dir: Path) -> None:
+    source = _create_file(tmp_dir / "workspace-1/data/equity/usa/minute/spy/20240101_trade.zip")
+    destination = tmp_dir / "workspace-2/data/equity/usa/minute/spy/20240101_trade.zip"
+
+    with DataStore(mock.Mock(), tmp_dir / "store", max_age=60) as data_store:
+        with mock.patch("time.time", return_value=1_000_000):
+            data_store.add("equity/usa/minute/spy/20240101_trade.zip", source)
+
+        with mock.patch("time.time", return_value=1_000_030):
+            assert data_store.materialize("equity/usa/minute/spy/20240101_trade.zip", destination)
+        destination.unlink()
+
+        with mock.patch("time.time", return_value=1_000_090):
+            assert not data_store.materialize("equity/usa/minute/spy/20240101_trade.zip", destination)
+
+    assert not destination.exists()
+
+
+def test_index_without_download_times_is_rebuilt(tmp_dir: Path) -> None:
+    import sqlite3
+
+    (tmp_dir / "store").mkdir()
+    connection = sqlite3.connect(str(tmp_dir / "store/index.db"))
+    connection.execute("CREATE TABLE files (path TEXT PRIMARY KEY, hash TEXT NOT NULL, size INTEGER NOT NULL)")
+    connection.execute("INSERT INTO files (path, hash, size) VALUES ('equity/usa/minute/spy/20240101_trade.zip', "
+                       "'abc', 7)")
+    connection.commit()
+    connection.close()
+
+    source = _create_file(tmp_dir / "workspace-1/data/equity/usa/minute/spy/20240101_trade.zip")
+    destination = tmp_dir / "workspace-2/data/equity/usa/minute/spy/20240101_trade.zip"
+
+    with DataStore(mock.Mock(), tmp_dir / "store") as data_store:
+        assert not data_store.materialize("equity/usa/minute/spy/20240101_trade.zip", destination)
+        data_store.add("equity/usa/minute/spy/20240101_trade.zip", source)
+        assert data_store.materialize("equity/usa/minute/spy/20240101_trade.zip", destination)
+
+
+def test_locked_index_falls_back_to_downloading(tmp_dir: Path) -> None:
+    import sqlite3
+
+    source = _create_file(tmp_dir / "workspace-1/data/equity/usa/minute/spy/20240101_trade.zip")
+    destination = tmp_dir / "workspace-2/data/equity/usa/minute/spy/20240101_trade.zip"
+
+    with mock.patch("lean.components.util.data_store._BUSY_TIMEOUT_SECONDS", 0.1):
+        with DataStore(mock.Mock(), tmp_dir / "store") as data_store:
+            data_store.add("equity/usa/minute/spy/20240101_trade.zip", source)
+
+            # Another process holding a write transaction locks the index for reading and writing
+            other_process = sqlite3.connect(str(tmp_dir / "store/index.db"), isolation_level=None)
+            other_process.execute("BEGIN EXCLUSIVE")
+
+            try:
+                assert not data_store.materialize("equity/usa/minute/spy/20240101_trade.zip", destination)
+                data_store.add("equity/usa/minute/spy/20240101_trade.zip", source)
+                data_store.collect_garbage()
+            finally:
+                other_process.execute("ROLLBACK")
+                other_process.close()
+
+            assert data_store.materialize("equity/usa/minute/spy/20240101_trade.zip", destination)
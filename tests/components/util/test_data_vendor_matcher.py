@@ -0,0 +1,82 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Optional
+
+import pytest
+
+from lean.components.util.data_vendor_matcher import DataVendorMatcher
+from lean.models.api import QCDataVendor
+
+
+def _create_vendor(name: str, regex: str, price: Optional[float] = 1) -> QCDataVendor:
+    return QCDataVendor(vendorName=name, regex=f"/{regex}/", price=price)
+
+
+@pytest.mark.parametrize("file,expected_vendor", [
+    ("equity/usa/map_files/map_files_20240101.zip", "Map files"),
+    ("equity/usa/minute/spy/20240101_trade.zip", "Equity"),
+    ("equity/usa/daily/spy.zip", "Equity"),
+    ("crypto/coinbase/daily/btcusd_trade.zip", "Anywhere"),
+    ("option/usa/minute/spy/20240101_quote_american.zip", "Options"),
+    ("forex/oanda/daily/eurusd.zip", None)
+])
+def test_match_returns_first_vendor_whose_regex_matches(file: str, expected_vendor: Optional[str]) -> None:
+    matcher = DataVendorMatcher([
+        _create_vendor("Free", "^equity\\/usa\\/", price=None),
+        _create_vendor("Map files", "^equity\\/usa\\/(factor_files|map_files)\\/[^\\/]+.zip$"),
+        _create_vendor("Equity", "^equity\\/usa\\/(minute|daily)\\/"),
+        _create_vendor("Anywhere", "coinbase\\/daily"),
+        _create_vendor("Options", "^option\\/usa\\/|^future\\/"),
+        _create_vendor("Equity fallback", "^equity\\/")
+    ])
+
+    vendor = matcher.match(file)
+
+    assert (vendor.vendorName if vendor is not None else None) == expected_vendor
+
+
+def test_match_respects_vendor_order_between_indexed_and_unindexed_vendors() -> None:
+    matcher = DataVendorMatcher([
+        _create_vendor("Unindexed", "daily"),
+        _create_vendor("Indexed", "^equity\\/usa\\/daily\\/")
+    ])
+
+    assert matcher.match("equity/usa/daily/spy.zip").vendorName == "Unindexed"
+
+
+@pytest.mark.parametrize("regex,file", [
+    ("^equity\\/usa?\\/daily", "equity/us/daily/spy.zip"),
+    ("^equity\\/usa*\\/daily", "equity/us/daily/spy.zip"),
+    ("^equity\\/us[a]\\/daily", "equity/usa/daily/spy.zip"),
+    ("^equity\\/\\w+\\/daily", "equity/usa/daily/spy.zip"),
+    ("^(equity|option)\\/usa", "option/usa/daily/spy.zip"),
+    ("^a|equity", "equity/usa/daily/spy.zip")
+])
+def test_match_handles_regexes_without_plain_literal_prefix(regex: str, file: str) -> None:
+    matcher = DataVendorMatcher([_create_vendor("Vendor", regex)])
+
+    assert matcher.match(file) is not None
+
+
+def test_match_handles_unindexed_regexes_which_cannot_be_combined() -> None:
+    matcher = DataVendorMatcher([
+        _create_vendor("Named", "(?P<market>usa)\\/daily"),
+        _create_vendor("Backreference", "(a)\\1"),
+        _create_vendor("Other named", "(?P<market>india)\\/daily")
+    ])
+
+    assert matcher.match("equity/usa/daily/spy.zip").vendorName == "Named"
+    assert matcher.match("equity/india/daily/spy.zip").vendorName == "Other named"
+    assert matcher.match("equity/aa/daily/spy.zip").vendorName == "Backreference"
+    assert matcher.match("equity/uk/daily/spy.zip") is None
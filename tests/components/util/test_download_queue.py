@@ -0,0 +1,84 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from unittest import mock
+
+from lean.components.util.download_queue import CLAIM_TIMEOUT_SECONDS, DownloadQueue
+from lean.constants import DOWNLOAD_PRIORITY_HIGH, DOWNLOAD_PRIORITY_LOW, DOWNLOAD_PRIORITY_NORMAL
+
+
+def _create_download_queue(sleep: mock.Mock = None) -> DownloadQueue:
+    from time import time
+    return DownloadQueue(mock.Mock(), Path("~/.lean/download-queue").expanduser(), clock=time, sleep=sleep or mock.Mock())
+
+
+def test_wait_for_turn_returns_immediately_without_claims() -> None:
+    sleep = mock.Mock()
+
+    _create_download_queue(sleep).wait_for_turn(DOWNLOAD_PRIORITY_LOW)
+
+    sleep.assert_not_called()
+
+
+def test_wait_for_turn_does_not_wait_for_claims_of_same_or_lower_priority() -> None:
+    sleep = mock.Mock()
+
+    with _create_download_queue().claim(DOWNLOAD_PRIORITY_LOW), _create_download_queue().claim(DOWNLOAD_PRIORITY_NORMAL):
+        _create_download_queue(sleep).wait_for_turn(DOWNLOAD_PRIORITY_NORMAL)
+
+    sleep.assert_not_called()
+
+
+def test_wait_for_turn_waits_until_higher_priority_claim_is_released() -> None:
+    other_process = _create_download_queue()
+    claim = other_process.claim(DOWNLOAD_PRIORITY_HIGH)
+    claim.__enter__()
+
+    from time import time
+    now = [time()]
+
+    def sleep_until_released(seconds: float) -> None:
+        now[0] += seconds
+        claim.__exit__(None, None, None)
+
+    sleep = mock.Mock(side_effect=sleep_until_released)
+    queue = DownloadQueue(mock.Mock(), Path("~/.lean/download-queue").expanduser(), clock=lambda: now[0], sleep=sleep)
+    queue.wait_for_turn(DOWNLOAD_PRIORITY_NORMAL)
+
+    sleep.assert_called_once()
+
+
+def test_wait_for_turn_ignores_expired_claims() -> None:
+    from os import utime
+    from time import time
+
+    directory = Path("~/.lean/download-queue").expanduser()
+    directory.mkdir(parents=True)
+    claim_file = directory / "2-abandoned.claim"
+    claim_file.touch()
+    expired = time() - CLAIM_TIMEOUT_SECONDS - 1
+    utime(claim_file, (expired, expired))
+
+    sleep = mock.Mock()
+    _create_download_queue(sleep).wait_for_turn(DOWNLOAD_PRIORITY_LOW)
+
+    sleep.assert_not_called()
+    assert not claim_file.exists()
+
+
+def test_claim_removes_claim_file_when_released() -> None:
+    with _create_download_queue().claim(DOWNLOAD_PRIORITY_HIGH):
+        assert len(list(Path("~/.lean/download-queue").expanduser().glob("*.claim"))) == 1
+
+    assert len(list(Path("~/.lean/download-queue").expanduser().glob("*.claim"))) == 0
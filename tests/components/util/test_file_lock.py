@@ -0,0 +1,98 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from threading import Thread
+
+import pytest
+from pyfakefs.fake_filesystem import FakeFilesystem
+
+from lean.components.util.file_lock import FileLock
+
+
+@pytest.fixture
+def tmp_dir(fs: FakeFilesystem) -> Path:
+    from tempfile import TemporaryDirectory
+
+    # pyfakefs doesn't implement file locking, so these tests use the real file system
+    fs.pause()
+    with TemporaryDirectory() as tmp_dir:
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setattr("lean.components.util.file_lock.FILE_LOCKS_DIRECTORY", str(Path(tmp_dir) / "locks"))
+            yield Path(tmp_dir)
+    fs.resume()
+
+
+def test_acquire_raises_when_lock_is_held_longer_than_timeout(tmp_dir: Path) -> None:
+    with FileLock(tmp_dir / "config.json"):
+        with pytest.raises(TimeoutError):
+            FileLock(tmp_dir / "config.json", timeout=0.1).acquire()
+
+
+def test_acquire_does_not_block_locks_of_other_files(tmp_dir: Path) -> None:
+    with FileLock(tmp_dir / "config.json"):
+        with FileLock(tmp_dir / "lean.json", timeout=0.1):
+            pass
+
+
+def test_acquire_waits_until_lock_is_released(tmp_dir: Path) -> None:
+    from time import sleep
+
+    order = []
+    lock = FileLock(tmp_dir / "config.json")
+    lock.acquire()
+
+    def acquire_in_thread() -> None:
+        with FileLock(tmp_dir / "config.json", timeout=5):
+            order.append("thread")
+
+    thread = Thread(target=acquire_in_thread)
+    thread.start()
+    sleep(0.1)
+    order.append("main")
+    lock.release()
+    thread.join()
+
+    assert order == ["main", "thread"]
+
+
+def test_release_removes_lock_file(tmp_dir: Path) -> None:
+    with FileLock(tmp_dir / "config.json"):
+        assert len(list((tmp_dir / "locks").iterdir())) == 1
+
+    assert list((tmp_dir / "locks").iterdir()) == []
+
+
+def test_lock_stays_exclusive_while_lock_files_are_removed(tmp_dir: Path) -> None:
+    from time import sleep
+
+    holders = []
+    overlaps = []
+
+    def hold_lock_repeatedly() -> None:
+        for _ in range(50):
+            with FileLock(tmp_dir / "config.json", timeout=10):
+                holders.append(1)
+                if len(holders) > 1:
+                    overlaps.append(len(holders))
+                sleep(0.0005)
+                holders.pop()
+
+    threads = [Thread(target=hold_lock_repeatedly) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert overlaps == []
+    assert list((tmp_dir / "locks").iterdir()) == []
@@ -0,0 +1,124 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from threading import Event
+from time import monotonic
+from unittest import mock
+
+from lean.components.util.housekeeping_manager import HousekeepingManager
+
+
+def test_finish_reports_results_of_tasks_in_submission_order() -> None:
+    reports = []
+
+    manager = HousekeepingManager(mock.Mock(), deadline_seconds=5)
+    manager.submit("first", lambda: lambda: reports.append("first"))
+    manager.submit("second", lambda: None)
+    manager.submit("third", lambda: lambda: reports.append("third"))
+
+    for name in ["first", "second", "third"]:
+        manager.wait(name)
+    manager.finish()
+
+    assert reports == ["first", "third"]
+
+
+def test_finish_does_not_wait_for_running_tasks() -> None:
+    blocker = Event()
+    report = mock.Mock()
+
+    def task():
+        blocker.wait(timeout=5)
+        return report
+
+    logger = mock.Mock()
+    manager = HousekeepingManager(logger, deadline_seconds=5)
+    manager.submit("slow", task)
+
+    start = monotonic()
+    manager.finish()
+    blocker.set()
+
+    assert monotonic() - start < 1
+    report.assert_not_called()
+    logger.debug.assert_called_once()
+
+
+def test_finish_only_reports_tasks_that_are_done() -> None:
+    blocker = Event()
+    done_report = mock.Mock()
+    slow_report = mock.Mock()
+
+    def slow_task():
+        blocker.wait(timeout=5)
+        return slow_report
+
+    manager = HousekeepingManager(mock.Mock(), deadline_seconds=5)
+    manager.submit("done", lambda: done_report)
+    manager.wait("done")
+    manager.submit("slow", slow_task)
+
+    manager.finish()
+    blocker.set()
+
+    done_report.assert_called_once()
+    slow_report.assert_not_called()
+
+
+def test_finish_logs_failing_tasks_without_raising() -> None:
+    def task():
+        raise RuntimeError("Oops")
+
+    logger = mock.Mock()
+    manager = HousekeepingManager(logger, deadline_seconds=5)
+    manager.submit("failing", task)
+
+    manager.wait("failing")
+    manager.finish()
+
+    logger.debug.assert_called_once()
+    assert "Oops" in logger.debug.call_args[0][0]
+
+
+def test_wait_blocks_until_task_is_done() -> None:
+    task_done = Event()
+
+    def task():
+        task_done.set()
+        return None
+
+    manager = HousekeepingManager(mock.Mock(), deadline_seconds=5)
+    manager.submit("task", task)
+
+    manager.wait("task")
+
+    assert task_done.is_set()
+
+
+def test_wait_stops_waiting_for_tasks_exceeding_their_deadline() -> None:
+    blocker = Event()
+
+    manager = HousekeepingManager(mock.Mock(), deadline_seconds=0.1)
+    manager.submit("slow", lambda: blocker.wait(timeout=5))
+
+    start = monotonic()
+    manager.wait("slow")
+    blocker.set()
+
+    assert monotonic() - start < 2
+
+
+def test_wait_returns_immediately_when_task_not_submitted() -> None:
+    manager = HousekeepingManager(mock.Mock(), deadline_seconds=5)
+
+    manager.wait("unknown")
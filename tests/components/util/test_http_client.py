@@ -115,3 +115,53 @@ def test_http_client_logs_debug_message_about_response_when_unsuccessful(request
             getattr(http_client, method)(EXAMPLE_URL)
 
     assert logger.debug.call_count == 2
+
+
+def test_http_client_reuses_session_for_requests_to_same_host(requests_mock: RequestsMock) -> None:
+    requests_mock.add(requests_mock.GET, EXAMPLE_URL + "first", "First body")
+    requests_mock.add(requests_mock.GET, EXAMPLE_URL + "second", "Second body")
+
+    http_client = HTTPClient(mock.Mock())
+
+    with mock.patch.object(requests.Session, "request", autospec=True, side_effect=requests.Session.request) as request:
+        http_client.get(EXAMPLE_URL + "first")
+        http_client.get(EXAMPLE_URL + "second")
+
+    assert request.call_count == 2
+    assert request.call_args_list[0][0][0] is request.call_args_list[1][0][0]
+
+
+def test_http_client_uses_separate_sessions_per_host(requests_mock: RequestsMock) -> None:
+    requests_mock.add(requests_mock.GET, EXAMPLE_URL, "Example body")
+    requests_mock.add(requests_mock.GET, "https://example.org/", "Other body")
+
+    http_client = HTTPClient(mock.Mock())
+
+    with mock.patch.object(requests.Session, "request", autospec=True, side_effect=requests.Session.request) as request:
+        http_client.get(EXAMPLE_URL)
+        http_client.get("https://example.org/")
+
+    assert request.call_args_list[0][0][0] is not request.call_args_list[1][0][0]
+
+
+def test_http_client_sizes_connection_pool_to_given_pool_size(requests_mock: RequestsMock) -> None:
+    requests_mock.add(requests_mock.GET, EXAMPLE_URL, "Example body")
+
+    http_client = HTTPClient(mock.Mock(), pool_size=16)
+    http_client.get(EXAMPLE_URL)
+
+    adapter = http_client._get_session(EXAMPLE_URL).get_adapter(EXAMPLE_URL)
+    assert adapter._pool_maxsize == 16
+
+
+def test_http_client_does_not_pool_connections_when_keep_alive_disabled(requests_mock: RequestsMock) -> None:
+    requests_mock.add(requests_mock.GET, EXAMPLE_URL, "Example body")
+
+    http_client = HTTPClient(mock.Mock(), keep_alive=False)
+
+    with mock.patch.object(requests.Session, "request", autospec=True, side_effect=requests.Session.request) as request:
+        response = http_client.get(EXAMPLE_URL)
+
+    assert response.text == "Example body"
+    assert request.call_count == 1
+    assert len(http_client._sessions) == 0
@@ -0,0 +1,110 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from pathlib import Path
+from unittest import mock
+
+from responses import RequestsMock
+
+from lean.components.util.http_client import HTTPClient
+from lean.components.util.http_stats import HTTPStats
+
+EXAMPLE_URL = "https://example.com/"
+
+
+def test_http_client_does_not_record_requests_when_stats_disabled(requests_mock: RequestsMock) -> None:
+    requests_mock.add(requests_mock.GET, EXAMPLE_URL, "Example body")
+
+    http_client = HTTPClient(mock.Mock())
+    http_client.get(EXAMPLE_URL)
+
+    assert http_client.stats is None
+
+
+def test_http_client_records_requests_by_stats_endpoint(requests_mock: RequestsMock) -> None:
+    requests_mock.add(requests_mock.POST, EXAMPLE_URL, "Example body")
+
+    http_client = HTTPClient(mock.Mock())
+    stats = http_client.enable_stats()
+
+    http_client.post(EXAMPLE_URL, data="payload", stats_endpoint="projects/read")
+    http_client.post(EXAMPLE_URL, data="payload", stats_endpoint="projects/read")
+
+    endpoint = stats.to_dict()["projects/read"]
+    assert endpoint["requests"] == 2
+    assert endpoint["errors"] == 0
+    assert endpoint["statusCodes"] == {"200": 2}
+    assert endpoint["bytesSent"] == 2 * len("payload")
+    assert endpoint["bytesReceived"] == 2 * len("Example body")
+
+
+def test_http_client_records_requests_without_stats_endpoint_by_method_and_host(requests_mock: RequestsMock) -> None:
+    requests_mock.add(requests_mock.GET, EXAMPLE_URL, status=404)
+
+    http_client = HTTPClient(mock.Mock())
+    stats = http_client.enable_stats()
+
+    http_client.get(EXAMPLE_URL, raise_for_status=False)
+
+    endpoint = stats.to_dict()["GET example.com"]
+    assert endpoint["requests"] == 1
+    assert endpoint["errors"] == 1
+    assert endpoint["statusCodes"] == {"404": 1}
+
+
+def test_http_client_records_requests_raising_errors(requests_mock: RequestsMock) -> None:
+    http_client = HTTPClient(mock.Mock())
+    stats = http_client.enable_stats()
+
+    try:
+        http_client.get(EXAMPLE_URL)
+    except Exception:
+        pass
+
+    endpoint = stats.to_dict()["GET example.com"]
+    assert endpoint["errors"] == 1
+    assert endpoint["statusCodes"] == {"error": 1}
+
+
+def test_record_retry_counts_retries_per_endpoint() -> None:
+    stats = HTTPStats()
+
+    stats.record_retry("projects/read")
+    stats.record_retry("projects/read")
+
+    assert stats.to_dict()["projects/read"]["retries"] == 2
+
+
+def test_write_json_writes_stats_of_all_endpoints(requests_mock: RequestsMock) -> None:
+    requests_mock.add(requests_mock.GET, EXAMPLE_URL, "Example body")
+
+    http_client = HTTPClient(mock.Mock())
+    stats = http_client.enable_stats()
+    http_client.get(EXAMPLE_URL, stats_endpoint="data/read")
+
+    path = Path.cwd() / "stats.json"
+    stats.write_json(path)
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["endpoints"]["data/read"]["requests"] == 1
+
+
+def test_log_summary_logs_table() -> None:
+    logger = mock.Mock()
+
+    stats = HTTPStats()
+    stats.record_retry("projects/read")
+    stats.log_summary(logger)
+
+    logger.info.assert_called_once()
@@ -0,0 +1,66 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from lean.components.util.jsonc import loads, strip_comments
+
+
+def test_strip_comments_removes_line_and_block_comments() -> None:
+    content = """
+{
+    // line comment
+    "a": 1, /* block comment */
+    /*
+     * multi-line block comment
+     */
+    "b": 2 // trailing comment
+}
+"""
+
+    assert loads(strip_comments(content)) == {"a": 1, "b": 2}
+    assert "comment" not in strip_comments(content)
+
+
+def test_strip_comments_preserves_comment_markers_in_strings() -> None:
+    content = '{ "url": "https://www.quantconnect.com", "glob": "/* not a comment */" } // comment'
+
+    assert strip_comments(content) == '{ "url": "https://www.quantconnect.com", "glob": "/* not a comment */" } '
+
+
+def test_strip_comments_preserves_escaped_quotes_in_strings() -> None:
+    content = '{ "quote": "say \\"// hi\\"" } // comment'
+
+    assert loads(content) == {"quote": 'say "// hi"'}
+
+
+def test_strip_comments_does_not_merge_consecutive_block_comments() -> None:
+    content = '{ /* first */ "a": 1, /* second */ "b": 2 }'
+
+    assert loads(content) == {"a": 1, "b": 2}
+
+
+def test_loads_removes_trailing_commas() -> None:
+    content = """
+{
+    "array": [1, 2, 3,],
+    "object": { "a": "x,}", }, // comment
+}
+"""
+
+    assert loads(content) == {"array": [1, 2, 3], "object": {"a": "x,}"}}
+
+
+def test_loads_raises_value_error_when_string_is_unterminated() -> None:
+    with pytest.raises(ValueError):
+        loads('{ "a": "unterminated // not a comment }')
@@ -42,6 +42,32 @@ def test_debug_logs_message(capsys: CaptureFixture) -> None:
     assert_stdout_stderr(capsys, "Message\n", "")
 
 
+def test_debug_renders_lazy_message_when_debug_logging_is_enabled(capsys: CaptureFixture) -> None:
+    logger = Logger()
+    logger.debug_logging_enabled = True
+    logger.debug(lambda: "Message")
+
+    assert_stdout_stderr(capsys, "Message\n", "")
+
+
+def test_debug_does_not_render_lazy_message_until_debug_logging_is_enabled(capsys: CaptureFixture) -> None:
+    render = mock.Mock(return_value="Message")
+
+    logger = Logger()
+    logger.debug(render)
+
+    render.assert_not_called()
+    assert_stdout_stderr(capsys, "", "")
+
+
+def test_debug_formats_message_template_with_args(capsys: CaptureFixture) -> None:
+    logger = Logger()
+    logger.debug_logging_enabled = True
+    logger.debug("Message {} of {}", 1, 2)
+
+    assert_stdout_stderr(capsys, "Message 1 of 2\n", "")
+
+
 def test_info_logs_message(capsys: CaptureFixture) -> None:
     logger = Logger()
     logger.info("Message")
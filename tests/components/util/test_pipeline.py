@@ -0,0 +1,119 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from threading import Event, Lock
+from unittest import mock
+
+import pytest
+
+from lean.components.util.pipeline import Pipeline, PipelineStage
+
+
+def test_run_passes_items_through_all_stages() -> None:
+    results = []
+    results_lock = Lock()
+
+    def collect(item: int) -> None:
+        with results_lock:
+            results.append(item)
+
+    pipeline = Pipeline(mock.Mock(), [
+        PipelineStage("double", 3, lambda item: item * 2),
+        PipelineStage("increment", 2, lambda item: item + 1),
+        PipelineStage("collect", 1, collect)
+    ], queue_size=2)
+
+    pipeline.run(range(100))
+
+    assert sorted(results) == [item * 2 + 1 for item in range(100)]
+    assert [stats["processed"] for stats in pipeline.get_stats().values()] == [100, 100, 100]
+
+
+def test_run_drops_items_for_which_a_stage_returns_none() -> None:
+    collect = mock.Mock()
+
+    pipeline = Pipeline(mock.Mock(), [
+        PipelineStage("filter", 2, lambda item: item if item % 2 == 0 else None),
+        PipelineStage("collect", 1, collect)
+    ], queue_size=1)
+
+    pipeline.run(range(10))
+
+    assert sorted(call.args[0] for call in collect.call_args_list) == [0, 2, 4, 6, 8]
+
+
+def test_run_overlaps_stages() -> None:
+    second_stage_started = Event()
+
+    def first_stage(item: int) -> int:
+        # The second item is only processed once the first item has reached the second stage
+        if item == 1:
+            assert second_stage_started.wait(timeout=5)
+        return item
+
+    pipeline = Pipeline(mock.Mock(), [
+        PipelineStage("first", 1, first_stage),
+        PipelineStage("second", 1, lambda item: second_stage_started.set())
+    ], queue_size=1)
+
+    pipeline.run(range(2))
+
+    assert pipeline.get_stats()["second"]["processed"] == 2
+
+
+def test_run_raises_first_error_and_stops_processing() -> None:
+    processed = mock.Mock()
+
+    def fail(item: int) -> int:
+        if item == 0:
+            raise RuntimeError("Oops")
+        return item
+
+    pipeline = Pipeline(mock.Mock(), [
+        PipelineStage("fail", 1, fail),
+        PipelineStage("process", 1, processed)
+    ], queue_size=1)
+
+    with pytest.raises(RuntimeError, match="Oops"):
+        pipeline.run(range(10))
+
+    processed.assert_not_called()
+
+
+def test_run_finishes_items_which_reached_stage_that_finishes_on_stop() -> None:
+    first_processed = []
+    second_processed = []
+    lock = Lock()
+
+    def first(item: int) -> int:
+        with lock:
+            first_processed.append(item)
+        return item
+
+    def second(item: int) -> int:
+        with lock:
+            second_processed.append(item)
+        if item == 0:
+            raise RuntimeError("Oops")
+        return item
+
+    pipeline = Pipeline(mock.Mock(), [
+        PipelineStage("first", 1, first),
+        PipelineStage("second", 1, second, finish_on_stop=True)
+    ], queue_size=2)
+
+    with pytest.raises(RuntimeError, match="Oops"):
+        pipeline.run(range(100))
+
+    assert len(first_processed) < 100
+    assert sorted(second_processed) == sorted(first_processed)
@@ -0,0 +1,69 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from threading import Thread
+from unittest import mock
+
+import pytest
+
+from lean.components.util.progress_aggregator import ProgressAggregator
+
+
+def test_refresh_sums_progress_of_all_threads() -> None:
+    progress = mock.Mock()
+    aggregator = ProgressAggregator(progress, 1, 800, clock=lambda: 0.0)
+
+    def report() -> None:
+        for _ in range(100):
+            aggregator.advance(1)
+            aggregator.add_bytes(1024)
+
+    threads = [Thread(target=report) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    aggregator.refresh()
+
+    assert progress.update.call_args.kwargs["completed"] == 800
+
+
+def test_refresh_shows_throughput_and_eta() -> None:
+    now = [0.0]
+    progress = mock.Mock()
+    aggregator = ProgressAggregator(progress, 1, 100, clock=lambda: now[0])
+    aggregator.start()
+    aggregator._stopped.set()
+
+    aggregator.advance(20)
+    aggregator.add_bytes(4 * 1024 * 1024)
+    now[0] = 2.0
+    aggregator.refresh()
+
+    kwargs = progress.update.call_args.kwargs
+    assert kwargs["files_per_second"] == pytest.approx(10)
+    assert kwargs["megabytes_per_second"] == pytest.approx(2)
+    assert kwargs["eta"] == "0:00:08"
+
+
+def test_stop_shows_final_progress() -> None:
+    progress = mock.Mock()
+    aggregator = ProgressAggregator(progress, 1, None)
+
+    with aggregator:
+        aggregator.advance(0.5)
+        aggregator.advance(0.5)
+
+    assert progress.update.call_args.kwargs["completed"] == 1
+    assert progress.update.call_args.kwargs["eta"] == "-:--:--"
@@ -72,7 +72,7 @@ def _assert_pull_manager_adds_property_to_project_config(prop: str,
             return None
         return []
 
-    project_config = mock.Mock()
+    project_config = mock.MagicMock()
     project_config.get = mock.MagicMock(side_effect=config_get_side_effect)
     project_config.set = mock.Mock()
 
@@ -119,7 +119,7 @@ def _assert_pull_manager_removes_property_from_project_config(prop: str, cloud_p
             return None
         return []
 
-    project_config = mock.Mock()
+    project_config = mock.MagicMock()
     project_config.get = mock.MagicMock(side_effect=config_get_side_effect)
     project_config.set = mock.Mock()
     project_config.delete = mock.Mock()
@@ -333,7 +333,7 @@ def test_pull_projects_updates_lean_config() -> None:
             return None
         return []
 
-    project_config = mock.Mock()
+    project_config = mock.MagicMock()
     project_config.get = mock.MagicMock(side_effect=config_get_side_effect)
 
     project_config_manager = mock.Mock()
@@ -495,3 +495,31 @@ def test_pull_project_doesnt_pull_libraries_the_user_doesnt_have_access_to() ->
          for library in test_library_own_libraries],
         any_order=True)
     library_manager.remove_lean_library_from_project.assert_not_called()
+
+
+def test_pull_projects_requests_files_in_windows_of_max_concurrency_projects() -> None:
+    from lean.components.api.async_api_client import AsyncAPIClient
+
+    create_fake_lean_cli_directory()
+
+    cloud_projects, _ = _make_cloud_projects_and_libraries(5, 0)
+    events = []
+
+    api_client = mock.Mock()
+    api_client.files.get_all.side_effect = lambda project_id: events.append(("fetch", project_id)) or []
+
+    pull_manager = PullManager(mock.Mock(), api_client, container.project_manager, container.project_config_manager,
+                               mock.Mock(), mock.Mock(), container.organization_manager, AsyncAPIClient(api_client, 2))
+
+    with mock.patch.object(pull_manager, "_pull_project",
+                           side_effect=lambda project, *args: events.append(("pull", project.projectId)) or Path.cwd()):
+        pull_manager.pull_projects(cloud_projects, cloud_projects)
+
+    # The files of a window may be requested in any order, but never before the previous window has been pulled
+    windows = [events[0:4], events[4:8], events[8:10]]
+    assert [sorted(window) for window in windows] == [
+        [("fetch", 1), ("fetch", 2), ("pull", 1), ("pull", 2)],
+        [("fetch", 3), ("fetch", 4), ("pull", 3), ("pull", 4)],
+        [("fetch", 5), ("pull", 5)]
+    ]
+    assert [event for event in events if event[0] == "pull"] == [("pull", index) for index in range(1, 6)]
@@ -0,0 +1,128 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from unittest import mock
+
+from lean.components.util.response_cache import CachedResponse, ResponseCache
+from lean.constants import API_BASE_URL
+
+
+def create_response(body: str, headers: dict = {}) -> mock.Mock:
+    response = mock.Mock()
+    response.text = body
+    response.headers = headers
+    return response
+
+
+def test_get_ttl_returns_none_for_uncacheable_endpoints() -> None:
+    cache = ResponseCache(mock.Mock(), str(Path.cwd() / "cache"))
+
+    assert cache.get_ttl("projects/create", {}) is None
+    assert cache.get_ttl("projects/read", {"projectId": 1}) is None
+    assert cache.get_ttl("projects/read", {}) is not None
+    assert cache.get_ttl("data/prices", {"organizationId": "abc"}) is not None
+
+
+def test_get_key_differs_per_user_and_parameters() -> None:
+    cache = ResponseCache(mock.Mock(), str(Path.cwd() / "cache"))
+
+    key = cache.get_key(API_BASE_URL, "1", "post", "data/prices", {"organizationId": "abc"})
+
+    assert key.startswith("data-prices-")
+    assert key == cache.get_key(API_BASE_URL, "1", "POST", "data/prices", {"organizationId": "abc"})
+    assert key != cache.get_key(API_BASE_URL, "2", "post", "data/prices", {"organizationId": "abc"})
+    assert key != cache.get_key(API_BASE_URL, "1", "post", "data/prices", {"organizationId": "def"})
+    assert key != cache.get_key("https://beta.quantconnect.com/api/v2/", "1", "post", "data/prices",
+                                {"organizationId": "abc"})
+
+
+def test_get_returns_stored_response() -> None:
+    cache = ResponseCache(mock.Mock(), str(Path.cwd() / "cache"))
+
+    cache.set("key", create_response('{"success": true}', {"ETag": '"abc"'}))
+    cached_response = cache.get("key")
+
+    assert cached_response is not None
+    assert cached_response.body == '{"success": true}'
+    assert cached_response.is_fresh(60)
+    assert cached_response.get_conditional_headers() == {"If-None-Match": '"abc"'}
+
+
+def test_get_returns_none_when_nothing_is_stored() -> None:
+    cache = ResponseCache(mock.Mock(), str(Path.cwd() / "cache"))
+
+    assert cache.get("key") is None
+
+
+def test_get_returns_none_when_entry_is_corrupted() -> None:
+    cache = ResponseCache(mock.Mock(), str(Path.cwd() / "cache"))
+
+    cache.set("key", create_response("{}"))
+    (Path.cwd() / "cache" / "key.json.gz").write_bytes(b"corrupted")
+
+    assert cache.get("key") is None
+
+
+def test_get_returns_none_when_bypassed() -> None:
+    cache = ResponseCache(mock.Mock(), str(Path.cwd() / "cache"))
+
+    cache.set("key", create_response("{}"))
+    cache.bypass = True
+
+    assert cache.get("key") is None
+
+
+def test_delete_deletes_single_response() -> None:
+    cache = ResponseCache(mock.Mock(), str(Path.cwd() / "cache"))
+
+    cache.set("key", create_response("{}"))
+    cache.set("other-key", create_response("{}"))
+    cache.delete("key")
+
+    assert cache.get("key") is None
+    assert cache.get("other-key") is not None
+
+
+def test_refresh_makes_stale_response_fresh() -> None:
+    cache = ResponseCache(mock.Mock(), str(Path.cwd() / "cache"))
+
+    cache.refresh("key", CachedResponse(stored_at=0, body="{}"))
+
+    assert cache.get("key").is_fresh(60)
+
+
+def test_invalidate_after_request_deletes_affected_responses() -> None:
+    cache = ResponseCache(mock.Mock(), str(Path.cwd() / "cache"))
+
+    cache.set(cache.get_key(API_BASE_URL, "1", "post", "projects/read", {}), create_response("{}"))
+    cache.set(cache.get_key(API_BASE_URL, "1", "post", "data/prices", {}), create_response("{}"))
+
+    cache.invalidate_after_request("projects/read")
+    assert cache.get(cache.get_key(API_BASE_URL, "1", "post", "projects/read", {})) is not None
+
+    cache.invalidate_after_request("files/update")
+    assert cache.get(cache.get_key(API_BASE_URL, "1", "post", "projects/read", {})) is None
+    assert cache.get(cache.get_key(API_BASE_URL, "1", "post", "data/prices", {})) is not None
+
+
+def test_set_logs_instead_of_raising_when_cache_directory_is_not_writable() -> None:
+    (Path.cwd() / "cache").write_text("not a directory", encoding="utf-8")
+
+    logger = mock.Mock()
+    cache = ResponseCache(logger, str(Path.cwd() / "cache"))
+    key = cache.get_key(API_BASE_URL, "1", "post", "data/prices", {})
+    cache.set(key, create_response("{}"))
+
+    assert cache.get(key) is None
+    logger.debug.assert_called_once()
@@ -0,0 +1,159 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+import pytest
+from requests import exceptions
+
+from lean.components.util.retry_policy import RetryPolicy, is_idempotent_endpoint
+
+
+def create_response(status_code: int, headers=None) -> mock.Mock:
+    response = mock.Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+def create_policy(**kwargs) -> RetryPolicy:
+    return RetryPolicy(mock.Mock(), sleep=mock.Mock(), **kwargs)
+
+
+@pytest.mark.parametrize("endpoint,expected", [("projects/read", True),
+                                               ("files/update", True),
+                                               ("projects/create", False),
+                                               ("live/commands/create", False),
+                                               ("live/update/liquidate", False)])
+def test_is_idempotent_endpoint(endpoint: str, expected: bool) -> None:
+    assert is_idempotent_endpoint(endpoint) == expected
+
+
+def test_run_returns_successful_response_without_retrying() -> None:
+    send = mock.Mock(return_value=create_response(200))
+
+    policy = create_policy()
+
+    assert policy.run(send).status_code == 200
+    send.assert_called_once()
+
+
+def test_run_retries_transient_status_until_max_retries_reached() -> None:
+    send = mock.Mock(return_value=create_response(503))
+
+    policy = create_policy(max_retries=3)
+
+    assert policy.run(send).status_code == 503
+    assert send.call_count == 4
+
+
+def test_run_retries_http_500_only_once() -> None:
+    send = mock.Mock(return_value=create_response(500))
+
+    policy = create_policy(max_retries=3)
+    policy.run(send)
+
+    assert send.call_count == 2
+
+
+def test_run_retries_http_429_for_non_idempotent_requests() -> None:
+    send = mock.Mock(side_effect=[create_response(429), create_response(200)])
+
+    policy = create_policy()
+
+    assert policy.run(send, idempotent=False).status_code == 200
+    assert send.call_count == 2
+
+
+def test_run_does_not_retry_read_timeout_for_non_idempotent_requests() -> None:
+    send = mock.Mock(side_effect=exceptions.ReadTimeout())
+
+    policy = create_policy()
+
+    with pytest.raises(exceptions.ReadTimeout):
+        policy.run(send, idempotent=False)
+
+    send.assert_called_once()
+
+
+@pytest.mark.parametrize("error", [exceptions.ConnectionError(), exceptions.ReadTimeout(),
+                                   exceptions.ChunkedEncodingError()])
+def test_run_retries_connection_errors_for_idempotent_requests(error: Exception) -> None:
+    send = mock.Mock(side_effect=[error, create_response(200)])
+
+    policy = create_policy()
+
+    assert policy.run(send).status_code == 200
+
+
+def test_run_retries_http_errors_raised_by_send() -> None:
+    error = exceptions.HTTPError(response=create_response(502))
+    send = mock.Mock(side_effect=[error, None])
+
+    policy = create_policy()
+    policy.run(send)
+
+    assert send.call_count == 2
+
+
+def test_run_does_not_retry_client_errors() -> None:
+    error = exceptions.HTTPError(response=create_response(404))
+    send = mock.Mock(side_effect=error)
+
+    policy = create_policy()
+
+    with pytest.raises(exceptions.HTTPError):
+        policy.run(send)
+
+    send.assert_called_once()
+
+
+def test_run_waits_as_long_as_retry_after_header_requests() -> None:
+    send = mock.Mock(side_effect=[create_response(429, {"Retry-After": "7"}), create_response(200)])
+
+    policy = create_policy()
+    policy.run(send)
+
+    policy._sleep.assert_called_once_with(7.0)
+
+
+def test_run_caps_retry_after_at_maximum_backoff() -> None:
+    send = mock.Mock(side_effect=[create_response(429, {"Retry-After": "3600"}), create_response(200)])
+
+    policy = create_policy(backoff_max=10)
+    policy.run(send)
+
+    policy._sleep.assert_called_once_with(10)
+
+
+def test_run_backs_off_exponentially_with_jitter() -> None:
+    send = mock.Mock(return_value=create_response(503))
+
+    policy = create_policy(max_retries=4, backoff_base=1, backoff_max=100)
+    policy.run(send)
+
+    delays = [call[0][0] for call in policy._sleep.call_args_list]
+    assert len(delays) == 4
+    for attempt, delay in enumerate(delays):
+        assert 0 <= delay <= 2 ** attempt
+
+
+def test_run_stops_retrying_when_retry_budget_is_exhausted() -> None:
+    send = mock.Mock(return_value=create_response(503))
+
+    policy = create_policy(max_retries=3, retry_budget=4)
+    policy.run(send)
+    policy.run(send)
+
+    # 1 + 3 retries for the first request, 1 + 1 retry for the second one
+    assert send.call_count == 6
@@ -37,7 +37,7 @@ def create_objects() -> Tuple[mock.Mock, Storage, mock.Mock, UpdateManager]:
     storage = Storage(str(Path("~/.lean/cache").expanduser()))
     docker_manager = mock.Mock()
 
-    update_manager = UpdateManager(logger, HTTPClient(logger), storage, docker_manager)
+    update_manager = UpdateManager(logger, HTTPClient(logger), storage, lambda: docker_manager)
 
     return logger, storage, docker_manager, update_manager
 
@@ -53,6 +53,21 @@ def test_warn_if_cli_outdated_warns_when_pypi_version_newer_than_current_version
     logger.warn.assert_called()
 
 
+@mock.patch.object(lean, "__version__", "0.0.1")
+def test_check_cli_outdated_only_warns_when_report_is_called(requests_mock: RequestsMock) -> None:
+    requests_mock.add(requests_mock.GET, "https://pypi.org/pypi/lean/json", '{ "info": { "version": "0.0.2" } }')
+
+    logger, storage, docker_manager, update_manager = create_objects()
+
+    report = update_manager.check_cli_outdated()
+
+    logger.warn.assert_not_called()
+
+    report()
+
+    logger.warn.assert_called()
+
+
 @mock.patch.object(lean, "__version__", "0.0.0-dev")
 def test_warn_if_cli_outdated_does_nothing_when_running_dev_version(requests_mock: RequestsMock) -> None:
     logger, storage, docker_manager, update_manager = create_objects()
@@ -327,3 +342,64 @@ def test_show_announcement_does_nothing_when_github_responds_with_error(requests
     update_manager.show_announcements()
 
     logger.info.assert_not_called()
+
+
+@mock.patch.object(lean, "__version__", "0.0.1")
+def test_check_cli_outdated_checks_again_when_result_was_not_reported_before_command_finished(
+        requests_mock: RequestsMock) -> None:
+    from threading import Event
+    from lean.components.util.housekeeping_manager import HousekeepingManager
+
+    request_received = Event()
+    command_finished = Event()
+    check_done = Event()
+
+    def callback(request):
+        request_received.set()
+        command_finished.wait(timeout=5)
+        return 200, {}, '{ "info": { "version": "0.0.2" } }'
+
+    requests_mock.add_callback(requests_mock.GET, "https://pypi.org/pypi/lean/json", callback=callback)
+
+    logger, storage, docker_manager, update_manager = create_objects()
+    housekeeping_manager = HousekeepingManager(logger, 5)
+
+    def check_cli_outdated():
+        try:
+            return update_manager.check_cli_outdated()
+        finally:
+            check_done.set()
+
+    housekeeping_manager.submit("cli-update", check_cli_outdated)
+    assert request_received.wait(timeout=5)
+
+    # The command finishes before the update check, so the result of the check is discarded
+    housekeeping_manager.finish()
+    command_finished.set()
+    assert check_done.wait(timeout=5)
+
+    logger.warn.assert_not_called()
+    assert not storage.has("last-update-check-cli")
+
+    update_manager.warn_if_cli_outdated()
+
+    logger.warn.assert_called()
+    assert storage.has("last-update-check-cli")
+
+
+def test_check_announcements_shows_announcements_again_when_result_was_not_reported(
+        requests_mock: RequestsMock) -> None:
+    requests_mock.add(requests_mock.GET,
+                      "https://raw.githubusercontent.com/QuantConnect/lean-cli/master/announcements.json",
+                      json.dumps({"announcements": [{"date": "2024-01-01", "message": "Hello"}]}))
+
+    logger, storage, docker_manager, update_manager = create_objects()
+
+    assert update_manager.check_announcements() is not None
+    assert not storage.has("last-update-check-announcements")
+    assert not storage.has("last-announcements-hash")
+
+    update_manager.show_announcements()
+
+    logger.info.assert_called_once()
+    assert storage.has("last-update-check-announcements")
@@ -17,7 +17,7 @@ from typing import List, Dict, Optional, Union, Set, Pattern
 import pytest
 
 from lean.models.data import DatasetOneOfCondition, OptionResult, DatasetTextOption, DatasetTextOptionTransform, \
-    DatasetSelectOption, DatasetDateOption, DataFileAllGroup, DataFileLatestGroup
+    DatasetSelectOption, DatasetDateOption, DataFileAllGroup, DataFileLatestGroup, merge_sorted_unique
 
 
 @pytest.mark.parametrize("option,values,results,expected", [
@@ -221,3 +221,38 @@ def test_data_file_latest_group_get_valid_files_works_correctly(prefix: str,
     group = DataFileLatestGroup(prefix=prefix, regex=regex)
 
     assert group.get_valid_files(files_with_prefix) == expected_result
+
+
+def test_merge_sorted_unique_merges_sources_without_duplicates() -> None:
+    merged = merge_sorted_unique([
+        ("a/1", lambda: iter(["a/1", "a/3", "b/1"])),
+        ("a/2", lambda: iter(["a/2", "a/3"])),
+        ("", lambda: iter([]))
+    ])
+
+    assert list(merged) == ["a/1", "a/2", "a/3", "b/1"]
+
+
+def test_merge_sorted_unique_opens_sources_when_their_lower_bound_is_reached() -> None:
+    opened = []
+
+    def create_source(name: str, values: List[str]):
+        def open_source():
+            opened.append(name)
+            return iter(values)
+        return values[0], open_source
+
+    merged = merge_sorted_unique([
+        create_source("aapl", ["aapl/1", "aapl/2"]),
+        create_source("msft", ["msft/1", "msft/2"]),
+        create_source("spy", ["spy/1", "spy/2"])
+    ])
+
+    assert next(merged) == "aapl/1"
+    assert next(merged) == "aapl/2"
+    assert opened == ["aapl"]
+
+    assert next(merged) == "msft/1"
+    assert opened == ["aapl", "msft"]
+
+    assert list(merged) == ["msft/2", "spy/1", "spy/2"]
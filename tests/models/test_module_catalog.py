@@ -0,0 +1,175 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from lean.constants import MODULE_BROKERAGE, MODULE_CLI_PLATFORM, MODULE_CLOUD_PLATFORM, MODULE_DATA_QUEUE_HANDLER
+from lean import models
+from lean.models import module_catalog
+
+_MODULE_DATA = {
+    "id": "test-brokerage",
+    "display-id": "TestBrokerage",
+    "type": [MODULE_BROKERAGE, MODULE_DATA_QUEUE_HANDLER],
+    "platform": [MODULE_CLI_PLATFORM, MODULE_CLOUD_PLATFORM],
+    "configurations": [
+        {
+            "id": "test-environment",
+            "type": "info",
+            "value": "live"
+        },
+        {
+            "id": "test-account-number",
+            "type": "input",
+            "input-method": "prompt",
+            "prompt-info": "Account number",
+            "filters": [
+                {
+                    "condition": {
+                        "dependent-config-id": "test-environment",
+                        "pattern": "^live$",
+                        "type": "regex"
+                    }
+                }
+            ]
+        }
+    ]
+}
+
+
+@pytest.fixture
+def modules_json_path() -> Path:
+    path = Path.cwd() / "modules.json"
+    path.write_text(json.dumps({"modules": [_MODULE_DATA]}), encoding="utf-8")
+
+    with mock.patch("lean.models.file_path", path):
+        yield path
+
+
+def test_load_catalog_parses_modules_of_all_platforms(modules_json_path: Path) -> None:
+    modules = module_catalog._load_catalog()
+
+    assert [module.get_id() for module in modules["cli_brokerages"]] == ["test-brokerage"]
+    assert [module.get_id() for module in modules["cli_data_queue_handlers"]] == ["test-brokerage"]
+    assert [module.get_id() for module in modules["cloud_brokerages"]] == ["test-brokerage"]
+    assert modules["cli_data_downloaders"] == []
+
+
+def test_load_catalog_uses_stored_catalog_when_json_file_is_unchanged(modules_json_path: Path) -> None:
+    module_catalog._load_catalog()
+
+    assert module_catalog.get_catalog_path().is_file()
+
+    with mock.patch.object(module_catalog, "_parse_modules", side_effect=AssertionError):
+        modules = module_catalog._load_catalog()
+
+    assert modules["cli_brokerages"][0].get_name() == "TestBrokerage"
+    assert modules["cli_brokerages"][0].get_config_value_from_name("test-environment") == "live"
+
+
+def test_load_catalog_rebuilds_catalog_when_json_file_changes(modules_json_path: Path) -> None:
+    module_catalog._load_catalog()
+
+    modules_json_path.write_text(json.dumps({"modules": []}), encoding="utf-8")
+    modules = module_catalog._load_catalog()
+
+    assert modules["cli_brokerages"] == []
+
+
+def test_load_catalog_rebuilds_corrupted_catalog(modules_json_path: Path) -> None:
+    module_catalog._load_catalog()
+    module_catalog.get_catalog_path().write_bytes(b"corrupted")
+
+    modules = module_catalog._load_catalog()
+
+    assert [module.get_id() for module in modules["cli_brokerages"]] == ["test-brokerage"]
+
+
+def test_ensure_modules_json_downloads_missing_file(requests_mock) -> None:
+    path = Path.cwd() / "missing.json"
+    requests_mock.add(requests_mock.GET, models.url, json={"modules": []})
+
+    with mock.patch("lean.models.file_path", path), mock.patch("lean.models.Thread") as thread:
+        models._ensure_modules_json()
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"modules": []}
+    thread.assert_not_called()
+
+
+def test_ensure_modules_json_refreshes_outdated_file_in_background(modules_json_path: Path) -> None:
+    os.utime(modules_json_path, (0, 0))
+
+    with mock.patch("lean.models.Thread") as thread:
+        models._ensure_modules_json()
+
+    thread.assert_called_once_with(target=models._refresh_modules_json, daemon=True)
+    thread.return_value.start.assert_called_once()
+
+
+def test_ensure_modules_json_does_not_refresh_recent_file(modules_json_path: Path) -> None:
+    with mock.patch("lean.models.Thread") as thread:
+        models._ensure_modules_json()
+
+    thread.assert_not_called()
+
+
+def test_load_catalog_rebuilds_catalog_when_model_source_changes(modules_json_path: Path) -> None:
+    module_catalog._load_catalog()
+
+    with mock.patch.object(module_catalog, "_get_source_fingerprint", return_value="changed"), \
+            mock.patch.object(module_catalog, "_parse_modules", return_value={}) as parse_modules:
+        module_catalog._load_catalog()
+
+    parse_modules.assert_called_once()
+
+
+def test_get_catalog_path_returns_path_outside_package_directory(modules_json_path: Path) -> None:
+    from lean.constants import MODULES_JSON_DIRECTORY
+
+    assert module_catalog.get_catalog_path().parent == Path(MODULES_JSON_DIRECTORY)
+
+
+def test_ensure_modules_json_copies_file_of_older_cli_version(requests_mock) -> None:
+    legacy_path = Path.cwd() / "legacy.json"
+    legacy_path.write_text(json.dumps({"modules": []}), encoding="utf-8")
+    path = Path.cwd() / "cache" / "modules.json"
+
+    with mock.patch("lean.models.file_path", path), \
+            mock.patch("lean.models.legacy_file_path", legacy_path), \
+            mock.patch("lean.models.Thread") as thread:
+        models._ensure_modules_json()
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"modules": []}
+    assert len(requests_mock.calls) == 0
+    thread.assert_not_called()
+
+
+def test_download_modules_json_removes_stale_temporary_files(requests_mock) -> None:
+    path = Path.cwd() / "modules.json"
+    stale_tmp_path = Path.cwd() / ".modules.json.stale"
+    stale_tmp_path.touch()
+    os.utime(stale_tmp_path, (0, 0))
+    recent_tmp_path = Path.cwd() / ".modules.json.recent"
+    recent_tmp_path.touch()
+
+    requests_mock.add(requests_mock.GET, models.url, json={"modules": []})
+
+    with mock.patch("lean.models.file_path", path), mock.patch("lean.models.file_name", path.name):
+        models._download_modules_json()
+
+    assert sorted(p.name for p in Path.cwd().iterdir()) == [".modules.json.recent", "modules.json"]
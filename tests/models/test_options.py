@@ -15,7 +15,7 @@ from unittest import mock
 
 import pytest
 
-from lean.models.options import ChoiceOption, Option
+from lean.models.options import BandwidthScheduleOption, ChoiceOption, IntegerOption, Option
 
 
 def test_option_get_value_returns_value_from_storage() -> None:
@@ -85,3 +85,56 @@ def test_choice_option_set_value_raises_when_new_value_not_in_allowed_values() -
         option.set_value("option3")
 
     storage.set.assert_not_called()
+
+
+def test_integer_option_set_value_writes_normalized_value_to_storage() -> None:
+    storage = mock.Mock()
+
+    option = IntegerOption("my-key", "Documentation for my-key.", False, storage, min_value=1)
+    option.set_value(" 16 ")
+
+    storage.set.assert_called_once_with("my-key", "16")
+
+
+@pytest.mark.parametrize("new_value", ["abc", "1.5", "0", "101"])
+def test_integer_option_set_value_raises_when_new_value_invalid(new_value: str) -> None:
+    storage = mock.Mock()
+
+    option = IntegerOption("my-key", "Documentation for my-key.", False, storage, min_value=1, max_value=100)
+
+    with pytest.raises(ValueError):
+        option.set_value(new_value)
+
+    storage.set.assert_not_called()
+
+
+@pytest.mark.parametrize("stored_value,expected", [(None, 5), ("12", 12), ("invalid", 5)])
+def test_integer_option_get_int_value_falls_back_to_default(stored_value, expected: int) -> None:
+    storage = mock.Mock()
+    storage.get.return_value = stored_value
+
+    option = IntegerOption("my-key", "Documentation for my-key.", False, storage, default_value=5)
+
+    assert option.get_int_value() == expected
+
+
+@pytest.mark.parametrize("new_value", ["09:00-17:00", "9-17=2", "09:00-17:00=fast", "09:00-17:00=0"])
+def test_bandwidth_schedule_option_set_value_raises_when_new_value_invalid(new_value: str) -> None:
+    storage = mock.Mock()
+
+    option = BandwidthScheduleOption("my-key", "Documentation for my-key.", False, storage)
+
+    with pytest.raises(ValueError):
+        option.set_value(new_value)
+
+    storage.set.assert_not_called()
+
+
+@pytest.mark.parametrize("stored_value,has_schedule", [(None, False), ("09:00-17:00=2", True), ("invalid", False)])
+def test_bandwidth_schedule_option_get_schedule_ignores_invalid_values(stored_value, has_schedule: bool) -> None:
+    storage = mock.Mock()
+    storage.get.return_value = stored_value
+
+    option = BandwidthScheduleOption("my-key", "Documentation for my-key.", False, storage)
+
+    assert (option.get_schedule() is not None) == has_schedule
@@ -11,9 +11,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import os
 from datetime import datetime
 from pathlib import Path
+from threading import Event
+from time import monotonic
 from typing import Optional
 from unittest import mock
 from unittest.mock import patch
@@ -100,16 +103,42 @@ def test_lean_command_parses_unknown_options() -> None:
 def test_lean_command_checks_for_cli_updates() -> None:
     @click.command(cls=LeanCommand)
     def command() -> None:
-        pass
+        container.housekeeping_manager.wait("cli-update")
+
+    update_manager = mock.Mock()
+    container.update_manager = update_manager
+
+    result = CliRunner().invoke(command)
+
+    assert result.exit_code == 0
+
+    update_manager.check_cli_outdated.assert_called_once()
+    update_manager.check_cli_outdated.return_value.assert_called_once()
+
+
+def test_lean_command_runs_housekeeping_while_command_runs() -> None:
+    command_started = Event()
+
+    @click.command(cls=LeanCommand)
+    def command() -> None:
+        command_started.set()
+        container.housekeeping_manager.wait("announcements")
+
+    report = mock.Mock()
+
+    def check_announcements():
+        # Only reports if the command body ran while this check was still in progress
+        return report if command_started.wait(timeout=2) else None
 
     update_manager = mock.Mock()
+    update_manager.check_announcements = check_announcements
     container.update_manager = update_manager
 
     result = CliRunner().invoke(command)
 
     assert result.exit_code == 0
 
-    update_manager.warn_if_cli_outdated.assert_called_once()
+    report.assert_called_once()
 
 
 def test_lean_command_does_not_check_for_cli_updates_when_command_raises() -> None:
@@ -117,7 +146,14 @@ def test_lean_command_does_not_check_for_cli_updates_when_command_raises() -> No
     def command() -> None:
         raise RuntimeError("Oops")
 
+    report = mock.Mock()
+
+    def check_cli_outdated():
+        Event().wait(timeout=2)
+        return report
+
     update_manager = mock.Mock()
+    update_manager.check_cli_outdated = check_cli_outdated
     container.update_manager = update_manager
 
     result = CliRunner().invoke(command)
@@ -125,6 +161,45 @@ def test_lean_command_does_not_check_for_cli_updates_when_command_raises() -> No
     assert result.exit_code != 0
 
     update_manager.warn_if_cli_outdated.assert_not_called()
+    report.assert_not_called()
+
+
+def test_lean_command_does_not_wait_for_housekeeping_it_does_not_need() -> None:
+    @click.command(cls=LeanCommand)
+    def command() -> None:
+        pass
+
+    blocker = Event()
+    report = mock.Mock()
+
+    def check_cli_outdated():
+        blocker.wait(timeout=5)
+        return report
+
+    update_manager = mock.Mock()
+    update_manager.check_cli_outdated = check_cli_outdated
+    container.update_manager = update_manager
+
+    start = monotonic()
+    result = CliRunner().invoke(command)
+    blocker.set()
+
+    assert result.exit_code == 0
+    assert monotonic() - start < 1
+    report.assert_not_called()
+
+
+def test_lean_command_writes_http_stats_when_http_stats_file_option_given() -> None:
+    @click.command(cls=LeanCommand)
+    def command() -> None:
+        container.http_client.stats.record_retry("projects/read")
+
+    result = CliRunner().invoke(command, ["--http-stats-file", "stats.json"])
+
+    assert result.exit_code == 0
+
+    stats = json.loads((Path.cwd() / "stats.json").read_text(encoding="utf-8"))
+    assert stats["endpoints"]["projects/read"]["retries"] == 1
 
 
 def test_path_parameter_fails_when_input_not_valid_path() -> None:
@@ -0,0 +1,95 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+from importlib import import_module
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from lean.commands import lean
+from lean.components.util.click_lazy_command_group import LazyCommandGroup
+
+
+@pytest.fixture
+def lazy_module() -> None:
+    # A module which is only importable by the lazy command group, it's removed again after each test
+    module = type(sys)("lazy_test_commands")
+
+    @click.command()
+    def cloud() -> None:
+        """Interact with the cloud using a very long help text which has to be shortened in the help."""
+        click.echo("cloud")
+
+    module.cloud = cloud
+    sys.modules[module.__name__] = module
+    yield
+    del sys.modules[module.__name__]
+
+
+def _create_group() -> LazyCommandGroup:
+    @click.group(cls=LazyCommandGroup)
+    def group() -> None:
+        pass
+
+    group.add_lazy_command("cloud",
+                           "lazy_test_commands:cloud",
+                           "Interact with the cloud using a very long help text which has to be shortened in the help.")
+    return group
+
+
+def test_lazy_command_group_imports_command_when_invoked(lazy_module) -> None:
+    group = _create_group()
+
+    assert "cloud" not in group.commands
+
+    result = CliRunner().invoke(group, ["cloud"])
+
+    assert result.exit_code == 0
+    assert result.output == "cloud\n"
+    assert "cloud" in group.commands
+
+
+def test_lazy_command_group_resolves_unique_prefix_match(lazy_module) -> None:
+    result = CliRunner().invoke(_create_group(), ["cl"])
+
+    assert result.exit_code == 0
+    assert result.output == "cloud\n"
+
+
+def test_lazy_command_group_help_is_identical_before_and_after_importing(lazy_module) -> None:
+    group = _create_group()
+
+    lazy_help = CliRunner().invoke(group, ["--help"]).output
+    assert "cloud" not in group.commands
+
+    group.get_command(None, "cloud")
+    loaded_help = CliRunner().invoke(group, ["--help"]).output
+
+    assert lazy_help == loaded_help
+    assert "..." in lazy_help
+
+
+@pytest.mark.parametrize("name", lean.list_commands(None))
+def test_lean_lazy_command_matches_command(name: str) -> None:
+    lazy_command = lean._lazy_commands[name]
+    module_name, attribute = lazy_command.import_path.split(":")
+    command = lean.get_command(None, name)
+
+    assert command is not None
+    assert command.name == name
+    assert getattr(import_module(module_name), attribute) is not None
+
+    short_help = command.short_help or command.help.split("\n\n")[0]
+    assert lazy_command.short_help == short_help
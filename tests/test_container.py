@@ -0,0 +1,115 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import subprocess
+import sys
+from typing import List
+from unittest import mock
+
+from pyfakefs.fake_filesystem import FakeFilesystem
+
+from lean.container import Container
+
+
+def _run_startup_script(fs: FakeFilesystem, script: str) -> dict:
+    # A fresh interpreter is used so modules imported by other tests don't influence the result
+    # It gets an empty home directory, so the configuration of the machine running the tests doesn't either
+    from os import environ
+    from tempfile import TemporaryDirectory
+
+    fs.pause()
+    try:
+        with TemporaryDirectory() as home:
+            result = subprocess.run([sys.executable, "-c", script],
+                                    capture_output=True,
+                                    text=True,
+                                    check=True,
+                                    env={**environ, "HOME": home, "USERPROFILE": home})
+    finally:
+        fs.resume()
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _get_components_imported_by_command(fs: FakeFilesystem, *args: str) -> List[str]:
+    return _run_startup_script(fs, f"""
+import json, sys
+from click.testing import CliRunner
+from lean.commands import lean
+CliRunner().invoke(lean, {list(args)!r})
+print(json.dumps({{"modules": [m for m in sys.modules if m.startswith("lean.components.")]}}))
+""")["modules"]
+
+
+def test_container_creates_components_on_first_access() -> None:
+    container = Container()
+
+    assert "lean_runner" not in vars(container)
+
+    lean_runner = container.lean_runner
+
+    assert "lean_runner" in vars(container)
+    assert container.lean_runner is lean_runner
+
+
+def test_container_initialize_uses_given_components_and_forgets_created_ones() -> None:
+    container = Container()
+    logger = container.logger
+    docker_manager = mock.Mock()
+
+    container.initialize(docker_manager=docker_manager)
+
+    assert container.docker_manager is docker_manager
+    assert container.logger is not logger
+
+
+def test_api_client_creates_clients_on_first_access() -> None:
+    api_client = Container().api_client
+
+    assert "projects" not in vars(api_client)
+    assert api_client.projects is api_client.projects
+
+
+def test_container_import_does_not_import_components(fs: FakeFilesystem) -> None:
+    modules = _run_startup_script(fs, """
+import json, sys
+from lean.container import container
+container.cli_config_manager
+print(json.dumps({"modules": [m for m in sys.modules if m.startswith("lean.components.")]}))
+""")["modules"]
+
+    assert "lean.components.config.cli_config_manager" in modules
+    assert "lean.components.api.api_client" not in modules
+    assert "lean.components.docker.docker_manager" not in modules
+    assert "lean.components.docker.lean_runner" not in modules
+
+
+def test_config_get_does_not_import_api_or_docker_components(fs: FakeFilesystem) -> None:
+    modules = _get_components_imported_by_command(fs, "config", "get", "default-language")
+
+    assert "lean.components.config.cli_config_manager" in modules
+    for module in ["lean.components.api.api_client",
+                   "lean.components.cloud.data_downloader",
+                   "lean.components.cloud.module_manager",
+                   "lean.components.docker.docker_manager",
+                   "lean.components.util.response_cache"]:
+        assert module not in modules
+
+
+def test_whoami_does_not_import_docker_or_data_components(fs: FakeFilesystem) -> None:
+    modules = _get_components_imported_by_command(fs, "whoami")
+
+    for module in ["lean.components.cloud.data_downloader",
+                   "lean.components.cloud.module_manager",
+                   "lean.components.docker.docker_manager"]:
+        assert module not in modules